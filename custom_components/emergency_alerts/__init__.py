@@ -1,6 +1,24 @@
+from datetime import datetime
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.components.persistent_notification import async_create
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEFAULT_PROFILE_DURATION,
+    MAX_PROFILE_DURATION,
+    SERVICE_GET_HISTORY,
+    SERVICE_PROFILE,
+)
+from .core.anomaly import async_setup_baselines
+from .core.bulk import async_apply_bulk, BULK_COMMANDS, FILTERS, match_alerts
+from .core.definition import async_drop_alert_definitions
+from .core.history import merge_histories
+from .core.profiler import start_profiler, stop_profiler
+from .core.transition_log import async_close_transition_log, async_setup_transition_log
 
 DOMAIN = "emergency_alerts"
 
@@ -33,6 +51,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         hass.config_entries.async_update_entry(entry, data=new_data)
         _LOGGER.warning(f"[MIGRATION] Added group='{group_name}' to entry '{entry.title}'")
 
+    # Replay the transition log (if enabled) before any alert is created, so
+    # alerts can restore their flags from it.
+    await async_setup_transition_log(hass)
+    # Likewise load the anomaly baselines, so anomaly alerts don't start cold.
+    await async_setup_baselines(hass)
+
     if hub_type == "global":
         # Store global options from the global settings hub
         if entry.options:
@@ -93,10 +117,111 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                     await hass.config_entries.async_reload(config_entry.entry_id)
                     break
 
+        async def handle_profile(call):
+            """Profile the integration's callbacks for a fixed duration."""
+            try:
+                duration = int(call.data.get("duration", DEFAULT_PROFILE_DURATION))
+            except (TypeError, ValueError):
+                duration = DEFAULT_PROFILE_DURATION
+            duration = min(max(duration, 1), MAX_PROFILE_DURATION)
+
+            if start_profiler() is None:
+                _LOGGER.warning("An Emergency Alerts profile is already running")
+                return
+            _LOGGER.info(f"Profiling Emergency Alerts callbacks for {duration}s")
+
+            async def finish_profile(_now):
+                profiler = stop_profiler()
+                if profiler is None:
+                    return
+                stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+                path = hass.config.path(f"emergency_alerts_profile_{stamp}.prof")
+                await hass.async_add_executor_job(profiler.profile.dump_stats, path)
+
+                rows = profiler.summary()
+                for row in rows:
+                    _LOGGER.info(
+                        f"Profile {row['function']}: {row['calls']} calls, "
+                        f"{row['total_ms']} ms total, {row['mean_ms']} ms mean"
+                    )
+                table = "\n".join(
+                    f"- `{row['function']}`: {row['calls']} calls, {row['total_ms']} ms"
+                    for row in rows[:10]
+                ) or "No profiled callbacks ran."
+                async_create(
+                    hass,
+                    title="Emergency Alerts Profile",
+                    message=f"Profile written to `{path}`.\n\n{table}",
+                    notification_id="emergency_alerts_profile",
+                )
+
+            async_call_later(hass, duration, finish_profile)
+
+        def _history_time(call, key):
+            value = call.data.get(key)
+            if value is None:
+                return None
+            parsed = value if isinstance(value, datetime) else dt_util.parse_datetime(str(value))
+            if parsed is None:
+                raise ServiceValidationError(f"Invalid {key} time: {value}")
+            return dt_util.as_utc(parsed).timestamp()
+
+        async def handle_get_history(call):
+            """Return recent status transitions by alert, hub and time range."""
+            entity_ids = call.data.get("entity_id")
+            if isinstance(entity_ids, str):
+                entity_ids = [entity_ids]
+            hub_name = call.data.get("hub_name")
+            start = _history_time(call, "start")
+            end = _history_time(call, "end")
+            limit = call.data.get("limit")
+            if limit is not None:
+                try:
+                    limit = max(int(limit), 0)
+                except (TypeError, ValueError):
+                    raise ServiceValidationError(f"Invalid limit: {limit}") from None
+
+            selected = [
+                (entity.entity_id, entity._history)
+                for entity in hass.data.get(DOMAIN, {}).get("entities", [])
+                if entity._history is not None
+                and (not entity_ids or entity.entity_id in entity_ids)
+                and (not hub_name or entity._hub_name == hub_name)
+            ]
+            transitions = merge_histories(selected, start, end, limit)
+            for row in transitions:
+                row["timestamp"] = dt_util.utc_from_timestamp(row["timestamp"]).isoformat()
+            return {"transitions": transitions}
+
+        async def handle_bulk(call):
+            """Apply one command to every alert matching the filters."""
+            filters = {key: call.data[key] for key in FILTERS if call.data.get(key)}
+            if not filters:
+                raise ServiceValidationError(
+                    f"{call.service} needs at least one of: {', '.join(FILTERS)}"
+                )
+            alerts = match_alerts(hass.data.get(DOMAIN, {}).get("entities", []), **filters)
+            result = async_apply_bulk(hass, alerts, BULK_COMMANDS[call.service])
+            _LOGGER.info(
+                f"{call.service}: {result['changed']} of {result['matched']} matching alerts changed"
+            )
+            return result
+
         hass.services.async_register(DOMAIN, "acknowledge", handle_acknowledge)
         hass.services.async_register(DOMAIN, "clear", handle_clear)
         hass.services.async_register(DOMAIN, "escalate", handle_escalate)
         hass.services.async_register(DOMAIN, "add_alert", handle_add_alert)
+        hass.services.async_register(DOMAIN, SERVICE_PROFILE, handle_profile)
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_HISTORY,
+            handle_get_history,
+            supports_response=SupportsResponse.ONLY,
+        )
+        for service in BULK_COMMANDS:
+            hass.services.async_register(
+                DOMAIN, service, handle_bulk, supports_response=SupportsResponse.OPTIONAL
+            )
 
         hass.data[DOMAIN]["services_registered"] = True
 
@@ -136,6 +261,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
 
         for entity in entities_to_remove:
             hass.data[DOMAIN]["entities"].remove(entity)
+    async_drop_alert_definitions(hass, entry.entry_id)
+    if hub_type == "global":
+        # Flushed and reopened by the setup that follows an options change.
+        await async_close_transition_log(hass)
 
     return unload_ok
 
@@ -1,20 +1,23 @@
-import json
+import asyncio
 import logging
-from datetime import datetime
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import callback, HomeAssistant
-from homeassistant.helpers.dispatcher import async_dispatcher_send, async_dispatcher_connect
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import (
     async_call_later,
     async_track_state_change_event,
     async_track_template_result,
     TrackTemplate,
+    TrackTemplateResultInfo,
 )
 from homeassistant.helpers.template import Template
-import yaml
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
@@ -24,19 +27,80 @@ from .const import (
     STATE_ACTIVE,
     STATE_INACTIVE,
     STATE_ESCALATED,
+    STATE_FLAPPING,
     SIGNAL_ALERT_UPDATE,
-    SIGNAL_SWITCH_UPDATE,
+    SIGNAL_PATTERN_MATCH,
+    STATUS_SENSOR_PREFIX,
+    STATUS_SENSOR_SUFFIX,
+    EVENT_ALERT_TRACE,
+    CONF_ENABLE_TRACE_EVENTS,
+    CONF_HISTORY_SIZE,
+    DEFAULT_HISTORY_SIZE,
     CONF_ON_ACKNOWLEDGED,
     CONF_ON_SNOOZED,
     CONF_ON_RESOLVED,
-    # TRIGGER_TYPE_COMBINED removed in Phase 2
-    COMP_EQ,
-    COMP_NE,
-    COMP_LT,
-    COMP_LTE,
-    COMP_GT,
-    COMP_GTE,
+    TRIGGER_TYPE_NUMERIC,
+    TRIGGER_TYPE_OCCURRENCE,
+    TRIGGER_TYPE_ANOMALY,
+    TRIGGER_TYPE_RATE,
+    TRIGGER_TYPE_STALE,
 )
+from .core.anomaly import Baseline, async_acquire_baseline, async_release_baseline
+from .core.conditions import values_unchanged
+from .core.definition import (
+    AlertDefinition,
+    async_get_alert_definitions,
+    definition_attribute,
+)
+from .core.flapping import FlapDetector
+from .core.history import (
+    CAUSE_SERVICE,
+    CAUSE_TRIGGER,
+    CAUSE_UNKNOWN,
+    TransitionHistory,
+)
+from .core.metrics import AlertMetrics, IntegrationMetrics, async_get_integration_metrics
+from .core.occurrence import OccurrenceWindow
+from .core.profiler import profiled
+from .core.rate import (
+    SampleWindow,
+    async_acquire_sample_window,
+    async_release_sample_window,
+)
+from .core.runtime import (
+    FLAG_ACKNOWLEDGED,
+    FLAG_CLEARED,
+    FLAG_ESCALATED,
+    FLAG_FLAPPING,
+    FLAG_ON,
+    FLAG_RESOLVED,
+    FLAG_SNOOZED,
+    FLAG_TRIGGERED,
+    AlertRuntime,
+    async_drop_alert_runtime,
+    async_get_alert_runtime,
+    field_attribute,
+    flag_attribute,
+)
+from .core.state_machine import (
+    CMD_ACKNOWLEDGE,
+    CMD_CLEAR,
+    CMD_CONDITION_CLEARED,
+    CMD_ESCALATE,
+    CMD_ESCALATION_TIMEOUT,
+    CMD_FLAP_END,
+    CMD_FLAP_START,
+    CMD_SNOOZE_EXPIRED,
+    CMD_TRIGGER,
+    TIMER_ARM,
+    TIMER_CANCEL,
+    TIMER_KEEP,
+    should_escalate,
+    shows_on,
+    step,
+)
+from .core.staleness import async_get_deadline_index, last_report
+from .core.tracing import TransitionTrace
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,142 +108,6 @@ ESCALATION_MINUTES = 5  # Default escalation time if not specified
 SUMMARY_UPDATE_SIGNAL = "emergency_alerts_summary_update"
 
 
-def _resolve_script_field(alert_data, action_field, script_field):
-    """Resolve an action list, preferring the explicit field over a script shortcut.
-
-    If ``alert_data[action_field]`` is set, return it unchanged. Otherwise,
-    if ``alert_data[script_field]`` is set, synthesize a single-entry list
-    that calls ``script.turn_on`` against the named script entity.
-
-    The synthesized action emits ``entity_id`` inside ``data`` (not
-    ``target``) because both ``_call_actions`` and ``_execute_action``
-    forward only ``action.get("data", {})`` into ``hass.services.async_call``
-    — ``target`` would be silently dropped, leaving the script call with no
-    entity to operate on. HA accepts ``entity_id`` inside ``data`` for the
-    ``script.turn_on`` service (legacy format).
-
-    Used to wire both ``on_triggered_script`` and ``on_escalated_script``
-    config-flow UI fields into the runtime action lists.
-    """
-    explicit = alert_data.get(action_field)
-    if explicit:
-        return explicit
-    script_entity = alert_data.get(script_field)
-    if script_entity:
-        return [
-            {
-                "service": "script.turn_on",
-                "data": {"entity_id": script_entity},
-            }
-        ]
-    return None
-
-
-def _resolve_on_triggered(alert_data):
-    """Resolve the on-trigger actions: explicit ``on_triggered`` or ``on_triggered_script``.
-
-    See :func:`_resolve_script_field` for the resolution rules.
-    """
-    return _resolve_script_field(alert_data, "on_triggered", "on_triggered_script")
-
-
-def _resolve_on_escalated(alert_data):
-    """Resolve the on-escalation actions: explicit ``on_escalated`` or ``on_escalated_script``.
-
-    Mirrors :func:`_resolve_on_triggered` so users can wire native escalation
-    notifications without an external wrapper automation. The
-    ``on_escalated_script`` field is exposed by the config_flow UI alongside
-    ``on_triggered_script``.
-    """
-    return _resolve_script_field(alert_data, "on_escalated", "on_escalated_script")
-
-
-def _parse_actions(action_string):
-    """Parse action string (JSON/YAML) into a list of action dictionaries.
-
-    Supports:
-    - Profile references: "profile:profile_id" (returns as-is for later resolution)
-    - Single action dict: {"service": "...", "data": {...}}
-    - List of actions: [{"service": "..."}, ...]
-    - Already parsed list: [dict, ...]
-    """
-    if not action_string:
-        return []
-
-    if isinstance(action_string, list):
-        return action_string  # Already a list
-
-    if isinstance(action_string, str):
-        # Check if it's a profile reference (starts with "profile:")
-        if action_string.startswith("profile:"):
-            return action_string  # Return as-is for later resolution
-        
-        try:
-            # Try parsing as JSON first
-            result = json.loads(action_string)
-            # If it's a single dict, wrap it in a list
-            if isinstance(result, dict):
-                return [result]
-            # If it's already a list, return it
-            if isinstance(result, list):
-                return result
-            # Otherwise, return empty list (invalid format)
-            return []
-        except json.JSONDecodeError:
-            try:
-                # Try parsing as YAML
-                result = yaml.safe_load(action_string)
-                # If it's a single dict, wrap it in a list
-                if isinstance(result, dict):
-                    return [result]
-                # If it's already a list, return it
-                if isinstance(result, list):
-                    return result
-                # Otherwise, return empty list (invalid format)
-                return []
-            except yaml.YAMLError:
-                _LOGGER.error(f"Failed to parse actions: {action_string}")
-                return []
-
-    # If it's already a dict (from config flow), wrap it in a list
-    if isinstance(action_string, dict):
-        return [action_string]
-
-    return []
-
-
-def _parse_logical_conditions(conditions_string):
-    """Parse logical conditions string (JSON/YAML) into a list of condition dictionaries."""
-    if not conditions_string:
-        return []
-
-    if isinstance(conditions_string, list):
-        return conditions_string  # Already a list
-
-    if isinstance(conditions_string, str):
-        try:
-            # Try parsing as JSON first
-            result = json.loads(conditions_string)
-            # Ensure result is a list
-            if not isinstance(result, list):
-                return []
-            return result
-        except json.JSONDecodeError:
-            try:
-                # Try parsing as YAML
-                result = yaml.safe_load(conditions_string)
-                # Ensure result is a list
-                if not isinstance(result, list):
-                    return []
-                return result
-            except yaml.YAMLError:
-                _LOGGER.error(
-                    f"Failed to parse logical conditions: {conditions_string}")
-                return []
-
-    return []
-
-
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ):
@@ -194,34 +122,91 @@ async def async_setup_entry(
         group = entry.data.get("group", "other")
         hub_name = entry.data.get("hub_name", group)
         alerts_data = entry.data.get("alerts", {})
+        definitions = async_get_alert_definitions(hass, entry)
 
-        entities = []
-        for alert_id, alert_data in alerts_data.items():
-            sensor = EmergencyBinarySensor(
-                hass=hass,
-                entry=entry,
-                alert_id=alert_id,
-                alert_data=alert_data,
-                group=group,
-                hub_name=hub_name,
-            )
-            entities.append(sensor)
+        @callback
+        def async_add_alerts(alert_ids):
+            entities = []
+            for alert_id in alert_ids:
+                sensor = EmergencyBinarySensor(
+                    hass=hass,
+                    entry=entry,
+                    alert_id=alert_id,
+                    # Pattern alert instances have no alert_data of their own.
+                    alert_data=alerts_data.get(alert_id, {}),
+                    group=group,
+                    hub_name=hub_name,
+                    runtime=async_get_alert_runtime(hass, entry.entry_id, alert_id),
+                    definition=definitions[alert_id],
+                )
+                entities.append(sensor)
 
-        if entities:
-            async_add_entities(entities, update_before_add=True)
-            
-            # Register entities for service access BEFORE async_add_entities completes
-            # This ensures switches can find them immediately
-            if DOMAIN not in hass.data:
-                hass.data[DOMAIN] = {}
-            if "entities" not in hass.data[DOMAIN]:
-                hass.data[DOMAIN]["entities"] = []
-            hass.data[DOMAIN]["entities"].extend(entities)
+            if entities:
+                async_add_entities(entities, update_before_add=True)
+
+                # Register entities for service access BEFORE async_add_entities completes
+                # This ensures switches can find them immediately
+                if DOMAIN not in hass.data:
+                    hass.data[DOMAIN] = {}
+                if "entities" not in hass.data[DOMAIN]:
+                    hass.data[DOMAIN]["entities"] = []
+                hass.data[DOMAIN]["entities"].extend(entities)
+
+        async_add_alerts(list(definitions))
+        # Entities matching a pattern alert after load get instances too.
+        entry.async_on_unload(
+            async_dispatcher_connect(
+                hass, f"{SIGNAL_PATTERN_MATCH}_{entry.entry_id}", async_add_alerts
+            )
+        )
 
 
 class EmergencyBinarySensor(BinarySensorEntity):
     _attr_should_poll = False
 
+    # Mutable alert state lives in the AlertRuntime record shared with the
+    # select and switches; these keep the attribute names they all use.
+    _is_on = flag_attribute(FLAG_ON)
+    _already_triggered = flag_attribute(FLAG_TRIGGERED)
+    _acknowledged = flag_attribute(FLAG_ACKNOWLEDGED)
+    _snoozed = flag_attribute(FLAG_SNOOZED)
+    _resolved = flag_attribute(FLAG_RESOLVED)
+    _escalated = flag_attribute(FLAG_ESCALATED)
+    _cleared = flag_attribute(FLAG_CLEARED)  # Legacy, can be removed
+    _first_triggered = field_attribute("first_triggered")
+    _last_cleared = field_attribute("last_cleared")
+    _snooze_until = field_attribute("snooze_until")
+    _escalation_task = field_attribute("escalation_unsub")
+    _snooze_task = field_attribute("snooze_task")
+    # for_seconds delay timer — armed when the trigger first goes True and
+    # held for self._for_seconds before the alert actually fires. Cancelled
+    # if the trigger clears before the delay elapses.
+    _pending_trigger_unsub = field_attribute("pending_trigger_unsub")
+    # Latency trace carried across a for_seconds dwell.
+    _pending_trace = field_attribute("pending_trace")
+    # Recent status transitions, allocated on the first one at the size
+    # configured in the global hub. _last_status is what the companion
+    # status sensor currently shows.
+    _history = field_attribute("history")
+    _last_status = field_attribute("last_status")
+
+    # Configuration comes from the immutable AlertDefinition shared with the
+    # select and switches.
+    _alert_name = definition_attribute("name")
+    _trigger_type = definition_attribute("trigger_type")
+    _entity_id = definition_attribute("entity_id")
+    _trigger_state = definition_attribute("trigger_state")
+    _template = definition_attribute("template")
+    _logical_conditions = definition_attribute("logical_conditions")
+    _logical_operator = definition_attribute("logical_operator")
+    _action_service = definition_attribute("action_service")
+    _severity = definition_attribute("severity")
+    _remind_after_seconds = definition_attribute("remind_after_seconds")
+    _for_seconds = definition_attribute("for_seconds")
+    _on_triggered = definition_attribute("on_triggered")
+    _on_cleared = definition_attribute("on_cleared")
+    _on_escalated = definition_attribute("on_escalated")
+
     def __init__(
         self,
         hass,
@@ -230,44 +215,22 @@ class EmergencyBinarySensor(BinarySensorEntity):
         alert_data: dict,
         group: str,
         hub_name: str,
+        runtime: AlertRuntime | None = None,
+        definition: AlertDefinition | None = None,
     ):
         self.hass = hass
+        self._definition = (
+            definition
+            if definition is not None
+            else AlertDefinition.from_config(alert_id, alert_data)
+        )
+        self._runtime = runtime if runtime is not None else AlertRuntime()
+        self._runtime.alert = self
         self._entry = entry
         self._alert_id = alert_id
         self._group = group
         self._hub_name = hub_name
 
-        # Extract alert configuration
-        name = alert_data["name"]
-        self._alert_name = name
-        self._trigger_type = alert_data.get("trigger_type", "simple")
-        self._entity_id = alert_data.get("entity_id")
-        self._trigger_state = alert_data.get("trigger_state")
-        self._template = alert_data.get("template")
-        self._logical_conditions = _parse_logical_conditions(
-            alert_data.get("logical_conditions"))
-        self._logical_operator = alert_data.get("logical_operator", "and")
-        self._combined_conditions = alert_data.get("combined_conditions", [])
-        self._combined_operator = alert_data.get("combined_operator", "and")
-        self._action_service = alert_data.get("action_service")
-        self._severity = alert_data.get("severity", "warning")
-        self._remind_after_seconds = alert_data.get("remind_after_seconds")
-        # Debounce: alert fires only after the trigger has been true for this
-        # many seconds continuously. 0 (default) = fire immediately. Useful for
-        # "window open >5min", "garage open too long", "leak sensor on >10s
-        # to debounce false positives", etc. Applies to all trigger types.
-        try:
-            self._for_seconds = int(alert_data.get("for_seconds") or 0)
-        except (TypeError, ValueError):
-            self._for_seconds = 0
-        self._on_triggered = _parse_actions(
-            _resolve_on_triggered(alert_data)
-        )
-        self._on_cleared = _parse_actions(alert_data.get("on_cleared"))
-        self._on_escalated = _parse_actions(
-            _resolve_on_escalated(alert_data)
-        )
-
         # Modern HA naming: the device carries the full label, the entity has
         # no name of its own. HA frontends render friendly_name as just
         # `device.name`, eliminating the `<device> <entity>` doubling that
@@ -282,41 +245,62 @@ class EmergencyBinarySensor(BinarySensorEntity):
         # ID still encodes that this is an emergency_alerts entity. Existing
         # alerts in the entity_registry keep their stored entity_id.
         self.entity_id = f"binary_sensor.emergency_{alert_id}"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"alert_{entry.entry_id}_{alert_id}")},
-            "name": name,
-            "manufacturer": "Emergency Alerts",
-            "model": f"{self._severity.title()} Alert",
-            "sw_version": "1.0",
-            "via_device": (DOMAIN, f"hub_{entry.entry_id}"),
-        }
 
-        # State tracking
-        self._is_on = False
-        self._first_triggered = None
-        self._last_cleared = None
-        self._already_triggered = False
+        # Trigger subscription
         self._unsub = None
-
-        # New state machine attributes
-        self._acknowledged = False
-        self._snoozed = False
-        self._resolved = False
-        self._escalated = False
-        self._cleared = False  # Legacy, can be removed
-
-        # Timers and async tasks
-        self._escalation_task = None
-        self._snooze_task = None
-        self._snooze_until = None
-        # for_seconds delay timer — armed when the trigger first goes True
-        # and held for self._for_seconds before the alert actually fires.
-        # Cancelled if the trigger clears before the delay elapses.
-        self._pending_trigger_unsub = None
+        # Entities this alert subscribed to for simple/logical triggers, or
+        # the template tracker (whose listeners are discovered at render time).
+        self._watched_entities: tuple[str, ...] = ()
+        self._template_info: TrackTemplateResultInfo | None = None
+        # Last result of each condition tree node, kept while subscribed so
+        # a change only recomputes the subtrees that read it.
+        self._condition_cache: bytearray | None = None
+        # Windowed triggers: the occurrence ring buffer or the shared rate
+        # sample window, and the timer for the moment the oldest entry that
+        # matters leaves the window.
+        self._occurrences: OccurrenceWindow | None = None
+        self._samples: SampleWindow | None = None
+        self._window_unsub: Callable[[], None] | None = None
+        # Anomaly triggers: the shared, persisted baseline of the entity.
+        self._baseline: Baseline | None = None
+        # Flap detection: recent trigger flips, the last trigger value seen
+        # and the timer for the moment the alert counts as stable again.
+        self._flaps: FlapDetector | None = None
+        self._trigger_value: bool | None = None
+        self._flap_unsub: Callable[[], None] | None = None
+        # Staleness triggers: when the entity last reported, and whether its
+        # deadline in the shared index has passed since.
+        self._last_report: float | None = None
+        self._stale = False
+
+        # Latency tracing: stamps for the evaluation in progress.
+        self._observed_ns: int | None = None
+        self._evaluated_ns: int | None = None
 
         # Store config entry for switch access
         self._config_entry = entry
 
+        # Runtime counters surfaced through diagnostics. The integration-wide
+        # counters are swapped for the shared instance once added to hass.
+        self._metrics = AlertMetrics()
+        self._integration_metrics = IntegrationMetrics()
+
+    @property
+    def device_info(self):
+        """Return the alert's device, built on demand.
+
+        HA only reads this while registering the entity, so it isn't kept
+        on every instance.
+        """
+        return {
+            "identifiers": {(DOMAIN, f"alert_{self._entry.entry_id}_{self._alert_id}")},
+            "name": self._alert_name,
+            "manufacturer": "Emergency Alerts",
+            "model": f"{self._severity.title()} Alert",
+            "sw_version": "1.0",
+            "via_device": (DOMAIN, f"hub_{self._entry.entry_id}"),
+        }
+
     def _get_global_options(self):
         """Get global options from hass.data"""
         return self.hass.data.get(DOMAIN, {}).get("global_options", {})
@@ -353,10 +337,69 @@ class EmergencyBinarySensor(BinarySensorEntity):
     async def async_added_to_hass(self):
         # Register cleanup callback when entity is properly added to hass
         self.async_on_remove(self._cleanup_timers)
+        self._integration_metrics = async_get_integration_metrics(self.hass)
         
         # Track referenced entities so the trigger re-evaluates when they change.
+        dependencies = self._definition.dependencies
+        tree = self._definition.tree
+        occurrence = self._definition.occurrence
+        if occurrence is not None:
+            self._occurrences = occurrence.new_window()
+        rate = self._definition.rate
+        if rate is not None:
+            self._samples = async_acquire_sample_window(self.hass, rate)
+            self.async_on_remove(self._release_samples)
+            self._samples.observe(
+                self.hass.states.get(rate.entity_id), dt_util.utcnow().timestamp()
+            )
+        stale = self._definition.stale
+        if stale is not None:
+            # Until the entity reports at all, count the silence from now.
+            self._last_report = last_report(self.hass.states.get(stale.entity_id))
+            if self._last_report is None:
+                self._last_report = dt_util.utcnow().timestamp()
+            self._schedule_stale_deadline()
+            self.async_on_remove(self._unschedule_stale_deadline)
+        if self._definition.flapping is not None:
+            self._flaps = self._definition.flapping.new_detector()
+        anomaly = self._definition.anomaly
+        if anomaly is not None:
+            self._baseline = async_acquire_baseline(self.hass, anomaly)
+            self.async_on_remove(self._release_baseline)
+
         @callback
         def state_change(event):
+            entity_id = event.data.get("entity_id")
+            old_state = event.data.get("old_state")
+            new_state = event.data.get("new_state")
+            if (
+                old_state is not None
+                and new_state is not None
+                and values_unchanged(dependencies.get(entity_id, ()), old_state, new_state)
+            ):
+                # Nothing this trigger reads changed (e.g. an attribute-only
+                # change for a state trigger).
+                self._metrics.evaluations_skipped += 1
+                self._integration_metrics.evaluations_skipped += 1
+                return
+            if self._condition_cache is not None and tree is not None:
+                tree.invalidate(self._condition_cache, entity_id, old_state, new_state)
+            elif (
+                self._occurrences is not None
+                and occurrence is not None
+                and occurrence.is_occurrence(old_state, new_state)
+            ):
+                self._occurrences.record(dt_util.utcnow().timestamp())
+                self._arm_window_timer()
+            elif self._samples is not None:
+                self._samples.observe(new_state, dt_util.utcnow().timestamp())
+                self._evaluate_trigger()
+                self._arm_window_timer()
+                return
+            elif self._baseline is not None and anomaly is not None:
+                self._baseline.observe(new_state, anomaly.read)
+            elif stale is not None:
+                self._record_report(new_state)
             self._evaluate_trigger()
 
         if self._trigger_type == "template" and self._template:
@@ -379,54 +422,47 @@ class EmergencyBinarySensor(BinarySensorEntity):
                 template_result_change,
             )
             self._unsub = info.async_remove
+            self._template_info = info
             # Kick off the initial async render so HA registers the listener
             # against the discovered entities.
             info.async_refresh()
         else:
-            # simple + logical triggers: derive the explicit entity list.
-            entities: set[str] = set()
-            if self._trigger_type == "simple" and self._entity_id:
-                entities.add(self._entity_id)
-            elif self._trigger_type == "logical" and self._logical_conditions:
-                for cond in self._logical_conditions:
-                    if isinstance(cond, dict) and "entity_id" in cond:
-                        entities.add(cond["entity_id"])
-
-            if entities:
+            # simple, logical and numeric triggers: the compiled conditions
+            # list the entities they read.
+            self._watched_entities = tuple(sorted(dependencies))
+            if tree is not None and dependencies:
+                self._condition_cache = tree.new_cache()
+            if dependencies:
                 self._unsub = async_track_state_change_event(
-                    self.hass, list(entities), state_change
+                    self.hass, list(self._watched_entities), state_change
                 )
             else:
                 # No entities to watch (logical with no entity_ids, or an
                 # otherwise unconfigured alert) — leave the listener unset.
                 self._unsub = None
 
-        # Listen for switch updates (switches will broadcast their state changes)
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                f"{SIGNAL_SWITCH_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-                self._handle_switch_update,
-            )
-        )
+        restored = 0
+        log = self.hass.data.get(DOMAIN, {}).get("transition_log")
+        if log is not None and not self._runtime.flags:
+            # Pick up where the last run left off; the first evaluation below
+            # then clears or refreshes the restored state.
+            restored = log.restored_flags(self._entry.entry_id, self._alert_id)
+            self._runtime.flags = restored
 
         # Set initial state
         self._evaluate_trigger()
+        flags = self._runtime.flags
+        if restored and should_escalate(flags) and not flags & FLAG_ESCALATED:
+            # Restored unhandled and still firing: restart the escalation clock.
+            self._arm_escalation_timer()
         # Create initial status sensor
         self._update_status_sensor()
 
-    @callback
-    def _handle_switch_update(self, switch_type: str, state: bool) -> None:
-        """Handle switch state updates."""
-        _LOGGER.debug(f"Alert {self._alert_id} received switch update: {switch_type}={state}")
-        # Switches update our internal state directly, so just refresh UI
-        self.async_write_ha_state()
-        self._update_status_sensor()
-
     async def async_will_remove_from_hass(self):
         if self._unsub:
             self._unsub()
             self._unsub = None
+        self._condition_cache = None
         if DOMAIN in self.hass.data and "entities" in self.hass.data[DOMAIN]:
             self.hass.data[DOMAIN]["entities"] = [
                 e for e in self.hass.data[DOMAIN]["entities"] if e != self
@@ -437,16 +473,40 @@ class EmergencyBinarySensor(BinarySensorEntity):
         if self._snooze_task:
             self._snooze_task.cancel()
             self._snooze_task = None
+        if self._runtime.alert is self:
+            self._runtime.alert = None
+            async_drop_alert_runtime(self.hass, self._entry.entry_id, self._alert_id)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the entity state, counting writes for diagnostics."""
+        self._metrics.state_writes += 1
+        super().async_write_ha_state()
+
+    def subscribed_entities(self) -> tuple[str, ...]:
+        """Return the entity_ids whose state changes re-evaluate this alert."""
+        if self._template_info is not None:
+            try:
+                return tuple(sorted(self._template_info.listeners.get("entities", ())))
+            except AttributeError:
+                return ()
+        return self._watched_entities
+
+    def pending_timers(self) -> dict[str, bool]:
+        """Return which of this alert's timers are currently armed."""
+        return {
+            "for_seconds": self._pending_trigger_unsub is not None,
+            "escalation": self._escalation_task is not None,
+            "snooze": self._snooze_task is not None,
+            "window": self._window_unsub is not None,
+            "flap": self._flap_unsub is not None,
+        }
 
     @property
     def is_on(self):
         """Binary sensor state - alert is actively triggered."""
-        # Show as ON only if condition is met and not in a handled state
-        if self._resolved:
-            return False  # Resolved alerts don't show as active
-        if self._snoozed:
-            return False  # Snoozed alerts don't show as active
-        return self._is_on
+        # Show as ON only if condition is met and not resolved or snoozed
+        return shows_on(self._runtime.flags)
 
     @property
     def extra_state_attributes(self):
@@ -468,6 +528,24 @@ class EmergencyBinarySensor(BinarySensorEntity):
             "resolved": self._resolved,
             "escalated": self._escalated,
         }
+        if self._definition.attribute:
+            attrs["monitored_attribute"] = self._definition.attribute
+        if self._definition.pattern_alert_id is not None:
+            attrs["pattern_alert"] = self._definition.pattern_alert_id
+        if self._occurrences is not None:
+            attrs["occurrences_in_window"] = self._occurrences.count(
+                dt_util.utcnow().timestamp()
+            )
+        if self._samples is not None:
+            attrs["change_in_window"] = round(self._samples.change(), 4)
+        if self._flaps is not None:
+            attrs["flap_score"] = self._flaps.score(dt_util.utcnow().timestamp())
+        if self._last_report is not None:
+            attrs["last_report"] = dt_util.utc_from_timestamp(self._last_report).isoformat()
+        if self._baseline is not None:
+            attrs["baseline_mean"] = round(self._baseline.mean, 4)
+            if self._baseline.last_z is not None:
+                attrs["deviation_sigma"] = round(self._baseline.last_z, 2)
 
         # Add snooze timing if snoozed
         if self._snoozed and self._snooze_until:
@@ -475,41 +553,30 @@ class EmergencyBinarySensor(BinarySensorEntity):
 
         return attrs
 
-    def _compare_values(self, entity_state, comparator, expected_value):
-        """Compare entity state using provided comparator."""
-        # Attempt numeric comparison first if both are numeric-like
-        def _to_number(value):
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                return None
-
-        left_num = _to_number(entity_state)
-        right_num = _to_number(expected_value)
-
-        if comparator in {COMP_LT, COMP_LTE, COMP_GT, COMP_GTE} and left_num is not None and right_num is not None:
-            if comparator == COMP_LT:
-                return left_num < right_num
-            if comparator == COMP_LTE:
-                return left_num <= right_num
-            if comparator == COMP_GT:
-                return left_num > right_num
-            if comparator == COMP_GTE:
-                return left_num >= right_num
-
-        # Fallback to string comparison
-        if comparator == COMP_EQ:
-            return str(entity_state) == str(expected_value)
-        if comparator == COMP_NE:
-            return str(entity_state) != str(expected_value)
-
-        # Default equality if comparator unknown
-        return str(entity_state) == str(expected_value)
-
     @callback
+    @profiled
     def _evaluate_trigger(self):
         """Compute the current trigger truth value and route to _set_state."""
-        self._set_state(self._compute_triggered())
+        metrics = self._metrics
+        writes_before = metrics.state_writes
+        started = time.perf_counter_ns()
+        self._observed_ns = started
+        try:
+            triggered = self._compute_triggered()
+            self._evaluated_ns = time.perf_counter_ns()
+            self._set_state(triggered)
+        finally:
+            self._observed_ns = self._evaluated_ns = None
+            elapsed = time.perf_counter_ns() - started
+            metrics.evaluations += 1
+            metrics.evaluation_time_ns += elapsed
+            integration = self._integration_metrics
+            integration.evaluations += 1
+            integration.evaluation_time_ns += elapsed
+            # Trigger-to-state latency: from observing the change to having
+            # written the resulting alert state.
+            if metrics.state_writes != writes_before:
+                integration.trigger_to_state.record(elapsed)
 
     @callback
     def _compute_triggered(self) -> bool:
@@ -518,44 +585,141 @@ class EmergencyBinarySensor(BinarySensorEntity):
         Split out from _evaluate_trigger so that delay callbacks can re-check
         truth without recursing through the side-effecting state machine.
         """
-        if (
-            self._trigger_type == "simple"
-            and self._entity_id
-            and self._trigger_state is not None
-        ):
-            state = self.hass.states.get(self._entity_id)
-            return bool(state and state.state == self._trigger_state)
-        if self._trigger_type == "template" and self._template:
-            tpl = Template(self._template, self.hass)
+        definition = self._definition
+        tree = definition.tree
+        if tree is not None:
+            # Simple and logical triggers. Without a subscription there is
+            # nothing invalidating the cache, so evaluate from scratch.
+            cache = self._condition_cache
+            if cache is None:
+                cache = tree.new_cache()
+            return tree.evaluate(cache, self.hass.states.get)
+        if definition.trigger_type == TRIGGER_TYPE_NUMERIC:
+            if definition.numeric is None or not definition.entity_id:
+                return False
+            state = self.hass.states.get(definition.entity_id)
+            value = definition.read_value(state) if state is not None else None
+            # Hysteresis: once met (or dwelling on for_seconds), the clear
+            # threshold applies.
+            return definition.numeric.evaluate(value, self._trigger_active())
+        if definition.trigger_type == TRIGGER_TYPE_OCCURRENCE:
+            window = self._occurrences
+            return window is not None and window.holds(dt_util.utcnow().timestamp())
+        if definition.trigger_type == TRIGGER_TYPE_RATE:
+            samples = self._samples
+            rate = definition.rate
+            if samples is None or rate is None:
+                return False
+            samples.expire(dt_util.utcnow().timestamp())
+            return rate.threshold.evaluate(
+                samples.change(), self._trigger_active()
+            )
+        if definition.trigger_type == TRIGGER_TYPE_STALE:
+            return self._stale
+        if definition.trigger_type == TRIGGER_TYPE_ANOMALY:
+            anomaly = definition.anomaly
+            return anomaly is not None and anomaly.deviates(self._baseline)
+        if definition.trigger_type == "template" and definition.template:
+            tpl = Template(definition.template, self.hass)
             try:
                 rendered = tpl.async_render()
                 return rendered in (True, "True", "true", 1, "1")
             except Exception as e:
                 _LOGGER.error(f"Template evaluation error: {e}")
                 return False
-        if self._trigger_type == "logical" and self._logical_conditions:
-            results = []
-            for cond in self._logical_conditions:
-                if isinstance(cond, dict) and "entity_id" in cond and "state" in cond:
-                    state = self.hass.states.get(cond["entity_id"])
-                    results.append(bool(state and state.state == cond["state"]))
-                else:
-                    _LOGGER.warning(
-                        f"Invalid logical condition format: {cond}")
-                    results.append(False)
-            if self._logical_operator == "or":
-                return any(results) if results else False
-            return all(results) if results else False
         return False
 
+    def _trigger_active(self) -> bool:
+        """Whether the trigger held last time (firing or dwelling on for_seconds)."""
+        return bool(
+            self._runtime.flags & FLAG_TRIGGERED
+            or self._pending_trigger_unsub is not None
+        )
+
+    def _window_deadline(self) -> float | None:
+        """When the oldest entry that can change a windowed trigger expires."""
+        if self._occurrences is not None:
+            return self._occurrences.expires_at()
+        if self._samples is not None and self._trigger_active():
+            # Only an active rate trigger needs expiry to clear it.
+            return self._samples.expires_at()
+        return None
+
+    @callback
+    def _arm_window_timer(self):
+        """Re-check the trigger when the oldest relevant window entry expires."""
+        self._cancel_window_timer()
+        deadline = self._window_deadline()
+        if deadline is None:
+            return
+        delay = deadline - dt_util.utcnow().timestamp()
+        if delay > 0:
+            self._window_unsub = async_call_later(
+                self.hass, delay, self._on_window_expired
+            )
+
+    def _cancel_window_timer(self):
+        if self._window_unsub:
+            self._window_unsub()
+            self._window_unsub = None
+
+    @callback
+    @profiled
+    def _on_window_expired(self, _now):
+        """An entry left the window; the trigger may no longer hold."""
+        self._window_unsub = None
+        self._evaluate_trigger()
+        # Re-arm for the next entry (or a timer that fired a hair early).
+        self._arm_window_timer()
+
+    def _release_samples(self):
+        self._samples = None
+        if self._definition.rate is not None:
+            async_release_sample_window(self.hass, self._definition.rate)
+
+    def _record_report(self, state):
+        """The entity reported: it is fresh, and its deadline moves out."""
+        reported = last_report(state)
+        if reported is None:
+            # Going unavailable isn't a sign of life; keep the old deadline.
+            return
+        self._last_report = reported
+        self._stale = False
+        self._schedule_stale_deadline()
+
+    def _schedule_stale_deadline(self):
+        stale = self._definition.stale
+        if stale is None or self._last_report is None:
+            return
+        async_get_deadline_index(self.hass).schedule(
+            self, self._last_report + stale.stale_seconds, self._on_stale
+        )
+
+    def _unschedule_stale_deadline(self):
+        async_get_deadline_index(self.hass).remove(self)
+
+    @callback
+    @profiled
+    def _on_stale(self):
+        """The entity's deadline passed without a report."""
+        self._stale = True
+        self._evaluate_trigger()
+
+    def _release_baseline(self):
+        self._baseline = None
+        if self._definition.anomaly is not None:
+            async_release_baseline(self.hass, self._definition.anomaly)
+
     @callback
     def _cancel_pending_trigger(self):
         """Cancel the for_seconds delay timer if armed."""
         if self._pending_trigger_unsub:
             self._pending_trigger_unsub()
             self._pending_trigger_unsub = None
+        self._pending_trace = None
 
     @callback
+    @profiled
     def _on_for_seconds_elapsed(self, _now):
         """Called when the for_seconds delay has elapsed.
 
@@ -564,10 +728,13 @@ class EmergencyBinarySensor(BinarySensorEntity):
         during the delay (and we somehow missed cancelling), don't fire.
         """
         self._pending_trigger_unsub = None
+        if self._pending_trace is not None:
+            self._pending_trace.fired_ns = time.perf_counter_ns()
         if self._compute_triggered():
             self._set_state(True, skip_delay=True)
         # If False, do nothing — the cleared-state side already ran when the
         # underlying entity changed.
+        self._pending_trace = None
 
     @callback
     def _set_state(self, triggered, skip_delay: bool = False):
@@ -582,7 +749,12 @@ class EmergencyBinarySensor(BinarySensorEntity):
 
         ``triggered=False`` always cancels any pending dwell and runs the
         cleared-side cleanup.
+
+        With flap detection, every flip of ``triggered`` is recorded first;
+        an alert that suppresses while flapping ignores both until stable.
         """
+        if self._flaps is not None and self._track_flapping(triggered):
+            return
         if triggered:
             # If we're already firing, keep refreshing state (e.g., attribute
             # updates on the monitored entity).
@@ -604,6 +776,10 @@ class EmergencyBinarySensor(BinarySensorEntity):
                 self._pending_trigger_unsub = async_call_later(
                     self.hass, self._for_seconds, self._on_for_seconds_elapsed
                 )
+                self._pending_trace = TransitionTrace(
+                    "triggered", self._observed_ns, self._evaluated_ns
+                )
+                self._pending_trace.armed_ns = time.perf_counter_ns()
                 return
             # No debounce configured, OR the dwell already elapsed (skip_delay)
             # — fire the alert now.
@@ -615,65 +791,168 @@ class EmergencyBinarySensor(BinarySensorEntity):
             self._apply_cleared_state()
 
     @callback
-    def _apply_triggered_state(self):
-        """The 'triggered' branch: mark active, run on_triggered actions, arm escalation."""
-        if self._resolved:
-            _LOGGER.debug(
-                f"Alert {self._alert_id} condition met but resolved — not triggering"
-            )
+    def _track_flapping(self, triggered: bool) -> bool:
+        """Record a trigger flip; return True if the alert holds its state while flapping."""
+        previous, self._trigger_value = self._trigger_value, triggered
+        flaps = self._flaps
+        if flaps is None:
+            return False
+        if previous is not None and previous != triggered:
+            now = dt_util.utcnow().timestamp()
+            flaps.record(now)
+            if self._runtime.flags & FLAG_FLAPPING:
+                # Still flipping: being stable moves further out.
+                self._arm_flap_timer()
+            elif flaps.flapping(now):
+                _LOGGER.info(f"Alert {self._alert_id} is flapping")
+                self.transition(CMD_FLAP_START)
+                self._arm_flap_timer()
+        return flaps.rule.suppress and bool(self._runtime.flags & FLAG_FLAPPING)
+
+    @callback
+    def _arm_flap_timer(self):
+        """Re-check the flap score when it can next fall to the stable level."""
+        self._cancel_flap_timer()
+        if self._flaps is None:
             return
+        delay = self._flaps.stable_at() - dt_util.utcnow().timestamp()
+        self._flap_unsub = async_call_later(self.hass, max(delay, 0), self._on_flap_timer)
 
-        if not self._already_triggered:
-            # First trigger
-            self._is_on = True
-            self._first_triggered = datetime.now().isoformat()
-            self._already_triggered = True
-            self.async_write_ha_state()
-            self._update_status_sensor()
-            self._call_actions(self._on_triggered)
+    def _cancel_flap_timer(self):
+        if self._flap_unsub:
+            self._flap_unsub()
+            self._flap_unsub = None
 
-            if not self._acknowledged and not self._snoozed:
-                self.hass.async_create_task(self._start_escalation_timer())
+    @callback
+    @profiled
+    def _on_flap_timer(self, _now):
+        """Flips aged out of the window; leave the flapping status if stable."""
+        self._flap_unsub = None
+        flaps = self._flaps
+        if flaps is None:
+            return
+        if flaps.score(dt_util.utcnow().timestamp()) > flaps.rule.stable_score:
+            # Fired a hair early.
+            self._arm_flap_timer()
+            return
+        if self.transition(CMD_FLAP_END):
+            _LOGGER.info(f"Alert {self._alert_id} is stable again")
+            if flaps.rule.suppress:
+                # Catch up with whatever the trigger settled on.
+                self._evaluate_trigger()
 
-            async_dispatcher_send(self.hass, SUMMARY_UPDATE_SIGNAL)
-            async_dispatcher_send(
-                self.hass,
-                f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-            )
-        else:
-            # Already triggered, just refresh state
-            self._is_on = True
+    @callback
+    def _apply_triggered_state(self):
+        """The 'triggered' branch: fire the alert, or refresh it if already firing."""
+        if self._already_triggered and not self._resolved:
+            # Already triggered, just refresh state (e.g., attribute updates
+            # on the monitored entity).
             self.async_write_ha_state()
-            self._update_status_sensor()
+            self._update_status_sensor(CAUSE_TRIGGER)
             async_dispatcher_send(self.hass, SUMMARY_UPDATE_SIGNAL)
+            return
+        if not self.transition(CMD_TRIGGER):
+            _LOGGER.debug(
+                f"Alert {self._alert_id} condition met but resolved — not triggering"
+            )
 
     @callback
     def _apply_cleared_state(self):
         """The 'cleared' branch: run on_cleared, drop is_on, reset flags."""
-        if self._already_triggered:
-            self._last_cleared = datetime.now().isoformat()
-            self._call_actions(self._on_cleared)
-
-        self._is_on = False
-        self._already_triggered = False
+        self.transition(CMD_CONDITION_CLEARED)
 
-        if self._resolved:
-            self._resolved = False
-            _LOGGER.debug(
-                f"Alert {self._alert_id} condition cleared — reset resolved flag"
+    @callback
+    @profiled
+    def transition(
+        self, command: str, cause: str | None = None, summary: bool = True
+    ) -> bool:
+        """Apply a state machine command; return False if its guard rejected it.
+
+        Every status change goes through here. The flags change in one step
+        from the transition table, the alert state and status sensor are
+        written once, and the select and switches get a single update signal
+        however many flags moved. Summary sensors are only signalled when
+        the alert's on/off reading changed, and not at all with
+        ``summary=False`` (bulk services signal once for the whole batch).
+        """
+        runtime = self._runtime
+        old = runtime.flags
+        row, new = step(old, command)
+        if row is None:
+            return False
+        runtime.flags = new
+        log = self.hass.data.get(DOMAIN, {}).get("transition_log")
+        if log is not None:
+            log.append(
+                self._entry.entry_id, self._alert_id, command, new, cause or row.cause or CAUSE_UNKNOWN
             )
-
-        if self._escalated:
-            self._escalated = False
+        if row.set & FLAG_TRIGGERED:
+            runtime.first_triggered = datetime.now().isoformat()
+        elif old & FLAG_TRIGGERED and not new & FLAG_TRIGGERED:
+            runtime.last_cleared = datetime.now().isoformat()
+
+        if row.escalation == TIMER_ARM and should_escalate(new):
+            self._arm_escalation_timer()
+        elif row.escalation != TIMER_KEEP:
+            self._cancel_escalation_timer()
+        if row.snooze == TIMER_ARM:
+            self._arm_snooze_timer()
+        elif row.snooze == TIMER_CANCEL:
+            self._cancel_snooze_timer()
+
+        if row.event is not None:
+            data = {"entity_id": self.entity_id, "alert_name": self._alert_name}
+            if new & FLAG_SNOOZED and runtime.snooze_until is not None:
+                data["snooze_until"] = runtime.snooze_until.isoformat()
+            self.hass.bus.async_fire(row.event, data)
+
+        actions = trace = None
+        if row.action is not None and old & row.action_if == row.action_if:
+            actions = getattr(self._definition, row.action)
+            if command == CMD_TRIGGER:
+                # Keep the stamps from a for_seconds dwell, if there was one.
+                trace, runtime.pending_trace = runtime.pending_trace, None
+            if trace is None:
+                trace = TransitionTrace(
+                    row.trace or row.action, self._observed_ns, self._evaluated_ns
+                )
 
         self.async_write_ha_state()
-        self._update_status_sensor()
-        self._cancel_escalation_timer()
-        async_dispatcher_send(self.hass, SUMMARY_UPDATE_SIGNAL)
+        self._update_status_sensor(cause or row.cause or CAUSE_UNKNOWN)
+        _LOGGER.debug(f"Alert {self._alert_id} {command}: now {runtime.last_status}")
+        if trace is not None:
+            trace.written_ns = time.perf_counter_ns()
+            self._call_actions(actions, trace)
+            self._close_trace(trace)
+
+        if summary and shows_on(old) != shows_on(new):
+            # Summaries only count firing alerts.
+            async_dispatcher_send(self.hass, SUMMARY_UPDATE_SIGNAL)
         async_dispatcher_send(
             self.hass,
             f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
         )
+        return True
+
+    @callback
+    def _close_trace(self, trace):
+        """Record a finished transition trace, once.
+
+        Called after the state write and again as each action completes; only
+        the call that finds everything done records the latency.
+        """
+        if not trace.try_close():
+            return
+        self._metrics.record_transition(trace.latency_ns())
+        if self._get_global_options().get(CONF_ENABLE_TRACE_EVENTS, False):
+            self.hass.bus.async_fire(
+                EVENT_ALERT_TRACE,
+                {
+                    "entity_id": self.entity_id,
+                    "alert_id": self._alert_id,
+                    **trace.as_dict(),
+                },
+            )
 
     def _resolve_profile(self, profile_ref):
         """Resolve a profile reference to its action list.
@@ -701,47 +980,20 @@ class EmergencyBinarySensor(BinarySensorEntity):
         _LOGGER.warning(f"Profile '{profile_id}' not found in Global Settings")
         return []
 
-    async def _execute_action(self, action_config):
-        """Execute an action configuration (called by switches).
-
-        Action config can be:
-        - A list of action dicts [{"service": "...", "data": {...}}]
-        - A single action dict {"service": "...", "data": {...}}
-        - A profile reference string "profile:profile_id"
-        """
-        if not action_config:
-            return
-
-        # Check if it's a profile reference
-        if isinstance(action_config, str) and action_config.startswith("profile:"):
-            actions = self._resolve_profile(action_config)
-        # Otherwise treat as action list
-        elif isinstance(action_config, list):
-            actions = action_config
-        else:
-            actions = [action_config]
-
-        for action in actions:
-            try:
-                if isinstance(action, dict) and "service" in action:
-                    domain, service = action["service"].split(".", 1)
-                    service_data = action.get("data", {})
-                    await self.hass.services.async_call(
-                        domain, service, service_data, blocking=False
-                    )
-                    _LOGGER.debug(f"Executed action {action['service']} for {self._alert_id}")
-            except Exception as e:
-                _LOGGER.error(f"Error executing action: {e}")
-
-    def _call_actions(self, actions):
+    @profiled
+    def _call_actions(self, actions, trace=None):
         """Call configured actions.
 
         Actions can be:
         - A list of action dicts [{"service": "...", "data": {...}}]
         - A profile reference string "profile:profile_id"
+
+        When ``trace`` is given, each action is stamped as enqueued, started
+        and completed on it.
         """
         if not actions:
             return
+        started = time.perf_counter_ns()
 
         # Resolve profile reference if needed
         action_list = actions
@@ -752,29 +1004,14 @@ class EmergencyBinarySensor(BinarySensorEntity):
         if not isinstance(action_list, list):
             action_list = [action_list]
 
-        # Call configured actions
+        # Resolve every service first so all actions are stamped as
+        # enqueued before any of them can complete.
+        calls = []
         for action in action_list:
             try:
                 if isinstance(action, dict) and "service" in action:
                     domain, service = action["service"].split(".", 1)
-                    service_data = action.get("data", {})
-                    # Fire and forget service call - properly schedule the async call
-
-                    async def safe_call():
-                        try:
-                            await self.hass.services.async_call(
-                                domain, service, service_data, blocking=False
-                            )
-                        except Exception as e:
-                            if (
-                                hasattr(e, "__class__") and
-                                e.__class__.__name__ == "ServiceNotFound"
-                            ):
-                                _LOGGER.warning(
-                                    f"Service not found: {domain}.{service}, skipping action.")
-                            else:
-                                _LOGGER.error(f"Error calling action: {e}")
-                    self.hass.async_create_task(safe_call())
+                    calls.append((domain, service, action.get("data", {})))
             except Exception as e:
                 _LOGGER.error(f"Error preparing action: {e}")
 
@@ -785,18 +1022,60 @@ class EmergencyBinarySensor(BinarySensorEntity):
                 try:
                     domain, service = global_service.split(".", 1)
                     message = self._get_global_notification_message()
-                    service_data = {"message": message}
-                    # Fire and forget service call - properly schedule the async call
-                    self.hass.async_create_task(
-                        self.hass.services.async_call(
-                            domain, service, service_data, blocking=False
-                        )
-                    )
+                    calls.append((domain, service, {"message": message}))
                     _LOGGER.debug(
                         f"Sent global notification for {self._alert_name}")
                 except Exception as e:
                     _LOGGER.error(f"Error sending global notification: {e}")
 
+        stamps = [
+            trace.action_enqueued(f"{domain}.{service}") if trace is not None else None
+            for domain, service, _data in calls
+        ]
+        # Fire and forget service calls - properly schedule the async calls
+        for (domain, service, service_data), stamp in zip(calls, stamps):
+            self._metrics.actions_dispatched += 1
+            self._integration_metrics.actions_dispatched += 1
+            self._metrics.actions_in_flight += 1
+            self.hass.async_create_task(
+                self._safe_call(domain, service, service_data, trace, stamp)
+            )
+
+        self._integration_metrics.action_time_ns += time.perf_counter_ns() - started
+
+    async def _safe_call(self, domain, service, service_data, trace=None, stamp=None):
+        """Run one fire-and-forget action, accounting and tracing it.
+
+        The call blocks inside this detached task so completion stamps and
+        failure counts reflect the service actually finishing; the state
+        machine never waits on it.
+        """
+        if stamp is not None:
+            stamp.started_ns = time.perf_counter_ns()
+        try:
+            await self.hass.services.async_call(
+                domain, service, service_data, blocking=True
+            )
+        except Exception as e:
+            self._metrics.actions_failed += 1
+            self._integration_metrics.actions_failed += 1
+            if stamp is not None:
+                stamp.ok = False
+            if (
+                hasattr(e, "__class__") and
+                e.__class__.__name__ == "ServiceNotFound"
+            ):
+                _LOGGER.warning(
+                    f"Service not found: {domain}.{service}, skipping action.")
+            else:
+                _LOGGER.error(f"Error calling action: {e}")
+        finally:
+            self._metrics.actions_in_flight -= 1
+            if stamp is not None:
+                stamp.completed_ns = time.perf_counter_ns()
+                trace.pending_actions -= 1
+                self._close_trace(trace)
+
     @callback
     def _cleanup_timers(self):
         """Clean up all timers when entity is removed."""
@@ -809,9 +1088,16 @@ class EmergencyBinarySensor(BinarySensorEntity):
         if self._pending_trigger_unsub:
             self._pending_trigger_unsub()
             self._pending_trigger_unsub = None
+        self._cancel_window_timer()
+        self._cancel_flap_timer()
 
     async def _start_escalation_timer(self):
-        """Start escalation timer (called by switches when un-acknowledging).
+        """Start the escalation timer; see _arm_escalation_timer."""
+        self._arm_escalation_timer()
+
+    @callback
+    def _arm_escalation_timer(self):
+        """(Re)arm the escalation timer.
 
         Info-severity alerts are ambient — they auto-clear when the underlying
         trigger condition flips. Escalating to a louder state makes no sense
@@ -828,84 +1114,89 @@ class EmergencyBinarySensor(BinarySensorEntity):
         if self._escalation_task:
             self._escalation_task()
 
-        @callback
-        def escalate(_):
-            # Only escalate if still active and not acknowledged/snoozed/resolved
-            if self._is_on and not self._acknowledged and not self._snoozed and not self._resolved:
-                self._escalated = True
-                self.async_write_ha_state()
-                self._call_actions(self._on_escalated)
-                async_dispatcher_send(self.hass, SUMMARY_UPDATE_SIGNAL)
-                # Notify switches
-                async_dispatcher_send(
-                    self.hass,
-                    f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-                )
-                _LOGGER.info(f"Alert {self._alert_id} escalated due to timeout")
-
         self._escalation_task = async_call_later(
-            self.hass, remind_after, escalate
+            self.hass, remind_after, self._on_escalation_timeout
         )
 
+    @callback
+    @profiled
+    def _on_escalation_timeout(self, _now):
+        """Escalation timer elapsed without the alert being handled."""
+        self._escalation_task = None
+        if self.transition(CMD_ESCALATION_TIMEOUT):
+            _LOGGER.info(f"Alert {self._alert_id} escalated due to timeout")
+
     def _cancel_escalation_timer(self):
         if self._escalation_task:
             self._escalation_task()
             self._escalation_task = None
 
+    @callback
+    def _arm_snooze_timer(self):
+        """(Re)start the snooze timer for the configured snooze duration."""
+        self._cancel_snooze_timer()
+        duration = self._definition.snooze_duration
+        self._snooze_until = datetime.now() + timedelta(seconds=duration)
+        self._snooze_task = asyncio.create_task(self._snooze_timer(duration))
+
+    def _cancel_snooze_timer(self):
+        if self._snooze_task:
+            self._snooze_task.cancel()
+            self._snooze_task = None
+        self._snooze_until = None
+
+    async def _snooze_timer(self, duration: float) -> None:
+        """Un-snooze the alert once the snooze duration elapses."""
+        try:
+            await asyncio.sleep(duration)
+        except asyncio.CancelledError:
+            _LOGGER.debug(f"Snooze timer cancelled for alert {self._alert_id}")
+            return
+        # This task is finishing; don't let the transition cancel it.
+        self._snooze_task = None
+        if self.transition(CMD_SNOOZE_EXPIRED):
+            _LOGGER.info(f"Snooze expired for alert {self._alert_id}")
+
     async def async_acknowledge(self):
-        self._acknowledged = True
-        self._cleared = False
-        self._escalated = False
-        self._cancel_escalation_timer()
-        self.async_write_ha_state()
-        self._update_status_sensor()
-        async_dispatcher_send(self.hass, SUMMARY_UPDATE_SIGNAL)
+        """Acknowledge the alert."""
+        self.transition(CMD_ACKNOWLEDGE, CAUSE_SERVICE)
 
     async def async_clear(self):
         """Manually clear the alert."""
-        if self._already_triggered:
-            self._last_cleared = datetime.now().isoformat()
-            self._call_actions(self._on_cleared)
-        self._is_on = False
-        self._already_triggered = False
-        self._acknowledged = False
-        self._escalated = False
-        self._cleared = True
-        self.async_write_ha_state()
-        self._cancel_escalation_timer()
-        self._update_status_sensor()
-        async_dispatcher_send(self.hass, SUMMARY_UPDATE_SIGNAL)
+        self.transition(CMD_CLEAR, CAUSE_SERVICE)
 
     async def async_escalate(self):
         """Manually escalate the alert."""
-        if self._is_on and not self._escalated:
-            self._escalated = True
-            self._acknowledged = False
-            self._cleared = False
-            self.async_write_ha_state()
-            self._call_actions(self._on_escalated)
-            self._update_status_sensor()
-            async_dispatcher_send(self.hass, SUMMARY_UPDATE_SIGNAL)
+        self.transition(CMD_ESCALATE, CAUSE_SERVICE)
 
     def get_status(self):
         """Get current alert status."""
         # Priority order matters
-        if not self._is_on:
+        flags = self._runtime.flags
+        if flags & FLAG_FLAPPING and not flags & (FLAG_SNOOZED | FLAG_RESOLVED):
+            # One status for the whole flapping spell, firing or not.
+            return STATE_FLAPPING
+        if not flags & FLAG_ON:
             return STATE_INACTIVE
-        if self._resolved:
+        if flags & FLAG_RESOLVED:
             return STATE_RESOLVED
-        if self._snoozed:
+        if flags & FLAG_SNOOZED:
             return STATE_SNOOZED
-        if self._escalated:
+        if flags & FLAG_ESCALATED:
             return STATE_ESCALATED
-        if self._acknowledged:
+        if flags & FLAG_ACKNOWLEDGED:
             return STATE_ACKNOWLEDGED
         return STATE_ACTIVE
 
-    def _update_status_sensor(self):
-        """Update the companion status sensor."""
+    def _update_status_sensor(self, cause: str = CAUSE_UNKNOWN):
+        """Update the companion status sensor, recording any status change."""
         status = self.get_status()
-        status_entity_id = f"sensor.emergency_{self._alert_id}_status"
+        if status != self._last_status:
+            self._record_transition(self._last_status, status, cause)
+            self._last_status = status
+        status_entity_id = (
+            f"{STATUS_SENSOR_PREFIX}{self._alert_id}{STATUS_SENSOR_SUFFIX}"
+        )
         _LOGGER.debug(f"Updating status sensor {status_entity_id} to {status}")
 
         attrs = {
@@ -916,6 +1207,7 @@ class EmergencyBinarySensor(BinarySensorEntity):
                 STATE_SNOOZED: "mdi:bell-sleep",
                 STATE_ESCALATED: "mdi:arrow-up-circle",
                 STATE_RESOLVED: "mdi:check-circle",
+                STATE_FLAPPING: "mdi:sine-wave",
                 STATE_INACTIVE: "mdi:circle-outline",
                 "cleared": "mdi:check-circle-outline",  # Legacy
             }.get(status, "mdi:help-circle"),
@@ -928,4 +1220,17 @@ class EmergencyBinarySensor(BinarySensorEntity):
         if self._snoozed and self._snooze_until:
             attrs["snooze_until"] = self._snooze_until.isoformat()
 
+        self._metrics.status_writes += 1
         self.hass.states.async_set(status_entity_id, status, attrs)
+
+    def _record_transition(self, from_status: str, to_status: str, cause: str) -> None:
+        """Append a status transition to this alert's history."""
+        history = self._history
+        if history is None:
+            size = self._get_global_options().get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE)
+            try:
+                size = max(int(size), 0)
+            except (TypeError, ValueError):
+                size = DEFAULT_HISTORY_SIZE
+            history = self._history = TransitionHistory(size)
+        history.record(time.time(), from_status, to_status, cause)
@@ -46,7 +46,29 @@ from .const import (
     CONF_HUB_NAME,
     CONF_CUSTOM_NAME,
     CONF_ALERTS,
+    CONF_ENTITY_PATTERN,
+    CONF_MATCH_DEVICE_CLASS,
+    CONF_MATCH_DOMAIN,
+    CONF_ENABLE_PERFORMANCE_SENSORS,
+    CONF_PERFORMANCE_INTERVAL,
+    CONF_ENABLE_TRACE_EVENTS,
+    CONF_ENABLE_TRANSITION_LOG,
+    CONF_HISTORY_SIZE,
+    COMPARATORS,
+    COMP_GT,
+    DEFAULT_PERFORMANCE_INTERVAL,
+    DEFAULT_HISTORY_SIZE,
+    MAX_HISTORY_SIZE,
 )
+from .core.anomaly import (
+    BASELINE_EWMA,
+    BASELINES,
+    DEFAULT_EWMA_ALPHA,
+    DEFAULT_MIN_SAMPLES,
+    DEFAULT_SIGMA,
+)
+from .core.conditions import is_valid_condition
+from .core.flapping import DEFAULT_FLAP_WINDOW_SECONDS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -125,6 +147,36 @@ class EmergencyOptionsFlow(config_entries.OptionsFlow):
                     "default_escalation_time",
                     default=self.config_entry.options.get("default_escalation_time", 300),
                 ): vol.All(vol.Coerce(int), vol.Range(min=60, max=3600)),
+                vol.Optional(
+                    CONF_ENABLE_PERFORMANCE_SENSORS,
+                    default=self.config_entry.options.get(
+                        CONF_ENABLE_PERFORMANCE_SENSORS, False
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_PERFORMANCE_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_PERFORMANCE_INTERVAL, DEFAULT_PERFORMANCE_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                vol.Optional(
+                    CONF_ENABLE_TRACE_EVENTS,
+                    default=self.config_entry.options.get(
+                        CONF_ENABLE_TRACE_EVENTS, False
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_HISTORY_SIZE,
+                    default=self.config_entry.options.get(
+                        CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_HISTORY_SIZE)),
+                vol.Optional(
+                    CONF_ENABLE_TRANSITION_LOG,
+                    default=self.config_entry.options.get(
+                        CONF_ENABLE_TRANSITION_LOG, False
+                    ),
+                ): bool,
             }),
         )
 
@@ -233,20 +285,29 @@ class EmergencyOptionsFlow(config_entries.OptionsFlow):
                 "trigger_type", default=defaults.get("trigger_type", "simple")
             ): selector.SelectSelector(
                 selector.SelectSelectorConfig(
-                    options=["simple", "template", "logical"],
+                    options=["simple", "template", "logical", "numeric", "occurrence", "rate", "anomaly", "stale"],
                     mode=selector.SelectSelectorMode.DROPDOWN,
                 )
             ),
             _optional("entity_id", defaults.get("entity_id")): selector.EntitySelector(),
+            # Pattern alert fields, used instead of entity_id: the alert is
+            # expanded into one instance per entity matching all of them
+            # (core.patterns). Not for template or logical triggers.
+            _optional(CONF_ENTITY_PATTERN, defaults.get(CONF_ENTITY_PATTERN)): str,
+            _optional(CONF_MATCH_DOMAIN, defaults.get(CONF_MATCH_DOMAIN)): str,
+            _optional(CONF_MATCH_DEVICE_CLASS, defaults.get(CONF_MATCH_DEVICE_CLASS)): str,
             vol.Optional(
                 "trigger_state", default=defaults.get("trigger_state", "on")
             ): str,
+            # Attribute path (e.g. "battery", "forecast.0.temperature") read
+            # instead of the entity's state by simple and numeric triggers.
+            _optional("attribute", defaults.get("attribute")): str,
             vol.Optional("template", default=defaults.get("template", "")): selector.TemplateSelector(),
             # Logical trigger fields. Only used when trigger_type == "logical".
             # `logical_conditions` is a list of {entity_id, state} pairs;
             # ObjectSelector renders it as a YAML editor and round-trips the
             # parsed list directly into alert_data. `_parse_logical_conditions`
-            # in binary_sensor.py also accepts a JSON/YAML string, so older
+            # in core/definition.py also accepts a JSON/YAML string, so older
             # alerts created via the API still load fine.
             _optional("logical_conditions", defaults.get("logical_conditions")): selector.ObjectSelector(),
             vol.Optional(
@@ -257,6 +318,54 @@ class EmergencyOptionsFlow(config_entries.OptionsFlow):
                     mode=selector.SelectSelectorMode.DROPDOWN,
                 )
             ),
+            # Numeric trigger fields. Only used when trigger_type == "numeric":
+            # entity_id's state <comparator> threshold, staying triggered
+            # until it crosses back past clear_threshold (blank = threshold).
+            vol.Optional(
+                "comparator", default=defaults.get("comparator", COMP_GT)
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=COMPARATORS,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            _optional("threshold", defaults.get("threshold")): vol.Coerce(float),
+            _optional("clear_threshold", defaults.get("clear_threshold")): vol.Coerce(float),
+            # Occurrence trigger fields. Only used when trigger_type ==
+            # "occurrence": entity_id going to trigger_state at least
+            # `occurrences` times within `window_seconds`. Rate triggers
+            # reuse `window_seconds` with the numeric comparator/threshold.
+            _optional("occurrences", defaults.get("occurrences")): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=1000)
+            ),
+            _optional("window_seconds", defaults.get("window_seconds")): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=604800)
+            ),
+            # Anomaly trigger fields. Only used when trigger_type ==
+            # "anomaly": entity_id's value more than `sigma` standard
+            # deviations from its learned baseline (core.anomaly).
+            vol.Optional(
+                "baseline", default=defaults.get("baseline", BASELINE_EWMA)
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=list(BASELINES),
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Optional("sigma", default=defaults.get("sigma", DEFAULT_SIGMA)): vol.All(
+                vol.Coerce(float), vol.Range(min=0.5, max=20)
+            ),
+            vol.Optional(
+                "ewma_alpha", default=defaults.get("ewma_alpha", DEFAULT_EWMA_ALPHA)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.001, max=0.5)),
+            vol.Optional(
+                "min_samples", default=defaults.get("min_samples", DEFAULT_MIN_SAMPLES)
+            ): vol.All(vol.Coerce(int), vol.Range(min=2, max=100000)),
+            # Stale trigger field. Only used when trigger_type == "stale":
+            # entity_id hasn't reported for this many seconds.
+            _optional("stale_seconds", defaults.get("stale_seconds")): vol.All(
+                vol.Coerce(int), vol.Range(min=60, max=2592000)
+            ),
             # Debounce / sustain duration: alert only fires after the trigger
             # condition has been true for this many seconds continuously. 0 =
             # no debounce (fire immediately). Useful for "window open >5min",
@@ -265,6 +374,20 @@ class EmergencyOptionsFlow(config_entries.OptionsFlow):
             vol.Optional(
                 "for_seconds", default=defaults.get("for_seconds", 0)
             ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+            # Flap detection: `flap_threshold` trigger flips within
+            # `flap_window_seconds` put the alert in the "flapping" status
+            # (0 = off); `flap_suppress` holds its state and actions until
+            # it is stable again. Applies to all trigger types.
+            vol.Optional(
+                "flap_threshold", default=defaults.get("flap_threshold", 0)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+            vol.Optional(
+                "flap_window_seconds",
+                default=defaults.get("flap_window_seconds", DEFAULT_FLAP_WINDOW_SECONDS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+            vol.Optional(
+                "flap_suppress", default=defaults.get("flap_suppress", False)
+            ): bool,
             _optional("on_triggered_script", defaults.get("on_triggered_script")): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain="script")
             ),
@@ -282,13 +405,27 @@ class EmergencyOptionsFlow(config_entries.OptionsFlow):
             "trigger_type": trigger_type,
             "severity": user_input.get("severity", "warning"),
         }
+        pattern = {
+            key: user_input[key].strip()
+            for key in (CONF_ENTITY_PATTERN, CONF_MATCH_DOMAIN, CONF_MATCH_DEVICE_CLASS)
+            if isinstance(user_input.get(key), str) and user_input[key].strip()
+        }
+        if trigger_type in ("template", "logical"):
+            if pattern:
+                raise vol.Invalid(
+                    f"Entity patterns can't be used with {trigger_type} triggers"
+                )
+        elif not (user_input.get("entity_id") or pattern):
+            raise vol.Invalid(
+                f"Entity ID is required for {trigger_type} triggers "
+                "unless an entity pattern is set"
+            )
 
         if trigger_type == "simple":
-            # Entity ID is required for simple triggers
-            if not user_input.get("entity_id"):
-                raise vol.Invalid("Entity ID is required for simple triggers")
-            alert_data["entity_id"] = user_input["entity_id"]
+            alert_data["entity_id"] = user_input.get("entity_id")
             alert_data["trigger_state"] = user_input.get("trigger_state", "on")
+            if user_input.get("attribute"):
+                alert_data["attribute"] = user_input["attribute"].strip()
         elif trigger_type == "template":
             # Template is required for template triggers
             if not user_input.get("template"):
@@ -298,27 +435,86 @@ class EmergencyOptionsFlow(config_entries.OptionsFlow):
             if user_input.get("entity_id"):
                 alert_data["entity_id"] = user_input["entity_id"]
         elif trigger_type == "logical":
-            # logical_conditions is a list of {entity_id, state} dicts; the
-            # runtime evaluator (binary_sensor._parse_logical_conditions) is
-            # the source of truth on the schema.
+            # logical_conditions is a list of {entity_id, state} dicts, or
+            # and/or/not groups of them; core.conditions compiles them and
+            # is the source of truth on the schema.
             conditions = user_input.get("logical_conditions")
             if not conditions:
                 raise vol.Invalid(
                     "At least one condition is required for logical triggers"
                 )
             if not isinstance(conditions, list) or not all(
-                isinstance(c, dict) and c.get("entity_id") and c.get("state") is not None
-                for c in conditions
+                is_valid_condition(c) for c in conditions
             ):
                 raise vol.Invalid(
                     "logical_conditions must be a list of "
-                    "{entity_id, state} dicts"
+                    "{entity_id, state} dicts or and/or/not groups of them"
                 )
             alert_data["logical_conditions"] = conditions
             alert_data["logical_operator"] = user_input.get(
                 "logical_operator", "and"
             )
 
+        elif trigger_type == "numeric":
+            if user_input.get("threshold") is None:
+                raise vol.Invalid("Threshold is required for numeric triggers")
+            alert_data["entity_id"] = user_input.get("entity_id")
+            alert_data["comparator"] = user_input.get("comparator", COMP_GT)
+            alert_data["threshold"] = float(user_input["threshold"])
+            if user_input.get("attribute"):
+                alert_data["attribute"] = user_input["attribute"].strip()
+            if user_input.get("clear_threshold") is not None:
+                alert_data["clear_threshold"] = float(user_input["clear_threshold"])
+
+        elif trigger_type == "occurrence":
+            if not user_input.get("occurrences") or not user_input.get("window_seconds"):
+                raise vol.Invalid(
+                    "Occurrences and window are required for occurrence triggers"
+                )
+            alert_data["entity_id"] = user_input.get("entity_id")
+            alert_data["trigger_state"] = user_input.get("trigger_state", "on")
+            alert_data["occurrences"] = int(user_input["occurrences"])
+            alert_data["window_seconds"] = int(user_input["window_seconds"])
+            if user_input.get("attribute"):
+                alert_data["attribute"] = user_input["attribute"].strip()
+
+        elif trigger_type == "rate":
+            if user_input.get("threshold") is None or not user_input.get("window_seconds"):
+                raise vol.Invalid("Threshold and window are required for rate triggers")
+            alert_data["entity_id"] = user_input.get("entity_id")
+            alert_data["comparator"] = user_input.get("comparator", COMP_GT)
+            alert_data["threshold"] = float(user_input["threshold"])
+            alert_data["window_seconds"] = int(user_input["window_seconds"])
+            if user_input.get("clear_threshold") is not None:
+                alert_data["clear_threshold"] = float(user_input["clear_threshold"])
+            if user_input.get("attribute"):
+                alert_data["attribute"] = user_input["attribute"].strip()
+
+        elif trigger_type == "anomaly":
+            alert_data["entity_id"] = user_input.get("entity_id")
+            alert_data["baseline"] = user_input.get("baseline", BASELINE_EWMA)
+            alert_data["sigma"] = float(user_input.get("sigma", DEFAULT_SIGMA))
+            if alert_data["baseline"] == BASELINE_EWMA:
+                alert_data["ewma_alpha"] = float(
+                    user_input.get("ewma_alpha", DEFAULT_EWMA_ALPHA)
+                )
+            alert_data["min_samples"] = int(
+                user_input.get("min_samples", DEFAULT_MIN_SAMPLES)
+            )
+            if user_input.get("attribute"):
+                alert_data["attribute"] = user_input["attribute"].strip()
+
+        elif trigger_type == "stale":
+            if not user_input.get("stale_seconds"):
+                raise vol.Invalid("Stale after (seconds) is required for stale triggers")
+            alert_data["entity_id"] = user_input.get("entity_id")
+            alert_data["stale_seconds"] = int(user_input["stale_seconds"])
+
+        if pattern:
+            # Matched entities take the place of entity_id.
+            alert_data.pop("entity_id", None)
+            alert_data.update(pattern)
+
         # Store script entity_id as string (binary sensor will build action)
         if user_input.get("on_triggered_script"):
             alert_data["on_triggered_script"] = user_input["on_triggered_script"]
@@ -337,6 +533,18 @@ class EmergencyOptionsFlow(config_entries.OptionsFlow):
             if for_seconds > 0:
                 alert_data["for_seconds"] = for_seconds
 
+        # Same for flap detection: only stored when switched on.
+        flap_threshold = user_input.get("flap_threshold")
+        if flap_threshold:
+            if int(flap_threshold) < 2:
+                raise vol.Invalid("Flap threshold must be at least 2 flips (or 0 for off)")
+            alert_data["flap_threshold"] = int(flap_threshold)
+            alert_data["flap_window_seconds"] = int(
+                user_input.get("flap_window_seconds") or DEFAULT_FLAP_WINDOW_SECONDS
+            )
+            if user_input.get("flap_suppress"):
+                alert_data["flap_suppress"] = True
+
         return alert_data
 
     async def async_step_edit_alert(self, user_input=None):
@@ -15,6 +15,26 @@ CONF_TRIGGER_STATE = "trigger_state"
 CONF_TEMPLATE = "template"
 CONF_LOGICAL_CONDITIONS = "logical_conditions"
 CONF_LOGICAL_OPERATOR = "logical_operator"
+# Numeric trigger: entity_id state <comparator> threshold, staying triggered
+# until it crosses back past clear_threshold (hysteresis)
+CONF_ATTRIBUTE = "attribute"
+CONF_COMPARATOR = "comparator"
+CONF_THRESHOLD = "threshold"
+CONF_CLEAR_THRESHOLD = "clear_threshold"
+CONF_OCCURRENCES = "occurrences"
+CONF_WINDOW_SECONDS = "window_seconds"
+# Anomaly trigger: deviation from a learned baseline ("ewma" or "welford")
+CONF_BASELINE = "baseline"
+CONF_SIGMA = "sigma"
+CONF_EWMA_ALPHA = "ewma_alpha"
+CONF_MIN_SAMPLES = "min_samples"
+# Stale trigger: entity_id hasn't reported for stale_seconds
+CONF_STALE_SECONDS = "stale_seconds"
+# Pattern alerts: expanded into one alert per entity matching all of these
+# (used instead of entity_id)
+CONF_ENTITY_PATTERN = "entity_pattern"
+CONF_MATCH_DOMAIN = "match_domain"
+CONF_MATCH_DEVICE_CLASS = "match_device_class"
 CONF_SEVERITY = "severity"
 CONF_GROUP = "group"
 CONF_ON_TRIGGERED = "on_triggered"
@@ -27,6 +47,22 @@ CONF_SNOOZE_DURATION = "snooze_duration"
 # Debounce: alert fires only if the trigger has been true for this many seconds
 # (0 = no debounce, fire immediately when trigger is true)
 CONF_FOR_SECONDS = "for_seconds"
+# Flap detection: flap_threshold trigger flips within flap_window_seconds
+# puts the alert in the "flapping" status; flap_suppress holds its state and
+# actions until it is stable again
+CONF_FLAP_THRESHOLD = "flap_threshold"
+CONF_FLAP_WINDOW_SECONDS = "flap_window_seconds"
+CONF_FLAP_SUPPRESS = "flap_suppress"
+CONF_ON_FLAPPING = "on_flapping"
+
+# Global hub: optional hot-path performance sensors
+CONF_ENABLE_PERFORMANCE_SENSORS = "enable_performance_sensors"
+CONF_PERFORMANCE_INTERVAL = "performance_publish_interval"
+CONF_ENABLE_TRACE_EVENTS = "enable_trace_events"
+# Global hub: transitions kept per alert for the get_history service
+CONF_HISTORY_SIZE = "history_size"
+# Global hub: append every transition to a replayable on-disk log
+CONF_ENABLE_TRANSITION_LOG = "enable_transition_log"
 
 # Notification profiles
 CONF_NOTIFICATION_PROFILES = "notification_profiles"
@@ -38,9 +74,14 @@ CONF_PROFILE_SERVICES = "profile_services"
 TRIGGER_TYPE_SIMPLE = "simple"
 TRIGGER_TYPE_TEMPLATE = "template"
 TRIGGER_TYPE_LOGICAL = "logical"
+TRIGGER_TYPE_NUMERIC = "numeric"
+TRIGGER_TYPE_OCCURRENCE = "occurrence"
+TRIGGER_TYPE_RATE = "rate"
+TRIGGER_TYPE_ANOMALY = "anomaly"
+TRIGGER_TYPE_STALE = "stale"
 # TRIGGER_TYPE_COMBINED removed in Phase 2 - redundant with logical
 
-# Comparators for combined triggers
+# Comparators for numeric triggers
 COMP_EQ = "=="
 COMP_NE = "!="
 COMP_LT = "<"
@@ -69,6 +110,7 @@ STATE_ACKNOWLEDGED = "acknowledged"
 STATE_SNOOZED = "snoozed"
 STATE_ESCALATED = "escalated"
 STATE_RESOLVED = "resolved"
+STATE_FLAPPING = "flapping"
 
 # Switch types
 SWITCH_TYPE_ACKNOWLEDGE = "acknowledged"
@@ -79,6 +121,12 @@ SWITCH_TYPE_RESOLVE = "resolved"
 SERVICE_ACKNOWLEDGE = "acknowledge"
 SERVICE_CLEAR = "clear"
 SERVICE_ESCALATE = "escalate"
+SERVICE_PROFILE = "profile"
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_BULK_ACKNOWLEDGE = "bulk_acknowledge"
+SERVICE_BULK_SNOOZE = "bulk_snooze"
+SERVICE_BULK_RESOLVE = "bulk_resolve"
+SERVICE_BULK_CLEAR = "bulk_clear"
 
 # Event types
 EVENT_ALERT_TRIGGERED = f"{DOMAIN}_alert_triggered"
@@ -87,16 +135,30 @@ EVENT_ALERT_ACKNOWLEDGED = f"{DOMAIN}_alert_acknowledged"
 EVENT_ALERT_ESCALATED = f"{DOMAIN}_alert_escalated"
 EVENT_ALERT_SNOOZED = f"{DOMAIN}_alert_snoozed"
 EVENT_ALERT_RESOLVED = f"{DOMAIN}_alert_resolved"
+EVENT_ALERT_FLAPPING = f"{DOMAIN}_alert_flapping"
+# Optional per-transition latency trace (see CONF_ENABLE_TRACE_EVENTS)
+EVENT_ALERT_TRACE = f"{DOMAIN}_alert_trace"
 
 # Dispatcher signals
 SIGNAL_ALERT_UPDATE = f"{DOMAIN}_alert_update"
 SIGNAL_SWITCH_UPDATE = f"{DOMAIN}_switch_update"
+# New pattern alert instances for an entry (suffixed with its entry_id)
+SIGNAL_PATTERN_MATCH = f"{DOMAIN}_pattern_match"
+
+# Each alert's status sensor is sensor.emergency_<alert_id>_status
+STATUS_SENSOR_PREFIX = "sensor.emergency_"
+STATUS_SENSOR_SUFFIX = "_status"
 
 # Default values
 DEFAULT_SEVERITY = SEVERITY_WARNING
 DEFAULT_GROUP = GROUP_OTHER
 DEFAULT_ESCALATION_TIME = 300  # 5 minutes in seconds
 DEFAULT_SNOOZE_DURATION = 300  # 5 minutes in seconds
+DEFAULT_PERFORMANCE_INTERVAL = 60  # seconds between performance sensor updates
+DEFAULT_PROFILE_DURATION = 60  # seconds a profile service call runs for
+MAX_PROFILE_DURATION = 3600
+DEFAULT_HISTORY_SIZE = 50  # transitions kept per alert (about 10 bytes each)
+MAX_HISTORY_SIZE = 1000
 
 # State transition rules (what states can coexist)
 # Format: {primary_state: [states_that_must_be_off]}
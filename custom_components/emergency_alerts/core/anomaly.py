@@ -0,0 +1,394 @@
+"""Anomaly trigger: a value far from its own running baseline.
+
+Instead of a fixed threshold, the trigger learns each entity's normal
+level and spread and holds while the latest reading is more than
+``sigma`` standard deviations from it. Two baselines are available, both
+O(1) per reading and a few floats of memory:
+
+* ``welford``: the mean and variance of every reading so far (Welford's
+  online algorithm), for values with a stable normal range.
+* ``ewma``: an exponentially weighted mean and variance with smoothing
+  factor ``ewma_alpha``, which follows slow drift (seasons, a new
+  appliance) and forgets old readings.
+
+A reading is scored against the baseline *before* it is folded in, so a
+sudden jump is judged against the history it departs from. Nothing is
+scored until the baseline has seen ``min_samples`` readings, and the
+standard deviation used for scoring never drops below 1% of the mean or
+0.1, so a sensor that has flat-lined doesn't turn its first small change
+into an infinite deviation.
+
+Baselines are shared by every alert with the same entity, attribute and
+method (:func:`async_acquire_baseline`) and persisted in HA's storage
+(:class:`BaselineStore`), so after a restart alerts pick up where they
+left off instead of warming up again.
+"""
+
+import abc
+import copy
+import logging
+import math
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers.storage import Store
+
+from ..const import (
+    CONF_ATTRIBUTE,
+    CONF_BASELINE,
+    CONF_EWMA_ALPHA,
+    CONF_MIN_SAMPLES,
+    CONF_SIGMA,
+    DOMAIN,
+)
+from .conditions import Accessor, compile_accessor, MISSING
+from .numeric import to_number
+
+_LOGGER = logging.getLogger(__name__)
+
+BASELINE_WELFORD = "welford"
+BASELINE_EWMA = "ewma"
+BASELINES = (BASELINE_EWMA, BASELINE_WELFORD)
+
+DEFAULT_SIGMA = 3.0
+DEFAULT_EWMA_ALPHA = 0.05
+DEFAULT_MIN_SAMPLES = 30
+# Floor of the standard deviation readings are scored against: this
+# fraction of the mean's magnitude, and never less than MIN_STD.
+STD_FLOOR_FRACTION = 0.01
+MIN_STD = 0.1
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.baselines"
+# Coalesce saves: a busy sensor updates its baseline every few seconds.
+SAVE_DELAY = 60
+
+BaselineKey = Tuple[str, Optional[str], str, Optional[float]]
+
+
+class AnomalyRule:
+    """The parsed, shared part of an anomaly trigger."""
+
+    __slots__ = (
+        "entity_id",
+        "attribute",
+        "read",
+        "method",
+        "sigma",
+        "alpha",
+        "min_samples",
+    )
+
+    def __init__(
+        self,
+        entity_id: str,
+        method: str = BASELINE_EWMA,
+        sigma: float = DEFAULT_SIGMA,
+        alpha: float = DEFAULT_EWMA_ALPHA,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        attribute: Optional[str] = None,
+    ) -> None:
+        """Store the rule, validating the method and ranges."""
+        if method not in BASELINES:
+            raise ValueError(f"unknown baseline {method!r}")
+        if sigma <= 0:
+            raise ValueError("sigma must be positive")
+        if not 0 < alpha < 1:
+            raise ValueError("ewma_alpha must be between 0 and 1")
+        if min_samples < 2:
+            raise ValueError("min_samples must be at least 2")
+        self.entity_id = entity_id
+        self.attribute = attribute or None
+        self.read: Accessor = compile_accessor(self.attribute)
+        self.method = method
+        self.sigma = sigma
+        self.alpha = alpha
+        self.min_samples = min_samples
+
+    @classmethod
+    def from_config(cls, alert_data: Dict[str, Any]) -> Optional["AnomalyRule"]:
+        """Parse the anomaly trigger fields, or return None if they're invalid."""
+        entity_id = alert_data.get("entity_id")
+        try:
+            if not entity_id:
+                raise ValueError("entity_id is required")
+            return cls(
+                entity_id,
+                alert_data.get(CONF_BASELINE) or BASELINE_EWMA,
+                float(alert_data.get(CONF_SIGMA) or DEFAULT_SIGMA),
+                float(alert_data.get(CONF_EWMA_ALPHA) or DEFAULT_EWMA_ALPHA),
+                int(alert_data.get(CONF_MIN_SAMPLES) or DEFAULT_MIN_SAMPLES),
+                alert_data.get(CONF_ATTRIBUTE),
+            )
+        except (TypeError, ValueError) as err:
+            _LOGGER.error(f"Invalid anomaly trigger: {err}")
+            return None
+
+    @property
+    def key(self) -> BaselineKey:
+        """Alerts with the same key share one baseline."""
+        alpha = self.alpha if self.method == BASELINE_EWMA else None
+        return (self.entity_id, self.attribute, self.method, alpha)
+
+    def bind(self, entity_id: str) -> "AnomalyRule":
+        """This rule for another entity; each entity learns its own baseline."""
+        bound = copy.copy(self)
+        bound.entity_id = entity_id
+        return bound
+
+    def new_baseline(self) -> "Baseline":
+        """An empty baseline of this rule's method."""
+        if self.method == BASELINE_WELFORD:
+            return WelfordBaseline(self.min_samples)
+        return EwmaBaseline(self.min_samples, self.alpha)
+
+    def deviates(self, baseline: Optional["Baseline"]) -> bool:
+        """Whether ``baseline``'s last reading was more than ``sigma`` out."""
+        return (
+            baseline is not None
+            and baseline.last_z is not None
+            and abs(baseline.last_z) > self.sigma
+        )
+
+    def __repr__(self) -> str:
+        return f"AnomalyRule({self.key}, {self.sigma} sigma)"
+
+
+class Baseline(abc.ABC):
+    """Running mean and variance of one entity's readings."""
+
+    __slots__ = (
+        "min_samples",
+        "count",
+        "mean",
+        "last_state",
+        "last_z",
+        "users",
+        "store",
+    )
+
+    def __init__(self, min_samples: int = DEFAULT_MIN_SAMPLES) -> None:
+        """Start with no readings."""
+        self.min_samples = min_samples
+        self.count = 0
+        self.mean = 0.0
+        self.last_state: Optional[State] = None
+        # Deviation of the last reading in standard deviations; None until
+        # the baseline has min_samples readings.
+        self.last_z: Optional[float] = None
+        self.users = 0
+        self.store: Optional["BaselineStore"] = None
+
+    def observe(self, state: Optional[State], read: Accessor) -> None:
+        """Score and record ``state``'s value once, however many alerts pass it on."""
+        if state is None or state is self.last_state:
+            return
+        self.last_state = state
+        value = read(state)
+        value = to_number(value) if value is not MISSING else None
+        if value is None or not math.isfinite(value):
+            # unavailable/unknown: keep the last score and the baseline.
+            return
+        self.last_z = self.score(value)
+        self.add(value)
+        if self.store is not None:
+            self.store.async_schedule_save()
+
+    def score(self, value: float) -> Optional[float]:
+        """``value``'s deviation from the mean in standard deviations."""
+        if self.count < self.min_samples:
+            return None
+        std = max(
+            math.sqrt(self.variance()), STD_FLOOR_FRACTION * abs(self.mean), MIN_STD
+        )
+        return (value - self.mean) / std
+
+    @abc.abstractmethod
+    def add(self, value: float) -> None:
+        """Fold ``value`` into the baseline."""
+
+    @abc.abstractmethod
+    def variance(self) -> float:
+        """The current variance estimate."""
+
+    @abc.abstractmethod
+    def as_dict(self) -> Dict[str, float]:
+        """The persisted statistics."""
+
+    @abc.abstractmethod
+    def restore(self, data: Dict[str, Any]) -> None:
+        """Load statistics saved by :meth:`as_dict`; ignore malformed data."""
+
+
+class WelfordBaseline(Baseline):
+    """Mean and variance of every reading (Welford's algorithm)."""
+
+    __slots__ = ("m2",)
+
+    def __init__(self, min_samples: int = DEFAULT_MIN_SAMPLES) -> None:
+        """Start with no readings."""
+        super().__init__(min_samples)
+        # Sum of squared differences from the mean.
+        self.m2 = 0.0
+
+    def add(self, value: float) -> None:
+        """Update the mean and the sum of squared differences."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def variance(self) -> float:
+        """The sample variance of every reading so far."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Count, mean and sum of squared differences."""
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        """Load count, mean and sum of squared differences."""
+        try:
+            count, mean, m2 = int(data["count"]), float(data["mean"]), float(data["m2"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if count >= 0 and m2 >= 0:
+            self.count, self.mean, self.m2 = count, mean, m2
+
+
+class EwmaBaseline(Baseline):
+    """Exponentially weighted mean and variance."""
+
+    __slots__ = ("alpha", "var")
+
+    def __init__(
+        self, min_samples: int = DEFAULT_MIN_SAMPLES, alpha: float = DEFAULT_EWMA_ALPHA
+    ) -> None:
+        """Start with no readings, weighting new ones by ``alpha``."""
+        super().__init__(min_samples)
+        self.alpha = alpha
+        self.var = 0.0
+
+    def add(self, value: float) -> None:
+        """Move the mean and variance ``alpha`` of the way towards ``value``."""
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return
+        diff = value - self.mean
+        increment = self.alpha * diff
+        self.mean += increment
+        self.var = (1 - self.alpha) * (self.var + diff * increment)
+
+    def variance(self) -> float:
+        """The weighted variance, dominated by recent readings."""
+        return self.var
+
+    def as_dict(self) -> Dict[str, float]:
+        """Count, mean and variance."""
+        return {"count": self.count, "mean": self.mean, "var": self.var}
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        """Load count, mean and variance."""
+        try:
+            count, mean, var = (
+                int(data["count"]),
+                float(data["mean"]),
+                float(data["var"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return
+        if count >= 0 and var >= 0:
+            self.count, self.mean, self.var = count, mean, var
+
+
+def _storage_key(key: BaselineKey) -> str:
+    entity_id, attribute, method, alpha = key
+    return f"{entity_id}|{attribute or ''}|{method}|{'' if alpha is None else alpha}"
+
+
+class BaselineStore:
+    """Shared baselines and their persistence in ``.storage``."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create the store; call :meth:`async_load` before acquiring."""
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._loaded = False
+        # Saved statistics of baselines not currently in use, by storage key.
+        self._saved: Dict[str, Dict[str, Any]] = {}
+        self.baselines: Dict[BaselineKey, Baseline] = {}
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """Read the saved baselines (once)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load()
+        if isinstance(data, dict) and isinstance(data.get("baselines"), dict):
+            self._saved = data["baselines"]
+
+    def acquire(self, rule: AnomalyRule) -> Baseline:
+        """Return the shared baseline for ``rule``, restoring it on first use."""
+        baseline = self.baselines.get(rule.key)
+        if baseline is None:
+            baseline = self.baselines[rule.key] = rule.new_baseline()
+            saved = self._saved.get(_storage_key(rule.key))
+            if saved:
+                baseline.restore(saved)
+            baseline.store = self
+        baseline.users += 1
+        return baseline
+
+    def release(self, rule: AnomalyRule) -> None:
+        """Drop one user of ``rule``'s baseline, keeping its statistics for later."""
+        baseline = self.baselines.get(rule.key)
+        if baseline is None:
+            return
+        baseline.users -= 1
+        if baseline.users <= 0:
+            del self.baselines[rule.key]
+            baseline.store = None
+            self._saved[_storage_key(rule.key)] = baseline.as_dict()
+            self.async_schedule_save()
+
+    def async_schedule_save(self) -> None:
+        """Save within SAVE_DELAY seconds; repeated calls don't postpone it."""
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        self._save_pending = False
+        baselines = dict(self._saved)
+        for key, baseline in self.baselines.items():
+            baselines[_storage_key(key)] = baseline.as_dict()
+        return {"baselines": baselines}
+
+
+async def async_setup_baselines(hass: HomeAssistant) -> BaselineStore:
+    """Create and load the shared baseline store."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store = domain_data.get("baselines")
+    if store is None:
+        store = domain_data["baselines"] = BaselineStore(hass)
+    await store.async_load()
+    return store
+
+
+def async_acquire_baseline(hass: HomeAssistant, rule: AnomalyRule) -> Baseline:
+    """Return the shared baseline for ``rule``, creating the store if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store = domain_data.get("baselines")
+    if store is None:
+        # Normally set up (and loaded) by async_setup_entry.
+        store = domain_data["baselines"] = BaselineStore(hass)
+    return store.acquire(rule)
+
+
+def async_release_baseline(hass: HomeAssistant, rule: AnomalyRule) -> None:
+    """Drop one user of ``rule``'s baseline."""
+    store = hass.data.get(DOMAIN, {}).get("baselines")
+    if store is not None:
+        store.release(rule)
@@ -0,0 +1,107 @@
+"""Apply one state machine command to many alerts at once.
+
+Backs the ``bulk_acknowledge`` / ``bulk_snooze`` / ``bulk_resolve`` /
+``bulk_clear`` services. Alerts are selected in a single pass over the
+registered alerts, then each gets one ``transition`` (one state write for
+the alert and its status sensor, one update signal for its select and
+switches). The hub summaries, which rescan every alert, are signalled once
+for the whole batch instead of once per alert.
+"""
+
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from homeassistant.core import callback, HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from ..const import (
+    SERVICE_BULK_ACKNOWLEDGE,
+    SERVICE_BULK_CLEAR,
+    SERVICE_BULK_RESOLVE,
+    SERVICE_BULK_SNOOZE,
+)
+from .history import CAUSE_SERVICE
+from .state_machine import CMD_ACKNOWLEDGE, CMD_CLEAR, CMD_RESOLVE, CMD_SNOOZE, shows_on
+
+BULK_COMMANDS = {
+    SERVICE_BULK_ACKNOWLEDGE: CMD_ACKNOWLEDGE,
+    SERVICE_BULK_SNOOZE: CMD_SNOOZE,
+    SERVICE_BULK_RESOLVE: CMD_RESOLVE,
+    SERVICE_BULK_CLEAR: CMD_CLEAR,
+}
+FILTERS = ("hub_name", "severity", "status", "entity_id")
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _as_set(value: Any) -> Optional[set]:
+    """Normalize a filter value to a set, or None when not given."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return {value}
+    return set(value)
+
+
+def match_alerts(
+    alerts: Iterable[Any],
+    hub_name: Any = None,
+    severity: Any = None,
+    status: Any = None,
+    entity_id: Any = None,
+) -> List[Any]:
+    """Return the alerts matching every given filter.
+
+    Each filter takes one value or a list. ``entity_id`` entries may be
+    shell-style globs (``binary_sensor.emergency_garage_*``); plain ids are
+    matched with a set lookup.
+    """
+    hubs = _as_set(hub_name)
+    severities = _as_set(severity)
+    statuses = _as_set(status)
+    entity_ids = _as_set(entity_id)
+    globs: Tuple[str, ...] = ()
+    if entity_ids is not None:
+        globs = tuple(p for p in entity_ids if not _GLOB_CHARS.isdisjoint(p))
+        entity_ids -= set(globs)
+
+    matched = []
+    for alert in alerts:
+        if hubs is not None and alert._hub_name not in hubs:
+            continue
+        if severities is not None and alert._severity not in severities:
+            continue
+        if (
+            entity_ids is not None
+            and alert.entity_id not in entity_ids
+            and not any(
+                fnmatchcase(alert.entity_id or "", pattern) for pattern in globs
+            )
+        ):
+            continue
+        if statuses is not None and alert.get_status() not in statuses:
+            continue
+        matched.append(alert)
+    return matched
+
+
+@callback
+def async_apply_bulk(
+    hass: HomeAssistant, alerts: List[Any], command: str, cause: str = CAUSE_SERVICE
+) -> Dict[str, Any]:
+    """Apply ``command`` to every alert; return how many matched and changed."""
+    changed = []
+    summary_changed = False
+    for alert in alerts:
+        old = alert._runtime.flags
+        if not alert.transition(command, cause, summary=False):
+            continue
+        new = alert._runtime.flags
+        if new != old:
+            changed.append(alert.entity_id)
+        summary_changed |= shows_on(old) != shows_on(new)
+    if summary_changed:
+        from ..binary_sensor import SUMMARY_UPDATE_SIGNAL
+
+        async_dispatcher_send(hass, SUMMARY_UPDATE_SIGNAL)
+    return {"matched": len(alerts), "changed": len(changed), "entity_ids": changed}
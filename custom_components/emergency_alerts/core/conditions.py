@@ -0,0 +1,376 @@
+"""Compiled entity conditions for simple, logical and numeric triggers.
+
+A condition reads one value from one entity (its state, or an attribute
+path such as ``battery`` or ``forecast.0.temperature``) and compares it
+with an expected value. The path and comparator are compiled once, when
+the alert definition is built, into an accessor and a test function, so
+an evaluation is one ``hass.states.get``, one attribute lookup and one
+comparison, with no Jinja rendering.
+
+Logical triggers nest conditions in ``and`` / ``or`` / ``not`` groups,
+compiled into a :class:`ConditionTree` that short-circuits and only
+recomputes the subtrees whose leaves saw a change.
+
+The accessors also say which parts of an entity an alert depends on.
+:func:`values_unchanged` uses them to drop ``state_changed`` events that
+don't touch anything the alert reads (for state-only alerts, every
+attribute-only change).
+"""
+
+import copy
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from homeassistant.core import State
+
+from ..const import COMP_EQ, COMP_NE
+from .numeric import compare_values, OPERATORS, to_number
+
+_LOGGER = logging.getLogger(__name__)
+
+# Returned by an accessor when the attribute path doesn't exist.
+MISSING = object()
+
+Accessor = Callable[[State], Any]
+
+
+def read_state(state: State) -> Any:
+    """Accessor for the entity state itself."""
+    return state.state
+
+
+@lru_cache(maxsize=None)
+def compile_accessor(path: Optional[str]) -> Accessor:
+    """Return an accessor for an attribute path, or for the state if empty.
+
+    Path segments are separated by dots; all-digit segments index lists.
+    Accessors are cached per path, so alerts reading the same attribute
+    share one function.
+    """
+    if not path:
+        return read_state
+    keys = tuple(int(key) if key.isdigit() else key for key in str(path).split("."))
+    if len(keys) == 1:
+        key = keys[0]
+
+        def read_attribute(state: State) -> Any:
+            return state.attributes.get(key, MISSING)
+
+        return read_attribute
+
+    def read_path(state: State) -> Any:
+        value = state.attributes
+        for key in keys:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                return MISSING
+        return value
+
+    return read_path
+
+
+def _compile_test(
+    comparator: Optional[str], expected: Any, attribute: bool
+) -> Callable[[Any], bool]:
+    """Bind ``comparator`` and ``expected`` into a one-argument test."""
+    if comparator is None:
+        if not attribute:
+            # Plain state match, as simple and logical triggers always did.
+            return lambda value: value == expected
+        comparator = COMP_EQ
+    text = str(expected)
+    if comparator == COMP_EQ:
+        return lambda value: str(value) == text
+    if comparator == COMP_NE:
+        return lambda value: str(value) != text
+    op = OPERATORS[comparator]
+    threshold = to_number(expected)
+    if threshold is not None:
+
+        def test_number(value: Any) -> bool:
+            number = to_number(value)
+            return number is not None and op(number, threshold)
+
+        return test_number
+    # Ordering against a non-number: compare_values falls back to equality.
+    return lambda value: compare_values(value, comparator, expected)
+
+
+class Condition:
+    """``entity_id``'s state or attribute compared with an expected value."""
+
+    __slots__ = ("entity_id", "attribute", "comparator", "expected", "read", "test")
+
+    def __init__(
+        self,
+        entity_id: str,
+        expected: Any,
+        attribute: Optional[str] = None,
+        comparator: Optional[str] = None,
+    ) -> None:
+        """Compile the accessor and comparison."""
+        if comparator is not None and comparator not in OPERATORS:
+            raise ValueError(f"unknown comparator {comparator!r}")
+        self.entity_id = entity_id
+        self.attribute = attribute or None
+        self.comparator = comparator
+        self.expected = expected
+        self.read = compile_accessor(self.attribute and str(self.attribute))
+        self.test = _compile_test(comparator, expected, self.attribute is not None)
+
+    @classmethod
+    def from_config(
+        cls, cond: Any, expected_key: str = "state", entity_id: Optional[str] = None
+    ) -> Optional["Condition"]:
+        """Compile a condition dict, or return None if it is incomplete.
+
+        ``entity_id`` overrides the dict's own (simple triggers keep it at
+        the top level of the alert config).
+        """
+        if not isinstance(cond, dict):
+            return None
+        entity_id = entity_id or cond.get("entity_id")
+        expected = cond.get(expected_key)
+        if not entity_id or expected is None:
+            return None
+        try:
+            return cls(
+                entity_id, expected, cond.get("attribute"), cond.get("comparator")
+            )
+        except ValueError as err:
+            _LOGGER.warning(f"Invalid condition {cond}: {err}")
+            return None
+
+    def holds(self, get: Callable[[str], Optional[State]]) -> bool:
+        """Evaluate against ``get`` (``hass.states.get``)."""
+        return self.matches(get(self.entity_id))
+
+    def matches(self, state: Optional[State]) -> bool:
+        """Evaluate against one state object of the entity."""
+        if state is None:
+            return False
+        value = self.read(state)
+        if value is MISSING:
+            return False
+        return self.test(value)
+
+    def bind(self, entity_id: str) -> "Condition":
+        """The same compiled test against another entity (pattern alerts)."""
+        bound = copy.copy(self)
+        bound.entity_id = entity_id
+        return bound
+
+    def __repr__(self) -> str:
+        target = (
+            self.entity_id
+            if self.attribute is None
+            else f"{self.entity_id}[{self.attribute}]"
+        )
+        return f"Condition({target} {self.comparator or COMP_EQ} {self.expected!r})"
+
+
+def dependencies(
+    reads: Iterable[Tuple[str, Accessor]],
+) -> Dict[str, Tuple[Accessor, ...]]:
+    """Group ``(entity_id, accessor)`` pairs into ``entity_id -> accessors``."""
+    grouped: Dict[str, Tuple[Accessor, ...]] = {}
+    for entity_id, read in reads:
+        current = grouped.get(entity_id, ())
+        if read not in current:
+            grouped[entity_id] = current + (read,)
+    return grouped
+
+
+def values_unchanged(reads: Tuple[Accessor, ...], old: State, new: State) -> bool:
+    """Whether every value an alert reads is the same in ``old`` and ``new``."""
+    for read in reads:
+        if read is read_state:
+            if old.state != new.state:
+                return False
+        elif read(old) != read(new):
+            return False
+    return True
+
+
+# Node kinds of a compiled condition tree.
+LEAF, ALL, ANY, NOT = range(4)
+GROUP_KEYS = {"and": ALL, "or": ANY, "not": NOT}
+
+# Per-node cache values: 0/1 are the last result, DIRTY means "recompute".
+DIRTY = 2
+
+
+class _TreeBuilder:
+    """Nodes of a :class:`ConditionTree` being compiled, as parallel lists."""
+
+    __slots__ = ("kinds", "children", "parents", "leaves")
+
+    def __init__(self) -> None:
+        """Start with no nodes."""
+        self.kinds: List[int] = []
+        self.children: List[Tuple[int, ...]] = []
+        self.parents: List[int] = []
+        self.leaves: List[Optional[Condition]] = []
+
+    def add_node(self, kind: int, parent: int, leaf: Optional[Condition] = None) -> int:
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.children.append(())
+        self.parents.append(parent)
+        self.leaves.append(leaf)
+        return index
+
+    def add_group(self, kind: int, items: List[Any], parent: int) -> int:
+        index = self.add_node(kind, parent)
+        if not items:
+            # An empty group never holds, like an empty condition list.
+            self.kinds[index] = LEAF
+            return index
+        self.children[index] = tuple(self.add_item(item, index) for item in items)
+        return index
+
+    def add_item(self, item: Any, parent: int) -> int:
+        if isinstance(item, dict) and len(item) == 1:
+            ((key, value),) = item.items()
+            kind = GROUP_KEYS.get(key)
+            if kind is not None:
+                if isinstance(value, dict):
+                    value = [value]
+                if isinstance(value, list):
+                    if kind == NOT:
+                        # NOT over a list negates the AND of its items.
+                        index = self.add_node(NOT, parent)
+                        if len(value) == 1:
+                            self.children[index] = (self.add_item(value[0], index),)
+                        else:
+                            self.children[index] = (self.add_group(ALL, value, index),)
+                        return index
+                    return self.add_group(kind, value, parent)
+        condition = Condition.from_config(item)
+        if condition is None:
+            _LOGGER.warning(f"Invalid logical condition format: {item}")
+        return self.add_node(LEAF, parent, condition)
+
+
+class ConditionTree:
+    """A compiled AND/OR/NOT tree over :class:`Condition` leaves.
+
+    The structure is immutable and shared by every alert using the
+    definition; each alert keeps its own node cache (:meth:`new_cache`).
+    Evaluation short-circuits and reuses cached results of subtrees whose
+    leaves haven't changed since the last evaluation; :meth:`invalidate`
+    marks the leaves reading a changed value, and their ancestors, for
+    recomputation.
+    """
+
+    __slots__ = ("kinds", "children", "parents", "leaves", "by_entity")
+
+    kinds: Tuple[int, ...]
+    children: Tuple[Tuple[int, ...], ...]
+    parents: Tuple[int, ...]
+    leaves: Tuple[Optional[Condition], ...]
+    by_entity: Dict[str, Tuple[int, ...]]
+
+    def __init__(self, items: Iterable[Any], any_: bool = False) -> None:
+        """Compile a list of condition dicts combined with AND (or OR)."""
+        builder = _TreeBuilder()
+        builder.add_group(ANY if any_ else ALL, list(items), -1)
+        by_entity: Dict[str, List[int]] = {}
+        for index, leaf in enumerate(builder.leaves):
+            if leaf is not None:
+                by_entity.setdefault(leaf.entity_id, []).append(index)
+        self.kinds = tuple(builder.kinds)
+        self.children = tuple(builder.children)
+        self.parents = tuple(builder.parents)
+        self.leaves = tuple(builder.leaves)
+        self.by_entity = {
+            entity_id: tuple(nodes) for entity_id, nodes in by_entity.items()
+        }
+
+    @classmethod
+    def single(cls, condition: Optional[Condition]) -> "ConditionTree":
+        """A one-leaf tree (simple triggers)."""
+        tree = cls.__new__(cls)
+        tree.kinds = (LEAF,)
+        tree.children = ((),)
+        tree.parents = (-1,)
+        tree.leaves = (condition,)
+        tree.by_entity = {condition.entity_id: (0,)} if condition is not None else {}
+        return tree
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def new_cache(self) -> bytearray:
+        """A node cache with every node marked for recomputation."""
+        return bytearray([DIRTY]) * len(self.kinds)
+
+    def reads(self) -> List[Tuple[str, Accessor]]:
+        """The ``(entity_id, accessor)`` pairs of every leaf."""
+        return [(leaf.entity_id, leaf.read) for leaf in self.leaves if leaf is not None]
+
+    def invalidate(
+        self,
+        cache: bytearray,
+        entity_id: str,
+        old: Optional[State],
+        new: Optional[State],
+    ) -> None:
+        """Mark the leaves whose value changed, and their ancestors, dirty."""
+        parents = self.parents
+        for index in self.by_entity.get(entity_id, ()):
+            leaf = self.leaves[index]
+            if leaf is not None and old is not None and new is not None:
+                if leaf.read(old) == leaf.read(new):
+                    continue
+            while index >= 0:
+                cache[index] = DIRTY
+                index = parents[index]
+
+    def evaluate(self, cache: bytearray, get: Callable[[str], Optional[State]]) -> bool:
+        """Evaluate the tree, recomputing only dirty nodes."""
+        return self._evaluate(0, cache, get)
+
+    def _evaluate(self, index: int, cache: bytearray, get) -> bool:
+        value = cache[index]
+        if value != DIRTY:
+            return value == 1
+        kind = self.kinds[index]
+        if kind == LEAF:
+            leaf = self.leaves[index]
+            result = leaf is not None and leaf.holds(get)
+        elif kind == ALL:
+            result = True
+            for child in self.children[index]:
+                if not self._evaluate(child, cache, get):
+                    result = False
+                    break
+        elif kind == ANY:
+            result = False
+            for child in self.children[index]:
+                if self._evaluate(child, cache, get):
+                    result = True
+                    break
+        else:
+            result = not self._evaluate(self.children[index][0], cache, get)
+        cache[index] = result
+        return result
+
+
+def is_valid_condition(item: Any) -> bool:
+    """Whether ``item`` is a leaf dict with entity_id and state, or a valid group."""
+    if not isinstance(item, dict):
+        return False
+    if len(item) == 1:
+        ((key, value),) = item.items()
+        if key in GROUP_KEYS:
+            if isinstance(value, dict):
+                value = [value]
+            return (
+                isinstance(value, list)
+                and bool(value)
+                and all(is_valid_condition(child) for child in value)
+            )
+    return bool(item.get("entity_id")) and item.get("state") is not None
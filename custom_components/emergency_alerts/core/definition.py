@@ -0,0 +1,466 @@
+"""Immutable, pre-parsed alert configuration.
+
+An alert's config dict is parsed once per config entry load into an
+:class:`AlertDefinition` that its binary sensor, select and switches all
+share. Action strings (JSON/YAML), script shortcuts, logical conditions
+and numeric thresholds are parsed there, and trigger conditions are
+compiled (see :mod:`.conditions`), so operator actions and evaluations
+read plain attributes instead of re-reading and re-parsing ``alert_data``.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import yaml
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from ..const import (
+    CONF_ATTRIBUTE,
+    DEFAULT_SEVERITY,
+    DEFAULT_SNOOZE_DURATION,
+    DOMAIN,
+    TRIGGER_TYPE_ANOMALY,
+    TRIGGER_TYPE_LOGICAL,
+    TRIGGER_TYPE_NUMERIC,
+    TRIGGER_TYPE_OCCURRENCE,
+    TRIGGER_TYPE_RATE,
+    TRIGGER_TYPE_SIMPLE,
+    TRIGGER_TYPE_STALE,
+)
+from .anomaly import AnomalyRule
+from .conditions import (
+    Accessor,
+    compile_accessor,
+    Condition,
+    ConditionTree,
+    dependencies,
+)
+from .flapping import FlapRule
+from .numeric import NumericThreshold
+from .occurrence import OccurrenceRule
+from .patterns import async_get_pattern_registry, EntityPattern
+from .rate import RateRule
+from .staleness import read_last_updated, StaleRule
+
+_LOGGER = logging.getLogger(__name__)
+
+# Trigger types that read a single entity_id, so a pattern alert can bind
+# them to each matching entity.
+PATTERN_TRIGGER_TYPES = (
+    TRIGGER_TYPE_SIMPLE,
+    TRIGGER_TYPE_NUMERIC,
+    TRIGGER_TYPE_OCCURRENCE,
+    TRIGGER_TYPE_RATE,
+    TRIGGER_TYPE_ANOMALY,
+    TRIGGER_TYPE_STALE,
+)
+
+# A parsed action field: a list of action dicts, or a "profile:<id>"
+# reference resolved against the global hub when the actions run.
+Actions = Union[List[Dict[str, Any]], str]
+
+
+def _resolve_script_field(alert_data, action_field, script_field):
+    """Resolve an action list, preferring the explicit field over a script shortcut.
+
+    If ``alert_data[action_field]`` is set, return it unchanged. Otherwise,
+    if ``alert_data[script_field]`` is set, synthesize a single-entry list
+    that calls ``script.turn_on`` against the named script entity.
+
+    The synthesized action emits ``entity_id`` inside ``data`` (not
+    ``target``) because both ``_call_actions`` and ``_execute_action``
+    forward only ``action.get("data", {})`` into ``hass.services.async_call``
+    — ``target`` would be silently dropped, leaving the script call with no
+    entity to operate on. HA accepts ``entity_id`` inside ``data`` for the
+    ``script.turn_on`` service (legacy format).
+
+    Used to wire both ``on_triggered_script`` and ``on_escalated_script``
+    config-flow UI fields into the runtime action lists.
+    """
+    explicit = alert_data.get(action_field)
+    if explicit:
+        return explicit
+    script_entity = alert_data.get(script_field)
+    if script_entity:
+        return [
+            {
+                "service": "script.turn_on",
+                "data": {"entity_id": script_entity},
+            }
+        ]
+    return None
+
+
+def _resolve_on_triggered(alert_data):
+    """Resolve the on-trigger actions: ``on_triggered`` or ``on_triggered_script``.
+
+    See :func:`_resolve_script_field` for the resolution rules.
+    """
+    return _resolve_script_field(alert_data, "on_triggered", "on_triggered_script")
+
+
+def _resolve_on_escalated(alert_data):
+    """Resolve the on-escalation actions: ``on_escalated`` or ``on_escalated_script``.
+
+    Mirrors :func:`_resolve_on_triggered` so users can wire native escalation
+    notifications without an external wrapper automation. The
+    ``on_escalated_script`` field is exposed by the config_flow UI alongside
+    ``on_triggered_script``.
+    """
+    return _resolve_script_field(alert_data, "on_escalated", "on_escalated_script")
+
+
+def _parse_actions(action_string):
+    """Parse action string (JSON/YAML) into a list of action dictionaries.
+
+    Supports:
+    - Profile references: "profile:profile_id" (returns as-is for later resolution)
+    - Single action dict: {"service": "...", "data": {...}}
+    - List of actions: [{"service": "..."}, ...]
+    - Already parsed list: [dict, ...]
+    """
+    if not action_string:
+        return []
+
+    if isinstance(action_string, list):
+        return action_string  # Already a list
+
+    if isinstance(action_string, str):
+        # Check if it's a profile reference (starts with "profile:")
+        if action_string.startswith("profile:"):
+            return action_string  # Return as-is for later resolution
+
+        try:
+            # Try parsing as JSON first
+            result = json.loads(action_string)
+            # If it's a single dict, wrap it in a list
+            if isinstance(result, dict):
+                return [result]
+            # If it's already a list, return it
+            if isinstance(result, list):
+                return result
+            # Otherwise, return empty list (invalid format)
+            return []
+        except json.JSONDecodeError:
+            try:
+                # Try parsing as YAML
+                result = yaml.safe_load(action_string)
+                # If it's a single dict, wrap it in a list
+                if isinstance(result, dict):
+                    return [result]
+                # If it's already a list, return it
+                if isinstance(result, list):
+                    return result
+                # Otherwise, return empty list (invalid format)
+                return []
+            except yaml.YAMLError:
+                _LOGGER.error(f"Failed to parse actions: {action_string}")
+                return []
+
+    # If it's already a dict (from config flow), wrap it in a list
+    if isinstance(action_string, dict):
+        return [action_string]
+
+    return []
+
+
+def _parse_logical_conditions(conditions_string):
+    """Parse a logical conditions string (JSON/YAML) into a list of condition dicts."""
+    if not conditions_string:
+        return []
+
+    if isinstance(conditions_string, list):
+        return conditions_string  # Already a list
+
+    if isinstance(conditions_string, str):
+        try:
+            # Try parsing as JSON first
+            result = json.loads(conditions_string)
+            # Ensure result is a list
+            if not isinstance(result, list):
+                return []
+            return result
+        except json.JSONDecodeError:
+            try:
+                # Try parsing as YAML
+                result = yaml.safe_load(conditions_string)
+                # Ensure result is a list
+                if not isinstance(result, list):
+                    return []
+                return result
+            except yaml.YAMLError:
+                _LOGGER.error(
+                    f"Failed to parse logical conditions: {conditions_string}"
+                )
+                return []
+
+    return []
+
+
+def _compile_tree(
+    trigger_type: str, alert_data: Dict[str, Any], logical_conditions: List[Any]
+) -> Optional[ConditionTree]:
+    """Compile the simple or logical trigger conditions into a tree.
+
+    Invalid logical conditions are logged here, once, and compiled as
+    leaves that never hold.
+    """
+    if trigger_type == TRIGGER_TYPE_SIMPLE:
+        return ConditionTree.single(
+            Condition.from_config(
+                alert_data, "trigger_state", alert_data.get("entity_id")
+            )
+        )
+    if trigger_type == TRIGGER_TYPE_LOGICAL:
+        return ConditionTree(
+            logical_conditions, alert_data.get("logical_operator", "and") == "or"
+        )
+    return None
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class AlertDefinition:
+    """One alert's configuration, parsed once and shared by its entities."""
+
+    alert_id: str
+    name: str
+    severity: str
+    trigger_type: str
+    entity_id: Optional[str]
+    trigger_state: Any
+    template: Optional[str]
+    logical_conditions: List[Dict[str, Any]]
+    logical_operator: str
+    # Optional attribute path read instead of entity_id's state (simple and
+    # numeric triggers; logical conditions carry their own).
+    attribute: Optional[str]
+    # Compiled simple/logical conditions; None for other trigger types.
+    tree: Optional[ConditionTree]
+    # Reads entity_id's value for numeric triggers.
+    read_value: Accessor
+    # entity_id -> accessors for every value the trigger reads; drives the
+    # subscriptions and which state_changed events are worth evaluating.
+    dependencies: Dict[str, Tuple[Accessor, ...]]
+    # Pre-parsed comparison for numeric triggers; None for other types or
+    # when the numeric fields are invalid.
+    numeric: Optional[NumericThreshold]
+    # Matching condition and window for "N times in M seconds" triggers.
+    occurrence: Optional[OccurrenceRule]
+    # Window and threshold for rate-of-change triggers.
+    rate: Optional[RateRule]
+    # Entity, baseline method and sigma for anomaly triggers.
+    anomaly: Optional[AnomalyRule]
+    # Entity and silence allowed for staleness (heartbeat) triggers.
+    stale: Optional[StaleRule]
+    action_service: Optional[str]
+    remind_after_seconds: Optional[int]
+    # Debounce: alert fires only after the trigger has been true for this
+    # many seconds continuously. 0 (default) = fire immediately. Useful for
+    # "window open >5min", "garage open too long", "leak sensor on >10s
+    # to debounce false positives", etc. Applies to all trigger types.
+    for_seconds: int
+    # Flap detection settings; None when flap_threshold isn't set.
+    flapping: Optional[FlapRule]
+    snooze_duration: Any
+    on_triggered: Actions
+    on_cleared: Actions
+    on_escalated: Actions
+    on_acknowledged: Actions
+    on_snoozed: Actions
+    on_resolved: Actions
+    # Run once when the alert starts flapping.
+    on_flapping: Actions
+    # For an instance of a pattern alert, the alert_id of its template.
+    pattern_alert_id: Optional[str] = None
+
+    @classmethod
+    def from_config(
+        cls, alert_id: str, alert_data: Dict[str, Any]
+    ) -> "AlertDefinition":
+        """Parse an ``alert_data`` dict from a config entry."""
+        try:
+            for_seconds = int(alert_data.get("for_seconds") or 0)
+        except (TypeError, ValueError):
+            for_seconds = 0
+        trigger_type = alert_data.get("trigger_type", "simple")
+        entity_id = alert_data.get("entity_id")
+        attribute = alert_data.get(CONF_ATTRIBUTE) or None
+        logical_conditions = _parse_logical_conditions(
+            alert_data.get("logical_conditions")
+        )
+        tree = _compile_tree(trigger_type, alert_data, logical_conditions)
+        read_value = compile_accessor(attribute)
+        reads = tree.reads() if tree is not None else []
+        if trigger_type == TRIGGER_TYPE_NUMERIC and entity_id:
+            reads.append((entity_id, read_value))
+        occurrence = None
+        if trigger_type == TRIGGER_TYPE_OCCURRENCE:
+            occurrence = OccurrenceRule.from_config(alert_data)
+            if occurrence is not None:
+                reads.append(
+                    (occurrence.condition.entity_id, occurrence.condition.read)
+                )
+        rate = (
+            RateRule.from_config(alert_data)
+            if trigger_type == TRIGGER_TYPE_RATE
+            else None
+        )
+        if rate is not None:
+            reads.append((rate.entity_id, rate.read))
+        anomaly = (
+            AnomalyRule.from_config(alert_data)
+            if trigger_type == TRIGGER_TYPE_ANOMALY
+            else None
+        )
+        if anomaly is not None:
+            reads.append((anomaly.entity_id, anomaly.read))
+        stale = (
+            StaleRule.from_config(alert_data)
+            if trigger_type == TRIGGER_TYPE_STALE
+            else None
+        )
+        if stale is not None:
+            # Every report moves last_updated, so no update is skipped.
+            reads.append((stale.entity_id, read_last_updated))
+        return cls(
+            alert_id=alert_id,
+            name=alert_data["name"],
+            severity=alert_data.get("severity", DEFAULT_SEVERITY),
+            trigger_type=trigger_type,
+            entity_id=entity_id,
+            trigger_state=alert_data.get("trigger_state"),
+            template=alert_data.get("template"),
+            logical_conditions=logical_conditions,
+            logical_operator=alert_data.get("logical_operator", "and"),
+            attribute=attribute,
+            tree=tree,
+            read_value=read_value,
+            dependencies=dependencies(reads),
+            numeric=(
+                NumericThreshold.from_config(alert_data)
+                if trigger_type == TRIGGER_TYPE_NUMERIC
+                else None
+            ),
+            occurrence=occurrence,
+            rate=rate,
+            anomaly=anomaly,
+            stale=stale,
+            action_service=alert_data.get("action_service"),
+            remind_after_seconds=alert_data.get("remind_after_seconds"),
+            for_seconds=for_seconds,
+            flapping=FlapRule.from_config(alert_data),
+            snooze_duration=alert_data.get("snooze_duration", DEFAULT_SNOOZE_DURATION),
+            on_triggered=_parse_actions(_resolve_on_triggered(alert_data)),
+            on_cleared=_parse_actions(alert_data.get("on_cleared")),
+            on_escalated=_parse_actions(_resolve_on_escalated(alert_data)),
+            on_acknowledged=_parse_actions(alert_data.get("on_acknowledged")),
+            on_snoozed=_parse_actions(alert_data.get("on_snoozed")),
+            on_resolved=_parse_actions(alert_data.get("on_resolved")),
+            on_flapping=_parse_actions(alert_data.get("on_flapping")),
+        )
+
+    def bind(self, alert_id: str, name: str, entity_id: str) -> "AlertDefinition":
+        """This pattern alert's definition for one matching entity.
+
+        The instance points the trigger at ``entity_id`` and shares
+        everything else with the template: compiled tests and accessors,
+        thresholds, windows and parsed actions.
+        """
+
+        def rebind(rule):
+            return None if rule is None else rule.bind(entity_id)
+
+        tree = self.tree
+        if tree is not None:
+            tree = ConditionTree.single(rebind(tree.leaves[0]))
+        accessors = tuple(
+            read for reads in self.dependencies.values() for read in reads
+        )
+        return replace(
+            self,
+            alert_id=alert_id,
+            name=name,
+            entity_id=entity_id,
+            tree=tree,
+            dependencies={entity_id: accessors} if accessors else {},
+            occurrence=rebind(self.occurrence),
+            rate=rebind(self.rate),
+            anomaly=rebind(self.anomaly),
+            stale=rebind(self.stale),
+            pattern_alert_id=self.alert_id,
+        )
+
+
+def definition_attribute(name: str) -> property:
+    """Return a read-only attribute backed by ``self._definition.<name>``."""
+
+    def getter(self) -> Any:
+        return getattr(self._definition, name)
+
+    return property(getter)
+
+
+def async_get_alert_definitions(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, AlertDefinition]:
+    """Return ``alert_id -> AlertDefinition`` for a group hub, parsing on first use.
+
+    The first platform to set up an entry parses its alerts; the others
+    reuse the result until the entry is unloaded. Pattern alerts are
+    expanded into one instance per matching entity (see :mod:`.patterns`),
+    and instances for entities that appear later are added to the same
+    dict.
+    """
+    definitions: Dict[str, Dict[str, AlertDefinition]] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault("definitions", {})
+    parsed = definitions.get(entry.entry_id)
+    if parsed is None:
+        parsed = definitions[entry.entry_id] = {}
+        for alert_id, alert_data in entry.data.get("alerts", {}).items():
+            pattern = EntityPattern.from_config(alert_data)
+            if pattern is None:
+                parsed[alert_id] = AlertDefinition.from_config(alert_id, alert_data)
+            else:
+                _add_pattern_alert(
+                    hass, entry.entry_id, alert_id, alert_data, pattern, parsed
+                )
+    return parsed
+
+
+def _add_pattern_alert(
+    hass: HomeAssistant,
+    entry_id: str,
+    alert_id: str,
+    alert_data: Dict[str, Any],
+    pattern: EntityPattern,
+    parsed: Dict[str, AlertDefinition],
+) -> None:
+    """Compile a pattern alert once and expand it into ``parsed``."""
+    trigger_type = alert_data.get("trigger_type", TRIGGER_TYPE_SIMPLE)
+    if trigger_type not in PATTERN_TRIGGER_TYPES:
+        _LOGGER.error(
+            f"Alert {alert_id}: {trigger_type} triggers can't be used with an "
+            "entity pattern"
+        )
+        return
+    # The glob stands in for entity_id until each match is bound.
+    template = AlertDefinition.from_config(
+        alert_id, {**alert_data, "entity_id": pattern.glob}
+    )
+    count = async_get_pattern_registry(hass).async_add(
+        entry_id, alert_id, pattern, template, parsed
+    )
+    _LOGGER.debug(f"Alert {alert_id} ({pattern!r}) matched {count} entities")
+
+
+def async_drop_alert_definitions(hass: HomeAssistant, entry_id: str) -> None:
+    """Forget an entry's parsed alerts so the next load re-parses them."""
+    domain_data = hass.data.get(DOMAIN, {})
+    domain_data.get("definitions", {}).pop(entry_id, None)
+    registry = domain_data.get("patterns")
+    if registry is not None:
+        registry.async_remove_entry(entry_id)
@@ -0,0 +1,111 @@
+"""Flap detection: an alert whose trigger keeps flipping on and off.
+
+A loose reed switch or a sensor hovering at its threshold can fire and
+clear an alert dozens of times an hour, running ``on_triggered`` and
+``on_cleared`` every time. The flap score is the number of trigger flips
+(either direction) in the last ``flap_window_seconds``; the alert starts
+flapping when it reaches ``flap_threshold`` and is stable again once it
+falls to half of that, so it doesn't flap in and out of flapping.
+
+As with :class:`.occurrence.OccurrenceWindow`, only the newest
+``flap_threshold`` flips can matter, so they live in a fixed ring buffer:
+recording and the start check are O(1), and the moment the alert becomes
+stable is the expiry of one known slot, so a single timer covers it.
+"""
+
+import logging
+from array import array
+from typing import Any, Dict, Optional
+
+from ..const import CONF_FLAP_SUPPRESS, CONF_FLAP_THRESHOLD, CONF_FLAP_WINDOW_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_FLAP_WINDOW_SECONDS = 3600
+
+_NEVER = float("-inf")
+
+
+class FlapRule:
+    """The parsed flap detection settings of an alert."""
+
+    __slots__ = ("threshold", "window_seconds", "suppress")
+
+    def __init__(
+        self,
+        threshold: int,
+        window_seconds: float = DEFAULT_FLAP_WINDOW_SECONDS,
+        suppress: bool = False,
+    ) -> None:
+        """Store the rule; ``threshold`` must be at least 2 flips."""
+        if threshold < 2 or window_seconds <= 0:
+            raise ValueError(
+                "flap_threshold must be at least 2 and the window positive"
+            )
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.suppress = suppress
+
+    @classmethod
+    def from_config(cls, alert_data: Dict[str, Any]) -> Optional["FlapRule"]:
+        """Parse the flap fields; None when detection is off or invalid."""
+        if not alert_data.get(CONF_FLAP_THRESHOLD):
+            return None
+        try:
+            return cls(
+                int(alert_data[CONF_FLAP_THRESHOLD]),
+                float(
+                    alert_data.get(CONF_FLAP_WINDOW_SECONDS)
+                    or DEFAULT_FLAP_WINDOW_SECONDS
+                ),
+                bool(alert_data.get(CONF_FLAP_SUPPRESS, False)),
+            )
+        except (TypeError, ValueError) as err:
+            _LOGGER.error(f"Ignoring invalid flap detection settings: {err}")
+            return None
+
+    @property
+    def stable_score(self) -> int:
+        """The score at or below which a flapping alert is stable again."""
+        return self.threshold // 2
+
+    def new_detector(self) -> "FlapDetector":
+        """A per-alert ring buffer for this rule."""
+        return FlapDetector(self)
+
+    def __repr__(self) -> str:
+        return f"FlapRule({self.threshold} flips in {self.window_seconds}s)"
+
+
+class FlapDetector:
+    """Ring buffer of the newest ``threshold`` trigger flip timestamps."""
+
+    __slots__ = ("rule", "_stamps", "_head")
+
+    def __init__(self, rule: FlapRule) -> None:
+        """Start with no flips recorded."""
+        self.rule = rule
+        self._stamps = array("d", [_NEVER]) * rule.threshold
+        self._head = 0
+
+    def record(self, timestamp: float) -> None:
+        """Add a flip, overwriting the oldest one kept."""
+        self._stamps[self._head] = timestamp
+        self._head = (self._head + 1) % len(self._stamps)
+
+    def _newest(self, n: int) -> float:
+        """Timestamp of the ``n``-th most recent flip (1 = newest)."""
+        return self._stamps[(self._head - n) % len(self._stamps)]
+
+    def flapping(self, now: float) -> bool:
+        """Whether the last ``threshold`` flips all fell inside the window."""
+        return self._stamps[self._head] > now - self.rule.window_seconds
+
+    def stable_at(self) -> float:
+        """When the score falls to :attr:`FlapRule.stable_score`, barring new flips."""
+        return self._newest(self.rule.stable_score + 1) + self.rule.window_seconds
+
+    def score(self, now: float) -> int:
+        """Flips inside the window, capped at the threshold."""
+        cutoff = now - self.rule.window_seconds
+        return sum(1 for stamp in self._stamps if stamp > cutoff)
@@ -0,0 +1,195 @@
+"""Fixed-size per-alert transition history.
+
+Each alert keeps its most recent status transitions in a ring buffer backed
+by two flat arrays: a float timestamp and a packed 16-bit code holding the
+from-status, to-status and cause. An entry therefore costs 10 bytes no matter
+how many transitions the alert has seen, and memory is fixed by the
+configured capacity.
+
+Timestamps are kept non-decreasing in ring order, so time-range queries
+binary-search the start and then walk exactly the matching entries.
+"""
+
+import heapq
+import itertools
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..const import (
+    STATE_ACKNOWLEDGED,
+    STATE_ACTIVE,
+    STATE_ESCALATED,
+    STATE_FLAPPING,
+    STATE_INACTIVE,
+    STATE_RESOLVED,
+    STATE_SNOOZED,
+)
+
+# Index order is part of the packed encoding; append new values only.
+STATUSES = (
+    STATE_INACTIVE,
+    STATE_ACTIVE,
+    STATE_ACKNOWLEDGED,
+    STATE_SNOOZED,
+    STATE_ESCALATED,
+    STATE_RESOLVED,
+    "unknown",
+    STATE_FLAPPING,
+)
+CAUSE_TRIGGER = "trigger"
+CAUSE_CONDITION_CLEARED = "condition_cleared"
+CAUSE_ESCALATION_TIMEOUT = "escalation_timeout"
+CAUSE_SNOOZE_EXPIRED = "snooze_expired"
+CAUSE_SERVICE = "service"
+CAUSE_SELECT = "select"
+CAUSE_SWITCH = "switch"
+CAUSE_UNKNOWN = "unknown"
+CAUSE_FLAPPING = "flapping"
+CAUSE_STABLE = "stable"
+CAUSES = (
+    CAUSE_UNKNOWN,
+    CAUSE_TRIGGER,
+    CAUSE_CONDITION_CLEARED,
+    CAUSE_ESCALATION_TIMEOUT,
+    CAUSE_SNOOZE_EXPIRED,
+    CAUSE_SERVICE,
+    CAUSE_SELECT,
+    CAUSE_SWITCH,
+    CAUSE_FLAPPING,
+    CAUSE_STABLE,
+)
+_STATUS_INDEX = {status: index for index, status in enumerate(STATUSES)}
+_CAUSE_INDEX = {cause: index for index, cause in enumerate(CAUSES)}
+_UNKNOWN_STATUS = _STATUS_INDEX["unknown"]
+
+# Bytes used by one entry: an 8-byte timestamp plus a 2-byte packed code.
+ENTRY_BYTES = 10
+
+Transition = Tuple[float, str, str, str]
+
+
+class TransitionHistory:
+    """Ring buffer of ``(timestamp, from, to, cause)`` transitions."""
+
+    __slots__ = ("capacity", "_times", "_codes", "_start", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        """Allocate a buffer for ``capacity`` transitions."""
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._codes = array("H", bytes(2 * capacity))
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored transitions."""
+        return self._count
+
+    def record(
+        self, timestamp: float, from_status: str, to_status: str, cause: str
+    ) -> None:
+        """Append a transition, overwriting the oldest when full."""
+        if not self.capacity:
+            return
+        if self._count:
+            # Wall clocks can step backwards; keep the ring sorted.
+            last = self._times[(self._start + self._count - 1) % self.capacity]
+            if timestamp < last:
+                timestamp = last
+        code = (
+            _STATUS_INDEX.get(from_status, _UNKNOWN_STATUS) << 12
+            | _STATUS_INDEX.get(to_status, _UNKNOWN_STATUS) << 8
+            | _CAUSE_INDEX.get(cause, 0)
+        )
+        if self._count < self.capacity:
+            slot = (self._start + self._count) % self.capacity
+            self._count += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._times[slot] = timestamp
+        self._codes[slot] = code
+
+    def _entry(self, position: int) -> Transition:
+        slot = (self._start + position) % self.capacity
+        code = self._codes[slot]
+        return (
+            self._times[slot],
+            STATUSES[code >> 12],
+            STATUSES[(code >> 8) & 0xF],
+            CAUSES[code & 0xFF],
+        )
+
+    def _bisect(self, timestamp: float, after: bool = False) -> int:
+        """Return the logical position of the first entry at ``timestamp`` or later.
+
+        With ``after``, entries stamped exactly at ``timestamp`` are skipped.
+        """
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            value = self._times[(self._start + mid) % self.capacity]
+            if value < timestamp or (after and value == timestamp):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def iter_range(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[Transition]:
+        """Yield transitions in ``[start, end]``, oldest first."""
+        first = 0 if start is None else self._bisect(start)
+        stop = self._count if end is None else self._bisect(end, after=True)
+        for position in range(first, stop):
+            yield self._entry(position)
+
+    def latest(
+        self,
+        limit: int,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[Transition]:
+        """Return up to ``limit`` most recent transitions in range, oldest first."""
+        first = 0 if start is None else self._bisect(start)
+        stop = self._count if end is None else self._bisect(end, after=True)
+        first = max(first, stop - limit)
+        return [self._entry(position) for position in range(first, stop)]
+
+
+def merge_histories(
+    histories: Iterable[Tuple[str, TransitionHistory]],
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Merge ``(entity_id, history)`` pairs into one time-ordered list.
+
+    With ``limit``, only the ``limit`` most recent matching transitions are
+    returned; each alert contributes at most ``limit`` candidates, so the
+    cost is bounded by the result size rather than the buffer sizes.
+    """
+    streams = []
+    for entity_id, history in histories:
+        entries = (
+            history.latest(limit, start, end)
+            if limit is not None
+            else history.iter_range(start, end)
+        )
+        streams.append(zip(entries, itertools.repeat(entity_id)))
+
+    merged = heapq.merge(*streams, key=lambda item: item[0][0])
+    if limit is not None:
+        rows = list(merged)[-limit:] if limit else []
+    else:
+        rows = list(merged)
+    return [
+        {
+            "entity_id": entity_id,
+            "timestamp": timestamp,
+            "from": from_status,
+            "to": to_status,
+            "cause": cause,
+        }
+        for (timestamp, from_status, to_status, cause), entity_id in rows
+    ]
@@ -0,0 +1,176 @@
+"""Runtime performance counters for Emergency Alerts.
+
+Counters are plain integer attributes bumped from event-loop callbacks, so
+reading them (e.g. from diagnostics) never needs a lock and never touches HA
+state.
+"""
+
+from typing import Any, Dict, Optional
+
+from homeassistant.core import HomeAssistant
+
+from ..const import DOMAIN
+
+# Bucket ``i`` of a LatencyHistogram holds durations shorter than ``2**i``
+# microseconds, so 32 buckets cover everything from sub-microsecond up to
+# roughly 35 minutes.
+HISTOGRAM_BUCKETS = 32
+# Per-alert transition histograms halve their counts once they hold this many
+# samples, so percentiles follow recent behaviour in constant memory.
+ROLLING_HISTOGRAM_SAMPLES = 256
+
+
+class AlertMetrics:
+    """Per-alert runtime counters."""
+
+    __slots__ = (
+        "evaluations",
+        "evaluations_skipped",
+        "evaluation_time_ns",
+        "state_writes",
+        "status_writes",
+        "actions_dispatched",
+        "actions_failed",
+        "actions_in_flight",
+        "transition_latency",
+    )
+
+    def __init__(self) -> None:
+        """Initialize all counters to zero."""
+        self.evaluations = 0
+        # Attribute-only changes of watched entities that didn't need one
+        self.evaluations_skipped = 0
+        self.evaluation_time_ns = 0
+        self.state_writes = 0
+        self.status_writes = 0
+        self.actions_dispatched = 0
+        self.actions_failed = 0
+        self.actions_in_flight = 0
+        # Created on the first traced transition; most alerts never fire.
+        self.transition_latency: Optional["LatencyHistogram"] = None
+
+    def record_transition(self, latency_ns: int) -> None:
+        """Add a traced transition latency to the rolling histogram."""
+        histogram = self.transition_latency
+        if histogram is None:
+            histogram = self.transition_latency = LatencyHistogram()
+        elif histogram.total >= ROLLING_HISTOGRAM_SAMPLES:
+            histogram.decay()
+        histogram.record(latency_ns)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of the counters."""
+        histogram = self.transition_latency
+        return {
+            "evaluations": self.evaluations,
+            "evaluations_skipped": self.evaluations_skipped,
+            "evaluation_time_ms": round(self.evaluation_time_ns / 1_000_000, 3),
+            "state_writes": self.state_writes,
+            "status_writes": self.status_writes,
+            "actions_dispatched": self.actions_dispatched,
+            "actions_failed": self.actions_failed,
+            "actions_in_flight": self.actions_in_flight,
+            "transition_latency_ms": (
+                None
+                if histogram is None
+                else {
+                    "p50": histogram.percentile(0.50),
+                    "p95": histogram.percentile(0.95),
+                    "p99": histogram.percentile(0.99),
+                    "samples": histogram.total,
+                }
+            ),
+        }
+
+
+class LatencyHistogram:
+    """Fixed-size log2 histogram of durations.
+
+    Recording is O(1) and allocation-free; percentiles are reported as the
+    upper bound of the bucket that contains them.
+    """
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.total = 0
+
+    def record(self, duration_ns: int) -> None:
+        """Add one duration sample, in nanoseconds."""
+        index = (duration_ns // 1000).bit_length()
+        if index >= HISTOGRAM_BUCKETS:
+            index = HISTOGRAM_BUCKETS - 1
+        self.counts[index] += 1
+        self.total += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Return the ``fraction`` percentile in milliseconds, or None if empty."""
+        if not self.total:
+            return None
+        rank = fraction * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return (1 << index) / 1000
+        return (1 << (HISTOGRAM_BUCKETS - 1)) / 1000
+
+    def decay(self) -> None:
+        """Halve every bucket, aging out older samples."""
+        self.counts = [count >> 1 for count in self.counts]
+        self.total = sum(self.counts)
+
+    def reset(self) -> None:
+        """Drop all samples."""
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.total = 0
+
+
+class IntegrationMetrics:
+    """Integration-wide hot-path counters, shared by every alert.
+
+    All counters are monotonic; consumers derive rates by diffing two
+    snapshots. Only ``trigger_to_state`` is windowed — the publisher resets
+    it after reading percentiles.
+    """
+
+    __slots__ = (
+        "evaluations",
+        "evaluations_skipped",
+        "evaluation_time_ns",
+        "actions_dispatched",
+        "actions_failed",
+        "action_time_ns",
+        "summary_writes",
+        "trigger_to_state",
+    )
+
+    def __init__(self) -> None:
+        """Initialize all counters to zero."""
+        self.evaluations = 0
+        self.evaluations_skipped = 0
+        self.evaluation_time_ns = 0
+        self.actions_dispatched = 0
+        self.actions_failed = 0
+        self.action_time_ns = 0
+        self.summary_writes = 0
+        self.trigger_to_state = LatencyHistogram()
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return the current monotonic counter values."""
+        return {
+            "evaluations": self.evaluations,
+            "evaluations_skipped": self.evaluations_skipped,
+            "evaluation_time_ns": self.evaluation_time_ns,
+            "actions_dispatched": self.actions_dispatched,
+            "actions_failed": self.actions_failed,
+            "action_time_ns": self.action_time_ns,
+            "summary_writes": self.summary_writes,
+        }
+
+
+def async_get_integration_metrics(hass: HomeAssistant) -> IntegrationMetrics:
+    """Return the integration-wide metrics, creating them on first use."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault("metrics", IntegrationMetrics())
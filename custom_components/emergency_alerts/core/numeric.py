@@ -0,0 +1,143 @@
+"""Comparators and the numeric threshold trigger.
+
+:func:`compare_values` is the one implementation of the comparator rules
+(numeric when both sides parse as floats, string equality otherwise).
+
+:class:`NumericThreshold` backs the ``numeric`` trigger type. Its
+thresholds are parsed to floats and its operator bound once, when the
+alert definition is built, so an evaluation is one ``float()`` of the
+entity state and one operator call. An optional ``clear_threshold`` adds
+hysteresis: once triggered, the alert stays triggered until the value
+crosses back past the clear threshold, so a reading hovering at the limit
+doesn't flap the alert on and off.
+"""
+
+import logging
+import operator
+from typing import Any, Callable, Dict, Optional
+
+from ..const import (
+    COMP_EQ,
+    COMP_GT,
+    COMP_GTE,
+    COMP_LT,
+    COMP_LTE,
+    COMP_NE,
+    CONF_CLEAR_THRESHOLD,
+    CONF_COMPARATOR,
+    CONF_THRESHOLD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    COMP_EQ: operator.eq,
+    COMP_NE: operator.ne,
+    COMP_LT: operator.lt,
+    COMP_LTE: operator.le,
+    COMP_GT: operator.gt,
+    COMP_GTE: operator.ge,
+}
+_ORDERED = {
+    COMP_LT: operator.lt,
+    COMP_LTE: operator.le,
+    COMP_GT: operator.gt,
+    COMP_GTE: operator.ge,
+}
+
+
+def to_number(value: Any) -> Optional[float]:
+    """Return ``float(value)``, or None if it doesn't parse."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def compare_values(entity_state: Any, comparator: str, expected_value: Any) -> bool:
+    """Compare an entity state with a comparator.
+
+    Ordering comparators compare numerically when both sides parse as
+    floats; everything else (and unknown comparators) falls back to string
+    equality, or inequality for ``!=``.
+    """
+    op = _ORDERED.get(comparator)
+    if op is not None:
+        left = to_number(entity_state)
+        right = to_number(expected_value)
+        if left is not None and right is not None:
+            return op(left, right)
+    if comparator == COMP_NE:
+        return str(entity_state) != str(expected_value)
+    return str(entity_state) == str(expected_value)
+
+
+class NumericThreshold:
+    """A pre-parsed numeric comparison with optional hysteresis."""
+
+    __slots__ = ("comparator", "op", "threshold", "clear_threshold")
+
+    def __init__(
+        self, comparator: str, threshold: float, clear_threshold: Optional[float] = None
+    ) -> None:
+        """Bind the operator; ``clear_threshold`` defaults to ``threshold``."""
+        self.comparator = comparator
+        self.op = OPERATORS[comparator]
+        self.threshold = threshold
+        if clear_threshold is None or comparator not in _ORDERED:
+            clear_threshold = threshold
+        elif comparator in (COMP_GT, COMP_GTE) and clear_threshold > threshold:
+            _LOGGER.warning(
+                f"clear_threshold {clear_threshold} is above threshold {threshold} "
+                f"for '{comparator}'; ignoring it"
+            )
+            clear_threshold = threshold
+        elif comparator in (COMP_LT, COMP_LTE) and clear_threshold < threshold:
+            _LOGGER.warning(
+                f"clear_threshold {clear_threshold} is below threshold {threshold} "
+                f"for '{comparator}'; ignoring it"
+            )
+            clear_threshold = threshold
+        self.clear_threshold = clear_threshold
+
+    @classmethod
+    def from_config(cls, alert_data: Dict[str, Any]) -> Optional["NumericThreshold"]:
+        """Parse the numeric trigger fields, or return None if they're invalid."""
+        comparator = alert_data.get(CONF_COMPARATOR, COMP_GT)
+        threshold = to_number(alert_data.get(CONF_THRESHOLD))
+        if comparator not in OPERATORS or threshold is None:
+            _LOGGER.error(
+                f"Numeric trigger needs a comparator ({', '.join(OPERATORS)}) and a "
+                f"numeric threshold; got {comparator!r} "
+                f"{alert_data.get(CONF_THRESHOLD)!r}"
+            )
+            return None
+        clear_threshold = alert_data.get(CONF_CLEAR_THRESHOLD)
+        if clear_threshold in (None, ""):
+            clear = None
+        else:
+            clear = to_number(clear_threshold)
+            if clear is None:
+                _LOGGER.warning(
+                    f"Ignoring non-numeric clear_threshold {clear_threshold!r}"
+                )
+        return cls(comparator, threshold, clear)
+
+    def evaluate(self, state: Any, active: bool) -> bool:
+        """Return whether the trigger holds for ``state``.
+
+        ``active`` says whether it held before; an active trigger is
+        compared against the clear threshold. States that aren't numbers
+        (``unavailable``, ``unknown``) keep the previous result.
+        """
+        try:
+            value = float(state)
+        except (TypeError, ValueError):
+            return active
+        return self.op(value, self.clear_threshold if active else self.threshold)
+
+    def __repr__(self) -> str:
+        return (
+            f"NumericThreshold({self.comparator} {self.threshold}, "
+            f"clear {self.clear_threshold})"
+        )
@@ -0,0 +1,112 @@
+"""Windowed occurrence trigger: "N times in M seconds".
+
+An occurrence is the watched value (an entity's state or attribute, see
+:class:`.conditions.Condition`) starting to match, e.g. a door going to
+``on`` or a pump switching on. The trigger holds while at least
+``occurrences`` of them fell in the last ``window_seconds``.
+
+Only the newest ``occurrences`` timestamps can matter, so each alert keeps
+exactly that many in a fixed ring buffer (:class:`OccurrenceWindow`).
+Recording overwrites the oldest slot, and the trigger holds iff that slot,
+the N-th most recent occurrence, is still inside the window: recording,
+checking and expiring are all O(1) with no list to prune. The alert arms a
+single timer for the moment that occurrence leaves the window.
+"""
+
+import logging
+from array import array
+from typing import Any, Dict, Optional
+
+from ..const import CONF_OCCURRENCES, CONF_WINDOW_SECONDS
+from .conditions import Condition
+
+_LOGGER = logging.getLogger(__name__)
+
+_NEVER = float("-inf")
+
+
+class OccurrenceRule:
+    """The parsed, shared part of an occurrence trigger."""
+
+    __slots__ = ("condition", "occurrences", "window_seconds")
+
+    def __init__(
+        self, condition: Condition, occurrences: int, window_seconds: float
+    ) -> None:
+        """Store the rule; ``occurrences`` and ``window_seconds`` must be positive."""
+        if occurrences < 1 or window_seconds <= 0:
+            raise ValueError("occurrences and window_seconds must be positive")
+        self.condition = condition
+        self.occurrences = occurrences
+        self.window_seconds = window_seconds
+
+    @classmethod
+    def from_config(cls, alert_data: Dict[str, Any]) -> Optional["OccurrenceRule"]:
+        """Parse the occurrence trigger fields, or return None if they're invalid."""
+        condition = Condition.from_config(
+            alert_data, "trigger_state", alert_data.get("entity_id")
+        )
+        try:
+            occurrences = int(alert_data[CONF_OCCURRENCES])
+            window_seconds = float(alert_data[CONF_WINDOW_SECONDS])
+            if condition is None:
+                raise ValueError("entity_id and trigger_state are required")
+            return cls(condition, occurrences, window_seconds)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.error(
+                "Occurrence trigger needs entity_id, trigger_state, "
+                f"{CONF_OCCURRENCES} and {CONF_WINDOW_SECONDS}: {err}"
+            )
+            return None
+
+    def is_occurrence(self, old_state: Any, new_state: Any) -> bool:
+        """Whether ``old_state`` -> ``new_state`` starts a match."""
+        return self.condition.matches(new_state) and not self.condition.matches(
+            old_state
+        )
+
+    def bind(self, entity_id: str) -> "OccurrenceRule":
+        """This rule counting another entity's occurrences."""
+        return OccurrenceRule(
+            self.condition.bind(entity_id), self.occurrences, self.window_seconds
+        )
+
+    def new_window(self) -> "OccurrenceWindow":
+        """A per-alert ring buffer for this rule."""
+        return OccurrenceWindow(self.occurrences, self.window_seconds)
+
+    def __repr__(self) -> str:
+        return (
+            f"OccurrenceRule({self.condition!r} x{self.occurrences} "
+            f"in {self.window_seconds}s)"
+        )
+
+
+class OccurrenceWindow:
+    """Ring buffer of the newest ``size`` occurrence timestamps."""
+
+    __slots__ = ("window_seconds", "_stamps", "_head")
+
+    def __init__(self, size: int, window_seconds: float) -> None:
+        """Start empty (every slot infinitely old)."""
+        self.window_seconds = window_seconds
+        self._stamps = array("d", [_NEVER]) * size
+        self._head = 0
+
+    def record(self, timestamp: float) -> None:
+        """Add an occurrence, overwriting the oldest one kept."""
+        self._stamps[self._head] = timestamp
+        self._head = (self._head + 1) % len(self._stamps)
+
+    def holds(self, now: float) -> bool:
+        """Whether the buffer's oldest occurrence is still inside the window."""
+        return self._stamps[self._head] > now - self.window_seconds
+
+    def expires_at(self) -> float:
+        """When :meth:`holds` turns false unless another occurrence arrives."""
+        return self._stamps[self._head] + self.window_seconds
+
+    def count(self, now: float) -> int:
+        """Occurrences inside the window (for attributes and diagnostics)."""
+        cutoff = now - self.window_seconds
+        return sum(1 for stamp in self._stamps if stamp > cutoff)
@@ -0,0 +1,319 @@
+"""Pattern alerts: one alert definition fanned out over matching entities.
+
+Instead of one hand-made alert per leak sensor, an alert can name an
+``entity_pattern`` glob (``binary_sensor.*_leak``), a ``match_domain``
+and/or a ``match_device_class`` in place of ``entity_id``. The alert is
+then a template: every entity matching all the given filters gets its own
+alert instance (``<alert_id>_<entity_id>``, with its own binary sensor,
+select and switches), both for the entities present at load time and for
+ones that appear later.
+
+Patterns are kept in a :class:`PrefixIndex` keyed by the literal text
+before the glob's first wildcard (``binary_sensor.`` for the example
+above), so a newly created entity is checked against the handful of
+patterns whose prefix it starts with rather than every pattern, and the
+initial expansion only walks the states of the pattern's domain when it
+has one. The template is compiled once; instances are bound copies that
+share its compiled conditions, thresholds and actions (see
+``AlertDefinition.bind``).
+"""
+
+import fnmatch
+import logging
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import callback, Event, HomeAssistant, State
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from ..const import (
+    CONF_ENTITY_PATTERN,
+    CONF_MATCH_DEVICE_CLASS,
+    CONF_MATCH_DOMAIN,
+    DOMAIN,
+    SIGNAL_PATTERN_MATCH,
+    STATUS_SENSOR_PREFIX,
+    STATUS_SENSOR_SUFFIX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_WILDCARDS = re.compile(r"[*?\[]")
+
+PatternKey = Tuple[str, str]
+
+
+def is_pattern_alert(alert_data: Dict[str, Any]) -> bool:
+    """Whether ``alert_data`` is a template expanded over matching entities."""
+    return bool(
+        alert_data.get(CONF_ENTITY_PATTERN)
+        or alert_data.get(CONF_MATCH_DOMAIN)
+        or alert_data.get(CONF_MATCH_DEVICE_CLASS)
+    )
+
+
+def instance_id(alert_id: str, entity_id: str) -> str:
+    """The alert id of ``alert_id``'s instance for ``entity_id``."""
+    return f"{alert_id}_{entity_id.replace('.', '_')}"
+
+
+class EntityPattern:
+    """Entity filters of a pattern alert: glob, domain and device class."""
+
+    __slots__ = ("glob", "domain", "device_class", "prefix", "_match")
+
+    def __init__(
+        self,
+        glob: Optional[str] = None,
+        domain: Optional[str] = None,
+        device_class: Optional[str] = None,
+    ) -> None:
+        """Compile the filters; at least one must be given."""
+        if not (glob or domain or device_class):
+            raise ValueError("a glob, domain or device class is required")
+        self.domain = domain or None
+        self.device_class = device_class or None
+        self.glob = glob or (f"{self.domain}.*" if self.domain else "*")
+        self._match = re.compile(fnmatch.translate(self.glob)).match
+        prefix = _WILDCARDS.split(self.glob, 1)[0]
+        if self.domain:
+            domain_prefix = f"{self.domain}."
+            # The longer of the two literal prefixes narrows the candidates.
+            if domain_prefix.startswith(prefix):
+                prefix = domain_prefix
+        self.prefix = prefix
+
+    @classmethod
+    def from_config(cls, alert_data: Dict[str, Any]) -> Optional["EntityPattern"]:
+        """Parse the pattern fields, or None for a single-entity alert."""
+        if not is_pattern_alert(alert_data):
+            return None
+        return cls(
+            alert_data.get(CONF_ENTITY_PATTERN),
+            alert_data.get(CONF_MATCH_DOMAIN),
+            alert_data.get(CONF_MATCH_DEVICE_CLASS),
+        )
+
+    @property
+    def state_domain(self) -> Optional[str]:
+        """The one domain every match is in, if the prefix pins it down."""
+        domain, dot, _ = self.prefix.partition(".")
+        return domain if dot else None
+
+    def matches(self, state: State) -> bool:
+        """Whether ``state``'s entity passes every filter."""
+        entity_id = state.entity_id
+        if self._match(entity_id) is None:
+            return False
+        if self.domain is not None and not entity_id.startswith(f"{self.domain}."):
+            return False
+        return (
+            self.device_class is None
+            or state.attributes.get("device_class") == self.device_class
+        )
+
+    def __repr__(self) -> str:
+        filters = [self.glob]
+        if self.domain:
+            filters.append(f"domain={self.domain}")
+        if self.device_class:
+            filters.append(f"device_class={self.device_class}")
+        return f"EntityPattern({', '.join(filters)})"
+
+
+class PrefixIndex:
+    """Patterns by the literal prefix of their glob.
+
+    A lookup slices the entity id at each distinct prefix length in use
+    and probes one dict per length, so its cost depends on how many
+    prefix lengths there are, not how many patterns.
+    """
+
+    def __init__(self) -> None:
+        """Start empty."""
+        self._buckets: Dict[str, Dict[PatternKey, EntityPattern]] = {}
+        self._lengths: Dict[int, int] = {}
+        self._prefixes: Dict[PatternKey, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+    def __contains__(self, key: PatternKey) -> bool:
+        return key in self._prefixes
+
+    def add(self, key: PatternKey, pattern: EntityPattern) -> None:
+        """Index ``pattern`` under ``key``, replacing what ``key`` had."""
+        self.remove(key)
+        prefix = pattern.prefix
+        self._buckets.setdefault(prefix, {})[key] = pattern
+        self._lengths[len(prefix)] = self._lengths.get(len(prefix), 0) + 1
+        self._prefixes[key] = prefix
+
+    def remove(self, key: PatternKey) -> None:
+        """Drop ``key``'s pattern, if any."""
+        prefix = self._prefixes.pop(key, None)
+        if prefix is None:
+            return
+        bucket = self._buckets[prefix]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[prefix]
+        length = len(prefix)
+        self._lengths[length] -= 1
+        if not self._lengths[length]:
+            del self._lengths[length]
+
+    def candidates(self, entity_id: str) -> Iterator[Tuple[PatternKey, EntityPattern]]:
+        """Patterns whose prefix ``entity_id`` starts with."""
+        buckets = self._buckets
+        for length in self._lengths:
+            bucket = buckets.get(entity_id[:length])
+            if bucket:
+                yield from bucket.items()
+
+    def match(self, state: State) -> List[PatternKey]:
+        """Keys of the patterns ``state``'s entity matches."""
+        return [
+            key
+            for key, pattern in self.candidates(state.entity_id)
+            if pattern.matches(state)
+        ]
+
+
+class PatternRegistry:
+    """The pattern alerts of every loaded group hub and their instances.
+
+    Registered templates are expanded into the entry's definitions dict
+    (the one the platforms set up from). A single ``state_changed``
+    listener, filtered to newly created entities and only attached while
+    there are patterns, adds instances for entities that appear later and
+    announces them to the entry's platforms with
+    ``SIGNAL_PATTERN_MATCH``.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Start with no patterns and no listener."""
+        self.hass = hass
+        self.index = PrefixIndex()
+        self._templates: Dict[PatternKey, Any] = {}
+        self._definitions: Dict[str, Dict[str, Any]] = {}
+        self._unsub: Optional[Callable[[], None]] = None
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    @callback
+    def async_add(
+        self,
+        entry_id: str,
+        alert_id: str,
+        pattern: EntityPattern,
+        template: Any,
+        definitions: Dict[str, Any],
+    ) -> int:
+        """Register a template and expand it over the current states.
+
+        ``definitions`` is the entry's ``alert_id -> AlertDefinition`` dict;
+        instances are added to it. Returns the number of instances.
+        """
+        key = (entry_id, alert_id)
+        self._templates[key] = template
+        self._definitions[entry_id] = definitions
+        self.index.add(key, pattern)
+        count = 0
+        for state in self.hass.states.async_all(pattern.state_domain):
+            if (
+                pattern.matches(state)
+                and not self._is_alert_entity(state)
+                and self._bind(key, state) is not None
+            ):
+                count += 1
+        self._listen()
+        return count
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Forget an unloaded entry's templates."""
+        for key in [key for key in self._templates if key[0] == entry_id]:
+            del self._templates[key]
+            self.index.remove(key)
+        self._definitions.pop(entry_id, None)
+        if not self._templates and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def _is_alert_entity(self, state: State) -> bool:
+        """Whether ``state``'s entity belongs to this integration.
+
+        A pattern like ``binary_sensor.*_leak`` also matches the alert's own
+        ``binary_sensor.emergency_leak_..._leak``, and ``match_domain: sensor``
+        matches every alert's status sensor; alerting on alerts would fan out
+        without end. The status sensors aren't registered entities, so they
+        are recognized by their id and ``alert_id`` attribute.
+        """
+        entity_id = state.entity_id
+        if (
+            entity_id.startswith(STATUS_SENSOR_PREFIX)
+            and entity_id.endswith(STATUS_SENSOR_SUFFIX)
+            and "alert_id" in state.attributes
+        ):
+            return True
+        entry = er.async_get(self.hass).async_get(entity_id)
+        return entry is not None and entry.platform == DOMAIN
+
+    def _bind(self, key: PatternKey, state: State) -> Optional[str]:
+        """Add ``key``'s instance for ``state``'s entity; None if it exists."""
+        entry_id, alert_id = key
+        definitions = self._definitions[entry_id]
+        bound_id = instance_id(alert_id, state.entity_id)
+        if bound_id in definitions:
+            return None
+        template = self._templates[key]
+        label = state.attributes.get("friendly_name") or state.entity_id
+        definitions[bound_id] = template.bind(
+            bound_id, f"{template.name} - {label}", state.entity_id
+        )
+        return bound_id
+
+    def _listen(self) -> None:
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._on_state_changed, event_filter=_is_new_entity
+            )
+
+    @callback
+    def _on_state_changed(self, event: Event) -> None:
+        """Add instances for a new entity and tell the platforms about them."""
+        state = event.data["new_state"]
+        matches = self.index.match(state)
+        if not matches or self._is_alert_entity(state):
+            return
+        added: Dict[str, List[str]] = {}
+        for key in matches:
+            bound_id = self._bind(key, state)
+            if bound_id is not None:
+                added.setdefault(key[0], []).append(bound_id)
+        for entry_id, alert_ids in added.items():
+            _LOGGER.debug(f"{state.entity_id} matched pattern alerts {alert_ids}")
+            async_dispatcher_send(
+                self.hass, f"{SIGNAL_PATTERN_MATCH}_{entry_id}", alert_ids
+            )
+
+
+@callback
+def _is_new_entity(event_data: Dict[str, Any]) -> bool:
+    """Only entities that just appeared can be new pattern matches."""
+    return (
+        event_data.get("old_state") is None and event_data.get("new_state") is not None
+    )
+
+
+def async_get_pattern_registry(hass: HomeAssistant) -> PatternRegistry:
+    """Return the integration-wide pattern registry, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    registry = domain_data.get("patterns")
+    if registry is None:
+        registry = domain_data["patterns"] = PatternRegistry(hass)
+    return registry
@@ -0,0 +1,110 @@
+"""Time-boxed profiler for the integration's event-loop callbacks.
+
+Callbacks opt in with the :func:`profiled` decorator. While no profile is
+running the decorator costs one global lookup per call; while one is running
+it accumulates per-callback wall time and call counts and captures a cProfile
+trace of everything the callbacks do (template rendering, summary rescans,
+action dispatch) for offline analysis with ``pstats``.
+"""
+
+import cProfile
+import functools
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+_active: Optional["CallbackProfiler"] = None
+
+
+class CallbackProfiler:
+    """Aggregate wall time and call counts for profiled callbacks."""
+
+    def __init__(self) -> None:
+        """Initialize an idle profiler."""
+        self.profile = cProfile.Profile()
+        self.calls: Dict[str, List[int]] = {}
+        self.started = time.monotonic()
+        self._depth = 0
+        self._tracing = False
+
+    def run(self, name: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """Call ``func`` and account its wall time under ``name``."""
+        outermost = self._depth == 0
+        self._depth += 1
+        if outermost:
+            try:
+                self.profile.enable()
+                self._tracing = True
+            except ValueError:
+                # Another profiler (e.g. HA's profiler integration) owns the
+                # interpreter hook; keep the wall-time aggregates only.
+                self._tracing = False
+        started = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            self._depth -= 1
+            if outermost and self._tracing:
+                self.profile.disable()
+                self._tracing = False
+            entry = self.calls.get(name)
+            if entry is None:
+                self.calls[name] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return per-callback totals, slowest first."""
+        rows: List[Dict[str, Any]] = [
+            {
+                "function": name,
+                "calls": calls,
+                "total_ms": round(total_ns / 1_000_000, 3),
+                "mean_ms": round(total_ns / calls / 1_000_000, 4),
+            }
+            for name, (calls, total_ns) in self.calls.items()
+        ]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+
+def profiled(func: Callable) -> Callable:
+    """Decorate a synchronous callback so an active profile accounts it."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        return profiler.run(name, func, args, kwargs)
+
+    return wrapper
+
+
+def start_profiler() -> Optional[CallbackProfiler]:
+    """Start a new profile, or return None if one is already running."""
+    global _active
+    if _active is not None:
+        _LOGGER.debug("Profile already running, not starting another")
+        return None
+    _active = CallbackProfiler()
+    _LOGGER.debug("Callback profile started")
+    return _active
+
+
+def stop_profiler() -> Optional[CallbackProfiler]:
+    """Stop the running profile and return it."""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        _LOGGER.debug(
+            "Callback profile stopped after "
+            f"{time.monotonic() - profiler.started:.1f}s, "
+            f"{len(profiler.calls)} callbacks seen"
+        )
+    return profiler
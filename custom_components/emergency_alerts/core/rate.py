@@ -0,0 +1,249 @@
+"""Rate-of-change trigger: how fast a numeric value is moving.
+
+The trigger compares the change over ``window_seconds`` with a threshold,
+e.g. ``> 2`` with a 600 s window for "rising more than 2 °C in 10
+minutes". The change is the least-squares slope of the samples inside the
+window times its length, so a single noisy reading moves it less than a
+first/last difference would.
+
+Samples live in a :class:`SampleWindow`: two parallel ``array('d')`` ring
+buffers (timestamps, values) that grow by doubling, plus the running
+sums the slope needs. Adding or expiring a sample updates the sums in
+O(1); the slope is a handful of float operations. One window is shared by
+every alert watching the same entity, attribute and window length
+(:func:`async_acquire_sample_window`), and it records each state change
+once however many alerts pass it on.
+"""
+
+import copy
+import logging
+from array import array
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, State
+
+from ..const import CONF_ATTRIBUTE, CONF_WINDOW_SECONDS, DOMAIN
+from .conditions import Accessor, compile_accessor
+from .numeric import NumericThreshold, to_number
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rebuild the running sums from the samples after this many evictions, so
+# floating-point error from adding and subtracting can't accumulate.
+_REBUILD_EVERY = 4096
+
+WindowKey = Tuple[str, Optional[str], float]
+
+
+class RateRule:
+    """The parsed, shared part of a rate-of-change trigger."""
+
+    __slots__ = ("entity_id", "attribute", "read", "window_seconds", "threshold")
+
+    def __init__(
+        self,
+        entity_id: str,
+        window_seconds: float,
+        threshold: NumericThreshold,
+        attribute: Optional[str] = None,
+    ) -> None:
+        """Store the rule; ``window_seconds`` must be positive."""
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+        self.entity_id = entity_id
+        self.attribute = attribute or None
+        self.read: Accessor = compile_accessor(self.attribute)
+        self.window_seconds = window_seconds
+        self.threshold = threshold
+
+    @classmethod
+    def from_config(cls, alert_data: Dict[str, Any]) -> Optional["RateRule"]:
+        """Parse the rate trigger fields, or return None if they're invalid."""
+        entity_id = alert_data.get("entity_id")
+        window_seconds = to_number(alert_data.get(CONF_WINDOW_SECONDS))
+        threshold = NumericThreshold.from_config(alert_data)
+        if (
+            not entity_id
+            or window_seconds is None
+            or window_seconds <= 0
+            or threshold is None
+        ):
+            _LOGGER.error(
+                f"Rate trigger needs entity_id, a positive {CONF_WINDOW_SECONDS} and a "
+                f"threshold; got {alert_data.get(CONF_WINDOW_SECONDS)!r}"
+            )
+            return None
+        return cls(entity_id, window_seconds, threshold, alert_data.get(CONF_ATTRIBUTE))
+
+    @property
+    def key(self) -> WindowKey:
+        """Alerts with the same key share one sample window."""
+        return (self.entity_id, self.attribute, self.window_seconds)
+
+    def bind(self, entity_id: str) -> "RateRule":
+        """This rule for another entity, sharing the accessor and threshold."""
+        bound = copy.copy(self)
+        bound.entity_id = entity_id
+        return bound
+
+    def __repr__(self) -> str:
+        return f"RateRule({self.key}, {self.threshold!r})"
+
+
+class SampleWindow:
+    """Time-bounded ``(timestamp, value)`` samples with incremental slope."""
+
+    __slots__ = (
+        "window_seconds",
+        "read",
+        "users",
+        "last_state",
+        "_times",
+        "_values",
+        "_head",
+        "_count",
+        "_origin",
+        "_sum_t",
+        "_sum_v",
+        "_sum_tt",
+        "_sum_tv",
+        "_evictions",
+    )
+
+    def __init__(
+        self, window_seconds: float, read: Accessor, capacity: int = 16
+    ) -> None:
+        """Start empty with room for ``capacity`` samples."""
+        self.window_seconds = window_seconds
+        self.read = read
+        self.users = 0
+        self.last_state: Optional[State] = None
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._head = 0
+        self._count = 0
+        self._origin = 0.0
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def observe(self, state: Optional[State], now: float) -> None:
+        """Record ``state``'s value once, however many alerts pass it on."""
+        if state is None or state is self.last_state:
+            return
+        self.last_state = state
+        value = to_number(self.read(state))
+        if value is not None:
+            self.add(now, value)
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Append a sample and drop the ones that fell out of the window."""
+        self.expire(timestamp)
+        if self._count == 0:
+            self._origin = timestamp
+        capacity = len(self._times)
+        if self._count == capacity:
+            self._grow()
+            capacity = len(self._times)
+        index = (self._head + self._count) % capacity
+        self._times[index] = timestamp
+        self._values[index] = value
+        self._count += 1
+        t = timestamp - self._origin
+        self._sum_t += t
+        self._sum_v += value
+        self._sum_tt += t * t
+        self._sum_tv += t * value
+
+    def expire(self, now: float) -> None:
+        """Drop samples older than the window."""
+        cutoff = now - self.window_seconds
+        times, values = self._times, self._values
+        capacity = len(times)
+        while self._count and times[self._head] <= cutoff:
+            t = times[self._head] - self._origin
+            value = values[self._head]
+            self._sum_t -= t
+            self._sum_v -= value
+            self._sum_tt -= t * t
+            self._sum_tv -= t * value
+            self._head = (self._head + 1) % capacity
+            self._count -= 1
+            self._evictions += 1
+        if self._count == 0:
+            self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+            self._evictions = 0
+        elif self._evictions >= _REBUILD_EVERY:
+            self._rebuild()
+
+    def slope(self) -> Optional[float]:
+        """Least-squares slope in units per second, or None below two samples."""
+        n = self._count
+        if n < 2:
+            return None
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return (n * self._sum_tv - self._sum_t * self._sum_v) / denominator
+
+    def change(self) -> float:
+        """Slope times the window length; 0 when there's no trend to measure."""
+        slope = self.slope()
+        return 0.0 if slope is None else slope * self.window_seconds
+
+    def expires_at(self) -> Optional[float]:
+        """When the oldest sample leaves the window, or None if empty."""
+        if not self._count:
+            return None
+        return self._times[self._head] + self.window_seconds
+
+    def _grow(self) -> None:
+        """Double the buffers, unrolling the ring so the head is at 0."""
+        capacity = len(self._times)
+        order = [(self._head + i) % capacity for i in range(self._count)]
+        times = array("d", (self._times[i] for i in order))
+        values = array("d", (self._values[i] for i in order))
+        padding = array("d", bytes(8 * capacity))
+        times.extend(padding)
+        values.extend(padding)
+        self._times, self._values, self._head = times, values, 0
+
+    def _rebuild(self) -> None:
+        """Recompute the sums exactly, re-basing times on the oldest sample."""
+        capacity = len(self._times)
+        self._origin = self._times[self._head]
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        for i in range(self._count):
+            index = (self._head + i) % capacity
+            t = self._times[index] - self._origin
+            value = self._values[index]
+            self._sum_t += t
+            self._sum_v += value
+            self._sum_tt += t * t
+            self._sum_tv += t * value
+        self._evictions = 0
+
+
+def async_acquire_sample_window(hass: HomeAssistant, rule: RateRule) -> SampleWindow:
+    """Return the shared window for ``rule``, creating it on first use."""
+    windows: Dict[WindowKey, SampleWindow] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault("sample_windows", {})
+    window = windows.get(rule.key)
+    if window is None:
+        window = windows[rule.key] = SampleWindow(rule.window_seconds, rule.read)
+    window.users += 1
+    return window
+
+
+def async_release_sample_window(hass: HomeAssistant, rule: RateRule) -> None:
+    """Drop one user of ``rule``'s window, forgetting it after the last."""
+    windows = hass.data.get(DOMAIN, {}).get("sample_windows", {})
+    window = windows.get(rule.key)
+    if window is None:
+        return
+    window.users -= 1
+    if window.users <= 0:
+        del windows[rule.key]
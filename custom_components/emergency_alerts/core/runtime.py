@@ -0,0 +1,162 @@
+"""Compact mutable runtime state shared by an alert's entities.
+
+An alert's binary sensor, select and switches all read and mutate the same
+handful of facts: which status flags are set, when it last fired or
+cleared, and which timers are armed. Keeping one :class:`AlertRuntime` per
+alert, with the boolean flags packed into a single integer and everything
+else in ``__slots__``, makes that state a fixed ~150 bytes per alert that
+does not grow as more platforms expose it.
+
+Entities expose the record through :func:`flag_attribute` and
+:func:`field_attribute` descriptors, so existing ``entity._acknowledged``
+style access keeps working unchanged.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple, TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+
+from ..const import DOMAIN, STATE_INACTIVE
+
+if TYPE_CHECKING:
+    from ..binary_sensor import EmergencyBinarySensor
+    from .history import TransitionHistory
+    from .tracing import TransitionTrace
+
+# Status flag bits. Values are internal; only ever combine them by name.
+FLAG_ON = 1 << 0  # trigger condition met and the alert has fired
+FLAG_TRIGGERED = 1 << 1  # on_triggered already ran for the current firing
+FLAG_ACKNOWLEDGED = 1 << 2
+FLAG_SNOOZED = 1 << 3
+FLAG_RESOLVED = 1 << 4
+FLAG_ESCALATED = 1 << 5
+FLAG_CLEARED = 1 << 6  # manually cleared (legacy)
+FLAG_FLAPPING = 1 << 7  # trigger flipping too often (see .flapping)
+
+FLAG_NAMES = (
+    ("on", FLAG_ON),
+    ("triggered", FLAG_TRIGGERED),
+    ("acknowledged", FLAG_ACKNOWLEDGED),
+    ("snoozed", FLAG_SNOOZED),
+    ("resolved", FLAG_RESOLVED),
+    ("escalated", FLAG_ESCALATED),
+    ("cleared", FLAG_CLEARED),
+    ("flapping", FLAG_FLAPPING),
+)
+
+
+class AlertRuntime:
+    """Mutable per-alert state: status flags, timestamps and timer handles."""
+
+    __slots__ = (
+        "flags",
+        "first_triggered",
+        "last_cleared",
+        "snooze_until",
+        "escalation_unsub",
+        "snooze_task",
+        "pending_trigger_unsub",
+        "pending_trace",
+        "last_status",
+        "history",
+        "alert",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an inactive alert with no timers armed."""
+        self.flags = 0
+        self.first_triggered: Optional[str] = None
+        self.last_cleared: Optional[str] = None
+        self.snooze_until: Optional[datetime] = None
+        # Cancel callables / tasks for the three timers an alert can arm.
+        self.escalation_unsub: Optional[Callable[[], None]] = None
+        self.snooze_task: Optional["asyncio.Task[None]"] = None
+        self.pending_trigger_unsub: Optional[Callable[[], None]] = None
+        # Latency trace carried across a for_seconds dwell.
+        self.pending_trace: Optional["TransitionTrace"] = None
+        # Status the companion status sensor currently shows.
+        self.last_status = STATE_INACTIVE
+        # TransitionHistory, allocated on the first transition.
+        self.history: Optional["TransitionHistory"] = None
+        # The alert's binary sensor, so siblings find it without a scan.
+        self.alert: Optional["EmergencyBinarySensor"] = None
+
+    def has(self, flag: int) -> bool:
+        """Return whether ``flag`` is set."""
+        return bool(self.flags & flag)
+
+    def set(self, flag: int, value: bool) -> None:
+        """Set or clear ``flag``."""
+        if value:
+            self.flags |= flag
+        else:
+            self.flags &= ~flag
+
+    def flags_dict(self) -> Dict[str, bool]:
+        """Return every flag by name, for diagnostics."""
+        flags = self.flags
+        return {name: bool(flags & flag) for name, flag in FLAG_NAMES}
+
+
+def flag_attribute(flag: int) -> property:
+    """Return a bool attribute backed by one bit of ``self._runtime.flags``."""
+
+    def getter(self) -> bool:
+        return bool(self._runtime.flags & flag)
+
+    def setter(self, value: bool) -> None:
+        runtime = self._runtime
+        if value:
+            runtime.flags |= flag
+        else:
+            runtime.flags &= ~flag
+
+    return property(getter, setter)
+
+
+def field_attribute(name: str) -> property:
+    """Return an attribute backed by the ``name`` slot of ``self._runtime``."""
+
+    def getter(self) -> Any:
+        return getattr(self._runtime, name)
+
+    def setter(self, value: Any) -> None:
+        setattr(self._runtime, name, value)
+
+    return property(getter, setter)
+
+
+def _runtime_key(entry_id: str, alert_id: str) -> Tuple[str, str]:
+    return (entry_id, alert_id)
+
+
+def async_get_alert_runtime(
+    hass: HomeAssistant, entry_id: str, alert_id: str
+) -> AlertRuntime:
+    """Return the shared runtime record for an alert, creating it on first use."""
+    runtimes = hass.data.setdefault(DOMAIN, {}).setdefault("runtime", {})
+    key = _runtime_key(entry_id, alert_id)
+    runtime = runtimes.get(key)
+    if runtime is None:
+        runtime = runtimes[key] = AlertRuntime()
+    return runtime
+
+
+def async_find_alert_runtime(
+    hass: HomeAssistant, entry_id: str, alert_id: str
+) -> Optional[AlertRuntime]:
+    """Return the runtime record for an alert if one exists."""
+    return (
+        hass.data.get(DOMAIN, {})
+        .get("runtime", {})
+        .get(_runtime_key(entry_id, alert_id))
+    )
+
+
+def async_drop_alert_runtime(hass: HomeAssistant, entry_id: str, alert_id: str) -> None:
+    """Forget an alert's runtime record once its entities are gone."""
+    hass.data.get(DOMAIN, {}).get("runtime", {}).pop(
+        _runtime_key(entry_id, alert_id), None
+    )
@@ -0,0 +1,229 @@
+"""Staleness (heartbeat) trigger: an entity that stopped reporting.
+
+The trigger holds once ``entity_id`` has gone ``stale_seconds`` without an
+update, e.g. a Zigbee sensor silent for two hours because its battery died
+or it dropped off the mesh. Any ``state_changed`` of the entity counts as a
+report (attribute-only updates included) except going ``unavailable`` or
+``unknown``, which is what a missing device looks like rather than a sign
+of life.
+
+Every stale alert's deadline (last report + ``stale_seconds``) lives in
+one shared :class:`DeadlineIndex`: a binary min-heap with a position map,
+so a report moves its alert's deadline in O(log n) and the integration
+keeps a single timer for the earliest deadline however many devices are
+watched, instead of a timer per entity or periodic polling.
+"""
+
+import copy
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import callback, HomeAssistant, State
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from ..const import CONF_STALE_SECONDS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_NOT_A_REPORT = (STATE_UNAVAILABLE, STATE_UNKNOWN)
+
+
+def read_last_updated(state: State) -> Any:
+    """Accessor for when the entity last reported (any change counts)."""
+    return state.last_updated
+
+
+def last_report(state: Optional[State]) -> Optional[float]:
+    """Timestamp of ``state`` as a report, or None if it isn't one."""
+    if state is None or state.state in _NOT_A_REPORT:
+        return None
+    return state.last_updated.timestamp()
+
+
+class StaleRule:
+    """The parsed, shared part of a staleness trigger."""
+
+    __slots__ = ("entity_id", "stale_seconds")
+
+    def __init__(self, entity_id: str, stale_seconds: float) -> None:
+        """Store the rule; ``stale_seconds`` must be positive."""
+        if stale_seconds <= 0:
+            raise ValueError("stale_seconds must be positive")
+        self.entity_id = entity_id
+        self.stale_seconds = stale_seconds
+
+    @classmethod
+    def from_config(cls, alert_data: Dict[str, Any]) -> Optional["StaleRule"]:
+        """Parse the staleness trigger fields, or return None if they're invalid."""
+        try:
+            entity_id = alert_data.get("entity_id")
+            if not entity_id:
+                raise ValueError("entity_id is required")
+            return cls(entity_id, float(alert_data[CONF_STALE_SECONDS]))
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.error(
+                "Stale trigger needs entity_id and a positive "
+                f"{CONF_STALE_SECONDS}: {err}"
+            )
+            return None
+
+    def bind(self, entity_id: str) -> "StaleRule":
+        """This rule watching another entity."""
+        bound = copy.copy(self)
+        bound.entity_id = entity_id
+        return bound
+
+    def __repr__(self) -> str:
+        return f"StaleRule({self.entity_id} silent {self.stale_seconds}s)"
+
+
+class DeadlineIndex:
+    """Deadlines by key in an indexed min-heap, with one timer for the earliest.
+
+    :meth:`schedule` inserts or moves a key's deadline and :meth:`remove`
+    drops it, both O(log n). When the earliest deadline passes, its handler
+    is called (once; schedule again to re-arm it).
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Start empty with no timer armed."""
+        self.hass = hass
+        self._deadlines: List[float] = []
+        self._keys: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._handlers: Dict[Hashable, Callable[[], None]] = {}
+        self._unsub: Optional[Callable[[], None]] = None
+        self._armed_for: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        """The deadline scheduled for ``key``, if any."""
+        index = self._positions.get(key)
+        return None if index is None else self._deadlines[index]
+
+    def next_deadline(self) -> Optional[float]:
+        """The earliest deadline, or None if empty."""
+        return self._deadlines[0] if self._deadlines else None
+
+    @callback
+    def schedule(
+        self, key: Hashable, deadline: float, handler: Callable[[], None]
+    ) -> None:
+        """Set ``key``'s deadline, calling ``handler`` once it passes."""
+        self._handlers[key] = handler
+        index = self._positions.get(key)
+        if index is None:
+            index = len(self._keys)
+            self._deadlines.append(deadline)
+            self._keys.append(key)
+            self._positions[key] = index
+            self._sift_up(index)
+        else:
+            previous = self._deadlines[index]
+            self._deadlines[index] = deadline
+            if deadline < previous:
+                self._sift_up(index)
+            else:
+                self._sift_down(index)
+        self._rearm()
+
+    @callback
+    def remove(self, key: Hashable) -> None:
+        """Forget ``key``'s deadline, if it has one."""
+        if self._discard(key):
+            self._rearm()
+
+    def _discard(self, key: Hashable) -> bool:
+        """Take ``key`` out of the heap without touching the timer."""
+        index = self._positions.pop(key, None)
+        self._handlers.pop(key, None)
+        if index is None:
+            return False
+        last = len(self._keys) - 1
+        if index != last:
+            self._move(last, index)
+        self._deadlines.pop()
+        self._keys.pop()
+        if index != last:
+            self._sift_down(self._sift_up(index))
+        return True
+
+    def _move(self, source: int, target: int) -> None:
+        key = self._keys[source]
+        self._deadlines[target] = self._deadlines[source]
+        self._keys[target] = key
+        self._positions[key] = target
+
+    def _swap(self, i: int, j: int) -> None:
+        deadlines, keys = self._deadlines, self._keys
+        deadlines[i], deadlines[j] = deadlines[j], deadlines[i]
+        keys[i], keys[j] = keys[j], keys[i]
+        self._positions[keys[i]] = i
+        self._positions[keys[j]] = j
+
+    def _sift_up(self, index: int) -> int:
+        deadlines = self._deadlines
+        while index:
+            parent = (index - 1) >> 1
+            if deadlines[parent] <= deadlines[index]:
+                break
+            self._swap(index, parent)
+            index = parent
+        return index
+
+    def _sift_down(self, index: int) -> int:
+        deadlines = self._deadlines
+        size = len(deadlines)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and deadlines[child] < deadlines[smallest]:
+                    smallest = child
+            if smallest == index:
+                return index
+            self._swap(index, smallest)
+            index = smallest
+
+    def _rearm(self) -> None:
+        """Point the timer at the earliest deadline if that changed."""
+        earliest = self.next_deadline()
+        if earliest == self._armed_for:
+            return
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._armed_for = earliest
+        if earliest is not None:
+            delay = max(earliest - dt_util.utcnow().timestamp(), 0)
+            self._unsub = async_call_later(self.hass, delay, self._on_timer)
+
+    @callback
+    def _on_timer(self, _now) -> None:
+        """Call the handler of every deadline that has passed."""
+        self._unsub = None
+        self._armed_for = None
+        now = dt_util.utcnow().timestamp()
+        while self._deadlines and self._deadlines[0] <= now:
+            key = self._keys[0]
+            handler = self._handlers.get(key)
+            self._discard(key)
+            if handler is not None:
+                handler()
+        # Also covers a timer that fired a hair early.
+        self._rearm()
+
+
+def async_get_deadline_index(hass: HomeAssistant) -> DeadlineIndex:
+    """Return the integration-wide deadline index, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    index = domain_data.get("deadlines")
+    if index is None:
+        index = domain_data["deadlines"] = DeadlineIndex(hass)
+    return index
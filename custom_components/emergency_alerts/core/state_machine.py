@@ -0,0 +1,317 @@
+"""Table-driven alert state machine.
+
+Every way an alert can change status -- its trigger firing or clearing, the
+escalation and snooze timers, the acknowledge/clear/escalate services, the
+state select and the three switches -- is a *command*. :data:`TRANSITIONS`
+maps each command to one :class:`Transition` row that says, in terms of the
+:mod:`.runtime` flag bits:
+
+- when the command applies (``require`` / ``forbid`` guards),
+- which flags it sets and clears, with the mutual exclusions from
+  ``STATE_EXCLUSIONS`` already folded into ``clear``,
+- what happens to the escalation and snooze timers,
+- which bus event to fire and which configured action to run.
+
+:func:`step` is the only decision logic: one dict lookup, two mask tests and
+one ``(flags & ~clear) | set``. The entity side
+(``EmergencyBinarySensor.transition``) applies the resulting effects and
+sends one coalesced update to the alert's other entities, plus one to the
+summary sensors only when the alert's on/off reading changed.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from ..const import (
+    EVENT_ALERT_ACKNOWLEDGED,
+    EVENT_ALERT_FLAPPING,
+    EVENT_ALERT_RESOLVED,
+    EVENT_ALERT_SNOOZED,
+    STATE_ACKNOWLEDGED,
+    STATE_EXCLUSIONS,
+    STATE_RESOLVED,
+    STATE_SNOOZED,
+)
+from .history import (
+    CAUSE_CONDITION_CLEARED,
+    CAUSE_ESCALATION_TIMEOUT,
+    CAUSE_FLAPPING,
+    CAUSE_SNOOZE_EXPIRED,
+    CAUSE_STABLE,
+    CAUSE_TRIGGER,
+)
+from .runtime import (
+    FLAG_ACKNOWLEDGED,
+    FLAG_CLEARED,
+    FLAG_ESCALATED,
+    FLAG_FLAPPING,
+    FLAG_ON,
+    FLAG_RESOLVED,
+    FLAG_SNOOZED,
+    FLAG_TRIGGERED,
+)
+
+# Commands. Values are only ever used as table keys.
+CMD_TRIGGER = "trigger"
+CMD_CONDITION_CLEARED = "condition_cleared"
+CMD_ESCALATION_TIMEOUT = "escalation_timeout"
+CMD_ESCALATE = "escalate"
+CMD_ACKNOWLEDGE = "acknowledge"
+CMD_UNACKNOWLEDGE = "unacknowledge"
+CMD_SNOOZE = "snooze"
+CMD_UNSNOOZE = "unsnooze"
+CMD_SNOOZE_EXPIRED = "snooze_expired"
+CMD_RESOLVE = "resolve"
+CMD_UNRESOLVE = "unresolve"
+CMD_REACTIVATE = "reactivate"  # select "active": drop every handled flag
+CMD_RESET = "reset"  # select "inactive": drop handled flags, no escalation
+CMD_CLEAR = "clear"  # legacy clear service
+CMD_FLAP_START = "flap_start"  # flap score reached the threshold
+CMD_FLAP_END = "flap_end"  # flap score fell back; stable again
+# Every command, in a fixed order: indexes are stored in the transition log,
+# so append new commands only.
+COMMANDS = (
+    CMD_TRIGGER,
+    CMD_CONDITION_CLEARED,
+    CMD_ESCALATION_TIMEOUT,
+    CMD_ESCALATE,
+    CMD_ACKNOWLEDGE,
+    CMD_UNACKNOWLEDGE,
+    CMD_SNOOZE,
+    CMD_UNSNOOZE,
+    CMD_SNOOZE_EXPIRED,
+    CMD_RESOLVE,
+    CMD_UNRESOLVE,
+    CMD_REACTIVATE,
+    CMD_RESET,
+    CMD_CLEAR,
+    CMD_FLAP_START,
+    CMD_FLAP_END,
+)
+
+# Timer effects.
+TIMER_KEEP = 0
+TIMER_CANCEL = 1
+TIMER_ARM = 2  # (re)arm; escalation only arms while the alert is unhandled
+
+# Flags that mean someone has dealt with the alert, so it must not escalate.
+HANDLED = FLAG_ACKNOWLEDGED | FLAG_SNOOZED | FLAG_RESOLVED
+
+_STATE_FLAGS = {
+    STATE_ACKNOWLEDGED: FLAG_ACKNOWLEDGED,
+    STATE_SNOOZED: FLAG_SNOOZED,
+    STATE_RESOLVED: FLAG_RESOLVED,
+}
+# STATE_EXCLUSIONS as bitmasks: setting the key flag clears the value mask.
+EXCLUSIONS: Dict[int, int] = {
+    _STATE_FLAGS[state]: sum(_STATE_FLAGS[other] for other in excluded)
+    for state, excluded in STATE_EXCLUSIONS.items()
+}
+
+
+class Transition:
+    """One row of the transition table."""
+
+    __slots__ = (
+        "command",
+        "require",
+        "forbid",
+        "set",
+        "clear",
+        "escalation",
+        "snooze",
+        "event",
+        "action",
+        "action_if",
+        "cause",
+        "trace",
+    )
+
+    def __init__(
+        self,
+        command: str,
+        *,
+        require: int = 0,
+        forbid: int = 0,
+        set: int = 0,
+        clear: int = 0,
+        escalation: int = TIMER_KEEP,
+        snooze: int = TIMER_KEEP,
+        event: Optional[str] = None,
+        action: Optional[str] = None,
+        action_if: int = 0,
+        cause: Optional[str] = None,
+        trace: Optional[str] = None,
+    ) -> None:
+        """Build a row, folding exclusions and implied timer effects in."""
+        for flag, excluded in EXCLUSIONS.items():
+            if set & flag:
+                clear |= excluded
+        clear &= ~set
+        if clear & FLAG_SNOOZED and snooze == TIMER_KEEP:
+            # Leaving the snoozed state always stops its timer.
+            snooze = TIMER_CANCEL
+        self.command = command
+        self.require = require
+        self.forbid = forbid
+        self.set = set
+        self.clear = clear
+        self.escalation = escalation
+        self.snooze = snooze
+        self.event = event
+        # Name of the AlertDefinition field holding the actions to run, run
+        # only if every action_if flag was set before the transition.
+        self.action = action
+        self.action_if = action_if
+        # History cause; None means the caller supplies it.
+        self.cause = cause
+        # TransitionTrace label for the latency metrics.
+        self.trace = trace
+
+    def __repr__(self) -> str:
+        return f"Transition({self.command!r})"
+
+
+_OPERATOR_CLEARED = FLAG_ACKNOWLEDGED | FLAG_SNOOZED | FLAG_RESOLVED | FLAG_ESCALATED
+
+TRANSITIONS: Dict[str, Transition] = {
+    row.command: row
+    for row in (
+        # Trigger condition met (after any for_seconds dwell). A resolved
+        # alert stays quiet until its condition clears.
+        Transition(
+            CMD_TRIGGER,
+            forbid=FLAG_RESOLVED | FLAG_TRIGGERED,
+            set=FLAG_ON | FLAG_TRIGGERED,
+            escalation=TIMER_ARM,
+            action="on_triggered",
+            cause=CAUSE_TRIGGER,
+            trace="triggered",
+        ),
+        Transition(
+            CMD_CONDITION_CLEARED,
+            clear=FLAG_ON | FLAG_TRIGGERED | FLAG_RESOLVED | FLAG_ESCALATED,
+            escalation=TIMER_CANCEL,
+            action="on_cleared",
+            action_if=FLAG_TRIGGERED,
+            cause=CAUSE_CONDITION_CLEARED,
+            trace="cleared",
+        ),
+        Transition(
+            CMD_ESCALATION_TIMEOUT,
+            require=FLAG_ON,
+            forbid=HANDLED,
+            set=FLAG_ESCALATED,
+            action="on_escalated",
+            cause=CAUSE_ESCALATION_TIMEOUT,
+            trace="escalated",
+        ),
+        Transition(
+            CMD_ESCALATE,
+            require=FLAG_ON,
+            forbid=FLAG_ESCALATED,
+            set=FLAG_ESCALATED,
+            clear=FLAG_ACKNOWLEDGED | FLAG_CLEARED,
+            escalation=TIMER_CANCEL,
+            action="on_escalated",
+            trace="escalated",
+        ),
+        Transition(
+            CMD_ACKNOWLEDGE,
+            set=FLAG_ACKNOWLEDGED,
+            clear=FLAG_ESCALATED | FLAG_CLEARED,
+            escalation=TIMER_CANCEL,
+            event=EVENT_ALERT_ACKNOWLEDGED,
+            action="on_acknowledged",
+            trace="acknowledged",
+        ),
+        Transition(
+            CMD_UNACKNOWLEDGE,
+            clear=FLAG_ACKNOWLEDGED | FLAG_ESCALATED,
+            escalation=TIMER_ARM,
+        ),
+        Transition(
+            CMD_SNOOZE,
+            set=FLAG_SNOOZED,
+            clear=FLAG_ESCALATED,
+            escalation=TIMER_CANCEL,
+            snooze=TIMER_ARM,
+            event=EVENT_ALERT_SNOOZED,
+            action="on_snoozed",
+            trace="snoozed",
+        ),
+        Transition(
+            CMD_UNSNOOZE,
+            clear=FLAG_SNOOZED | FLAG_ESCALATED,
+            escalation=TIMER_ARM,
+        ),
+        Transition(
+            CMD_SNOOZE_EXPIRED,
+            require=FLAG_SNOOZED,
+            clear=FLAG_SNOOZED,
+            escalation=TIMER_ARM,
+            cause=CAUSE_SNOOZE_EXPIRED,
+        ),
+        Transition(
+            CMD_RESOLVE,
+            set=FLAG_RESOLVED,
+            clear=FLAG_ESCALATED,
+            escalation=TIMER_CANCEL,
+            event=EVENT_ALERT_RESOLVED,
+            action="on_resolved",
+            trace="resolved",
+        ),
+        Transition(
+            CMD_UNRESOLVE,
+            clear=FLAG_RESOLVED | FLAG_ESCALATED,
+            escalation=TIMER_ARM,
+        ),
+        Transition(CMD_REACTIVATE, clear=_OPERATOR_CLEARED, escalation=TIMER_ARM),
+        Transition(CMD_RESET, clear=_OPERATOR_CLEARED, escalation=TIMER_CANCEL),
+        Transition(
+            CMD_CLEAR,
+            set=FLAG_CLEARED,
+            clear=FLAG_ON | FLAG_TRIGGERED | FLAG_ACKNOWLEDGED | FLAG_ESCALATED,
+            escalation=TIMER_CANCEL,
+            action="on_cleared",
+            action_if=FLAG_TRIGGERED,
+            trace="cleared",
+        ),
+        # Flapping overrides the status shown, not the on/off flags, so the
+        # trigger keeps firing and clearing underneath (unless the alert
+        # suppresses that while flapping).
+        Transition(
+            CMD_FLAP_START,
+            forbid=FLAG_FLAPPING,
+            set=FLAG_FLAPPING,
+            event=EVENT_ALERT_FLAPPING,
+            action="on_flapping",
+            cause=CAUSE_FLAPPING,
+            trace="flapping",
+        ),
+        Transition(
+            CMD_FLAP_END, require=FLAG_FLAPPING, clear=FLAG_FLAPPING, cause=CAUSE_STABLE
+        ),
+    )
+}
+
+
+def step(flags: int, command: str) -> Tuple[Optional[Transition], int]:
+    """Return the row for ``command`` and the flags after it.
+
+    The row is None, and the flags unchanged, when the command's guard does
+    not hold in ``flags``. Unknown commands raise ``KeyError``.
+    """
+    row = TRANSITIONS[command]
+    if flags & row.require != row.require or flags & row.forbid:
+        return None, flags
+    return row, (flags & ~row.clear) | row.set
+
+
+def shows_on(flags: int) -> bool:
+    """Return whether an alert in ``flags`` reads as on (and counts as firing)."""
+    return bool(flags & FLAG_ON) and not flags & (FLAG_SNOOZED | FLAG_RESOLVED)
+
+
+def should_escalate(flags: int) -> bool:
+    """Return whether an alert in ``flags`` should have its escalation timer armed."""
+    return bool(flags & FLAG_ON) and not flags & HANDLED
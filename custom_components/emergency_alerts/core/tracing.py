@@ -0,0 +1,126 @@
+"""Trigger-to-notification latency tracing.
+
+Every alert transition that can notify someone (trigger, clear, escalate,
+acknowledge, snooze, resolve) gets a :class:`TransitionTrace` carrying a
+process-wide monotonic trace ID and ``perf_counter_ns`` stamps for each
+pipeline stage. When the last action of a transition completes, the trace is
+closed and its latency recorded.
+"""
+
+import itertools
+import time
+from typing import Any, Dict, List, Optional
+
+_trace_ids = itertools.count(1)
+
+
+class ActionStamp:
+    """Timing of one action dispatched for a transition."""
+
+    __slots__ = ("service", "enqueued_ns", "started_ns", "completed_ns", "ok")
+
+    def __init__(self, service: str) -> None:
+        """Stamp the action as enqueued now."""
+        self.service = service
+        self.enqueued_ns = time.perf_counter_ns()
+        self.started_ns: Optional[int] = None
+        self.completed_ns: Optional[int] = None
+        self.ok = True
+
+
+class TransitionTrace:
+    """Stage timestamps for one alert transition."""
+
+    __slots__ = (
+        "trace_id",
+        "transition",
+        "observed_ns",
+        "evaluated_ns",
+        "armed_ns",
+        "fired_ns",
+        "written_ns",
+        "actions",
+        "pending_actions",
+        "closed",
+    )
+
+    def __init__(
+        self,
+        transition: str,
+        observed_ns: Optional[int] = None,
+        evaluated_ns: Optional[int] = None,
+    ) -> None:
+        """Start a trace; stages default to now when not observed earlier."""
+        now = time.perf_counter_ns()
+        self.trace_id = next(_trace_ids)
+        self.transition = transition
+        self.observed_ns = observed_ns or now
+        self.evaluated_ns = evaluated_ns or now
+        self.armed_ns: Optional[int] = None
+        self.fired_ns: Optional[int] = None
+        self.written_ns: Optional[int] = None
+        self.actions: List[ActionStamp] = []
+        self.pending_actions = 0
+        self.closed = False
+
+    def action_enqueued(self, service: str) -> ActionStamp:
+        """Record an action being scheduled and return its stamp."""
+        stamp = ActionStamp(service)
+        self.actions.append(stamp)
+        self.pending_actions += 1
+        return stamp
+
+    @property
+    def complete(self) -> bool:
+        """True once the state is written and every action has finished."""
+        return self.written_ns is not None and self.pending_actions == 0
+
+    def try_close(self) -> bool:
+        """Close the trace if it is complete; True only on the closing call."""
+        if self.closed or not self.complete:
+            return False
+        self.closed = True
+        return True
+
+    def end_ns(self) -> int:
+        """Return the time the last stage of the transition finished."""
+        end = self.written_ns or self.evaluated_ns
+        for stamp in self.actions:
+            if stamp.completed_ns is not None and stamp.completed_ns > end:
+                end = stamp.completed_ns
+        return end
+
+    def latency_ns(self) -> int:
+        """Processing latency, excluding any deliberate for_seconds dwell."""
+        start = self.fired_ns if self.fired_ns is not None else self.observed_ns
+        return self.end_ns() - start
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return stage offsets in milliseconds relative to observation."""
+        origin = self.observed_ns
+
+        def offset(stamp_ns: Optional[int]) -> Optional[float]:
+            if stamp_ns is None:
+                return None
+            return round((stamp_ns - origin) / 1_000_000, 3)
+
+        return {
+            "trace_id": self.trace_id,
+            "transition": self.transition,
+            "evaluated_ms": offset(self.evaluated_ns),
+            "armed_ms": offset(self.armed_ns),
+            "fired_ms": offset(self.fired_ns),
+            "written_ms": offset(self.written_ns),
+            "actions": [
+                {
+                    "service": stamp.service,
+                    "enqueued_ms": offset(stamp.enqueued_ns),
+                    "started_ms": offset(stamp.started_ns),
+                    "completed_ms": offset(stamp.completed_ns),
+                    "ok": stamp.ok,
+                }
+                for stamp in self.actions
+            ],
+            "total_ms": offset(self.end_ns()),
+            "latency_ms": round(self.latency_ns() / 1_000_000, 3),
+        }
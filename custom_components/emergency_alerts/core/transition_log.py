@@ -0,0 +1,375 @@
+"""Append-only on-disk log of alert state machine transitions.
+
+Every transition applied by ``EmergencyBinarySensor.transition`` is packed
+into a 15-byte header plus the entry and alert ids::
+
+    <d timestamp> <B command> <B flags after> <B cause> <H len> <H len> ids
+
+Records are appended to an in-memory buffer on the event loop; a flush a
+few seconds later (or sooner once the buffer is large) writes the whole
+batch and fsyncs it once, in the executor. The event loop never touches
+the file.
+
+Since each record carries the alert's complete flags after the transition,
+replaying a file and keeping the last record per alert rebuilds the current
+state. When the file outgrows ``max_bytes`` it is rotated to ``.1`` (older
+files shift up, the oldest is dropped) and the new file starts with one
+snapshot record per alert that isn't plain inactive, so the current file
+alone is always enough to rebuild state; the rotated files keep the audit
+trail.
+"""
+
+import asyncio
+import logging
+import os
+import struct
+import time
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+from ..const import CONF_ENABLE_TRANSITION_LOG, DOMAIN
+from .history import CAUSES
+from .runtime import (
+    FLAG_ACKNOWLEDGED,
+    FLAG_ESCALATED,
+    FLAG_ON,
+    FLAG_RESOLVED,
+    FLAG_TRIGGERED,
+)
+from .state_machine import COMMANDS
+
+_LOGGER = logging.getLogger(__name__)
+
+TRANSITION_LOG_FILE = "emergency_alerts_transitions.log"
+MAGIC = b"EATLOG1\n"
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_BACKUPS = 2
+DEFAULT_FLUSH_INTERVAL = 5.0  # seconds between batched writes
+FLUSH_BYTES = 64 * 1024  # flush early once this much is buffered
+
+# Command index 255 marks a snapshot record written after rotation.
+SNAPSHOT = "snapshot"
+_SNAPSHOT_CODE = 255
+_COMMAND_CODES = {command: index for index, command in enumerate(COMMANDS)}
+_CAUSE_CODES = {cause: index for index, cause in enumerate(CAUSES)}
+_HEADER = struct.Struct("<dBBBHH")
+
+# Flags restored on restart. Snoozes are dropped because their deadline
+# isn't logged; the alert comes back unsnoozed. Flapping is dropped because
+# the flips behind it aren't either.
+RESTORABLE_FLAGS = (
+    FLAG_ON | FLAG_TRIGGERED | FLAG_ACKNOWLEDGED | FLAG_RESOLVED | FLAG_ESCALATED
+)
+
+AlertKey = Tuple[str, str]
+
+
+class LogRecord(NamedTuple):
+    """One decoded transition."""
+
+    timestamp: float
+    entry_id: str
+    alert_id: str
+    command: str
+    flags: int
+    cause: str
+
+
+def pack_record(
+    timestamp: float,
+    command_code: int,
+    flags: int,
+    cause_code: int,
+    entry_id: str,
+    alert_id: str,
+) -> bytes:
+    """Encode one record."""
+    entry = entry_id.encode()
+    alert = alert_id.encode()
+    return (
+        _HEADER.pack(timestamp, command_code, flags, cause_code, len(entry), len(alert))
+        + entry
+        + alert
+    )
+
+
+def iter_records(path: str) -> Iterator[LogRecord]:
+    """Yield every record in a log file, oldest first.
+
+    A record cut short by a crash mid-write ends the iteration. Raises
+    ``ValueError`` if the file isn't a transition log.
+    """
+    with open(path, "rb") as handle:
+        data = handle.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not an emergency_alerts transition log")
+    offset = len(MAGIC)
+    header_size = _HEADER.size
+    end = len(data)
+    while offset + header_size <= end:
+        timestamp, command, flags, cause, entry_len, alert_len = _HEADER.unpack_from(
+            data, offset
+        )
+        start = offset + header_size
+        stop = start + entry_len + alert_len
+        if stop > end:
+            break
+        yield LogRecord(
+            timestamp,
+            data[start : start + entry_len].decode(),
+            data[start + entry_len : stop].decode(),
+            SNAPSHOT if command == _SNAPSHOT_CODE else COMMANDS[command],
+            flags,
+            CAUSES[cause] if cause < len(CAUSES) else CAUSES[0],
+        )
+        offset = stop
+
+
+def replay(path: str) -> Dict[AlertKey, Tuple[float, int]]:
+    """Return ``(timestamp, flags)`` of the last record per alert.
+
+    Alerts whose last record left them plain inactive (no flags) are left
+    out, as they are from rotation snapshots.
+    """
+    state: Dict[AlertKey, Tuple[float, int]] = {}
+    for record in iter_records(path):
+        key = (record.entry_id, record.alert_id)
+        if record.flags:
+            state[key] = (record.timestamp, record.flags)
+        else:
+            state.pop(key, None)
+    return state
+
+
+class TransitionLog:
+    """Batched, rotating writer for the transition log."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        """Create a writer; call :meth:`async_load` before appending."""
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self._buffer = bytearray()
+        # Last (timestamp, flags) per alert with any flag set, for snapshots
+        # and restores.
+        self._latest: Dict[AlertKey, Tuple[float, int]] = {}
+        self._size = 0
+        self._flush_unsub: Optional[Callable[[], None]] = None
+        self._flush_queued = (
+            False  # a flush task exists that hasn't taken the buffer yet
+        )
+        self._write_lock = asyncio.Lock()
+        self._load_task: Optional["asyncio.Task[None]"] = None
+        self._stop_unsub: Optional[Callable[[], None]] = None
+        self._closed = False
+        self.records = 0
+        self.flushes = 0
+        self.rotations = 0
+        self.write_errors = 0
+
+    async def async_load(self) -> None:
+        """Replay the existing file, once, however many callers wait on it."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        self._latest, self._size = await self.hass.async_add_executor_job(self._load)
+        _LOGGER.debug(
+            f"Transition log {self.path}: {len(self._latest)} alerts restored"
+        )
+
+    def _load(self) -> Tuple[Dict[AlertKey, Tuple[float, int]], int]:
+        """Read the current file (executor)."""
+        if not os.path.exists(self.path):
+            return {}, 0
+        try:
+            state = replay(self.path)
+        except (OSError, ValueError, UnicodeDecodeError) as err:
+            _LOGGER.error(
+                f"Unreadable transition log {self.path}, starting a new one: {err}"
+            )
+            try:
+                os.replace(self.path, f"{self.path}.corrupt")
+            except OSError:
+                pass
+            return {}, 0
+        return state, os.path.getsize(self.path)
+
+    def restored_flags(self, entry_id: str, alert_id: str) -> int:
+        """Return the flags to restore for an alert being set up."""
+        latest = self._latest.get((entry_id, alert_id))
+        return latest[1] & RESTORABLE_FLAGS if latest else 0
+
+    @callback
+    def append(
+        self, entry_id: str, alert_id: str, command: str, flags: int, cause: str
+    ) -> None:
+        """Buffer one transition; it reaches disk with the next flush."""
+        if self._closed:
+            return
+        timestamp = time.time()
+        self._buffer += pack_record(
+            timestamp,
+            _COMMAND_CODES[command],
+            flags,
+            _CAUSE_CODES.get(cause, 0),
+            entry_id,
+            alert_id,
+        )
+        key = (entry_id, alert_id)
+        if flags:
+            self._latest[key] = (timestamp, flags)
+        else:
+            self._latest.pop(key, None)
+        self.records += 1
+        if self._flush_queued:
+            return
+        if len(self._buffer) >= FLUSH_BYTES:
+            self._cancel_scheduled_flush()
+            self._flush_queued = True
+            self.hass.async_create_task(self.async_flush())
+        elif self._flush_unsub is None:
+            self._flush_unsub = async_call_later(
+                self.hass, self.flush_interval, self._scheduled_flush
+            )
+
+    @callback
+    def _scheduled_flush(self, _now) -> None:
+        self._flush_unsub = None
+        self._flush_queued = True
+        self.hass.async_create_task(self.async_flush())
+
+    def _cancel_scheduled_flush(self) -> None:
+        if self._flush_unsub is not None:
+            self._flush_unsub()
+            self._flush_unsub = None
+
+    async def async_flush(self) -> None:
+        """Write and fsync everything buffered so far, in the executor."""
+        async with self._write_lock:
+            self._flush_queued = False
+            if not self._buffer:
+                return
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            # Taken together with the data, so the snapshot matches it.
+            snapshot = (
+                dict(self._latest) if self._size + len(data) > self.max_bytes else None
+            )
+            try:
+                self._size, rotated = await self.hass.async_add_executor_job(
+                    self._write, data, snapshot
+                )
+            except OSError as err:
+                self.write_errors += 1
+                _LOGGER.error(f"Could not write transition log {self.path}: {err}")
+                return
+            self.flushes += 1
+            self.rotations += rotated
+
+    def _write(
+        self, data: bytes, snapshot: Optional[Dict[AlertKey, Tuple[float, int]]]
+    ) -> Tuple[int, bool]:
+        """Append a batch, then rotate if asked (executor)."""
+        with open(self.path, "ab") as handle:
+            if handle.tell() == 0:
+                handle.write(MAGIC)
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+            size = handle.tell()
+        if snapshot is None:
+            return size, False
+
+        if self.backups > 0:
+            for index in range(self.backups - 1, 0, -1):
+                older = f"{self.path}.{index}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        body = b"".join(
+            pack_record(timestamp, _SNAPSHOT_CODE, flags, 0, entry_id, alert_id)
+            for (entry_id, alert_id), (timestamp, flags) in snapshot.items()
+        )
+        with open(self.path, "wb") as handle:
+            handle.write(MAGIC + body)
+            handle.flush()
+            os.fsync(handle.fileno())
+        return len(MAGIC) + len(body), True
+
+    @callback
+    def async_listen_stop(self) -> None:
+        """Close the log when Home Assistant stops."""
+        if self._stop_unsub is None:
+            self._stop_unsub = self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STOP, self.async_close
+            )
+
+    async def async_close(self, _event=None) -> None:
+        """Flush what's buffered and stop accepting records."""
+        if self._stop_unsub is not None:
+            # Once the stop event has fired its listener is already gone.
+            if _event is None:
+                self._stop_unsub()
+            self._stop_unsub = None
+        self._cancel_scheduled_flush()
+        if self._load_task is not None:
+            await self._load_task
+        await self.async_flush()
+        self._closed = True
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for diagnostics."""
+        return {
+            "path": self.path,
+            "size_bytes": self._size,
+            "buffered_bytes": len(self._buffer),
+            "alerts_tracked": len(self._latest),
+            "records": self.records,
+            "flushes": self.flushes,
+            "rotations": self.rotations,
+            "write_errors": self.write_errors,
+        }
+
+
+def _log_enabled(hass: HomeAssistant) -> bool:
+    """Read the option from the global settings hub, whether or not it's set up yet."""
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.data.get("hub_type") == "global":
+            return bool(entry.options.get(CONF_ENABLE_TRANSITION_LOG, False))
+    return False
+
+
+async def async_setup_transition_log(hass: HomeAssistant) -> Optional[TransitionLog]:
+    """Open and replay the shared log if the global hub enables it."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    log = domain_data.get("transition_log")
+    if log is None:
+        if not _log_enabled(hass):
+            return None
+        log = domain_data["transition_log"] = TransitionLog(
+            hass, hass.config.path(TRANSITION_LOG_FILE)
+        )
+        log.async_listen_stop()
+    await log.async_load()
+    return log
+
+
+async def async_close_transition_log(hass: HomeAssistant) -> None:
+    """Flush and drop the shared log, e.g. when the global hub unloads."""
+    log = hass.data.get(DOMAIN, {}).pop("transition_log", None)
+    if log is not None:
+        await log.async_close()
@@ -6,14 +6,23 @@ import logging
 from typing import Dict, Any, Optional
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.template import Template
+from homeassistant.util import dt as dt_util
 
 from ..const import (
+    CONF_ATTRIBUTE,
     TRIGGER_TYPE_SIMPLE,
     TRIGGER_TYPE_TEMPLATE,
     TRIGGER_TYPE_LOGICAL,
+    TRIGGER_TYPE_NUMERIC,
+    TRIGGER_TYPE_OCCURRENCE,
+    TRIGGER_TYPE_RATE,
+    TRIGGER_TYPE_ANOMALY,
+    TRIGGER_TYPE_STALE,
     # TRIGGER_TYPE_COMBINED removed in Phase 2
-    COMP_EQ, COMP_NE, COMP_LT, COMP_LTE, COMP_GT, COMP_GTE,
 )
+from .conditions import Condition, ConditionTree, compile_accessor
+from .numeric import NumericThreshold
+from .staleness import StaleRule, last_report
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,7 +39,7 @@ class TriggerEvaluator:
         
         Args:
             config: Trigger configuration dictionary containing:
-                - trigger_type: Type of trigger (simple, template, logical, combined)
+                - trigger_type: Type of trigger (simple, template, logical, numeric)
                 - Additional fields based on trigger type
         
         Returns:
@@ -44,21 +53,22 @@ class TriggerEvaluator:
             return await self._evaluate_template(config)
         elif trigger_type == TRIGGER_TYPE_LOGICAL:
             return self._evaluate_logical(config)
+        elif trigger_type == TRIGGER_TYPE_NUMERIC:
+            return self._evaluate_numeric(config)
+        elif trigger_type == TRIGGER_TYPE_STALE:
+            return self._evaluate_stale(config)
+        elif trigger_type in (TRIGGER_TYPE_OCCURRENCE, TRIGGER_TYPE_RATE, TRIGGER_TYPE_ANOMALY):
+            # These look at past state changes; a one-off evaluation has none.
+            return False
         # TRIGGER_TYPE_COMBINED removed in Phase 2 - was redundant with logical
         else:
             _LOGGER.warning(f"Unknown trigger type: {trigger_type}")
             return False
     
     def _evaluate_simple(self, config: Dict[str, Any]) -> bool:
-        """Evaluate simple entity state trigger."""
-        entity_id = config.get("entity_id")
-        trigger_state = config.get("trigger_state")
-        
-        if not entity_id or trigger_state is None:
-            return False
-        
-        state = self.hass.states.get(entity_id)
-        return state and state.state == trigger_state
+        """Evaluate simple entity state (or attribute) trigger."""
+        condition = Condition.from_config(config, "trigger_state", config.get("entity_id"))
+        return condition is not None and condition.holds(self.hass.states.get)
     
     async def _evaluate_template(self, config: Dict[str, Any]) -> bool:
         """Evaluate Jinja2 template trigger."""
@@ -77,84 +87,33 @@ class TriggerEvaluator:
             return False
     
     def _evaluate_logical(self, config: Dict[str, Any]) -> bool:
-        """Evaluate logical AND/OR conditions."""
-        conditions = config.get("logical_conditions", [])
-        operator = config.get("logical_operator", "and")
-        
-        if not conditions:
+        """Evaluate logical AND/OR/NOT condition trees."""
+        tree = ConditionTree(
+            config.get("logical_conditions", []), config.get("logical_operator") == "or"
+        )
+        return tree.evaluate(tree.new_cache(), self.hass.states.get)
+
+    def _evaluate_numeric(self, config: Dict[str, Any]) -> bool:
+        """Evaluate numeric threshold trigger.
+
+        Stateless, so hysteresis doesn't apply: this is the rising-edge
+        comparison against ``threshold``.
+        """
+        entity_id = config.get("entity_id")
+        numeric = NumericThreshold.from_config(config)
+        if not entity_id or numeric is None:
             return False
-        
-        results = []
-        for cond in conditions:
-            if not isinstance(cond, dict) or "entity_id" not in cond or "state" not in cond:
-                _LOGGER.warning(f"Invalid logical condition format: {cond}")
-                results.append(False)
-                continue
-            
-            state = self.hass.states.get(cond["entity_id"])
-            results.append(state and state.state == cond["state"])
-        
-        if operator == "or":
-            return any(results) if results else False
-        else:  # Default to AND
-            return all(results) if results else False
-    
-    def _evaluate_combined(self, config: Dict[str, Any]) -> bool:
-        """Evaluate combined trigger with comparators."""
-        conditions = config.get("combined_conditions", [])
-        operator = config.get("combined_operator", "and")
-        
-        if not conditions:
+
+        state = self.hass.states.get(entity_id)
+        value = compile_accessor(config.get(CONF_ATTRIBUTE))(state) if state else None
+        return numeric.evaluate(value, False)
+
+    def _evaluate_stale(self, config: Dict[str, Any]) -> bool:
+        """Evaluate a staleness trigger: the last report is too old, or there is none."""
+        rule = StaleRule.from_config(config)
+        if rule is None:
             return False
-        
-        results = []
-        for cond in conditions:
-            if not isinstance(cond, dict) or "entity_id" not in cond or "value" not in cond:
-                _LOGGER.warning(f"Invalid combined condition format: {cond}")
-                results.append(False)
-                continue
-            
-            state = self.hass.states.get(cond["entity_id"])
-            if not state:
-                results.append(False)
-                continue
-            
-            comparator = cond.get("comparator", COMP_EQ)
-            results.append(self._compare_values(state.state, comparator, cond["value"]))
-        
-        if operator == "or":
-            return any(results) if results else False
-        else:  # Default to AND
-            return all(results) if results else False
-    
-    def _compare_values(self, entity_state: str, comparator: str, expected_value: str) -> bool:
-        """Compare entity state using provided comparator."""
-        # Attempt numeric comparison first
-        def _to_number(value):
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                return None
-        
-        left_num = _to_number(entity_state)
-        right_num = _to_number(expected_value)
-        
-        # Numeric comparisons
-        if comparator in {COMP_LT, COMP_LTE, COMP_GT, COMP_GTE} and left_num is not None and right_num is not None:
-            if comparator == COMP_LT:
-                return left_num < right_num
-            if comparator == COMP_LTE:
-                return left_num <= right_num
-            if comparator == COMP_GT:
-                return left_num > right_num
-            if comparator == COMP_GTE:
-                return left_num >= right_num
-        
-        # String comparisons
-        if comparator == COMP_EQ:
-            return str(entity_state) == str(expected_value)
-        if comparator == COMP_NE:
-            return str(entity_state) != str(expected_value)
-        
-        # Default to equality
-        return str(entity_state) == str(expected_value)
\ No newline at end of file
+        reported = last_report(self.hass.states.get(rule.entity_id))
+        return reported is None or (
+            dt_util.utcnow().timestamp() - reported >= rule.stale_seconds
+        )
@@ -1,5 +1,113 @@
-# diagnostics.py stub for Home Assistant diagnostics support
+"""Diagnostics support for Emergency Alerts.
 
+Everything here is read from counters the entities already maintain — no
+templates are rendered and no states are written — so pulling diagnostics
+from a large install stays cheap.
+"""
 
-def async_get_config_entry_diagnostics(hass, entry):
-    return {"info": "Diagnostics not yet implemented."}
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .core.history import ENTRY_BYTES
+from .core.metrics import async_get_integration_metrics
+
+# Action service payloads can carry phone numbers, device IDs and message
+# text; keep the service names but drop everything passed to them.
+TO_REDACT = {"data", "service_data"}
+
+
+def _entities_for_entry(hass: HomeAssistant, entry_id: str) -> list:
+    """Return the alert entities that belong to a config entry."""
+    return [
+        entity
+        for entity in hass.data.get(DOMAIN, {}).get("entities", [])
+        if getattr(getattr(entity, "_entry", None), "entry_id", None) == entry_id
+    ]
+
+
+def _hub_runtime(entities: list) -> dict[str, Any]:
+    """Aggregate runtime counters for the alerts of one hub."""
+    by_trigger_type: Counter[str] = Counter()
+    by_status: Counter[str] = Counter()
+    pending_timers: Counter[str] = Counter()
+    subscriptions: Counter[str] = Counter()
+    actions = {"dispatched": 0, "failed": 0, "in_flight": 0}
+    state_writes = 0
+    history = {"transitions": 0, "bytes": 0}
+    alerts: dict[str, Any] = {}
+
+    for entity in entities:
+        metrics = entity._metrics
+        by_trigger_type[entity._trigger_type] += 1
+        by_status[entity.get_status()] += 1
+        for kind, armed in entity.pending_timers().items():
+            pending_timers[kind] += int(armed)
+        for entity_id in entity.subscribed_entities():
+            subscriptions[entity_id] += 1
+        actions["dispatched"] += metrics.actions_dispatched
+        actions["failed"] += metrics.actions_failed
+        actions["in_flight"] += metrics.actions_in_flight
+        state_writes += metrics.state_writes + metrics.status_writes
+        if entity._history is not None:
+            history["transitions"] += len(entity._history)
+            history["bytes"] += entity._history.capacity * ENTRY_BYTES
+        alerts[entity._alert_id] = metrics.as_dict()
+
+    return {
+        "alert_count": len(entities),
+        "by_trigger_type": dict(by_trigger_type),
+        "by_status": dict(by_status),
+        "pending_timers": {
+            kind: pending_timers.get(kind, 0)
+            for kind in ("for_seconds", "escalation", "snooze", "window", "flap")
+        },
+        "actions": actions,
+        "state_writes": state_writes,
+        "subscriptions": dict(subscriptions),
+        "history": history,
+        "alerts": alerts,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    hub_type = entry.data.get("hub_type")
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "title": entry.title,
+            "version": entry.version,
+            "hub_type": hub_type,
+            "hub_name": entry.data.get("hub_name"),
+        },
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+    }
+
+    if hub_type == "group":
+        diagnostics["alerts"] = async_redact_data(
+            dict(entry.data.get("alerts", {})), TO_REDACT
+        )
+        diagnostics["runtime"] = _hub_runtime(_entities_for_entry(hass, entry.entry_id))
+    elif hub_type == "global":
+        # The global hub owns no alerts; summarize every group hub instead.
+        diagnostics["hubs"] = {
+            group_entry.data.get("hub_name", group_entry.entry_id): _hub_runtime(
+                _entities_for_entry(hass, group_entry.entry_id)
+            )
+            for group_entry in hass.config_entries.async_entries(DOMAIN)
+            if group_entry.data.get("hub_type") == "group"
+        }
+        diagnostics["integration"] = async_get_integration_metrics(hass).snapshot()
+        log = hass.data.get(DOMAIN, {}).get("transition_log")
+        if log is not None:
+            diagnostics["transition_log"] = log.stats()
+
+    return diagnostics
@@ -1,14 +1,12 @@
 """Select platform for Emergency Alerts integration - unified state control."""
 import logging
-import asyncio
-from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 
 from .const import (
@@ -19,11 +17,20 @@ from .const import (
     STATE_SNOOZED,
     STATE_ESCALATED,
     STATE_RESOLVED,
-    DEFAULT_SNOOZE_DURATION,
     SIGNAL_ALERT_UPDATE,
-    EVENT_ALERT_ACKNOWLEDGED,
-    EVENT_ALERT_SNOOZED,
-    EVENT_ALERT_RESOLVED,
+    SIGNAL_PATTERN_MATCH,
+)
+from .core.definition import AlertDefinition, async_get_alert_definitions
+from .core.history import CAUSE_SELECT
+from .core.profiler import profiled
+from .core.runtime import async_find_alert_runtime
+from .core.state_machine import (
+    CMD_ACKNOWLEDGE,
+    CMD_ESCALATE,
+    CMD_REACTIVATE,
+    CMD_RESET,
+    CMD_RESOLVE,
+    CMD_SNOOZE,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -50,6 +57,16 @@ INFO_ALERT_STATES = [
     STATE_RESOLVED,
 ]
 
+# State machine command for each option.
+_OPTION_COMMANDS = {
+    STATE_INACTIVE: CMD_RESET,
+    STATE_ACTIVE: CMD_REACTIVATE,
+    STATE_ACKNOWLEDGED: CMD_ACKNOWLEDGE,
+    STATE_SNOOZED: CMD_SNOOZE,
+    STATE_ESCALATED: CMD_ESCALATE,
+    STATE_RESOLVED: CMD_RESOLVE,
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -59,14 +76,26 @@ async def async_setup_entry(
         return
 
     alerts_data = entry.data.get("alerts", {})
-    selects = []
+    definitions = async_get_alert_definitions(hass, entry)
 
-    for alert_id, alert_data in alerts_data.items():
+    @callback
+    def async_add_alerts(alert_ids):
         # Create single select entity per alert for state control
-        selects.append(EmergencyAlertStateSelect(hass, entry, alert_id, alert_data))
-
-    if selects:
-        async_add_entities(selects, update_before_add=True)
+        selects = [
+            EmergencyAlertStateSelect(
+                hass, entry, alert_id, alerts_data.get(alert_id, {}), definitions[alert_id]
+            )
+            for alert_id in alert_ids
+        ]
+        if selects:
+            async_add_entities(selects, update_before_add=True)
+
+    async_add_alerts(list(definitions))
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_PATTERN_MATCH}_{entry.entry_id}", async_add_alerts
+        )
+    )
 
 
 class EmergencyAlertStateSelect(SelectEntity):
@@ -78,20 +107,23 @@ class EmergencyAlertStateSelect(SelectEntity):
         entry: ConfigEntry,
         alert_id: str,
         alert_data: dict,
+        definition: AlertDefinition | None = None,
     ) -> None:
         """Initialize the select entity."""
         self.hass = hass
         self._entry = entry
         self._alert_id = alert_id
-        self._alert_data = alert_data
+        self._definition = (
+            definition
+            if definition is not None
+            else AlertDefinition.from_config(alert_id, alert_data)
+        )
         # Severity decides the option set: info alerts are ambient (no snooze,
         # no escalation), warning/critical use the full state machine.
-        self._severity = alert_data.get("severity", "warning")
         self._attr_options = (
-            INFO_ALERT_STATES if self._severity == "info" else ALERT_STATES
+            INFO_ALERT_STATES if self._definition.severity == "info" else ALERT_STATES
         )
         self._attr_current_option = STATE_ACTIVE
-        self._snooze_task = None
 
         # Modern HA naming: device carries the alert's display name, the select
         # entity is just the "State" surface on that device. HA renders this as
@@ -104,9 +136,11 @@ class EmergencyAlertStateSelect(SelectEntity):
         self.entity_id = f"select.{alert_id}_state"
         self._attr_icon = "mdi:state-machine"
 
-        # Device info - link to alert device (name comes from binary_sensor)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, f"alert_{entry.entry_id}_{alert_id}")},
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Link to the alert device (name comes from binary_sensor)."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"alert_{self._entry.entry_id}_{self._alert_id}")},
         )
 
     async def async_added_to_hass(self) -> None:
@@ -124,6 +158,7 @@ class EmergencyAlertStateSelect(SelectEntity):
         self._sync_state_from_binary_sensor()
 
     @callback
+    @profiled
     def _handle_alert_update(self) -> None:
         """Handle alert updates - sync our state from binary sensor."""
         self._sync_state_from_binary_sensor()
@@ -139,6 +174,8 @@ class EmergencyAlertStateSelect(SelectEntity):
                 self._attr_current_option = STATE_RESOLVED
             elif binary_sensor._snoozed:
                 self._attr_current_option = STATE_SNOOZED
+            elif binary_sensor._escalated:
+                self._attr_current_option = STATE_ESCALATED
             elif binary_sensor._acknowledged:
                 self._attr_current_option = STATE_ACKNOWLEDGED
             elif binary_sensor.is_on:
@@ -148,6 +185,9 @@ class EmergencyAlertStateSelect(SelectEntity):
 
     def _get_binary_sensor_entity(self):
         """Get the binary sensor entity instance."""
+        runtime = async_find_alert_runtime(self.hass, self._entry.entry_id, self._alert_id)
+        if runtime is not None and runtime.alert is not None:
+            return runtime.alert
         entities = self.hass.data.get(DOMAIN, {}).get("entities", [])
         for entity in entities:
             if (
@@ -166,132 +206,14 @@ class EmergencyAlertStateSelect(SelectEntity):
             _LOGGER.warning(f"Could not find binary sensor for alert {self._alert_id}")
             return
 
-        _LOGGER.info(f"Setting alert {self._alert_id} state to: {option}")
-
-        # Clear all states first
-        binary_sensor._acknowledged = False
-        binary_sensor._snoozed = False
-        binary_sensor._resolved = False
-        binary_sensor._escalated = False
-        binary_sensor._snooze_until = None
-        
-        # Cancel any running timers
-        if binary_sensor._escalation_task:
-            binary_sensor._escalation_task()
-            binary_sensor._escalation_task = None
-        
-        if self._snooze_task:
-            self._snooze_task.cancel()
-            self._snooze_task = None
-
-        # Set new state and execute corresponding actions
-        if option == STATE_ACKNOWLEDGED:
-            binary_sensor._acknowledged = True
-            self._attr_current_option = STATE_ACKNOWLEDGED
-            
-            # Fire event
-            self.hass.bus.async_fire(
-                EVENT_ALERT_ACKNOWLEDGED,
-                {"entity_id": binary_sensor.entity_id, "alert_name": self._alert_data.get("name")},
-            )
-            
-            # Execute action
-            if "on_acknowledged" in self._alert_data:
-                await binary_sensor._execute_action(self._alert_data["on_acknowledged"])
-            
-            _LOGGER.info(f"Alert {self._alert_id} acknowledged")
-
-        elif option == STATE_SNOOZED:
-            binary_sensor._snoozed = True
-            snooze_duration = self._alert_data.get("snooze_duration", DEFAULT_SNOOZE_DURATION)
-            binary_sensor._snooze_until = datetime.now() + timedelta(seconds=snooze_duration)
-            self._attr_current_option = STATE_SNOOZED
-            
-            # Start snooze timer
-            self._snooze_task = asyncio.create_task(
-                self._snooze_timer(snooze_duration, binary_sensor)
-            )
-            
-            # Fire event
-            self.hass.bus.async_fire(
-                EVENT_ALERT_SNOOZED,
-                {
-                    "entity_id": binary_sensor.entity_id,
-                    "alert_name": self._alert_data.get("name"),
-                    "snooze_until": binary_sensor._snooze_until.isoformat(),
-                },
-            )
-            
-            # Execute action
-            if "on_snoozed" in self._alert_data:
-                await binary_sensor._execute_action(self._alert_data["on_snoozed"])
-            
-            _LOGGER.info(f"Alert {self._alert_id} snoozed for {snooze_duration} seconds")
-
-        elif option == STATE_RESOLVED:
-            binary_sensor._resolved = True
-            self._attr_current_option = STATE_RESOLVED
-            
-            # Fire event
-            self.hass.bus.async_fire(
-                EVENT_ALERT_RESOLVED,
-                {"entity_id": binary_sensor.entity_id, "alert_name": self._alert_data.get("name")},
-            )
-            
-            # Execute action
-            if "on_resolved" in self._alert_data:
-                await binary_sensor._execute_action(self._alert_data["on_resolved"])
-            
-            _LOGGER.info(f"Alert {self._alert_id} marked as resolved")
-
-        elif option == STATE_ACTIVE:
-            # Return to active state (clear all flags)
-            self._attr_current_option = STATE_ACTIVE
-            
-            # Restart escalation timer if alert is still on
-            if binary_sensor.is_on:
-                await binary_sensor._start_escalation_timer()
-            
-            _LOGGER.info(f"Alert {self._alert_id} returned to active state")
-
-        # Update all entities
-        binary_sensor.async_write_ha_state()
-        binary_sensor._update_status_sensor()
-        self.async_write_ha_state()
-
-        # Broadcast update
-        async_dispatcher_send(
-            self.hass,
-            f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-        )
-
-    async def _snooze_timer(self, duration: int, binary_sensor) -> None:
-        """Auto clear snooze after duration."""
-        try:
-            await asyncio.sleep(duration)
-            
-            # Time expired, return to active state
-            binary_sensor._snoozed = False
-            binary_sensor._snooze_until = None
-            self._snooze_task = None
-            
-            # Determine new state
-            if binary_sensor.is_on:
-                self._attr_current_option = STATE_ACTIVE
-                # Restart escalation if alert still active
-                await binary_sensor._start_escalation_timer()
-            else:
-                self._attr_current_option = STATE_INACTIVE
-            
-            binary_sensor.async_write_ha_state()
-            self.async_write_ha_state()
-
-            async_dispatcher_send(
-                self.hass,
-                f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-            )
+        command = _OPTION_COMMANDS.get(option)
+        if command is None:
+            _LOGGER.warning(f"Unknown state {option} for alert {self._alert_id}")
+            return
 
-            _LOGGER.info(f"Snooze expired for alert {self._alert_id}")
-            
-        except asyncio.CancelledError:
-            _LOGGER.debug(f"Snooze timer cancelled for alert {self._alert_id}")
\ No newline at end of file
+        _LOGGER.info(f"Setting alert {self._alert_id} state to: {option}")
+        if not binary_sensor.transition(command, CAUSE_SELECT):
+            _LOGGER.debug(f"Alert {self._alert_id} cannot move to {option} from its current state")
+        # The alert update signal re-syncs and writes every sibling entity;
+        # keep this one current even when it isn't registered.
+        self._sync_state_from_binary_sensor()
@@ -1,12 +1,23 @@
 import logging
+import time
+from datetime import timedelta
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import callback, HomeAssistant
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
-from .const import DOMAIN
+from .const import (
+    CONF_ENABLE_PERFORMANCE_SENSORS,
+    CONF_PERFORMANCE_INTERVAL,
+    DEFAULT_PERFORMANCE_INTERVAL,
+    DOMAIN,
+)
+from .core.metrics import async_get_integration_metrics, IntegrationMetrics
+from .core.profiler import profiled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,6 +56,25 @@ async def async_setup_entry(
         hub_sensor = EmergencyHubSensor(hass, entry, group_name, hub_name)
         async_add_entities([hub_sensor], update_before_add=True)
 
+    # Optional hot-path instrumentation, owned by the global settings hub
+    if hub_type == "global" and entry.options.get(CONF_ENABLE_PERFORMANCE_SENSORS):
+        publisher = PerformancePublisher(async_get_integration_metrics(hass))
+        sensors = [
+            EmergencyPerformanceSensor(publisher, key, name, unit, state_class)
+            for key, name, unit, state_class in PERFORMANCE_SENSORS
+        ]
+        publisher.sensors = sensors
+        async_add_entities(sensors)
+
+        interval = entry.options.get(
+            CONF_PERFORMANCE_INTERVAL, DEFAULT_PERFORMANCE_INTERVAL
+        )
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, publisher.async_publish, timedelta(seconds=interval)
+            )
+        )
+
 
 class EmergencyGlobalSummarySensor(SensorEntity):
     _attr_should_poll = False
@@ -62,16 +92,19 @@ class EmergencyGlobalSummarySensor(SensorEntity):
     async def async_added_to_hass(self):
         from .binary_sensor import SUMMARY_UPDATE_SIGNAL
 
-        @callback
-        def update_summary():
-            self._update_active_alerts()
-            self.async_write_ha_state()
-
+        self._metrics = async_get_integration_metrics(self.hass)
         self._unsub = async_dispatcher_connect(
-            self.hass, SUMMARY_UPDATE_SIGNAL, update_summary
+            self.hass, SUMMARY_UPDATE_SIGNAL, self._handle_summary_update
         )
         self._update_active_alerts()
 
+    @callback
+    @profiled
+    def _handle_summary_update(self):
+        self._update_active_alerts()
+        self._metrics.summary_writes += 1
+        self.async_write_ha_state()
+
     async def async_will_remove_from_hass(self):
         if self._unsub:
             self._unsub()
@@ -138,16 +171,20 @@ class EmergencyHubSensor(SensorEntity):
         """Subscribe to alert state-change broadcasts."""
         from .binary_sensor import SUMMARY_UPDATE_SIGNAL
 
-        @callback
-        def update_summary():
-            self._refresh_active_alerts()
-            self.async_write_ha_state()
-
+        self._metrics = async_get_integration_metrics(self.hass)
         self._unsub = async_dispatcher_connect(
-            self.hass, SUMMARY_UPDATE_SIGNAL, update_summary
+            self.hass, SUMMARY_UPDATE_SIGNAL, self._handle_summary_update
         )
         self._refresh_active_alerts()
 
+    @callback
+    @profiled
+    def _handle_summary_update(self):
+        """Recompute the firing list and write state on a summary broadcast."""
+        self._refresh_active_alerts()
+        self._metrics.summary_writes += 1
+        self.async_write_ha_state()
+
     async def async_will_remove_from_hass(self):
         if self._unsub:
             self._unsub()
@@ -184,3 +221,82 @@ class EmergencyHubSensor(SensorEntity):
             "alerts": list(alerts_data.keys()),
             "active_alerts": list(self._active_alerts),
         }
+
+
+# (key, name, unit, state_class) for each optional performance sensor
+PERFORMANCE_SENSORS = (
+    ("evaluations_per_second", "Evaluations per second", "evaluations/s", SensorStateClass.MEASUREMENT),
+    ("skipped_evaluations_per_second", "Skipped evaluations per second", "evaluations/s", SensorStateClass.MEASUREMENT),
+    ("trigger_latency_p50", "Trigger latency p50", "ms", SensorStateClass.MEASUREMENT),
+    ("trigger_latency_p95", "Trigger latency p95", "ms", SensorStateClass.MEASUREMENT),
+    ("trigger_latency_p99", "Trigger latency p99", "ms", SensorStateClass.MEASUREMENT),
+    ("actions_dispatched", "Actions dispatched", None, SensorStateClass.TOTAL_INCREASING),
+    ("actions_failed", "Actions failed", None, SensorStateClass.TOTAL_INCREASING),
+    ("summary_writes_per_second", "Summary writes per second", "writes/s", SensorStateClass.MEASUREMENT),
+    ("evaluation_loop_time", "Evaluation loop time", "ms/s", SensorStateClass.MEASUREMENT),
+    ("action_loop_time", "Action dispatch loop time", "ms/s", SensorStateClass.MEASUREMENT),
+)
+
+
+class PerformancePublisher:
+    """Turn the integration-wide hot-path counters into sensor values.
+
+    Alert callbacks only bump counters; this runs on the publish interval and
+    is the only place performance sensors write state.
+    """
+
+    def __init__(self, metrics: IntegrationMetrics):
+        self._metrics = metrics
+        self._last = metrics.snapshot()
+        self._last_time = time.monotonic()
+        self.values: dict = {}
+        self.sensors: list = []
+
+    @callback
+    def async_publish(self, _now=None):
+        """Compute per-interval rates and percentiles, then write the sensors."""
+        now = time.monotonic()
+        elapsed = max(now - self._last_time, 1e-9)
+        current = self._metrics.snapshot()
+        delta = {key: current[key] - self._last[key] for key in current}
+        histogram = self._metrics.trigger_to_state
+
+        self.values = {
+            "evaluations_per_second": round(delta["evaluations"] / elapsed, 2),
+            "skipped_evaluations_per_second": round(delta["evaluations_skipped"] / elapsed, 2),
+            "trigger_latency_p50": histogram.percentile(0.50),
+            "trigger_latency_p95": histogram.percentile(0.95),
+            "trigger_latency_p99": histogram.percentile(0.99),
+            "actions_dispatched": current["actions_dispatched"],
+            "actions_failed": current["actions_failed"],
+            "summary_writes_per_second": round(delta["summary_writes"] / elapsed, 2),
+            "evaluation_loop_time": round(delta["evaluation_time_ns"] / 1e6 / elapsed, 3),
+            "action_loop_time": round(delta["action_time_ns"] / 1e6 / elapsed, 3),
+        }
+        histogram.reset()
+        self._last = current
+        self._last_time = now
+
+        for sensor in self.sensors:
+            if sensor.hass is not None:
+                sensor.async_write_ha_state()
+
+
+class EmergencyPerformanceSensor(SensorEntity):
+    """Diagnostic sensor exposing one hot-path performance figure."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, publisher, key, name, unit, state_class):
+        self._publisher = publisher
+        self._key = key
+        self._attr_name = f"Emergency Alerts {name}"
+        self._attr_unique_id = f"emergency_alerts_performance_{key}"
+        self._attr_icon = "mdi:speedometer"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    @property
+    def native_value(self):
+        return self._publisher.values.get(self._key)
@@ -1,14 +1,12 @@
 """Switch platform for Emergency Alerts integration."""
 import logging
-import asyncio
-from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity, SwitchDeviceClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 
 from .const import (
@@ -16,16 +14,25 @@ from .const import (
     SWITCH_TYPE_ACKNOWLEDGE,
     SWITCH_TYPE_SNOOZE,
     SWITCH_TYPE_RESOLVE,
-    STATE_EXCLUSIONS,
-    STATE_ACKNOWLEDGED,
-    STATE_SNOOZED,
-    STATE_RESOLVED,
-    DEFAULT_SNOOZE_DURATION,
-    SIGNAL_SWITCH_UPDATE,
     SIGNAL_ALERT_UPDATE,
-    EVENT_ALERT_ACKNOWLEDGED,
-    EVENT_ALERT_SNOOZED,
-    EVENT_ALERT_RESOLVED,
+    SIGNAL_PATTERN_MATCH,
+)
+from .core.definition import AlertDefinition, async_get_alert_definitions
+from .core.history import CAUSE_SWITCH
+from .core.profiler import profiled
+from .core.runtime import (
+    FLAG_ACKNOWLEDGED,
+    FLAG_RESOLVED,
+    FLAG_SNOOZED,
+    async_find_alert_runtime,
+)
+from .core.state_machine import (
+    CMD_ACKNOWLEDGE,
+    CMD_RESOLVE,
+    CMD_SNOOZE,
+    CMD_UNACKNOWLEDGE,
+    CMD_UNRESOLVE,
+    CMD_UNSNOOZE,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,20 +46,43 @@ async def async_setup_entry(
         return
 
     alerts_data = entry.data.get("alerts", {})
-    switches = []
+    definitions = async_get_alert_definitions(hass, entry)
+
+    @callback
+    def async_add_alerts(alert_ids):
+        switches = []
+        for alert_id in alert_ids:
+            # Create 3 switches per alert: acknowledge, snooze, resolve
+            alert_data = alerts_data.get(alert_id, {})
+            definition = definitions[alert_id]
+            for switch_class in (
+                EmergencyAlertAcknowledgeSwitch,
+                EmergencyAlertSnoozeSwitch,
+                EmergencyAlertResolveSwitch,
+            ):
+                switches.append(switch_class(hass, entry, alert_id, alert_data, definition))
 
-    for alert_id, alert_data in alerts_data.items():
-        # Create 3 switches per alert: acknowledge, snooze, resolve
-        switches.append(EmergencyAlertAcknowledgeSwitch(hass, entry, alert_id, alert_data))
-        switches.append(EmergencyAlertSnoozeSwitch(hass, entry, alert_id, alert_data))
-        switches.append(EmergencyAlertResolveSwitch(hass, entry, alert_id, alert_data))
+        if switches:
+            async_add_entities(switches, update_before_add=True)
 
-    if switches:
-        async_add_entities(switches, update_before_add=True)
+    async_add_alerts(list(definitions))
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_PATTERN_MATCH}_{entry.entry_id}", async_add_alerts
+        )
+    )
 
 
 class BaseEmergencyAlertSwitch(SwitchEntity):
-    """Base class for Emergency Alert switches."""
+    """Base class for Emergency Alert switches.
+
+    Each switch mirrors one runtime flag and turns it on and off through a
+    pair of state machine commands.
+    """
+
+    _flag = 0
+    _on_command = ""
+    _off_command = ""
 
     def __init__(
         self,
@@ -62,12 +92,17 @@ class BaseEmergencyAlertSwitch(SwitchEntity):
         alert_data: dict,
         switch_type: str,
         switch_name: str,
+        definition: AlertDefinition | None = None,
     ) -> None:
         """Initialize the switch."""
         self.hass = hass
         self._entry = entry
         self._alert_id = alert_id
-        self._alert_data = alert_data
+        self._definition = (
+            definition
+            if definition is not None
+            else AlertDefinition.from_config(alert_id, alert_data)
+        )
         self._switch_type = switch_type
         self._attr_is_on = False
 
@@ -77,22 +112,15 @@ class BaseEmergencyAlertSwitch(SwitchEntity):
         self._attr_name = switch_name
         self._attr_unique_id = f"{entry.entry_id}_{alert_id}_{switch_type}"
 
-        # Device info - link to alert device (name comes from binary_sensor)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, f"alert_{entry.entry_id}_{alert_id}")},
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Link to the alert device (name comes from binary_sensor)."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"alert_{self._entry.entry_id}_{self._alert_id}")},
         )
 
     async def async_added_to_hass(self) -> None:
         """Register callbacks when entity is added."""
-        # Listen for switch updates
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                f"{SIGNAL_SWITCH_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-                self._handle_switch_update,
-            )
-        )
-
         # Listen for alert updates (to sync state)
         self.async_on_remove(
             async_dispatcher_connect(
@@ -101,43 +129,26 @@ class BaseEmergencyAlertSwitch(SwitchEntity):
                 self._handle_alert_update,
             )
         )
+        self._sync_state_from_binary_sensor()
 
     @callback
-    def _handle_switch_update(self, switch_type: str = None, state: bool = None) -> None:
-        """Handle switch state updates from binary sensor."""
-        # If switch_type matches or not provided, update state
-        if switch_type is None or switch_type == self._switch_type:
-            if state is not None:
-                self._attr_is_on = state
-            else:
-                # If state not provided, sync from binary sensor
-                self._sync_state_from_binary_sensor()
-            self.async_write_ha_state()
-
-    @callback
+    @profiled
     def _handle_alert_update(self) -> None:
         """Handle alert updates - sync our state from binary sensor."""
         self._sync_state_from_binary_sensor()
         self.async_write_ha_state()
 
     def _sync_state_from_binary_sensor(self) -> None:
-        """Sync switch state from binary sensor entity attributes."""
-        # Use the same entity ID pattern as binary sensor: emergency_{hub_name}_{alert_id}
-        hub_name = self._entry.data.get("hub_name", "")
-        binary_sensor_id = f"binary_sensor.emergency_{hub_name}_{self._alert_id}"
-        entity = self.hass.states.get(binary_sensor_id)
-
-        if entity:
-            # Get state from attributes
-            if self._switch_type == SWITCH_TYPE_ACKNOWLEDGE:
-                self._attr_is_on = entity.attributes.get("acknowledged", False)
-            elif self._switch_type == SWITCH_TYPE_SNOOZE:
-                self._attr_is_on = entity.attributes.get("snoozed", False)
-            elif self._switch_type == SWITCH_TYPE_RESOLVE:
-                self._attr_is_on = entity.attributes.get("resolved", False)
+        """Sync switch state from the alert's runtime flags."""
+        binary_sensor = self._get_binary_sensor_entity()
+        if binary_sensor:
+            self._attr_is_on = bool(binary_sensor._runtime.flags & self._flag)
 
     def _get_binary_sensor_entity(self):
         """Get the binary sensor entity instance."""
+        runtime = async_find_alert_runtime(self.hass, self._entry.entry_id, self._alert_id)
+        if runtime is not None and runtime.alert is not None:
+            return runtime.alert
         entities = self.hass.data.get(DOMAIN, {}).get("entities", [])
         for entity in entities:
             if (
@@ -149,347 +160,81 @@ class BaseEmergencyAlertSwitch(SwitchEntity):
                 return entity
         return None
 
-    async def _enforce_state_exclusions(self, new_state: str) -> None:
-        """Enforce mutual exclusivity of states."""
-        if new_state in STATE_EXCLUSIONS:
-            excluded_states = STATE_EXCLUSIONS[new_state]
-            binary_sensor = self._get_binary_sensor_entity()
-
-            if binary_sensor:
-                # Turn off excluded switches
-                excluded_switch_types = []
-                for excluded_state in excluded_states:
-                    if excluded_state == STATE_ACKNOWLEDGED and binary_sensor._acknowledged:
-                        binary_sensor._acknowledged = False
-                        excluded_switch_types.append(SWITCH_TYPE_ACKNOWLEDGE)
-                        _LOGGER.debug(f"Turning off acknowledged for {self._alert_id} due to {new_state}")
-                    elif excluded_state == STATE_SNOOZED and binary_sensor._snoozed:
-                        binary_sensor._snoozed = False
-                        binary_sensor._snooze_until = None
-                        excluded_switch_types.append(SWITCH_TYPE_SNOOZE)
-                        if binary_sensor._snooze_task:
-                            binary_sensor._snooze_task.cancel()
-                        _LOGGER.debug(f"Turning off snoozed for {self._alert_id} due to {new_state}")
-                    elif excluded_state == STATE_RESOLVED and binary_sensor._resolved:
-                        binary_sensor._resolved = False
-                        excluded_switch_types.append(SWITCH_TYPE_RESOLVE)
-                        _LOGGER.debug(f"Turning off resolved for {self._alert_id} due to {new_state}")
-
-                # Update binary sensor
-                binary_sensor.async_write_ha_state()
-                binary_sensor._update_status_sensor()
-
-                # Explicitly update excluded switches by finding and updating them directly
-                # This ensures switches are updated even if dispatcher isn't set up (e.g., in unit tests)
-                entities = self.hass.data.get(DOMAIN, {}).get("entities", [])
-                for entity in entities:
-                    if (
-                        hasattr(entity, "_alert_id")
-                        and entity._alert_id == self._alert_id
-                        and hasattr(entity, "_entry")
-                        and entity._entry.entry_id == self._entry.entry_id
-                    ):
-                        # Find all switches for this alert and update excluded ones
-                        # We can't easily find switches, so we'll rely on dispatcher signals
-                        # But we ensure binary sensor state is updated first
-                        break
-
-                # Explicitly update excluded switches via dispatcher
-                # Note: async_dispatcher_send only passes positional args, not keyword args
-                for switch_type in excluded_switch_types:
-                    async_dispatcher_send(
-                        self.hass,
-                        f"{SIGNAL_SWITCH_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-                        switch_type,
-                        False,  # state=False
-                    )
-
-                # Broadcast alert update to sync all switches
-                async_dispatcher_send(
-                    self.hass,
-                    f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-                )
-                
-                # Give dispatcher signals time to process (important for tests)
-                await self.hass.async_block_till_done()
-
-
-class EmergencyAlertAcknowledgeSwitch(BaseEmergencyAlertSwitch):
-    """Switch to acknowledge an alert (prevents escalation)."""
-
-    def __init__(self, hass, entry, alert_id, alert_data):
-        """Initialize acknowledge switch."""
-        super().__init__(
-            hass, entry, alert_id, alert_data,
-            SWITCH_TYPE_ACKNOWLEDGE,
-            "Acknowledged"
-        )
-        self._attr_icon = "mdi:check-circle-outline"
+    async def _async_apply(self, command: str) -> None:
+        """Run a state machine command on the alert.
 
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        """Acknowledge the alert."""
+        The transition applies the state exclusions and timers, and its
+        alert update signal re-syncs every switch of this alert.
+        """
         binary_sensor = self._get_binary_sensor_entity()
         if not binary_sensor:
             _LOGGER.warning(f"Could not find binary sensor for alert {self._alert_id}")
             return
+        binary_sensor.transition(command, CAUSE_SWITCH)
+        # Keep this switch current even when it isn't registered.
+        self._sync_state_from_binary_sensor()
+        _LOGGER.info(f"Alert {self._alert_id}: {command}")
 
-        # Enforce state exclusions first (this will clear conflicting states)
-        await self._enforce_state_exclusions(STATE_ACKNOWLEDGED)
-        
-        # Set acknowledged state after exclusions
-        binary_sensor._acknowledged = True
-        binary_sensor._escalated = False
-        self._attr_is_on = True
-        
-        # Update binary sensor state immediately (this ensures state is synced)
-        binary_sensor.async_write_ha_state()
-        binary_sensor._update_status_sensor()
-
-        # Cancel escalation timer (call cancellation function from async_call_later)
-        if binary_sensor._escalation_task:
-            binary_sensor._escalation_task()  # Call the cancellation function
-            binary_sensor._escalation_task = None
-
-        # Fire event
-        self.hass.bus.async_fire(
-            EVENT_ALERT_ACKNOWLEDGED,
-            {"entity_id": binary_sensor.entity_id, "alert_name": self._alert_data.get("name")},
-        )
-
-        # Execute on_acknowledged action if configured
-        if "on_acknowledged" in self._alert_data:
-            await binary_sensor._execute_action(self._alert_data["on_acknowledged"])
-
-        # Update states
-        binary_sensor.async_write_ha_state()
-        binary_sensor._update_status_sensor()
-        self.async_write_ha_state()
-
-        # Broadcast update
-        async_dispatcher_send(
-            self.hass,
-            f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-        )
-
-        _LOGGER.info(f"Alert {self._alert_id} acknowledged")
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Set the switch's flag on the alert."""
+        await self._async_apply(self._on_command)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        """Un-acknowledge the alert (allow escalation again)."""
-        binary_sensor = self._get_binary_sensor_entity()
-        if not binary_sensor:
-            return
+        """Clear the switch's flag on the alert."""
+        await self._async_apply(self._off_command)
 
-        binary_sensor._acknowledged = False
-        binary_sensor._escalated = False
-        self._attr_is_on = False
 
-        # Restart escalation timer if alert is still active
-        if binary_sensor.is_on:
-            await binary_sensor._start_escalation_timer()
+class EmergencyAlertAcknowledgeSwitch(BaseEmergencyAlertSwitch):
+    """Switch to acknowledge an alert (prevents escalation)."""
 
-        binary_sensor.async_write_ha_state()
-        binary_sensor._update_status_sensor()
-        self.async_write_ha_state()
+    _flag = FLAG_ACKNOWLEDGED
+    _on_command = CMD_ACKNOWLEDGE
+    # Un-acknowledging allows escalation again.
+    _off_command = CMD_UNACKNOWLEDGE
 
-        async_dispatcher_send(
-            self.hass,
-            f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
+    def __init__(self, hass, entry, alert_id, alert_data, definition=None):
+        """Initialize acknowledge switch."""
+        super().__init__(
+            hass, entry, alert_id, alert_data,
+            SWITCH_TYPE_ACKNOWLEDGE,
+            "Acknowledged",
+            definition,
         )
-
-        _LOGGER.info(f"Alert {self._alert_id} un-acknowledged")
+        self._attr_icon = "mdi:check-circle-outline"
 
 
 class EmergencyAlertSnoozeSwitch(BaseEmergencyAlertSwitch):
     """Switch to snooze an alert (temporary silence)."""
 
-    def __init__(self, hass, entry, alert_id, alert_data):
+    _flag = FLAG_SNOOZED
+    _on_command = CMD_SNOOZE
+    _off_command = CMD_UNSNOOZE
+
+    def __init__(self, hass, entry, alert_id, alert_data, definition=None):
         """Initialize snooze switch."""
         super().__init__(
             hass, entry, alert_id, alert_data,
             SWITCH_TYPE_SNOOZE,
-            "Snoozed"
+            "Snoozed",
+            definition,
         )
         self._attr_icon = "mdi:bell-sleep"
 
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        """Snooze the alert for configured duration."""
-        binary_sensor = self._get_binary_sensor_entity()
-        if not binary_sensor:
-            _LOGGER.warning(f"Could not find binary sensor for alert {self._alert_id}")
-            return
-
-        # Enforce state exclusions first (this will clear conflicting states)
-        await self._enforce_state_exclusions(STATE_SNOOZED)
-        
-        # Set snooze state after exclusions
-        binary_sensor._snoozed = True
-        binary_sensor._escalated = False
-        snooze_duration = self._alert_data.get("snooze_duration", DEFAULT_SNOOZE_DURATION)
-        binary_sensor._snooze_until = datetime.now() + timedelta(seconds=snooze_duration)
-        self._attr_is_on = True
-        
-        # Ensure binary sensor state is updated before continuing
-        binary_sensor.async_write_ha_state()
-        binary_sensor._update_status_sensor()
-
-        # Start snooze timer (auto turn off)
-        if binary_sensor._snooze_task:
-            binary_sensor._snooze_task.cancel()
-        binary_sensor._snooze_task = asyncio.create_task(self._snooze_timer(snooze_duration, binary_sensor))
-
-        # Fire event
-        self.hass.bus.async_fire(
-            EVENT_ALERT_SNOOZED,
-            {
-                "entity_id": binary_sensor.entity_id,
-                "alert_name": self._alert_data.get("name"),
-                "snooze_until": binary_sensor._snooze_until.isoformat(),
-            },
-        )
-
-        # Execute on_snoozed action if configured
-        if "on_snoozed" in self._alert_data:
-            await binary_sensor._execute_action(self._alert_data["on_snoozed"])
-
-        # Update states
-        binary_sensor.async_write_ha_state()
-        binary_sensor._update_status_sensor()
-        self.async_write_ha_state()
-
-        # Broadcast update
-        async_dispatcher_send(
-            self.hass,
-            f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-        )
-
-        _LOGGER.info(f"Alert {self._alert_id} snoozed for {snooze_duration} seconds")
-
-    async def _snooze_timer(self, duration: int, binary_sensor) -> None:
-        """Auto turn off snooze after duration."""
-        try:
-            await asyncio.sleep(duration)
-            # Time expired, turn off snooze
-            binary_sensor._snoozed = False
-            binary_sensor._snooze_until = None
-            binary_sensor._snooze_task = None
-            self._attr_is_on = False
-
-            binary_sensor.async_write_ha_state()
-            self.async_write_ha_state()
-
-            async_dispatcher_send(
-                self.hass,
-                f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-            )
-
-            _LOGGER.info(f"Snooze expired for alert {self._alert_id}")
-        except asyncio.CancelledError:
-            _LOGGER.debug(f"Snooze timer cancelled for alert {self._alert_id}")
-
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        """Cancel snooze immediately."""
-        binary_sensor = self._get_binary_sensor_entity()
-        if not binary_sensor:
-            return
-
-        binary_sensor._snoozed = False
-        binary_sensor._snooze_until = None
-        binary_sensor._escalated = False
-        self._attr_is_on = False
-
-        # Cancel snooze task
-        if binary_sensor._snooze_task:
-            binary_sensor._snooze_task.cancel()
-            binary_sensor._snooze_task = None
-
-        binary_sensor.async_write_ha_state()
-        binary_sensor._update_status_sensor()
-        self.async_write_ha_state()
-
-        async_dispatcher_send(
-            self.hass,
-            f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-        )
-
-        _LOGGER.info(f"Snooze cancelled for alert {self._alert_id}")
-
 
 class EmergencyAlertResolveSwitch(BaseEmergencyAlertSwitch):
     """Switch to mark alert as resolved."""
 
-    def __init__(self, hass, entry, alert_id, alert_data):
+    _flag = FLAG_RESOLVED
+    _on_command = CMD_RESOLVE
+    # Un-resolving allows triggering again.
+    _off_command = CMD_UNRESOLVE
+
+    def __init__(self, hass, entry, alert_id, alert_data, definition=None):
         """Initialize resolve switch."""
         super().__init__(
             hass, entry, alert_id, alert_data,
             SWITCH_TYPE_RESOLVE,
-            "Resolved"
+            "Resolved",
+            definition,
         )
         self._attr_icon = "mdi:check-circle"
-
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        """Mark alert as resolved."""
-        binary_sensor = self._get_binary_sensor_entity()
-        if not binary_sensor:
-            _LOGGER.warning(f"Could not find binary sensor for alert {self._alert_id}")
-            return
-
-        # Enforce state exclusions first (this will clear conflicting states)
-        await self._enforce_state_exclusions(STATE_RESOLVED)
-        
-        # Set resolved state after exclusions
-        binary_sensor._resolved = True
-        binary_sensor._escalated = False
-        self._attr_is_on = True
-        
-        # Ensure binary sensor state is updated before continuing
-        binary_sensor.async_write_ha_state()
-        binary_sensor._update_status_sensor()
-
-        # Cancel escalation timer (call cancellation function from async_call_later)
-        if binary_sensor._escalation_task:
-            binary_sensor._escalation_task()  # Call the cancellation function
-            binary_sensor._escalation_task = None
-
-        # Fire event
-        self.hass.bus.async_fire(
-            EVENT_ALERT_RESOLVED,
-            {"entity_id": binary_sensor.entity_id, "alert_name": self._alert_data.get("name")},
-        )
-
-        # Execute on_resolved action if configured
-        if "on_resolved" in self._alert_data:
-            await binary_sensor._execute_action(self._alert_data["on_resolved"])
-
-        # Update states
-        binary_sensor.async_write_ha_state()
-        binary_sensor._update_status_sensor()
-        self.async_write_ha_state()
-
-        # Broadcast update
-        async_dispatcher_send(
-            self.hass,
-            f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-        )
-
-        _LOGGER.info(f"Alert {self._alert_id} marked as resolved")
-
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        """Un-resolve the alert (allow triggering again)."""
-        binary_sensor = self._get_binary_sensor_entity()
-        if not binary_sensor:
-            return
-
-        binary_sensor._resolved = False
-        binary_sensor._escalated = False
-        self._attr_is_on = False
-
-        binary_sensor.async_write_ha_state()
-        binary_sensor._update_status_sensor()
-        self.async_write_ha_state()
-
-        async_dispatcher_send(
-            self.hass,
-            f"{SIGNAL_ALERT_UPDATE}_{self._entry.entry_id}_{self._alert_id}",
-        )
-
-        _LOGGER.info(f"Alert {self._alert_id} un-resolved")
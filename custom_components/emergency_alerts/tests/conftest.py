@@ -267,8 +267,8 @@ def mock_binary_sensor():
     sensor._snooze_until = None
     sensor.is_on = False
     sensor.async_update_ha_state = AsyncMock()
-    sensor._execute_action = AsyncMock()
-    sensor._start_escalation_timer = AsyncMock()
+    sensor.transition = Mock(return_value=True)
+    sensor._arm_escalation_timer = Mock()
     return sensor
 
 
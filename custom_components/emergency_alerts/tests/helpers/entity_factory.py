@@ -35,6 +35,20 @@ def create_group_hub_entry(
     return entry
 
 
+async def setup_group_hub(
+    hass: HomeAssistant,
+    alerts: Dict[str, Dict[str, Any]],
+    hub_name: str = "test_hub",
+    group: str = "security",
+    **kwargs
+) -> MockConfigEntry:
+    """Add a group hub with ``alerts`` to hass and set it up."""
+    entry = create_group_hub_entry(hass, hub_name, group, alerts, **kwargs)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
 def create_global_hub_entry(
     hass: HomeAssistant,
     options: Dict[str, Any] | None = None,
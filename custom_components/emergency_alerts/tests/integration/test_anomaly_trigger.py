@@ -0,0 +1,62 @@
+"""Integration tests for anomaly triggers."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.emergency_alerts.const import DOMAIN
+from custom_components.emergency_alerts.tests.helpers.entity_factory import (
+    setup_group_hub,
+)
+
+
+@pytest.mark.integration
+async def test_anomaly_trigger_uses_the_saved_baseline(
+    hass: HomeAssistant, hass_storage
+):
+    """A baseline saved before the restart scores the first readings."""
+    hass_storage[f"{DOMAIN}.baselines"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.baselines",
+        "data": {
+            "baselines": {
+                "sensor.energy||welford|": {
+                    "count": 500,
+                    "mean": 400.0,
+                    "m2": 499 * 2500.0,
+                },
+            }
+        },
+    }
+    hass.states.async_set("sensor.energy", "410")
+    await setup_group_hub(
+        hass,
+        {
+            "energy_spike": {
+                "name": "Energy Spike",
+                "trigger_type": "anomaly",
+                "entity_id": "sensor.energy",
+                "baseline": "welford",
+                "sigma": 3,
+                "severity": "warning",
+            },
+        },
+        hub_name="energy_hub",
+        group="power",
+    )
+    alert = "binary_sensor.emergency_energy_spike"
+
+    # Mean 400, std 50: 450 is one sigma, 600 is four.
+    hass.states.async_set("sensor.energy", "450")
+    await hass.async_block_till_done()
+    assert hass.states.get(alert).state == "off"
+    assert hass.states.get(alert).attributes["deviation_sigma"] == pytest.approx(1.0)
+
+    hass.states.async_set("sensor.energy", "600")
+    await hass.async_block_till_done()
+    assert hass.states.get(alert).state == "on"
+    assert hass.states.get(alert).attributes["deviation_sigma"] > 3
+
+    hass.states.async_set("sensor.energy", "420")
+    await hass.async_block_till_done()
+    assert hass.states.get(alert).state == "off"
@@ -0,0 +1,47 @@
+"""Integration tests for triggers on entity attributes."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.emergency_alerts.const import DOMAIN
+from custom_components.emergency_alerts.tests.helpers.entity_factory import (
+    setup_group_hub,
+)
+
+
+@pytest.mark.integration
+async def test_attribute_triggers_follow_attribute_changes(hass: HomeAssistant):
+    """Attribute alerts see attribute-only changes; state alerts skip them."""
+    await setup_group_hub(
+        hass,
+        {
+            "phone_battery": {
+                "name": "Phone Battery",
+                "trigger_type": "numeric",
+                "entity_id": "device_tracker.phone",
+                "attribute": "battery",
+                "comparator": "<",
+                "threshold": 15,
+                "clear_threshold": 20,
+            },
+            "phone_away": {
+                "name": "Phone Away",
+                "trigger_type": "simple",
+                "entity_id": "device_tracker.phone",
+                "trigger_state": "not_home",
+            },
+        },
+        hub_name="phone_hub",
+        group="devices",
+    )
+
+    battery = "binary_sensor.emergency_phone_battery"
+    for level, expected in ((50, "off"), (12, "on"), (18, "on"), (21, "off")):
+        hass.states.async_set("device_tracker.phone", "home", {"battery": level})
+        await hass.async_block_till_done()
+        assert hass.states.get(battery).state == expected, level
+
+    alerts = {alert._alert_id: alert for alert in hass.data[DOMAIN]["entities"]}
+    assert alerts["phone_battery"]._metrics.evaluations_skipped == 0
+    assert alerts["phone_away"]._metrics.evaluations_skipped == 3
+    assert hass.states.get(battery).attributes["monitored_attribute"] == "battery"
@@ -0,0 +1,90 @@
+"""Integration tests for the ``emergency_alerts.bulk_*`` services."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.emergency_alerts.const import DOMAIN
+from custom_components.emergency_alerts.tests.helpers.entity_factory import (
+    setup_group_hub,
+)
+
+
+@pytest.fixture
+async def init_bulk_hub(hass: HomeAssistant):
+    """A group hub with three alerts of mixed severity."""
+    entry = await setup_group_hub(
+        hass,
+        {
+            f"garage_{name}": {
+                "name": f"Garage {name.title()}",
+                "trigger_type": "simple",
+                "entity_id": f"binary_sensor.{name}",
+                "trigger_state": "on",
+                "severity": severity,
+            }
+            for name, severity in (
+                ("door", "warning"),
+                ("leak", "critical"),
+                ("light", "info"),
+            )
+        },
+        hub_name="outage_hub",
+        group="infrastructure",
+    )
+    for name in ("door", "leak"):
+        hass.states.async_set(f"binary_sensor.{name}", "on")
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _bulk(hass: HomeAssistant, service: str, **data):
+    return await hass.services.async_call(
+        DOMAIN, service, data, blocking=True, return_response=True
+    )
+
+
+@pytest.mark.integration
+async def test_bulk_snooze_by_glob_and_status(hass: HomeAssistant, init_bulk_hub):
+    """Only matching alerts change, and the counts say so."""
+    result = await _bulk(
+        hass,
+        "bulk_snooze",
+        entity_id=["binary_sensor.emergency_garage_*"],
+        status=["active"],
+    )
+
+    assert result["matched"] == 2
+    assert result["changed"] == 2
+    assert sorted(result["entity_ids"]) == [
+        "binary_sensor.emergency_garage_door",
+        "binary_sensor.emergency_garage_leak",
+    ]
+    assert hass.states.get("sensor.emergency_garage_door_status").state == "snoozed"
+    assert hass.states.get("sensor.emergency_garage_light_status").state == "inactive"
+    for alert in hass.data[DOMAIN]["entities"]:
+        alert._cancel_snooze_timer()
+
+
+@pytest.mark.integration
+async def test_bulk_acknowledge_by_severity(hass: HomeAssistant, init_bulk_hub):
+    """Severity and hub filters combine; repeating the call changes nothing."""
+    result = await _bulk(
+        hass, "bulk_acknowledge", hub_name="outage_hub", severity=["critical"]
+    )
+
+    assert (result["matched"], result["changed"]) == (1, 1)
+    assert (
+        hass.states.get("sensor.emergency_garage_leak_status").state == "acknowledged"
+    )
+    assert hass.states.get("sensor.emergency_garage_door_status").state == "active"
+
+    again = await _bulk(hass, "bulk_acknowledge", severity="critical")
+    assert (again["matched"], again["changed"]) == (1, 0)
+
+
+@pytest.mark.integration
+async def test_bulk_requires_a_filter(hass: HomeAssistant, init_bulk_hub):
+    """An unfiltered call would hit every alert, so it is rejected."""
+    with pytest.raises(ServiceValidationError):
+        await _bulk(hass, "bulk_resolve")
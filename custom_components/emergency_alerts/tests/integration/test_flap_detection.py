@@ -0,0 +1,104 @@
+"""Integration tests for flap detection."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.emergency_alerts.const import DOMAIN, EVENT_ALERT_FLAPPING
+from custom_components.emergency_alerts.tests.helpers.entity_factory import (
+    setup_group_hub,
+)
+
+ALERT = "binary_sensor.emergency_reed_switch"
+STATUS = "sensor.emergency_reed_switch_status"
+
+
+async def _setup(hass: HomeAssistant, **flap):
+    hass.states.async_set("binary_sensor.garage_reed", "off")
+    await setup_group_hub(
+        hass,
+        {
+            "reed_switch": {
+                "name": "Reed Switch",
+                "trigger_type": "simple",
+                "entity_id": "binary_sensor.garage_reed",
+                "trigger_state": "on",
+                "severity": "info",
+                "on_triggered": [
+                    {"service": "notify.test", "data": {"message": "open"}}
+                ],
+                "on_flapping": [
+                    {"service": "notify.test", "data": {"message": "flapping"}}
+                ],
+                "flap_threshold": 4,
+                "flap_window_seconds": 600,
+                **flap,
+            },
+        },
+        hub_name="garage_hub",
+        group="security",
+    )
+
+
+async def _flip(hass: HomeAssistant, freezer, *states):
+    for state in states:
+        freezer.tick(timedelta(seconds=30))
+        hass.states.async_set("binary_sensor.garage_reed", state)
+        await hass.async_block_till_done()
+
+
+@pytest.mark.integration
+async def test_flapping_alert_shows_one_status_and_notifies_once(
+    hass: HomeAssistant, freezer
+):
+    """The status stays "flapping" across cycles and on_flapping runs once."""
+    calls = async_mock_service(hass, "notify", "test")
+    events = async_capture_events(hass, EVENT_ALERT_FLAPPING)
+    await _setup(hass)
+
+    await _flip(hass, freezer, "on", "off", "on", "off")
+    assert hass.states.get(STATUS).state == "flapping"
+    await _flip(hass, freezer, "on", "off")
+    assert hass.states.get(ALERT).state == "off"
+    assert hass.states.get(STATUS).state == "flapping"
+    assert len(events) == 1
+    assert [call.data["message"] for call in calls].count("flapping") == 1
+
+    # Ten quiet minutes later the flips have aged out: stable again.
+    freezer.tick(timedelta(seconds=600))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert hass.states.get(STATUS).state == "inactive"
+    assert not hass.data[DOMAIN]["entities"][0].pending_timers()["flap"]
+
+
+@pytest.mark.integration
+async def test_suppressed_flapping_holds_state_until_stable(
+    hass: HomeAssistant, freezer
+):
+    """With flap_suppress the alert neither writes nor acts until it settles."""
+    calls = async_mock_service(hass, "notify", "test")
+    await _setup(hass, flap_suppress=True)
+
+    await _flip(hass, freezer, "on", "off", "on", "off")
+    held = hass.states.get(ALERT)
+    assert held.state == "on"
+    opened = [call.data["message"] for call in calls].count("open")
+
+    await _flip(hass, freezer, "on", "off", "on", "off")
+    assert hass.states.get(ALERT).last_updated == held.last_updated
+    assert [call.data["message"] for call in calls].count("open") == opened
+
+    # Settled off: once stable the alert catches up and clears.
+    freezer.tick(timedelta(seconds=600))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert hass.states.get(ALERT).state == "off"
+    assert hass.states.get(STATUS).state == "inactive"
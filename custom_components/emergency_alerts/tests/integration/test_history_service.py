@@ -0,0 +1,82 @@
+"""Integration tests for the ``emergency_alerts.get_history`` service."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.emergency_alerts.const import DOMAIN
+
+
+async def _get_history(hass: HomeAssistant, **data):
+    response = await hass.services.async_call(
+        DOMAIN, "get_history", data, blocking=True, return_response=True
+    )
+    return response["transitions"]
+
+
+@pytest.mark.integration
+async def test_history_records_transitions_with_cause(
+    hass: HomeAssistant, init_group_hub
+):
+    """Trigger, acknowledge and clear show up in order with their causes."""
+    hass.states.async_set("binary_sensor.test_sensor", "on")
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        DOMAIN,
+        "acknowledge",
+        {"entity_id": "binary_sensor.emergency_test_alert"},
+        blocking=True,
+    )
+    hass.states.async_set("binary_sensor.test_sensor", "off")
+    await hass.async_block_till_done()
+
+    transitions = await _get_history(
+        hass, entity_id="binary_sensor.emergency_test_alert"
+    )
+
+    assert [(t["from"], t["to"], t["cause"]) for t in transitions] == [
+        ("inactive", "active", "trigger"),
+        ("active", "acknowledged", "service"),
+        ("acknowledged", "inactive", "condition_cleared"),
+    ]
+    assert all(
+        t["entity_id"] == "binary_sensor.emergency_test_alert" for t in transitions
+    )
+
+
+@pytest.mark.integration
+async def test_history_filters_by_hub_time_and_limit(
+    hass: HomeAssistant, init_group_hub
+):
+    """Hub, time range and limit narrow the result."""
+    for state in ("on", "off", "on"):
+        hass.states.async_set("binary_sensor.test_sensor", state)
+        await hass.async_block_till_done()
+
+    assert len(await _get_history(hass, hub_name="test_hub")) == 3
+    assert await _get_history(hass, hub_name="other_hub") == []
+
+    latest = await _get_history(hass, hub_name="test_hub", limit=1)
+    assert [(t["from"], t["to"]) for t in latest] == [("inactive", "active")]
+
+    assert await _get_history(hass, start="2999-01-01T00:00:00+00:00") == []
+
+    with pytest.raises(ServiceValidationError):
+        await _get_history(hass, limit="abc")
+    with pytest.raises(ServiceValidationError):
+        await _get_history(hass, start="yesterday")
+
+
+@pytest.mark.integration
+async def test_history_size_is_configurable(hass: HomeAssistant, init_group_hub):
+    """The global history size bounds each alert's buffer."""
+    hass.data[DOMAIN]["global_options"] = {"history_size": 2}
+    entity = hass.data[DOMAIN]["entities"][0]
+    entity._history = None
+
+    for state in ("on", "off", "on", "off"):
+        hass.states.async_set("binary_sensor.test_sensor", state)
+        await hass.async_block_till_done()
+
+    assert entity._history.capacity == 2
+    assert len(await _get_history(hass)) == 2
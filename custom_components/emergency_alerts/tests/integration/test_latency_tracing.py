@@ -0,0 +1,108 @@
+"""Integration tests for trigger-to-notification latency tracing."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+    async_mock_service,
+    MockConfigEntry,
+)
+
+from custom_components.emergency_alerts.const import DOMAIN, EVENT_ALERT_TRACE
+
+
+async def _setup(hass: HomeAssistant, trace_events: bool) -> MockConfigEntry:
+    global_entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        title="Emergency Alerts - Global Settings",
+        data={"hub_type": "global", "name": "Global Settings"},
+        options={"enable_trace_events": trace_events},
+    )
+    global_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(global_entry.entry_id)
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        title="Emergency Alerts - Leaks",
+        data={
+            "hub_type": "group",
+            "group": "safety",
+            "hub_name": "leaks",
+            "alerts": {
+                "water_leak": {
+                    "name": "Water Leak",
+                    "trigger_type": "simple",
+                    "entity_id": "binary_sensor.leak",
+                    "trigger_state": "on",
+                    "severity": "critical",
+                    "for_seconds": 10,
+                    "on_triggered": [
+                        {"service": "notify.phone", "data": {"message": "Leak!"}}
+                    ],
+                },
+            },
+        },
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def _alert(hass: HomeAssistant):
+    return next(e for e in hass.data[DOMAIN]["entities"] if e._alert_id == "water_leak")
+
+
+@pytest.mark.integration
+async def test_trace_event_covers_every_stage(hass: HomeAssistant):
+    """A dwell-delayed trigger emits one trace with all stages stamped."""
+    calls = async_mock_service(hass, "notify", "phone")
+    events = async_capture_events(hass, EVENT_ALERT_TRACE)
+    await _setup(hass, trace_events=True)
+
+    hass.states.async_set("binary_sensor.leak", "on")
+    await hass.async_block_till_done()
+    assert events == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert len(events) == 1
+    trace = events[0].data
+    assert trace["alert_id"] == "water_leak"
+    assert trace["transition"] == "triggered"
+    assert trace["armed_ms"] is not None
+    assert trace["fired_ms"] >= trace["armed_ms"]
+    assert trace["written_ms"] >= trace["fired_ms"]
+    action = trace["actions"][0]
+    assert action["service"] == "notify.phone"
+    assert action["ok"] is True
+    assert action["enqueued_ms"] <= action["started_ms"] <= action["completed_ms"]
+    # Processing latency excludes the deliberate 10s dwell.
+    assert trace["latency_ms"] < 10_000
+
+    assert _alert(hass)._metrics.transition_latency.total == 1
+
+
+@pytest.mark.integration
+async def test_trace_events_are_opt_in(hass: HomeAssistant):
+    """Without the option, latencies are recorded but no events fire."""
+    async_mock_service(hass, "notify", "phone")
+    events = async_capture_events(hass, EVENT_ALERT_TRACE)
+    await _setup(hass, trace_events=False)
+
+    hass.states.async_set("binary_sensor.leak", "on")
+    await hass.async_block_till_done()
+    hass.states.async_set("binary_sensor.leak", "off")
+    await hass.async_block_till_done()
+
+    assert events == []
+    # The dwell was cancelled, so nothing fired and nothing was traced.
+    assert _alert(hass)._metrics.transition_latency is None
@@ -0,0 +1,86 @@
+"""Integration tests for "N times in M seconds" occurrence triggers."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.emergency_alerts.tests.helpers.entity_factory import (
+    setup_group_hub,
+)
+
+
+async def _setup_hub(hass: HomeAssistant, **extra) -> None:
+    await setup_group_hub(
+        hass,
+        {
+            "door_cycling": {
+                "name": "Door Cycling",
+                "trigger_type": "occurrence",
+                "entity_id": "binary_sensor.door",
+                "trigger_state": "on",
+                "occurrences": 3,
+                "window_seconds": 60,
+                "severity": "warning",
+                **extra,
+            },
+        },
+        hub_name="occurrence_hub",
+        group="security",
+    )
+
+
+async def _open_close(hass: HomeAssistant, freezer, seconds: float) -> None:
+    for state in ("on", "off"):
+        hass.states.async_set("binary_sensor.door", state)
+        await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=seconds))
+
+
+@pytest.mark.integration
+async def test_fires_on_nth_occurrence_and_clears_when_it_expires(
+    hass: HomeAssistant, freezer
+):
+    """Fires on the third opening within a minute; clears when one ages out."""
+    await _setup_hub(hass)
+    alert = "binary_sensor.emergency_door_cycling"
+
+    await _open_close(hass, freezer, 20)
+    await _open_close(hass, freezer, 20)
+    assert hass.states.get(alert).state == "off"
+
+    # Staying open is not a new occurrence.
+    hass.states.async_set("binary_sensor.door", "off", {"battery": 50})
+    await hass.async_block_till_done()
+    await _open_close(hass, freezer, 0)
+    assert hass.states.get(alert).state == "on"
+    assert hass.states.get(alert).attributes["occurrences_in_window"] == 3
+
+    # The first opening leaves the window 60 s after it happened.
+    freezer.tick(timedelta(seconds=19))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert hass.states.get(alert).state == "on"
+
+    freezer.tick(timedelta(seconds=2))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert hass.states.get(alert).state == "off"
+
+
+@pytest.mark.integration
+async def test_for_seconds_applies_to_occurrences(hass: HomeAssistant, freezer):
+    """The count must stay reached for for_seconds before the alert fires."""
+    await _setup_hub(hass, for_seconds=30)
+    alert = "binary_sensor.emergency_door_cycling"
+
+    for _ in range(3):
+        await _open_close(hass, freezer, 5)
+    assert hass.states.get(alert).state == "off"
+
+    freezer.tick(timedelta(seconds=30))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert hass.states.get(alert).state == "on"
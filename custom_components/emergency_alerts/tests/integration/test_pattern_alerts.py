@@ -0,0 +1,144 @@
+"""Integration tests for pattern alerts expanded over matching entities."""
+
+import pytest
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+
+from custom_components.emergency_alerts.const import DOMAIN
+from custom_components.emergency_alerts.tests.helpers.entity_factory import (
+    setup_group_hub,
+)
+
+
+@pytest.mark.integration
+async def test_pattern_alert_expands_and_picks_up_new_entities(hass: HomeAssistant):
+    """Each matching entity gets its own alert, including ones added after load."""
+    hass.states.async_set(
+        "binary_sensor.kitchen_leak", "off", {"device_class": "moisture"}
+    )
+    hass.states.async_set(
+        "binary_sensor.bath_leak", "off", {"device_class": "moisture"}
+    )
+    hass.states.async_set("binary_sensor.garage_leak", "off")
+    hass.states.async_set(
+        "sensor.phone_temperature", "21", {"device_class": "temperature"}
+    )
+    hass.states.async_set("sensor.phone_battery", "80", {"device_class": "battery"})
+    listeners = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    entry = await setup_group_hub(
+        hass,
+        {
+            "leak": {
+                "name": "Leak",
+                "trigger_type": "simple",
+                # Also matches the alerts' own binary_sensor.emergency_leak_..._leak.
+                "entity_pattern": "binary_sensor.*_leak",
+                "trigger_state": "on",
+                "severity": "critical",
+            },
+            "battery_low": {
+                "name": "Battery Low",
+                "trigger_type": "numeric",
+                "match_domain": "sensor",
+                "match_device_class": "battery",
+                "comparator": "<",
+                "threshold": 15,
+            },
+        },
+        hub_name="water_hub",
+        group="environmental",
+    )
+
+    definitions = hass.data[DOMAIN]["definitions"][entry.entry_id]
+    assert set(definitions) == {
+        "leak_binary_sensor_kitchen_leak",
+        "leak_binary_sensor_bath_leak",
+        "leak_binary_sensor_garage_leak",
+        "battery_low_sensor_phone_battery",
+    }
+    kitchen = "binary_sensor.emergency_leak_binary_sensor_kitchen_leak"
+    assert hass.states.get(kitchen).attributes["pattern_alert"] == "leak"
+    assert hass.states.get("select.leak_binary_sensor_kitchen_leak_state") is not None
+    assert (
+        hass.states.get("binary_sensor.emergency_battery_low_sensor_tablet_battery")
+        is None
+    )
+
+    hass.states.async_set(
+        "binary_sensor.kitchen_leak", "on", {"device_class": "moisture"}
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(kitchen).state == "on"
+    assert (
+        hass.states.get("binary_sensor.emergency_leak_binary_sensor_bath_leak").state
+        == "off"
+    )
+
+    # A new leak sensor is paired: its alert appears and works.
+    hass.states.async_set(
+        "binary_sensor.attic_leak", "on", {"device_class": "moisture"}
+    )
+    await hass.async_block_till_done()
+    attic = "binary_sensor.emergency_leak_binary_sensor_attic_leak"
+    assert "leak_binary_sensor_attic_leak" in definitions
+    assert len(definitions) == 5
+    assert hass.states.get(attic).state == "on"
+
+    hass.states.async_set("sensor.tablet_battery", "90", {"device_class": "battery"})
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.tablet_battery", "9", {"device_class": "battery"})
+    await hass.async_block_till_done()
+    assert (
+        hass.states.get(
+            "binary_sensor.emergency_battery_low_sensor_tablet_battery"
+        ).state
+        == "on"
+    )
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert len(hass.data[DOMAIN]["patterns"]) == 0
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners
+
+
+@pytest.mark.integration
+async def test_domain_pattern_skips_alert_status_sensors(hass: HomeAssistant):
+    """Status sensors of the alerts a pattern creates aren't matched again."""
+    hass.states.async_set("sensor.pump_power", "120")
+    hass.states.async_set("sensor.fridge_power", "80")
+    entry = await setup_group_hub(
+        hass,
+        {
+            "sensor_down": {
+                "name": "Sensor Down",
+                "trigger_type": "simple",
+                "match_domain": "sensor",
+                "trigger_state": "unavailable",
+                "severity": "warning",
+            },
+        },
+        hub_name="sensor_hub",
+        group="other",
+    )
+    await hass.async_block_till_done()
+
+    definitions = hass.data[DOMAIN]["definitions"][entry.entry_id]
+    assert set(definitions) == {
+        "sensor_down_sensor_pump_power",
+        "sensor_down_sensor_fridge_power",
+    }
+    status = "sensor.emergency_sensor_down_sensor_pump_power_status"
+    assert hass.states.get(status).attributes["alert_id"] == (
+        "sensor_down_sensor_pump_power"
+    )
+
+    # A new sensor adds one alert, not one for its status sensor as well.
+    hass.states.async_set("sensor.heater_power", "0")
+    await hass.async_block_till_done()
+    assert len(definitions) == 3
+
+    # On reload the status sensors already exist as states.
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    definitions = hass.data[DOMAIN]["definitions"][entry.entry_id]
+    assert len(definitions) == 3
@@ -0,0 +1,35 @@
+"""Integration test for the ``emergency_alerts.profile`` service."""
+
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.emergency_alerts.const import DOMAIN
+
+
+@pytest.mark.integration
+async def test_profile_service_writes_pstats_and_stops(
+    hass: HomeAssistant, init_group_hub, tmp_path
+):
+    """The profile runs for the requested duration, then writes its file."""
+    hass.config.config_dir = str(tmp_path)
+
+    await hass.services.async_call(DOMAIN, "profile", {"duration": 5}, blocking=True)
+
+    hass.states.async_set("binary_sensor.test_sensor", "on")
+    await hass.async_block_till_done()
+    assert not list(Path(tmp_path).glob("*.prof"))
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+
+    profiles = list(Path(tmp_path).glob("emergency_alerts_profile_*.prof"))
+    assert len(profiles) == 1
+
+    from custom_components.emergency_alerts.core import profiler
+
+    assert profiler._active is None
@@ -0,0 +1,52 @@
+"""Integration tests for rate-of-change triggers."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.emergency_alerts.const import DOMAIN
+from custom_components.emergency_alerts.tests.helpers.entity_factory import (
+    setup_group_hub,
+)
+
+
+@pytest.mark.integration
+async def test_rate_trigger_fires_on_fast_rise_and_clears_as_samples_age(
+    hass: HomeAssistant, freezer
+):
+    """Rising 3 degrees in five minutes fires; a flat reading clears it later."""
+    hass.states.async_set("sensor.freezer", "-18")
+    await setup_group_hub(
+        hass,
+        {
+            "freezer_rising": {
+                "name": "Freezer Rising",
+                "trigger_type": "rate",
+                "entity_id": "sensor.freezer",
+                "comparator": ">",
+                "threshold": 2,
+                "window_seconds": 600,
+                "severity": "critical",
+            },
+        },
+        hub_name="freezer_hub",
+        group="kitchen",
+    )
+    alert = "binary_sensor.emergency_freezer_rising"
+
+    for value in ("-17.5", "-16.8", "-15.9", "-15.0"):
+        freezer.tick(timedelta(seconds=75))
+        hass.states.async_set("sensor.freezer", value)
+        await hass.async_block_till_done()
+    assert hass.states.get(alert).state == "on"
+    assert hass.states.get(alert).attributes["change_in_window"] > 2
+
+    # No further readings: the rise ages out of the window and it clears.
+    freezer.tick(timedelta(seconds=600))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert hass.states.get(alert).state == "off"
+    assert not hass.data[DOMAIN]["entities"][0].pending_timers()["window"]
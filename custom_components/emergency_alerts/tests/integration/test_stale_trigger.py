@@ -0,0 +1,66 @@
+"""Integration tests for staleness (heartbeat) triggers."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.emergency_alerts.const import DOMAIN
+from custom_components.emergency_alerts.tests.helpers.entity_factory import (
+    setup_group_hub,
+)
+
+
+async def _tick(hass: HomeAssistant, freezer, seconds: float):
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+@pytest.mark.integration
+async def test_silent_sensors_go_stale_and_recover(hass: HomeAssistant, freezer):
+    """Each sensor fires after its own silence; a report clears it; one timer."""
+    for name in ("hall", "attic", "shed"):
+        hass.states.async_set(f"sensor.{name}_temperature", "20", {"battery": 80})
+    entry = await setup_group_hub(
+        hass,
+        {
+            f"{name}_silent": {
+                "name": f"{name.title()} Silent",
+                "trigger_type": "stale",
+                "entity_id": f"sensor.{name}_temperature",
+                "stale_seconds": 7200,
+                "severity": "warning",
+            }
+            for name in ("hall", "attic", "shed")
+        },
+        hub_name="zigbee_hub",
+        group="power",
+    )
+    index = hass.data[DOMAIN]["deadlines"]
+    assert len(index) == 3
+
+    # The hall reports (attribute-only), the attic goes unavailable.
+    await _tick(hass, freezer, 3600)
+    hass.states.async_set("sensor.hall_temperature", "20", {"battery": 79})
+    hass.states.async_set("sensor.attic_temperature", "unavailable")
+    await hass.async_block_till_done()
+
+    await _tick(hass, freezer, 3601)
+    assert hass.states.get("binary_sensor.emergency_hall_silent").state == "off"
+    assert hass.states.get("binary_sensor.emergency_attic_silent").state == "on"
+    assert hass.states.get("binary_sensor.emergency_shed_silent").state == "on"
+
+    hass.states.async_set("sensor.shed_temperature", "12")
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.emergency_shed_silent").state == "off"
+
+    await _tick(hass, freezer, 3600)
+    assert hass.states.get("binary_sensor.emergency_hall_silent").state == "on"
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert len(index) == 0
+    assert index.next_deadline() is None
@@ -0,0 +1,186 @@
+"""Integration tests for the append-only transition log."""
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant
+
+from custom_components.emergency_alerts.core.runtime import (
+    FLAG_ACKNOWLEDGED,
+    FLAG_ON,
+    FLAG_SNOOZED,
+    FLAG_TRIGGERED,
+)
+from custom_components.emergency_alerts.core.state_machine import (
+    CMD_ACKNOWLEDGE,
+    CMD_CONDITION_CLEARED,
+    CMD_SNOOZE,
+    CMD_TRIGGER,
+)
+from custom_components.emergency_alerts.core.transition_log import (
+    FLUSH_BYTES,
+    iter_records,
+    replay,
+    SNAPSHOT,
+    TransitionLog,
+)
+
+FIRING = FLAG_ON | FLAG_TRIGGERED
+
+
+@pytest.mark.integration
+async def test_append_buffers_and_replay_rebuilds_state(hass: HomeAssistant, tmp_path):
+    """Appends only buffer and schedule one flush; replay keeps the last flags."""
+    path = tmp_path / "transitions.log"
+    log = TransitionLog(hass, str(path))
+
+    log.append("hub", "door", CMD_TRIGGER, FIRING, "trigger")
+    log.append("hub", "door", CMD_ACKNOWLEDGE, FIRING | FLAG_ACKNOWLEDGED, "service")
+    log.append("hub", "leak", CMD_TRIGGER, FIRING, "trigger")
+    log.append("hub", "leak", CMD_CONDITION_CLEARED, 0, "condition_cleared")
+
+    assert not path.exists()
+    assert log._flush_unsub is not None
+    await log.async_flush()
+    assert log.flushes == 1
+
+    records = list(iter_records(str(path)))
+    assert [(r.alert_id, r.command, r.cause) for r in records] == [
+        ("door", CMD_TRIGGER, "trigger"),
+        ("door", CMD_ACKNOWLEDGE, "service"),
+        ("leak", CMD_TRIGGER, "trigger"),
+        ("leak", CMD_CONDITION_CLEARED, "condition_cleared"),
+    ]
+    state = replay(str(path))
+    assert set(state) == {("hub", "door")}
+    assert state[("hub", "door")][1] == FIRING | FLAG_ACKNOWLEDGED
+
+    # A record cut short by a crash is ignored.
+    with open(path, "ab") as handle:
+        handle.write(b"\x00" * 7)
+    assert len(list(iter_records(str(path)))) == 4
+    await log.async_close()
+
+
+@pytest.mark.integration
+async def test_rotation_starts_with_a_snapshot(hass: HomeAssistant, tmp_path):
+    """After rotating, the current file alone rebuilds state."""
+    path = tmp_path / "transitions.log"
+    log = TransitionLog(hass, str(path), max_bytes=200, backups=2)
+
+    for round_ in range(12):
+        log.append("hub", "door", CMD_TRIGGER, FIRING, "trigger")
+        log.append("hub", f"alert{round_}", CMD_SNOOZE, FIRING | FLAG_SNOOZED, "select")
+        await log.async_flush()
+
+    assert log.rotations >= 2
+    assert (tmp_path / "transitions.log.1").exists()
+    assert (tmp_path / "transitions.log.2").exists()
+    assert not (tmp_path / "transitions.log.3").exists()
+    records = list(iter_records(str(path)))
+    assert records[0].command == SNAPSHOT
+    assert replay(str(path)) == log._latest
+    assert len(log._latest) == 13
+    await log.async_close()
+
+
+def _fill(log, count):
+    """Append ``count`` records of 28 bytes each."""
+    for index in range(count):
+        log.append("hub", f"alert{index:05d}", CMD_TRIGGER, FIRING, "trigger")
+
+
+@pytest.mark.integration
+async def test_full_buffer_flushes_early(hass: HomeAssistant, tmp_path):
+    """A full buffer is flushed now instead of when the timer fires."""
+    path = tmp_path / "transitions.log"
+    log = TransitionLog(hass, str(path))
+    count = -(-FLUSH_BYTES // 28)
+
+    _fill(log, count - 1)
+    assert len(log._buffer) == (count - 1) * 28
+    assert log._flush_unsub is not None
+
+    log.append("hub", "alert_last", CMD_TRIGGER, FIRING, "trigger")
+    assert log._flush_unsub is None
+    await hass.async_block_till_done()
+
+    assert log.flushes == 1
+    assert len(log._buffer) == 0
+    assert len(list(iter_records(str(path)))) == count
+    await log.async_close()
+
+
+@pytest.mark.integration
+async def test_flush_during_a_write_waits_and_is_queued_once(
+    hass: HomeAssistant, tmp_path
+):
+    """Flushes don't overlap; a full buffer during a write queues one more."""
+    path = tmp_path / "transitions.log"
+    log = TransitionLog(hass, str(path))
+    count = -(-FLUSH_BYTES // 28)
+
+    log.append("hub", "first", CMD_TRIGGER, FIRING, "trigger")
+    first = hass.async_create_task(log.async_flush())
+    # The first write holds the lock, so this flush stays queued...
+    _fill(log, count)
+    assert log._flush_queued
+    # ...and takes these records along when it runs.
+    log.append("hub", "late", CMD_TRIGGER, FIRING, "trigger")
+    assert log._flush_unsub is None
+    await first
+    await hass.async_block_till_done()
+
+    assert log.flushes == 2
+    assert not log._flush_queued
+    alert_ids = [record.alert_id for record in iter_records(str(path))]
+    assert alert_ids[0] == "first"
+    assert alert_ids[-1] == "late"
+    assert len(alert_ids) == count + 2
+    await log.async_close()
+
+
+@pytest.mark.integration
+async def test_write_error_is_counted_and_dropped(hass: HomeAssistant, tmp_path):
+    """A failed write is logged and counted; the log keeps accepting records."""
+    path = tmp_path / "transitions.log"
+    log = TransitionLog(hass, str(path))
+    log.append("hub", "door", CMD_TRIGGER, FIRING, "trigger")
+
+    with patch.object(log, "_write", side_effect=OSError("disk full")):
+        await log.async_flush()
+
+    assert log.write_errors == 1
+    assert log.flushes == 0
+    assert log.stats()["buffered_bytes"] == 0
+    assert log.restored_flags("hub", "door") == FIRING
+
+    log.append("hub", "door", CMD_ACKNOWLEDGE, FIRING | FLAG_ACKNOWLEDGED, "service")
+    await log.async_flush()
+    assert [r.command for r in iter_records(str(path))] == [CMD_ACKNOWLEDGE]
+    await log.async_close()
+
+
+@pytest.mark.integration
+async def test_close_removes_stop_listener(hass: HomeAssistant, tmp_path):
+    """Closing the log before shutdown drops its stop listener."""
+    log = TransitionLog(hass, str(tmp_path / "transitions.log"))
+    listeners = hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0)
+
+    log.async_listen_stop()
+    assert hass.bus.async_listeners()[EVENT_HOMEASSISTANT_STOP] == listeners + 1
+
+    await log.async_close()
+    assert hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0) == listeners
+
+
+@pytest.mark.integration
+async def test_restored_flags_drop_snooze(hass: HomeAssistant, tmp_path):
+    """Snoozes are not restored because their deadline isn't logged."""
+    log = TransitionLog(hass, str(tmp_path / "transitions.log"))
+    log.append("hub", "door", CMD_SNOOZE, FIRING | FLAG_SNOOZED, "select")
+
+    assert log.restored_flags("hub", "door") == FIRING
+    assert log.restored_flags("hub", "other") == 0
+    await log.async_close()
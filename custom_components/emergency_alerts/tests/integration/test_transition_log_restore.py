@@ -0,0 +1,85 @@
+"""Integration test for restoring alert state from the transition log."""
+
+import time
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.emergency_alerts.const import DOMAIN
+from custom_components.emergency_alerts.core.runtime import (
+    FLAG_ACKNOWLEDGED,
+    FLAG_ON,
+    FLAG_SNOOZED,
+    FLAG_TRIGGERED,
+)
+from custom_components.emergency_alerts.core.transition_log import (
+    MAGIC,
+    pack_record,
+    TRANSITION_LOG_FILE,
+)
+from custom_components.emergency_alerts.tests.helpers.entity_factory import (
+    create_global_hub_entry,
+    create_group_hub_entry,
+)
+
+FIRING = FLAG_ON | FLAG_TRIGGERED
+
+
+def _alert(sensor: str) -> dict:
+    return {
+        "name": sensor.title(),
+        "trigger_type": "simple",
+        "entity_id": f"binary_sensor.{sensor}",
+        "trigger_state": "on",
+        "severity": "warning",
+    }
+
+
+@pytest.mark.integration
+async def test_restart_restores_flags_and_rearms_escalation(
+    hass: HomeAssistant, tmp_path
+):
+    """Alerts come back as the log left them; unhandled ones escalate again."""
+    hass.config.config_dir = str(tmp_path)
+    create_global_hub_entry(
+        hass,
+        options={"default_escalation_time": 300, "enable_transition_log": True},
+    )
+    alerts = {name: _alert(name) for name in ("door", "leak", "smoke", "window")}
+    entry = create_group_hub_entry(hass, "restore_hub", "security", alerts)
+
+    # What the previous run left behind.
+    now = time.time()
+    records = {
+        "door": FIRING,
+        "leak": FIRING | FLAG_ACKNOWLEDGED,
+        "smoke": FIRING | FLAG_SNOOZED,
+        "window": FIRING,
+    }
+    with open(tmp_path / TRANSITION_LOG_FILE, "wb") as handle:
+        handle.write(MAGIC)
+        for alert_id, flags in records.items():
+            handle.write(pack_record(now, 0, flags, 0, entry.entry_id, alert_id))
+    for sensor in ("door", "leak", "smoke"):
+        hass.states.async_set(f"binary_sensor.{sensor}", "on")
+    hass.states.async_set("binary_sensor.window", "off")
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    alerts = {alert._alert_id: alert for alert in hass.data[DOMAIN]["entities"]}
+    log = hass.data[DOMAIN]["transition_log"]
+    assert log.restored_flags(entry.entry_id, "door") == FIRING
+
+    # Unhandled and still firing: restored and the escalation clock restarted.
+    assert alerts["door"]._runtime.flags == FIRING
+    assert alerts["door"].pending_timers()["escalation"]
+    # Acknowledged: stays acknowledged, nothing to escalate.
+    assert alerts["leak"]._acknowledged
+    assert not alerts["leak"].pending_timers()["escalation"]
+    # The snooze isn't restored, so the alert is unhandled again.
+    assert not alerts["smoke"]._runtime.flags & FLAG_SNOOZED
+    assert alerts["smoke"].pending_timers()["escalation"]
+    # The condition cleared while Home Assistant was down.
+    assert hass.states.get("binary_sensor.emergency_window").state == "off"
+    assert not alerts["window"].pending_timers()["escalation"]
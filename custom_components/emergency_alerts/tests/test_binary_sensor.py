@@ -5,11 +5,13 @@ from unittest.mock import AsyncMock, Mock, patch
 from homeassistant.core import HomeAssistant
 
 from custom_components.emergency_alerts.binary_sensor import (
-    _resolve_on_escalated,
-    _resolve_on_triggered,
     async_setup_entry,
     EmergencyBinarySensor,
 )
+from custom_components.emergency_alerts.core.definition import (
+    _resolve_on_escalated,
+    _resolve_on_triggered,
+)
 
 
 async def test_simple_trigger_setup(hass: HomeAssistant, mock_config_entry):
@@ -33,7 +35,7 @@ async def test_simple_trigger_setup(hass: HomeAssistant, mock_config_entry):
     # renders friendly_name as just the device name (no "Emergency:" prefix).
     assert sensor._attr_name is None
     assert sensor._attr_has_entity_name is True
-    assert sensor._attr_device_info["name"] == "Test Alert"
+    assert sensor.device_info["name"] == "Test Alert"
     assert sensor._trigger_type == "simple"
     assert sensor._entity_id == "binary_sensor.test_sensor"
     assert sensor._trigger_state == "on"
@@ -370,7 +372,7 @@ async def test_extra_state_attributes(hass: HomeAssistant, create_binary_sensor)
 # ---------------------------------------------------------------------------
 
 
-def _make_sensor(hass, severity: str = "warning"):
+def _make_sensor(hass, severity: str = "warning", **alert_data):
     """Build an EmergencyBinarySensor with a given severity for naming tests."""
     from unittest.mock import MagicMock
     from custom_components.emergency_alerts.binary_sensor import EmergencyBinarySensor
@@ -385,6 +387,7 @@ def _make_sensor(hass, severity: str = "warning"):
             "entity_id": "binary_sensor.dishwasher_running",
             "trigger_state": "off",
             "severity": severity,
+            **alert_data,
         },
         group="appliances", hub_name="test_hub",
     )
@@ -396,14 +399,14 @@ async def test_v4_4_naming_uses_has_entity_name_with_none_name(hass: HomeAssista
     assert s._attr_has_entity_name is True, "has_entity_name must be True"
     assert s._attr_name is None, "_attr_name must be None so HA renders only device.name"
     # Device name carries the alert label — no 'Emergency Alert: ' prefix.
-    assert s._attr_device_info["name"] == "Dishwasher Done"
+    assert s.device_info["name"] == "Dishwasher Done"
 
 
 async def test_v4_4_device_name_has_no_legacy_prefix(hass: HomeAssistant):
     """No code path should reintroduce the 'Emergency Alert: ' device prefix."""
     s = _make_sensor(hass)
-    assert "Emergency Alert:" not in s._attr_device_info["name"]
-    assert "Emergency:" not in (s._attr_device_info.get("name") or "")
+    assert "Emergency Alert:" not in s.device_info["name"]
+    assert "Emergency:" not in (s.device_info.get("name") or "")
 
 
 async def test_v4_4_escalation_timer_skipped_for_info_severity(hass: HomeAssistant):
@@ -418,10 +421,9 @@ async def test_v4_4_escalation_timer_skipped_for_info_severity(hass: HomeAssista
 
 async def test_v4_4_escalation_timer_still_arms_for_warning(hass: HomeAssistant):
     """Warning alerts (and critical) must still arm the escalation timer."""
-    s = _make_sensor(hass, severity="warning")
-    s.hass = hass
     # Skip the early-return on remind_after=None by setting a non-zero time.
-    s._remind_after_seconds = 300
+    s = _make_sensor(hass, severity="warning", remind_after_seconds=300)
+    s.hass = hass
 
     await s._start_escalation_timer()
     assert s._escalation_task is not None, \
@@ -434,9 +436,8 @@ async def test_v4_4_escalation_timer_still_arms_for_warning(hass: HomeAssistant)
 
 async def test_v4_4_escalation_timer_still_arms_for_critical(hass: HomeAssistant):
     """Critical severity is treated identically to warning here."""
-    s = _make_sensor(hass, severity="critical")
+    s = _make_sensor(hass, severity="critical", remind_after_seconds=300)
     s.hass = hass
-    s._remind_after_seconds = 300
 
     await s._start_escalation_timer()
     assert s._escalation_task is not None
@@ -240,6 +240,31 @@ def test_build_alert_data_rejects_logical_with_malformed_conditions():
         })
 
 
+def test_build_alert_data_accepts_nested_condition_groups():
+    """and/or/not groups validate recursively; empty groups are rejected."""
+    flow = EmergencyOptionsFlow()
+    conditions = [
+        {"entity_id": "binary_sensor.front_door", "state": "on"},
+        {"or": [
+            {"entity_id": "alarm_control_panel.home", "state": "armed_away"},
+            {"not": {"entity_id": "person.alex", "state": "home"}},
+        ]},
+    ]
+    data = flow._build_alert_data({
+        "name": "Door While Away",
+        "trigger_type": "logical",
+        "logical_conditions": conditions,
+    })
+    assert data["logical_conditions"] == conditions
+
+    with pytest.raises(vol.Invalid, match="must be a list of"):
+        flow._build_alert_data({
+            "name": "Bad Alert",
+            "trigger_type": "logical",
+            "logical_conditions": [{"or": []}],
+        })
+
+
 def test_build_alert_data_persists_logical_fields():
     """Happy path: a valid logical alert serializes both fields into storage."""
     flow = EmergencyOptionsFlow()
@@ -383,3 +408,186 @@ async def test_edit_alert_with_renamed_slug_drops_old_key(_options_flow_factory)
     alerts = flow.config_entry.data["alerts"]
     assert "old_name" not in alerts
     assert "new_name" in alerts
+
+
+def test_build_alert_data_persists_numeric_fields():
+    """A numeric alert stores float thresholds and requires a threshold."""
+    flow = EmergencyOptionsFlow()
+    data = flow._build_alert_data({
+        "name": "Freezer Warm",
+        "severity": "critical",
+        "trigger_type": "numeric",
+        "entity_id": "sensor.freezer",
+        "comparator": ">",
+        "threshold": "-10",
+        "clear_threshold": -12,
+    })
+    assert data["comparator"] == ">"
+    assert data["threshold"] == -10.0
+    assert data["clear_threshold"] == -12.0
+
+    with pytest.raises(vol.Invalid, match="Threshold is required"):
+        flow._build_alert_data({
+            "name": "Freezer Warm",
+            "trigger_type": "numeric",
+            "entity_id": "sensor.freezer",
+        })
+
+
+def test_build_alert_data_persists_attribute():
+    """Simple and numeric alerts keep an attribute path; blank means the state."""
+    flow = EmergencyOptionsFlow()
+    data = flow._build_alert_data({
+        "name": "Heating On",
+        "trigger_type": "simple",
+        "entity_id": "climate.hallway",
+        "trigger_state": "heating",
+        "attribute": " hvac_action ",
+    })
+    assert data["attribute"] == "hvac_action"
+
+    data = flow._build_alert_data({
+        "name": "Door",
+        "trigger_type": "simple",
+        "entity_id": "binary_sensor.door",
+        "attribute": "",
+    })
+    assert "attribute" not in data
+
+
+def test_build_alert_data_persists_occurrence_fields():
+    """An occurrence alert stores its count and window and requires both."""
+    flow = EmergencyOptionsFlow()
+    data = flow._build_alert_data({
+        "name": "Pump Cycling",
+        "trigger_type": "occurrence",
+        "entity_id": "switch.pump",
+        "trigger_state": "on",
+        "occurrences": 6,
+        "window_seconds": 3600,
+    })
+    assert (data["occurrences"], data["window_seconds"]) == (6, 3600)
+    assert data["trigger_state"] == "on"
+
+    with pytest.raises(vol.Invalid, match="Occurrences and window are required"):
+        flow._build_alert_data({
+            "name": "Pump Cycling",
+            "trigger_type": "occurrence",
+            "entity_id": "switch.pump",
+            "occurrences": 6,
+        })
+
+
+def test_build_alert_data_persists_rate_fields():
+    """A rate alert stores its threshold and window and requires both."""
+    flow = EmergencyOptionsFlow()
+    data = flow._build_alert_data({
+        "name": "Freezer Rising",
+        "trigger_type": "rate",
+        "entity_id": "sensor.freezer",
+        "comparator": ">",
+        "threshold": 2,
+        "window_seconds": 600,
+    })
+    assert (data["comparator"], data["threshold"], data["window_seconds"]) == (">", 2.0, 600)
+
+    with pytest.raises(vol.Invalid, match="Threshold and window are required"):
+        flow._build_alert_data({
+            "name": "Freezer Rising",
+            "trigger_type": "rate",
+            "entity_id": "sensor.freezer",
+            "threshold": 2,
+        })
+
+
+def test_build_alert_data_persists_anomaly_fields():
+    """An anomaly alert stores its baseline settings; welford drops the alpha."""
+    flow = EmergencyOptionsFlow()
+    data = flow._build_alert_data({
+        "name": "Energy Spike",
+        "trigger_type": "anomaly",
+        "entity_id": "sensor.energy",
+        "baseline": "ewma",
+        "sigma": 4,
+        "ewma_alpha": 0.1,
+        "min_samples": 50,
+    })
+    assert (data["baseline"], data["sigma"], data["ewma_alpha"], data["min_samples"]) == (
+        "ewma", 4.0, 0.1, 50
+    )
+
+    data = flow._build_alert_data({
+        "name": "Humidity Odd",
+        "trigger_type": "anomaly",
+        "entity_id": "sensor.humidity",
+        "baseline": "welford",
+    })
+    assert data["baseline"] == "welford"
+    assert "ewma_alpha" not in data
+
+    with pytest.raises(vol.Invalid, match="Entity ID is required"):
+        flow._build_alert_data({"name": "Energy Spike", "trigger_type": "anomaly"})
+
+
+def test_build_alert_data_persists_flap_detection_only_when_on():
+    """Flap fields are stored only with a threshold, which must be at least 2."""
+    flow = EmergencyOptionsFlow()
+    base = {
+        "name": "Reed Switch",
+        "trigger_type": "simple",
+        "entity_id": "binary_sensor.garage_reed",
+        "flap_window_seconds": 900,
+        "flap_suppress": True,
+    }
+    assert "flap_threshold" not in flow._build_alert_data({**base, "flap_threshold": 0})
+
+    data = flow._build_alert_data({**base, "flap_threshold": 6})
+    assert (data["flap_threshold"], data["flap_window_seconds"], data["flap_suppress"]) == (
+        6, 900, True
+    )
+
+    with pytest.raises(vol.Invalid, match="at least 2"):
+        flow._build_alert_data({**base, "flap_threshold": 1})
+
+
+def test_build_alert_data_persists_stale_fields():
+    """A stale alert stores its silence and requires it."""
+    flow = EmergencyOptionsFlow()
+    data = flow._build_alert_data({
+        "name": "Hall Silent",
+        "trigger_type": "stale",
+        "entity_id": "sensor.hall_temperature",
+        "stale_seconds": 7200,
+    })
+    assert (data["entity_id"], data["stale_seconds"]) == ("sensor.hall_temperature", 7200)
+
+    with pytest.raises(vol.Invalid, match="Stale after"):
+        flow._build_alert_data({
+            "name": "Hall Silent",
+            "trigger_type": "stale",
+            "entity_id": "sensor.hall_temperature",
+        })
+
+
+def test_build_alert_data_stores_pattern_instead_of_entity():
+    """A pattern alert stores its filters and no entity_id; template triggers refuse them."""
+    flow = EmergencyOptionsFlow()
+    data = flow._build_alert_data({
+        "name": "Leak",
+        "trigger_type": "simple",
+        "entity_id": "",
+        "entity_pattern": " binary_sensor.*_leak ",
+        "match_device_class": "moisture",
+        "trigger_state": "on",
+    })
+    assert "entity_id" not in data
+    assert data["entity_pattern"] == "binary_sensor.*_leak"
+    assert data["match_device_class"] == "moisture"
+
+    with pytest.raises(vol.Invalid, match="Entity patterns"):
+        flow._build_alert_data({
+            "name": "Leak",
+            "trigger_type": "template",
+            "template": "{{ true }}",
+            "match_domain": "binary_sensor",
+        })
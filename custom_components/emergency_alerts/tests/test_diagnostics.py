@@ -0,0 +1,107 @@
+"""Test Emergency Alerts diagnostics."""
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.emergency_alerts.const import DOMAIN
+from custom_components.emergency_alerts.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+async def _setup_hub(hass: HomeAssistant) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        title="Emergency Alerts - Diagnostics",
+        data={
+            "hub_type": "group",
+            "group": "safety",
+            "hub_name": "diag_hub",
+            "alerts": {
+                "leak": {
+                    "name": "Leak",
+                    "trigger_type": "simple",
+                    "entity_id": "binary_sensor.leak",
+                    "trigger_state": "on",
+                    "severity": "critical",
+                    "on_triggered": [
+                        {"service": "notify.phone", "data": {"message": "secret"}}
+                    ],
+                },
+                "door": {
+                    "name": "Door",
+                    "trigger_type": "logical",
+                    "logical_conditions": [
+                        {"entity_id": "binary_sensor.leak", "state": "on"},
+                        {"entity_id": "binary_sensor.door", "state": "on"},
+                    ],
+                    "logical_operator": "or",
+                    "severity": "warning",
+                    "for_seconds": 60,
+                },
+            },
+        },
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_diagnostics_reports_runtime_counters(hass: HomeAssistant):
+    """Diagnostics aggregate per-hub counters from the alert entities."""
+    entry = await _setup_hub(hass)
+
+    hass.states.async_set("binary_sensor.leak", "on")
+    await hass.async_block_till_done()
+
+    diag = await async_get_config_entry_diagnostics(hass, entry)
+    runtime = diag["runtime"]
+
+    assert runtime["alert_count"] == 2
+    assert runtime["by_trigger_type"] == {"simple": 1, "logical": 1}
+    assert runtime["by_status"] == {"active": 1, "inactive": 1}
+    # The logical alert is holding its for_seconds dwell.
+    assert runtime["pending_timers"]["for_seconds"] == 1
+    assert runtime["subscriptions"] == {
+        "binary_sensor.leak": 2,
+        "binary_sensor.door": 1,
+    }
+    assert runtime["actions"]["dispatched"] == 1
+    assert runtime["state_writes"] > 0
+    assert runtime["alerts"]["leak"]["evaluations"] >= 2
+
+
+async def test_diagnostics_redacts_service_data(hass: HomeAssistant):
+    """Action payloads are redacted while service names are kept."""
+    entry = await _setup_hub(hass)
+
+    diag = await async_get_config_entry_diagnostics(hass, entry)
+    action = diag["alerts"]["leak"]["on_triggered"][0]
+
+    assert action["service"] == "notify.phone"
+    assert action["data"] == "**REDACTED**"
+
+
+async def test_attribute_only_changes_skip_evaluation(hass: HomeAssistant):
+    """A new attribute on a watched entity doesn't re-evaluate state triggers."""
+    entry = await _setup_hub(hass)
+
+    hass.states.async_set("binary_sensor.leak", "on", {"battery": 90})
+    await hass.async_block_till_done()
+    before = (await async_get_config_entry_diagnostics(hass, entry))["runtime"]
+
+    hass.states.async_set("binary_sensor.leak", "on", {"battery": 80})
+    await hass.async_block_till_done()
+    after = (await async_get_config_entry_diagnostics(hass, entry))["runtime"]
+
+    for alert in ("leak", "door"):
+        assert (
+            after["alerts"][alert]["evaluations"]
+            == before["alerts"][alert]["evaluations"]
+        )
+        assert (
+            after["alerts"][alert]["evaluations_skipped"]
+            == before["alerts"][alert]["evaluations_skipped"] + 1
+        )
@@ -0,0 +1,60 @@
+"""Test the optional performance sensors on the global settings hub."""
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    MockConfigEntry,
+)
+
+from custom_components.emergency_alerts.const import DOMAIN
+
+
+async def _setup_global_hub(hass: HomeAssistant, enabled: bool) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        title="Emergency Alerts - Global Settings",
+        data={"hub_type": "global", "name": "Global Settings"},
+        options={
+            "enable_performance_sensors": enabled,
+            "performance_publish_interval": 30,
+        },
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_performance_sensors_disabled_by_default(hass: HomeAssistant):
+    """No performance sensors unless the global option is enabled."""
+    await _setup_global_hub(hass, enabled=False)
+
+    assert hass.states.get("sensor.emergency_alerts_evaluations_per_second") is None
+
+
+async def test_performance_sensors_publish_on_interval(
+    hass: HomeAssistant, init_group_hub
+):
+    """Counters from alert evaluation are published on the interval only."""
+    await _setup_global_hub(hass, enabled=True)
+
+    hass.states.async_set("binary_sensor.test_sensor", "on")
+    await hass.async_block_till_done()
+
+    # Nothing is written from the hot path before the interval fires.
+    before = hass.states.get("sensor.emergency_alerts_evaluations_per_second")
+    assert before.state == "unknown"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+
+    rate = hass.states.get("sensor.emergency_alerts_evaluations_per_second")
+    assert float(rate.state) > 0
+    p50 = hass.states.get("sensor.emergency_alerts_trigger_latency_p50")
+    assert float(p50.state) > 0
+    summary_rate = hass.states.get("sensor.emergency_alerts_summary_writes_per_second")
+    assert float(summary_rate.state) > 0
@@ -1,10 +1,12 @@
 """Test switch platform for Emergency Alerts integration."""
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import ANY, Mock, patch
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 
+from custom_components.emergency_alerts.binary_sensor import EmergencyBinarySensor
+from custom_components.emergency_alerts.core.definition import AlertDefinition
 from custom_components.emergency_alerts.switch import (
     async_setup_entry,
     EmergencyAlertAcknowledgeSwitch,
@@ -45,27 +47,21 @@ def mock_config_entry():
 
 
 @pytest.fixture
-def mock_binary_sensor(mock_config_entry):
-    """Create a mock binary sensor entity."""
-    # Create a simple object with real attributes instead of Mock
-    class MockBinarySensor:
-        def __init__(self, entry):
-            self.entity_id = "binary_sensor.emergency_test_hub_test_alert"
-            self._alert_id = "test_alert"
-            self._entry = entry
-            self._acknowledged = False
-            self._snoozed = False
-            self._resolved = False
-            self._escalated = False
-            self._escalation_task = None
-            self._snooze_task = None
-            self._snooze_until = None
-            self.is_on = False
-            self.async_write_ha_state = Mock()
-            self._update_status_sensor = Mock()
-            self._execute_action = AsyncMock()
-    
-    return MockBinarySensor(mock_config_entry)
+def mock_binary_sensor(hass, mock_config_entry):
+    """Create a binary sensor with its state writes and actions mocked out."""
+    sensor = EmergencyBinarySensor(
+        hass=hass,
+        entry=mock_config_entry,
+        alert_id="test_alert",
+        alert_data=mock_config_entry.data["alerts"]["test_alert"],
+        group="security",
+        hub_name="test_hub",
+    )
+    sensor.async_write_ha_state = Mock()
+    sensor._update_status_sensor = Mock()
+    sensor._call_actions = Mock()
+    sensor._arm_escalation_timer = Mock()
+    return sensor
 
 
 @pytest.mark.asyncio
@@ -136,9 +132,8 @@ async def test_acknowledge_switch_turn_on(hass: HomeAssistant, mock_config_entry
     assert mock_binary_sensor._acknowledged is True
     assert switch._attr_is_on is True
 
-    # Verify escalation task cancelled
-    if mock_binary_sensor._escalation_task:
-        mock_binary_sensor._escalation_task.cancel.assert_called_once()
+    # Verify escalation timer cancelled
+    assert mock_binary_sensor._escalation_task is None
 
 
 @pytest.mark.asyncio
@@ -154,8 +149,7 @@ async def test_acknowledge_switch_turn_off(hass: HomeAssistant, mock_config_entr
         hass.data[DOMAIN] = {}
     hass.data[DOMAIN]["entities"] = [mock_binary_sensor]
     mock_binary_sensor._acknowledged = True
-    mock_binary_sensor.is_on = True
-    mock_binary_sensor._start_escalation_timer = AsyncMock()
+    mock_binary_sensor._is_on = True
 
     await switch.async_turn_off()
 
@@ -164,7 +158,7 @@ async def test_acknowledge_switch_turn_off(hass: HomeAssistant, mock_config_entr
     assert switch._attr_is_on is False
 
     # Verify escalation timer restarted for active alert
-    mock_binary_sensor._start_escalation_timer.assert_called_once()
+    mock_binary_sensor._arm_escalation_timer.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -253,8 +247,17 @@ async def test_snooze_timer_auto_expires(hass: HomeAssistant, mock_config_entry,
     )
     switch.entity_id = "switch.emergency_test_alert_snoozed"
 
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = {}
+    hass.data[DOMAIN]["entities"] = [mock_binary_sensor]
+    mock_binary_sensor._snoozed = True
+    mock_binary_sensor._snooze_until = datetime.now() + timedelta(seconds=300)
+    switch._attr_is_on = True
+    await switch.async_added_to_hass()
+
     # Manually call the timer function with short duration
-    await switch._snooze_timer(0.1, mock_binary_sensor)
+    await mock_binary_sensor._snooze_timer(0.1)
+    await hass.async_block_till_done()
 
     # After timer expires
     assert mock_binary_sensor._snoozed is False
@@ -384,6 +387,7 @@ async def test_switch_executes_configured_actions(hass: HomeAssistant, mock_conf
     """Test that switches execute configured actions."""
     alert_data = mock_config_entry.data["alerts"]["test_alert"]
     alert_data["on_acknowledged"] = [{"service": "notify.test", "data": {}}]
+    mock_binary_sensor._definition = AlertDefinition.from_config("test_alert", alert_data)
 
     switch = EmergencyAlertAcknowledgeSwitch(hass, mock_config_entry, "test_alert", alert_data)
     switch.entity_id = "switch.emergency_test_alert_acknowledged"
@@ -395,4 +399,4 @@ async def test_switch_executes_configured_actions(hass: HomeAssistant, mock_conf
     await switch.async_turn_on()
 
     # Verify action executed
-    mock_binary_sensor._execute_action.assert_called_once_with(alert_data["on_acknowledged"])
+    mock_binary_sensor._call_actions.assert_called_once_with(alert_data["on_acknowledged"], ANY)
@@ -4,7 +4,10 @@ import json
 import pytest
 import yaml
 
-from custom_components.emergency_alerts.binary_sensor import _parse_actions, _parse_logical_conditions
+from custom_components.emergency_alerts.core.definition import (
+    _parse_actions,
+    _parse_logical_conditions,
+)
 
 
 @pytest.mark.unit
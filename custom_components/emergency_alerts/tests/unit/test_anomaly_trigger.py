@@ -0,0 +1,140 @@
+"""Unit tests for the anomaly trigger's running baselines."""
+
+import math
+from statistics import mean, variance
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.emergency_alerts.core.anomaly import (
+    AnomalyRule,
+    BaselineStore,
+    EwmaBaseline,
+    WelfordBaseline,
+)
+from custom_components.emergency_alerts.core.conditions import read_state
+from custom_components.emergency_alerts.core.definition import AlertDefinition
+
+
+def _state(value):
+    state = Mock()
+    state.state = value
+    return state
+
+
+@pytest.mark.unit
+def test_welford_matches_the_sample_mean_and_variance():
+    """The running statistics equal the batch ones."""
+    values = [20.1, 19.8, 20.4, 21.0, 19.5, 20.2, 20.0, 20.7]
+    baseline = WelfordBaseline(min_samples=2)
+    for value in values:
+        baseline.add(value)
+    assert baseline.mean == pytest.approx(mean(values))
+    assert baseline.variance() == pytest.approx(variance(values))
+
+
+@pytest.mark.unit
+def test_ewma_follows_drift():
+    """The EWMA mean moves to a new level; its variance stays bounded."""
+    baseline = EwmaBaseline(min_samples=2, alpha=0.2)
+    for _ in range(50):
+        baseline.add(10.0)
+    assert (baseline.mean, baseline.variance()) == (10.0, 0.0)
+    for _ in range(50):
+        baseline.add(20.0)
+    assert baseline.mean == pytest.approx(20.0, abs=1e-3)
+    assert baseline.variance() < 0.01
+
+
+@pytest.mark.unit
+def test_readings_are_scored_before_they_join_the_baseline():
+    """No score during warm-up; afterwards a jump scores against the old spread."""
+    baseline = WelfordBaseline(min_samples=4)
+    for value in ("10", "12", "10", "12"):
+        baseline.observe(_state(value), read_state)
+        assert baseline.last_z is None
+    # Mean 11, sample std ~1.155: 20 is ~7.8 sigma out.
+    baseline.observe(_state("20"), read_state)
+    assert baseline.last_z == pytest.approx(9 / math.sqrt(4 / 3))
+    assert AnomalyRule("sensor.x", "welford", sigma=3).deviates(baseline)
+    assert baseline.count == 5
+
+    # Non-numeric states neither score nor update.
+    baseline.observe(_state("unavailable"), read_state)
+    assert baseline.count == 5
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("baseline_class", [WelfordBaseline, EwmaBaseline])
+def test_flat_lined_sensor_scores_against_a_floor(baseline_class):
+    """Zero variance doesn't make the first small change an infinite deviation."""
+    rule = AnomalyRule("sensor.x", sigma=3)
+    baseline = baseline_class(min_samples=30)
+    for _ in range(40):
+        baseline.observe(_state("0"), read_state)
+    assert baseline.last_z == 0.0
+
+    baseline.observe(_state("0.1"), read_state)
+    assert math.isfinite(baseline.last_z)
+    assert not rule.deviates(baseline)
+
+    # A real jump still stands out.
+    baseline.observe(_state("5"), read_state)
+    assert rule.deviates(baseline)
+
+    # The floor scales with the level a sensor sits at.
+    baseline = baseline_class(min_samples=30)
+    for _ in range(40):
+        baseline.observe(_state("1000"), read_state)
+    baseline.observe(_state("1005"), read_state)
+    assert baseline.last_z == pytest.approx(0.5)
+
+
+@pytest.mark.unit
+def test_invalid_anomaly_config_is_rejected():
+    """A bad method or alpha leaves the definition without a rule."""
+    assert (
+        AnomalyRule.from_config({"entity_id": "sensor.x", "baseline": "median"}) is None
+    )
+    assert AnomalyRule.from_config({"entity_id": "sensor.x", "ewma_alpha": 2}) is None
+    rule = AnomalyRule.from_config({"entity_id": "sensor.x", "attribute": "power"})
+    assert (rule.method, rule.sigma, rule.min_samples) == ("ewma", 3.0, 30)
+
+    definition = AlertDefinition.from_config(
+        "energy", {"name": "Energy", "trigger_type": "anomaly", "entity_id": "sensor.x"}
+    )
+    assert definition.anomaly.key == ("sensor.x", None, "ewma", 0.05)
+    assert list(definition.dependencies) == ["sensor.x"]
+
+
+@pytest.mark.unit
+async def test_baselines_are_shared_restored_and_saved():
+    """Alerts share a restored baseline, saved once the last one goes."""
+    with patch("custom_components.emergency_alerts.core.anomaly.Store"):
+        store = BaselineStore(Mock())
+    store._store.async_load = AsyncMock(
+        return_value={
+            "baselines": {
+                "sensor.energy||welford|": {"count": 3, "mean": 2.0, "m2": 2.0}
+            }
+        }
+    )
+    await store.async_load()
+    rule = AnomalyRule("sensor.energy", "welford", min_samples=2)
+    first = store.acquire(rule)
+    assert store.acquire(rule) is first
+    assert (first.count, first.mean, first.variance()) == (3, 2.0, 1.0)
+
+    first.observe(_state("6"), read_state)
+    assert first.last_z == pytest.approx(4.0)
+    # Saves are coalesced until the store writes.
+    first.observe(_state("2"), read_state)
+    store._store.async_delay_save.assert_called_once()
+
+    store.release(rule)
+    store.release(rule)
+    assert rule.key not in store.baselines
+    data_func = store._store.async_delay_save.call_args.args[0]
+    saved = data_func()["baselines"]["sensor.energy||welford|"]
+    assert (saved["count"], saved["mean"]) == (5, pytest.approx(2.8))
+    assert store.acquire(rule) is not first
@@ -0,0 +1,161 @@
+"""Unit tests for compiled trigger conditions and attribute accessors."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.emergency_alerts.core.conditions import (
+    compile_accessor,
+    Condition,
+    ConditionTree,
+    DIRTY,
+    is_valid_condition,
+    MISSING,
+    read_state,
+    values_unchanged,
+)
+from custom_components.emergency_alerts.core.definition import AlertDefinition
+
+
+def _state(state="on", **attributes):
+    return Mock(state=state, attributes=attributes)
+
+
+@pytest.mark.unit
+def test_accessors_follow_attribute_paths():
+    """Dotted paths walk dicts and lists; missing parts read as MISSING."""
+    weather = _state("sunny", forecast=[{"temperature": 31}], wind=4)
+
+    assert compile_accessor(None) is read_state
+    assert compile_accessor("wind")(weather) == 4
+    assert compile_accessor("forecast.0.temperature")(weather) == 31
+    assert compile_accessor("forecast.3.temperature")(weather) is MISSING
+    assert compile_accessor("humidity")(weather) is MISSING
+    # Compiled once per path and shared.
+    assert compile_accessor("wind") is compile_accessor("wind")
+
+
+@pytest.mark.unit
+def test_condition_comparators():
+    """Attribute values compare numerically or as text; states match exactly."""
+    states = {
+        "sensor.phone": _state("ok", battery=12, charging=False),
+        "climate.hall": _state("heat", hvac_action="heating"),
+    }
+    get = states.get
+
+    assert Condition("sensor.phone", 15, "battery", "<").holds(get)
+    assert not Condition("sensor.phone", "10", "battery", "<=").holds(get)
+    assert Condition("climate.hall", "heating", "hvac_action").holds(get)
+    assert Condition("sensor.phone", "False", "charging").holds(get)
+    assert not Condition("sensor.phone", 15, "voltage", "<").holds(get)
+    assert not Condition("sensor.gone", "on").holds(get)
+    assert Condition("climate.hall", "heat").holds(get)
+    with pytest.raises(ValueError):
+        Condition("sensor.phone", 1, "battery", "~")
+
+
+@pytest.mark.unit
+def test_definition_dependencies_drive_event_skipping():
+    """Only changes to values a trigger reads are worth an evaluation."""
+    definition = AlertDefinition.from_config(
+        "heating",
+        {
+            "name": "Heating",
+            "trigger_type": "logical",
+            "logical_conditions": [
+                {
+                    "entity_id": "climate.hall",
+                    "attribute": "hvac_action",
+                    "state": "heating",
+                },
+                {"entity_id": "climate.hall", "state": "heat"},
+                {"entity_id": "binary_sensor.window", "state": "on"},
+                {"entity_id": "binary_sensor.broken"},
+            ],
+        },
+    )
+    assert definition.tree.leaves[-1] is None
+    reads = definition.dependencies
+    assert set(reads) == {"climate.hall", "binary_sensor.window"}
+
+    window = reads["binary_sensor.window"]
+    assert values_unchanged(window, _state("on", battery=90), _state("on", battery=80))
+    hall = reads["climate.hall"]
+    assert values_unchanged(
+        hall,
+        _state("heat", hvac_action="heating", current_temperature=20),
+        _state("heat", hvac_action="heating", current_temperature=21),
+    )
+    assert not values_unchanged(
+        hall, _state("heat", hvac_action="heating"), _state("heat", hvac_action="idle")
+    )
+
+
+NESTED = [
+    {"entity_id": "binary_sensor.door", "state": "on"},
+    {
+        "or": [
+            {"entity_id": "alarm_control_panel.home", "state": "armed_away"},
+            {"not": {"entity_id": "person.alex", "state": "home"}},
+        ]
+    },
+]
+
+
+@pytest.mark.unit
+def test_condition_tree_nests_and_short_circuits():
+    """Groups nest; a false AND stops before the rest of its children."""
+    states = {
+        "binary_sensor.door": _state("on"),
+        "alarm_control_panel.home": _state("disarmed"),
+        "person.alex": _state("not_home"),
+    }
+    get = Mock(side_effect=states.get)
+    tree = ConditionTree(NESTED)
+
+    assert tree.evaluate(tree.new_cache(), get)
+    states["person.alex"] = _state("home")
+    assert not tree.evaluate(tree.new_cache(), get)
+
+    states["binary_sensor.door"] = _state("off")
+    get.reset_mock()
+    assert not tree.evaluate(tree.new_cache(), get)
+    get.assert_called_once_with("binary_sensor.door")
+
+    # Nothing exists: the alarm leaf fails and NOT(alex home) holds.
+    assert ConditionTree(NESTED[1:], any_=True).evaluate(
+        bytearray([DIRTY]) * 5, lambda _: None
+    )
+    assert not ConditionTree([]).evaluate(bytearray([DIRTY]), get)
+    assert is_valid_condition(NESTED[1])
+    assert not is_valid_condition({"or": []})
+    assert not is_valid_condition({"not": {"entity_id": "person.alex"}})
+
+
+@pytest.mark.unit
+def test_condition_tree_recomputes_only_changed_subtrees():
+    """Invalidation dirties the changed leaf's path; siblings keep their result."""
+    states = {
+        "binary_sensor.door": _state("on"),
+        "alarm_control_panel.home": _state("armed_away"),
+        "person.alex": _state("home"),
+    }
+    get = Mock(side_effect=states.get)
+    tree = ConditionTree(NESTED)
+    cache = tree.new_cache()
+    assert tree.evaluate(cache, get)
+
+    old, states["person.alex"] = states["person.alex"], _state("not_home")
+    tree.invalidate(cache, "person.alex", old, states["person.alex"])
+    get.reset_mock()
+    assert tree.evaluate(cache, get)
+    # The OR holds through the cached alarm leaf; nothing is read.
+    get.assert_not_called()
+
+    old, states["binary_sensor.door"] = states["binary_sensor.door"], _state("off")
+    tree.invalidate(cache, "binary_sensor.door", old, states["binary_sensor.door"])
+    get.reset_mock()
+    assert not tree.evaluate(cache, get)
+    get.assert_called_once_with("binary_sensor.door")
+    assert cache[0] == 0
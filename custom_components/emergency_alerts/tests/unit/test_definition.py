@@ -0,0 +1,72 @@
+"""Unit tests for the immutable parsed alert definition."""
+
+import dataclasses
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.emergency_alerts.const import DEFAULT_SNOOZE_DURATION
+from custom_components.emergency_alerts.core.definition import (
+    AlertDefinition,
+    async_drop_alert_definitions,
+    async_get_alert_definitions,
+)
+
+
+@pytest.mark.unit
+def test_from_config_parses_actions_and_defaults():
+    """Action strings are parsed once; missing fields take their defaults."""
+    definition = AlertDefinition.from_config(
+        "door",
+        {
+            "name": "Door",
+            "entity_id": "binary_sensor.door",
+            "trigger_state": "on",
+            "on_acknowledged": (
+                '{"service": "notify.mobile", "data": {"message": "ack"}}'
+            ),
+            "on_resolved": "profile:night",
+            "on_triggered_script": "script.chime",
+            "for_seconds": "bogus",
+        },
+    )
+
+    assert definition.trigger_type == "simple"
+    assert definition.severity == "warning"
+    assert definition.snooze_duration == DEFAULT_SNOOZE_DURATION
+    assert definition.for_seconds == 0
+    assert definition.on_acknowledged == [
+        {"service": "notify.mobile", "data": {"message": "ack"}}
+    ]
+    assert definition.on_resolved == "profile:night"
+    assert definition.on_triggered == [
+        {"service": "script.turn_on", "data": {"entity_id": "script.chime"}}
+    ]
+    assert definition.on_snoozed == []
+
+
+@pytest.mark.unit
+def test_definition_is_frozen():
+    """Entities cannot change the shared configuration."""
+    definition = AlertDefinition.from_config("door", {"name": "Door"})
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        definition.severity = "critical"
+    assert not hasattr(definition, "__dict__")
+
+
+@pytest.mark.unit
+def test_entry_definitions_are_parsed_once_until_dropped():
+    """Every platform setting up an entry gets the same parsed objects."""
+    hass = Mock()
+    hass.data = {}
+    entry = Mock()
+    entry.entry_id = "hub"
+    entry.data = {"alerts": {"door": {"name": "Door"}, "leak": {"name": "Leak"}}}
+
+    first = async_get_alert_definitions(hass, entry)
+    assert set(first) == {"door", "leak"}
+    assert async_get_alert_definitions(hass, entry)["door"] is first["door"]
+
+    async_drop_alert_definitions(hass, "hub")
+    assert async_get_alert_definitions(hass, entry)["door"] is not first["door"]
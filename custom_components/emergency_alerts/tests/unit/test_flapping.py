@@ -0,0 +1,59 @@
+"""Unit tests for flap detection."""
+
+import pytest
+
+from custom_components.emergency_alerts.core.flapping import FlapRule
+from custom_components.emergency_alerts.core.runtime import (
+    FLAG_FLAPPING,
+    FLAG_ON,
+    FLAG_TRIGGERED,
+)
+from custom_components.emergency_alerts.core.state_machine import (
+    CMD_CONDITION_CLEARED,
+    CMD_FLAP_END,
+    CMD_FLAP_START,
+    step,
+)
+
+
+@pytest.mark.unit
+def test_flapping_starts_at_threshold_and_ends_at_half():
+    """Six flips in an hour start it; it is stable once three or fewer remain."""
+    detector = FlapRule(6, 3600).new_detector()
+    for minute in range(5):
+        detector.record(60.0 * minute)
+    assert not detector.flapping(300.0)
+    detector.record(300.0)
+    assert detector.flapping(300.0)
+    assert detector.score(300.0) == 6
+
+    # The fourth newest flip (minute 2) leaving the window leaves three.
+    assert detector.stable_at() == 120.0 + 3600
+    assert detector.score(3720.5) == 3
+
+
+@pytest.mark.unit
+def test_flap_rule_is_off_unless_configured():
+    """No threshold, no detection; a threshold below two is rejected."""
+    assert FlapRule.from_config({}) is None
+    assert FlapRule.from_config({"flap_threshold": 0}) is None
+    assert FlapRule.from_config({"flap_threshold": 1}) is None
+    rule = FlapRule.from_config({"flap_threshold": "8", "flap_suppress": True})
+    assert (rule.threshold, rule.window_seconds, rule.suppress, rule.stable_score) == (
+        8,
+        3600.0,
+        True,
+        4,
+    )
+
+
+@pytest.mark.unit
+def test_flapping_survives_the_trigger_clearing():
+    """The flapping flag is only set and cleared by its own commands."""
+    _, flags = step(FLAG_ON | FLAG_TRIGGERED, CMD_FLAP_START)
+    assert flags & FLAG_FLAPPING
+    assert step(flags, CMD_FLAP_START)[0] is None
+
+    _, flags = step(flags, CMD_CONDITION_CLEARED)
+    assert flags == FLAG_FLAPPING
+    assert step(flags, CMD_FLAP_END)[1] == 0
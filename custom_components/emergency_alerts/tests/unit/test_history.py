@@ -0,0 +1,88 @@
+"""Unit tests for the per-alert transition history ring buffer."""
+
+import pytest
+
+from custom_components.emergency_alerts.core.history import (
+    CAUSE_SERVICE,
+    CAUSE_TRIGGER,
+    merge_histories,
+    TransitionHistory,
+)
+
+
+def _fill(history, count, start=0.0):
+    for index in range(count):
+        history.record(start + index, "inactive", "active", CAUSE_TRIGGER)
+
+
+@pytest.mark.unit
+def test_ring_buffer_keeps_only_most_recent():
+    """Once full, the oldest transitions are overwritten."""
+    history = TransitionHistory(4)
+    _fill(history, 10)
+
+    assert len(history) == 4
+    assert [entry[0] for entry in history.iter_range()] == [6.0, 7.0, 8.0, 9.0]
+
+
+@pytest.mark.unit
+def test_entries_round_trip_statuses_and_cause():
+    """Packed codes decode back to the recorded statuses and cause."""
+    history = TransitionHistory(2)
+    history.record(1.0, "active", "acknowledged", CAUSE_SERVICE)
+    history.record(2.0, "acknowledged", "bogus", "not-a-cause")
+
+    assert list(history.iter_range()) == [
+        (1.0, "active", "acknowledged", "service"),
+        (2.0, "acknowledged", "unknown", "unknown"),
+    ]
+
+
+@pytest.mark.unit
+def test_time_range_is_inclusive_across_wraparound():
+    """Range queries bisect correctly after the ring has wrapped."""
+    history = TransitionHistory(5)
+    _fill(history, 8)  # holds 3..7, physically rotated
+
+    assert [e[0] for e in history.iter_range(4.0, 6.0)] == [4.0, 5.0, 6.0]
+    assert [e[0] for e in history.iter_range(start=6.5)] == [7.0]
+    assert [e[0] for e in history.latest(2, end=6.0)] == [5.0, 6.0]
+    assert list(history.iter_range(10.0)) == []
+
+
+@pytest.mark.unit
+def test_clock_going_backwards_keeps_order():
+    """A timestamp earlier than the last one is clamped to keep order."""
+    history = TransitionHistory(3)
+    history.record(10.0, "inactive", "active", CAUSE_TRIGGER)
+    history.record(5.0, "active", "inactive", CAUSE_TRIGGER)
+
+    assert [e[0] for e in history.iter_range()] == [10.0, 10.0]
+
+
+@pytest.mark.unit
+def test_zero_capacity_records_nothing():
+    """A zero-size history is a no-op."""
+    history = TransitionHistory(0)
+    _fill(history, 3)
+    assert len(history) == 0
+    assert list(history.iter_range()) == []
+
+
+@pytest.mark.unit
+def test_merge_orders_by_time_and_applies_limit():
+    """Merging interleaves alerts by time and keeps the newest ``limit``."""
+    first = TransitionHistory(10)
+    second = TransitionHistory(10)
+    _fill(first, 3, start=0.0)  # 0, 1, 2
+    _fill(second, 3, start=0.5)  # 0.5, 1.5, 2.5
+
+    rows = merge_histories(
+        [("binary_sensor.a", first), ("binary_sensor.b", second)], limit=3
+    )
+
+    assert [(row["entity_id"], row["timestamp"]) for row in rows] == [
+        ("binary_sensor.b", 1.5),
+        ("binary_sensor.a", 2.0),
+        ("binary_sensor.b", 2.5),
+    ]
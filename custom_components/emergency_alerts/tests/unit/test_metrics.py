@@ -0,0 +1,59 @@
+"""Unit tests for the runtime metrics primitives."""
+
+import pytest
+
+from custom_components.emergency_alerts.core.metrics import (
+    HISTOGRAM_BUCKETS,
+    IntegrationMetrics,
+    LatencyHistogram,
+)
+
+
+@pytest.mark.unit
+class TestLatencyHistogram:
+    """Test the fixed-size latency histogram."""
+
+    def test_empty_histogram_has_no_percentiles(self):
+        """An empty histogram reports None rather than a fake zero."""
+        assert LatencyHistogram().percentile(0.5) is None
+
+    def test_percentiles_report_bucket_upper_bounds(self):
+        """Samples land in log2 microsecond buckets."""
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(3_000)  # 3µs -> bucket [2µs, 4µs)
+        for _ in range(10):
+            histogram.record(1_500_000)  # 1.5ms -> bucket [1.024ms, 2.048ms)
+
+        assert histogram.percentile(0.50) == 0.004
+        assert histogram.percentile(0.95) == 2.048
+        assert histogram.total == 100
+
+    def test_huge_durations_are_clamped_to_last_bucket(self):
+        """The bucket array never grows."""
+        histogram = LatencyHistogram()
+        histogram.record(10**15)
+        assert len(histogram.counts) == HISTOGRAM_BUCKETS
+        assert histogram.counts[-1] == 1
+
+    def test_reset(self):
+        """Reset drops all samples."""
+        histogram = LatencyHistogram()
+        histogram.record(1_000)
+        histogram.reset()
+        assert histogram.total == 0
+        assert histogram.percentile(0.99) is None
+
+
+@pytest.mark.unit
+def test_integration_snapshot_is_monotonic_counters():
+    """Snapshots expose the counters without the windowed histogram."""
+    metrics = IntegrationMetrics()
+    metrics.evaluations += 3
+    metrics.summary_writes += 1
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["evaluations"] == 3
+    assert snapshot["summary_writes"] == 1
+    assert "trigger_to_state" not in snapshot
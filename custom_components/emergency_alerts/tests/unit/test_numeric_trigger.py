@@ -0,0 +1,100 @@
+"""Unit tests for numeric threshold triggers."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.emergency_alerts.binary_sensor import EmergencyBinarySensor
+from custom_components.emergency_alerts.core.definition import AlertDefinition
+from custom_components.emergency_alerts.core.numeric import (
+    compare_values,
+    NumericThreshold,
+)
+
+
+@pytest.mark.unit
+def test_compare_values_numeric_then_string():
+    """Ordering comparators go numeric when both sides parse; else equality."""
+    assert compare_values("10", ">", "9.5") is True
+    assert compare_values("10", "<", "9.5") is False
+    assert compare_values("on", ">", "9") is False
+    assert compare_values("on", "==", "on") is True
+    assert compare_values("1.0", "==", "1") is False
+    assert compare_values("off", "!=", "on") is True
+
+
+@pytest.mark.unit
+def test_definition_parses_thresholds_once():
+    """Thresholds are floats on the definition; invalid ones disable the trigger."""
+    definition = AlertDefinition.from_config(
+        "freezer",
+        {
+            "name": "Freezer",
+            "trigger_type": "numeric",
+            "entity_id": "sensor.freezer",
+            "comparator": ">",
+            "threshold": "-10",
+            "clear_threshold": -12,
+        },
+    )
+    assert definition.numeric.threshold == -10.0
+    assert definition.numeric.clear_threshold == -12.0
+
+    bad = AlertDefinition.from_config(
+        "bad", {"name": "Bad", "trigger_type": "numeric", "threshold": "warm"}
+    )
+    assert bad.numeric is None
+    # A clear threshold on the wrong side of the threshold is ignored.
+    assert NumericThreshold("<", 10.0, 5.0).clear_threshold == 10.0
+
+
+@pytest.mark.unit
+def test_hysteresis_and_non_numeric_states():
+    """Once on, only crossing the clear threshold turns the trigger off."""
+    numeric = NumericThreshold(">", 30.0, 28.0)
+    active = False
+    seen = []
+    for state in ("29", "30.5", "29.5", "unavailable", "28.5", "28", "29.9", "31"):
+        active = numeric.evaluate(state, active)
+        seen.append(active)
+    assert seen == [False, True, True, True, True, False, False, True]
+
+
+@pytest.mark.unit
+@patch("custom_components.emergency_alerts.binary_sensor.async_dispatcher_send")
+def test_numeric_alert_does_not_flap_at_the_limit(mock_dispatcher):
+    """A reading hovering at the threshold fires once."""
+    hass = Mock()
+    hass.data = {}
+    entry = Mock()
+    entry.entry_id = "test_entry"
+    state = Mock()
+    hass.states.get = Mock(return_value=state)
+    sensor = EmergencyBinarySensor(
+        hass=hass,
+        entry=entry,
+        alert_id="server_room",
+        alert_data={
+            "name": "Server Room Hot",
+            "trigger_type": "numeric",
+            "entity_id": "sensor.server_room",
+            "comparator": ">=",
+            "threshold": 30,
+            "clear_threshold": 27,
+        },
+        group="security",
+        hub_name="test_hub",
+    )
+    sensor.async_write_ha_state = Mock()
+    sensor._update_status_sensor = Mock()
+    # The mock hass has no event loop to arm the escalation timer on
+    sensor._arm_escalation_timer = Mock()
+    sensor.transition = Mock(wraps=sensor.transition)
+
+    for value in ("29.8", "30.1", "29.9", "30.0", "29.7", "26.9"):
+        state.state = value
+        sensor._evaluate_trigger()
+
+    commands = [call.args[0] for call in sensor.transition.call_args_list]
+    assert commands == ["condition_cleared", "trigger", "condition_cleared"]
+    assert sensor._is_on is False
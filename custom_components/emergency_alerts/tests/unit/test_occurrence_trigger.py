@@ -0,0 +1,67 @@
+"""Unit tests for the windowed occurrence trigger."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.emergency_alerts.core.definition import AlertDefinition
+from custom_components.emergency_alerts.core.occurrence import OccurrenceWindow
+
+
+@pytest.mark.unit
+def test_window_holds_while_the_nth_newest_is_inside():
+    """Three in ten seconds: the oldest of the last three decides."""
+    window = OccurrenceWindow(3, 10.0)
+    for stamp in (0.0, 4.0):
+        window.record(stamp)
+    assert not window.holds(5.0)
+
+    window.record(8.0)
+    assert window.holds(9.0)
+    assert window.expires_at() == 10.0
+    assert not window.holds(10.0)
+
+    # A fourth occurrence overwrites the oldest and moves the expiry.
+    window.record(11.0)
+    assert window.holds(11.0)
+    assert window.expires_at() == 14.0
+    assert window.count(11.0) == 3
+    assert window.count(16.0) == 2
+
+
+@pytest.mark.unit
+def test_rule_counts_only_edges_into_the_trigger_state():
+    """Staying in the trigger state or leaving it is not an occurrence."""
+    definition = AlertDefinition.from_config(
+        "door",
+        {
+            "name": "Door",
+            "trigger_type": "occurrence",
+            "entity_id": "binary_sensor.door",
+            "trigger_state": "on",
+            "occurrences": "5",
+            "window_seconds": 600,
+        },
+    )
+    rule = definition.occurrence
+    assert (rule.occurrences, rule.window_seconds) == (5, 600.0)
+    assert set(definition.dependencies) == {"binary_sensor.door"}
+
+    on, off = Mock(state="on"), Mock(state="off")
+    assert rule.is_occurrence(off, on)
+    assert rule.is_occurrence(None, on)
+    assert not rule.is_occurrence(on, on)
+    assert not rule.is_occurrence(on, off)
+
+    bad = AlertDefinition.from_config(
+        "bad",
+        {
+            "name": "Bad",
+            "trigger_type": "occurrence",
+            "entity_id": "x.y",
+            "trigger_state": "on",
+            "occurrences": 0,
+            "window_seconds": 60,
+        },
+    )
+    assert bad.occurrence is None
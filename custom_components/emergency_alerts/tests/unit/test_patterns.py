@@ -0,0 +1,108 @@
+"""Unit tests for pattern alerts: matching, the prefix index and binding."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.emergency_alerts.core.definition import AlertDefinition
+from custom_components.emergency_alerts.core.patterns import (
+    EntityPattern,
+    instance_id,
+    PrefixIndex,
+)
+
+
+def _state(entity_id, device_class=None):
+    attributes = {"device_class": device_class} if device_class else {}
+    return Mock(entity_id=entity_id, attributes=attributes)
+
+
+@pytest.mark.unit
+def test_pattern_filters_and_prefix():
+    """Glob, domain and device class must all match; the prefix is literal."""
+    pattern = EntityPattern("binary_sensor.*_leak", device_class="moisture")
+    assert pattern.prefix == "binary_sensor."
+    assert pattern.state_domain == "binary_sensor"
+    assert pattern.matches(_state("binary_sensor.kitchen_leak", "moisture"))
+    assert not pattern.matches(_state("binary_sensor.kitchen_leak", "door"))
+    assert not pattern.matches(_state("sensor.kitchen_leak", "moisture"))
+
+    # A domain alone, and a domain that is longer than the glob's prefix.
+    assert EntityPattern(domain="sensor").prefix == "sensor."
+    assert EntityPattern("sens*", domain="sensor").prefix == "sensor."
+    battery = EntityPattern(device_class="battery")
+    assert (battery.prefix, battery.state_domain) == ("", None)
+    assert battery.matches(_state("sensor.phone_battery", "battery"))
+
+    with pytest.raises(ValueError):
+        EntityPattern()
+
+
+@pytest.mark.unit
+def test_prefix_index_only_returns_patterns_sharing_the_prefix():
+    """Lookups probe one bucket per prefix length; removal empties them."""
+    index = PrefixIndex()
+    index.add(("hub", "leak"), EntityPattern("binary_sensor.*_leak"))
+    index.add(("hub", "kitchen"), EntityPattern("binary_sensor.kitchen_*"))
+    index.add(("hub", "battery"), EntityPattern(device_class="battery"))
+    for n in range(200):
+        index.add(("hub", f"light_{n}"), EntityPattern(f"light.room_{n}_*"))
+
+    candidates = {key for key, _ in index.candidates("binary_sensor.kitchen_leak")}
+    assert candidates == {("hub", "leak"), ("hub", "kitchen"), ("hub", "battery")}
+    assert set(index.match(_state("binary_sensor.kitchen_leak"))) == {
+        ("hub", "leak"),
+        ("hub", "kitchen"),
+    }
+    assert index.match(_state("light.room_7_ceiling")) == [("hub", "light_7")]
+
+    index.remove(("hub", "kitchen"))
+    index.remove(("hub", "missing"))
+    assert ("hub", "kitchen") not in index
+    assert index.match(_state("binary_sensor.kitchen_leak")) == [("hub", "leak")]
+    for n in range(200):
+        index.remove(("hub", f"light_{n}"))
+    assert len(index) == 2
+    assert index._lengths == {len("binary_sensor."): 1, 0: 1}
+
+
+@pytest.mark.unit
+def test_bound_instances_share_the_compiled_trigger():
+    """Instances re-target the trigger but share tests, thresholds and actions."""
+    template = AlertDefinition.from_config(
+        "leak",
+        {
+            "name": "Leak",
+            "trigger_type": "simple",
+            "entity_id": "binary_sensor.*_leak",
+            "trigger_state": "on",
+            "on_triggered": [{"service": "notify.notify"}],
+        },
+    )
+    kitchen = template.bind(
+        instance_id("leak", "binary_sensor.kitchen_leak"),
+        "Leak - Kitchen",
+        "binary_sensor.kitchen_leak",
+    )
+    assert kitchen.alert_id == "leak_binary_sensor_kitchen_leak"
+    assert kitchen.pattern_alert_id == "leak"
+    assert list(kitchen.dependencies) == ["binary_sensor.kitchen_leak"]
+    leaf = kitchen.tree.leaves[0]
+    assert leaf.entity_id == "binary_sensor.kitchen_leak"
+    assert leaf.test is template.tree.leaves[0].test
+    assert kitchen.on_triggered is template.on_triggered
+    assert template.tree.leaves[0].entity_id == "binary_sensor.*_leak"
+
+    battery = AlertDefinition.from_config(
+        "low",
+        {
+            "name": "Battery Low",
+            "trigger_type": "numeric",
+            "entity_id": "*",
+            "attribute": "battery",
+            "comparator": "<",
+            "threshold": 15,
+        },
+    ).bind("low_sensor_phone", "Battery Low - Phone", "sensor.phone")
+    assert battery.numeric is not None
+    assert list(battery.dependencies) == ["sensor.phone"]
@@ -0,0 +1,72 @@
+"""Unit tests for the callback profiler."""
+
+import pytest
+
+from custom_components.emergency_alerts.core import profiler as profiler_module
+from custom_components.emergency_alerts.core.profiler import (
+    profiled,
+    start_profiler,
+    stop_profiler,
+)
+
+
+class _Alert:
+    @profiled
+    def evaluate(self, value):
+        return self.dispatch(value) + 1
+
+    @profiled
+    def dispatch(self, value):
+        return value * 2
+
+
+@pytest.fixture(autouse=True)
+def _no_active_profile():
+    """Never leak a running profile between tests."""
+    stop_profiler()
+    yield
+    stop_profiler()
+
+
+@pytest.mark.unit
+def test_profiled_is_transparent_when_idle():
+    """Decorated callbacks behave normally and record nothing when idle."""
+    assert _Alert().evaluate(2) == 5
+    assert profiler_module._active is None
+
+
+@pytest.mark.unit
+def test_profile_aggregates_calls_including_nested():
+    """Nested profiled callbacks are each accounted."""
+    profiler = start_profiler()
+    alert = _Alert()
+    for value in range(3):
+        alert.evaluate(value)
+    assert stop_profiler() is profiler
+
+    rows = {row["function"]: row for row in profiler.summary()}
+    assert rows["_Alert.evaluate"]["calls"] == 3
+    assert rows["_Alert.dispatch"]["calls"] == 3
+    assert rows["_Alert.evaluate"]["total_ms"] >= rows["_Alert.dispatch"]["total_ms"]
+
+
+@pytest.mark.unit
+def test_only_one_profile_at_a_time():
+    """A second start while running is refused."""
+    assert start_profiler() is not None
+    assert start_profiler() is None
+
+
+@pytest.mark.unit
+def test_profile_dumps_pstats(tmp_path):
+    """The captured trace loads with pstats."""
+    import pstats
+
+    profiler = start_profiler()
+    _Alert().evaluate(1)
+    stop_profiler()
+
+    path = tmp_path / "out.prof"
+    profiler.profile.dump_stats(str(path))
+    stats = pstats.Stats(str(path))
+    assert any(func[2] == "dispatch" for func in stats.stats)
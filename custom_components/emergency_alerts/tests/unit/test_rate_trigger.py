@@ -0,0 +1,64 @@
+"""Unit tests for the rate-of-change trigger's sample window."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.emergency_alerts.core.conditions import read_state
+from custom_components.emergency_alerts.core.definition import AlertDefinition
+from custom_components.emergency_alerts.core.rate import (
+    async_acquire_sample_window,
+    async_release_sample_window,
+    SampleWindow,
+)
+
+
+@pytest.mark.unit
+def test_slope_is_maintained_across_growth_and_expiry():
+    """The running least-squares slope matches a straight line's."""
+    window = SampleWindow(600.0, read_state, capacity=2)
+    assert window.slope() is None
+
+    # 0.01 units/s for 20 minutes, one sample a minute.
+    for minute in range(21):
+        window.add(1_700_000_000.0 + 60 * minute, 5.0 + 0.6 * minute)
+    # Samples older than 10 minutes are gone; the slope is exact.
+    assert len(window) == 10
+    assert window.slope() == pytest.approx(0.01)
+    assert window.change() == pytest.approx(6.0)
+    assert window.expires_at() == 1_700_000_000.0 + 60 * 11 + 600
+
+    window.expire(1_700_000_000.0 + 60 * 29)
+    assert len(window) == 1
+    assert window.change() == 0.0
+
+
+@pytest.mark.unit
+def test_alerts_on_the_same_entity_share_one_window():
+    """Same entity, attribute and window: one window, fed once per change."""
+    hass = Mock()
+    hass.data = {}
+    config = {
+        "name": "Freezer Rising",
+        "trigger_type": "rate",
+        "entity_id": "sensor.freezer",
+        "comparator": ">",
+        "threshold": 2,
+        "window_seconds": 600,
+    }
+    first = AlertDefinition.from_config("a", config).rate
+    second = AlertDefinition.from_config("b", {**config, "threshold": 4}).rate
+
+    window = async_acquire_sample_window(hass, first)
+    assert async_acquire_sample_window(hass, second) is window
+
+    state = Mock(state="-18.5")
+    window.observe(state, 100.0)
+    window.observe(state, 100.0)
+    window.observe(Mock(state="unavailable"), 101.0)
+    assert len(window) == 1
+
+    async_release_sample_window(hass, first)
+    assert hass.data["emergency_alerts"]["sample_windows"]
+    async_release_sample_window(hass, second)
+    assert not hass.data["emergency_alerts"]["sample_windows"]
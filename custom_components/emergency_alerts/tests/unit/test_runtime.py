@@ -0,0 +1,98 @@
+"""Unit tests for the shared per-alert runtime record."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.emergency_alerts.binary_sensor import EmergencyBinarySensor
+from custom_components.emergency_alerts.core.runtime import (
+    AlertRuntime,
+    async_drop_alert_runtime,
+    async_find_alert_runtime,
+    async_get_alert_runtime,
+    FLAG_ACKNOWLEDGED,
+    FLAG_ON,
+    FLAG_SNOOZED,
+)
+
+
+def _sensor(runtime=None):
+    entry = Mock()
+    entry.entry_id = "entry"
+    return EmergencyBinarySensor(
+        hass=Mock(),
+        entry=entry,
+        alert_id="door",
+        alert_data={
+            "name": "Door",
+            "trigger_type": "simple",
+            "entity_id": "binary_sensor.door",
+        },
+        group="security",
+        hub_name="security",
+        runtime=runtime,
+    )
+
+
+@pytest.mark.unit
+def test_runtime_has_no_instance_dict():
+    """The record is slot-only, so its size is fixed."""
+    runtime = AlertRuntime()
+
+    assert not hasattr(runtime, "__dict__")
+    with pytest.raises(AttributeError):
+        runtime.something_else = 1
+
+
+@pytest.mark.unit
+def test_sensor_flags_are_bits_of_the_runtime():
+    """Entity flag attributes read and write the shared bitfield."""
+    runtime = AlertRuntime()
+    sensor = _sensor(runtime)
+
+    sensor._is_on = True
+    sensor._snoozed = True
+    assert runtime.flags == FLAG_ON | FLAG_SNOOZED
+
+    runtime.set(FLAG_SNOOZED, False)
+    runtime.set(FLAG_ACKNOWLEDGED, True)
+    assert sensor._snoozed is False
+    assert sensor._acknowledged is True
+    assert runtime.flags_dict()["acknowledged"] is True
+
+
+@pytest.mark.unit
+def test_sensor_timers_and_timestamps_live_in_the_runtime():
+    """Timer handles set through the sensor are visible on the record."""
+    runtime = AlertRuntime()
+    sensor = _sensor(runtime)
+    unsub = Mock()
+
+    sensor._escalation_task = unsub
+    sensor._first_triggered = "2024-01-01T00:00:00"
+
+    assert runtime.escalation_unsub is unsub
+    assert runtime.first_triggered == "2024-01-01T00:00:00"
+    assert sensor.pending_timers() == {
+        "for_seconds": False,
+        "escalation": True,
+        "snooze": False,
+        "window": False,
+        "flap": False,
+    }
+    assert runtime.alert is sensor
+
+
+@pytest.mark.unit
+def test_registry_returns_one_record_per_alert():
+    """Platforms asking for the same alert share one record until dropped."""
+    hass = Mock()
+    hass.data = {}
+
+    runtime = async_get_alert_runtime(hass, "entry", "door")
+    assert async_get_alert_runtime(hass, "entry", "door") is runtime
+    assert async_get_alert_runtime(hass, "other", "door") is not runtime
+    assert async_find_alert_runtime(hass, "entry", "door") is runtime
+
+    async_drop_alert_runtime(hass, "entry", "door")
+    assert async_find_alert_runtime(hass, "entry", "door") is None
@@ -0,0 +1,94 @@
+"""Unit tests for the staleness trigger's deadline index."""
+
+import random
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.emergency_alerts.core.definition import AlertDefinition
+from custom_components.emergency_alerts.core.staleness import DeadlineIndex, StaleRule
+
+
+@pytest.fixture
+def call_later():
+    with (
+        patch(
+            "custom_components.emergency_alerts.core.staleness.async_call_later"
+        ) as call_later,
+        patch(
+            "custom_components.emergency_alerts.core.staleness.dt_util.utcnow"
+        ) as utcnow,
+    ):
+        utcnow.return_value.timestamp.return_value = 0.0
+        yield call_later
+
+
+@pytest.mark.unit
+def test_heap_order_survives_reschedules_and_removals(call_later):
+    """Random moves and removals keep the earliest deadline at the head."""
+    index = DeadlineIndex(Mock())
+    rng = random.Random(7)
+    expected = {}
+    for step in range(2000):
+        key = f"sensor.device_{rng.randrange(200)}"
+        if rng.random() < 0.2:
+            index.remove(key)
+            expected.pop(key, None)
+        else:
+            deadline = rng.uniform(1, 10_000)
+            index.schedule(key, deadline, Mock())
+            expected[key] = deadline
+        assert len(index) == len(expected)
+        assert index.next_deadline() == (min(expected.values()) if expected else None)
+    for key, deadline in expected.items():
+        assert index.deadline(key) == deadline
+
+
+@pytest.mark.unit
+def test_one_timer_follows_the_earliest_deadline(call_later):
+    """Only a change of the earliest deadline re-arms the single timer."""
+    index = DeadlineIndex(Mock())
+    first, second = Mock(), Mock()
+    index.schedule("a", 100.0, first)
+    index.schedule("b", 200.0, second)
+    index.schedule("b", 300.0, second)
+    assert call_later.call_count == 1
+    assert call_later.call_args.args[1] == 100.0
+
+    index.schedule("a", 400.0, first)
+    assert call_later.call_count == 2
+    assert call_later.call_args.args[1] == 300.0
+
+    # The timer fires: due handlers run once and leave the index.
+    with patch(
+        "custom_components.emergency_alerts.core.staleness.dt_util.utcnow"
+    ) as utcnow:
+        utcnow.return_value.timestamp.return_value = 300.0
+        call_later.call_args.args[2](None)
+    second.assert_called_once_with()
+    first.assert_not_called()
+    assert "b" not in index
+    assert index.next_deadline() == 400.0
+
+    index.remove("a")
+    assert index.next_deadline() is None
+    call_later.return_value.assert_called()
+
+
+@pytest.mark.unit
+def test_stale_rule_parsing():
+    """The definition watches every report of the entity."""
+    assert StaleRule.from_config({"entity_id": "sensor.x"}) is None
+    assert StaleRule.from_config({"entity_id": "sensor.x", "stale_seconds": 0}) is None
+
+    definition = AlertDefinition.from_config(
+        "silent",
+        {
+            "name": "Silent",
+            "trigger_type": "stale",
+            "entity_id": "sensor.x",
+            "stale_seconds": 7200,
+        },
+    )
+    assert definition.stale.stale_seconds == 7200.0
+    assert list(definition.dependencies) == ["sensor.x"]
@@ -0,0 +1,64 @@
+"""Unit tests for transition latency traces."""
+
+import pytest
+
+from custom_components.emergency_alerts.core.metrics import (
+    AlertMetrics,
+    ROLLING_HISTOGRAM_SAMPLES,
+)
+from custom_components.emergency_alerts.core.tracing import TransitionTrace
+
+
+@pytest.mark.unit
+def test_trace_ids_are_monotonic():
+    """Each trace gets a larger ID than the one before it."""
+    first = TransitionTrace("triggered")
+    second = TransitionTrace("cleared")
+    assert second.trace_id > first.trace_id
+
+
+@pytest.mark.unit
+def test_trace_closes_once_after_write_and_actions():
+    """A trace closes only when written and every action finished."""
+    trace = TransitionTrace("triggered", observed_ns=1_000, evaluated_ns=2_000)
+    stamp = trace.action_enqueued("notify.phone")
+    assert not trace.try_close()
+
+    trace.written_ns = 3_000
+    assert not trace.try_close()
+
+    stamp.started_ns = 4_000
+    stamp.completed_ns = 9_000
+    trace.pending_actions -= 1
+    assert trace.try_close()
+    assert not trace.try_close()
+
+    data = trace.as_dict()
+    assert data["written_ms"] == 0.002
+    assert data["actions"][0]["completed_ms"] == 0.008
+    assert trace.latency_ns() == 8_000
+
+
+@pytest.mark.unit
+def test_latency_excludes_for_seconds_dwell():
+    """Dwell time between arming and firing is not processing latency."""
+    trace = TransitionTrace("triggered", observed_ns=1_000, evaluated_ns=1_500)
+    trace.armed_ns = 2_000
+    trace.fired_ns = 60_000_000_000
+    trace.written_ns = 60_000_004_000
+
+    assert trace.latency_ns() == 4_000
+    assert trace.as_dict()["fired_ms"] == pytest.approx(59_999.999, abs=1e-3)
+
+
+@pytest.mark.unit
+def test_per_alert_histogram_is_rolling():
+    """The per-alert histogram ages out old samples instead of growing."""
+    metrics = AlertMetrics()
+    assert metrics.as_dict()["transition_latency_ms"] is None
+
+    for _ in range(ROLLING_HISTOGRAM_SAMPLES * 3):
+        metrics.record_transition(5_000)
+
+    assert metrics.transition_latency.total <= ROLLING_HISTOGRAM_SAMPLES
+    assert metrics.as_dict()["transition_latency_ms"]["p50"] == 0.008
@@ -0,0 +1,99 @@
+"""Unit tests for the table-driven alert state machine."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.emergency_alerts.binary_sensor import EmergencyBinarySensor
+from custom_components.emergency_alerts.const import EVENT_ALERT_SNOOZED
+from custom_components.emergency_alerts.core.runtime import (
+    FLAG_ACKNOWLEDGED,
+    FLAG_ESCALATED,
+    FLAG_ON,
+    FLAG_RESOLVED,
+    FLAG_SNOOZED,
+    FLAG_TRIGGERED,
+)
+from custom_components.emergency_alerts.core.state_machine import (
+    CMD_ACKNOWLEDGE,
+    CMD_CONDITION_CLEARED,
+    CMD_ESCALATION_TIMEOUT,
+    CMD_RESOLVE,
+    CMD_SNOOZE,
+    CMD_TRIGGER,
+    step,
+    TIMER_CANCEL,
+    TRANSITIONS,
+)
+
+FIRING = FLAG_ON | FLAG_TRIGGERED
+
+
+@pytest.mark.unit
+def test_exclusions_are_folded_into_each_row():
+    """Setting a handled flag clears the others, and leaving snooze stops its timer."""
+    row, flags = step(FIRING | FLAG_SNOOZED | FLAG_ESCALATED, CMD_ACKNOWLEDGE)
+
+    assert flags == FIRING | FLAG_ACKNOWLEDGED
+    assert row.snooze == TIMER_CANCEL
+    assert TRANSITIONS[CMD_RESOLVE].clear & (FLAG_ACKNOWLEDGED | FLAG_SNOOZED) == (
+        FLAG_ACKNOWLEDGED | FLAG_SNOOZED
+    )
+
+
+@pytest.mark.unit
+def test_guards_reject_without_changing_flags():
+    """Commands whose guard fails return no row and the flags untouched."""
+    assert step(FLAG_RESOLVED, CMD_TRIGGER) == (None, FLAG_RESOLVED)
+    assert step(FIRING, CMD_TRIGGER) == (None, FIRING)
+    assert step(FIRING | FLAG_ACKNOWLEDGED, CMD_ESCALATION_TIMEOUT)[0] is None
+    assert step(0, CMD_ESCALATION_TIMEOUT)[0] is None
+
+    row, flags = step(FIRING | FLAG_RESOLVED | FLAG_ESCALATED, CMD_CONDITION_CLEARED)
+    assert row is TRANSITIONS[CMD_CONDITION_CLEARED]
+    assert flags == 0
+
+
+@pytest.mark.unit
+@patch("custom_components.emergency_alerts.binary_sensor.async_dispatcher_send")
+@patch("custom_components.emergency_alerts.binary_sensor.asyncio.create_task")
+def test_transition_writes_once_and_sends_one_alert_update(
+    create_task, dispatcher_send
+):
+    """A transition moving several flags still writes and notifies once."""
+    hass = Mock()
+    hass.data = {}
+    entry = Mock()
+    entry.entry_id = "entry"
+    sensor = EmergencyBinarySensor(
+        hass=hass,
+        entry=entry,
+        alert_id="door",
+        alert_data={"name": "Door", "on_snoozed": [{"service": "notify.me"}]},
+        group="security",
+        hub_name="security",
+    )
+    sensor.async_write_ha_state = Mock()
+    sensor._update_status_sensor = Mock()
+    sensor._call_actions = Mock()
+    sensor._runtime.flags = FIRING | FLAG_ACKNOWLEDGED
+    create_task.side_effect = lambda coro: coro.close()
+
+    assert sensor.transition(CMD_SNOOZE, "select") is True
+
+    assert sensor._runtime.flags == FIRING | FLAG_SNOOZED
+    assert sensor._snooze_until is not None
+    create_task.assert_called_once()
+    sensor.async_write_ha_state.assert_called_once()
+    sensor._update_status_sensor.assert_called_once_with("select")
+    sensor._call_actions.assert_called_once()
+    assert sensor._call_actions.call_args[0][0] == [{"service": "notify.me"}]
+    event, data = hass.bus.async_fire.call_args[0]
+    assert event == EVENT_ALERT_SNOOZED
+    assert data["snooze_until"] == sensor._snooze_until.isoformat()
+    alert_updates = [
+        call
+        for call in dispatcher_send.call_args_list
+        if call[0][1].endswith("_entry_door")
+    ]
+    assert len(alert_updates) == 1
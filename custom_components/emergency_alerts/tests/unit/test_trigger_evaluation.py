@@ -42,6 +42,8 @@ class TestSimpleTriggerEvaluation:
         
         # Mock async_write_ha_state to avoid entity_id requirement
         sensor.async_write_ha_state = Mock()
+        # The mock hass has no event loop to arm the escalation timer on
+        sensor._arm_escalation_timer = Mock()
         
         sensor._evaluate_trigger()
         assert sensor._is_on is True
@@ -77,6 +79,8 @@ class TestSimpleTriggerEvaluation:
         
         # Mock async_write_ha_state to avoid entity_id requirement
         sensor.async_write_ha_state = Mock()
+        # The mock hass has no event loop to arm the escalation timer on
+        sensor._arm_escalation_timer = Mock()
         
         sensor._evaluate_trigger()
         assert sensor._is_on is False
@@ -110,6 +114,8 @@ class TestSimpleTriggerEvaluation:
         
         # Mock async_write_ha_state to avoid entity_id requirement
         sensor.async_write_ha_state = Mock()
+        # The mock hass has no event loop to arm the escalation timer on
+        sensor._arm_escalation_timer = Mock()
         
         sensor._evaluate_trigger()
         assert sensor._is_on is False
@@ -156,6 +162,8 @@ class TestLogicalTriggerEvaluation:
         
         # Mock async_write_ha_state to avoid entity_id requirement
         sensor.async_write_ha_state = Mock()
+        # The mock hass has no event loop to arm the escalation timer on
+        sensor._arm_escalation_timer = Mock()
         
         sensor._evaluate_trigger()
         assert sensor._is_on is True
@@ -200,6 +208,8 @@ class TestLogicalTriggerEvaluation:
         
         # Mock async_write_ha_state to avoid entity_id requirement
         sensor.async_write_ha_state = Mock()
+        # The mock hass has no event loop to arm the escalation timer on
+        sensor._arm_escalation_timer = Mock()
         
         sensor._evaluate_trigger()
         assert sensor._is_on is False
@@ -244,6 +254,8 @@ class TestLogicalTriggerEvaluation:
         
         # Mock async_write_ha_state to avoid entity_id requirement
         sensor.async_write_ha_state = Mock()
+        # The mock hass has no event loop to arm the escalation timer on
+        sensor._arm_escalation_timer = Mock()
         
         sensor._evaluate_trigger()
         assert sensor._is_on is True
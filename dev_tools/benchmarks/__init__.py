@@ -0,0 +1,6 @@
+"""Benchmarks for the Emergency Alerts integration.
+
+Run from the repository root, e.g. ``python -m dev_tools.benchmarks.scale``.
+Everything runs on the mock HA core in ``dev_tools/mock_ha``; no Home
+Assistant installation is needed.
+"""
@@ -0,0 +1,199 @@
+"""Build large synthetic installs on the mock HA core.
+
+An install is one global settings hub plus ``hubs`` group hubs holding
+``alerts`` alerts between them. Alerts watch a shared pool of source
+entities (``binary_sensor.bench_source_<n>``), so one source state change
+fans out to several alerts the way a busy real install does.
+"""
+
+import gc
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# Set up mock homeassistant modules BEFORE importing the integration
+from dev_tools.mock_ha.homeassistant_shim import (  # noqa: E402
+    ConfigEntry,
+    setup_test_environment,
+)
+
+setup_test_environment()
+
+from dev_tools.mock_ha.ha_core import create_mock_hass  # noqa: E402
+
+DOMAIN = "emergency_alerts"
+NOTIFY_DOMAIN = "notify"
+NOTIFY_SERVICE = "bench"
+
+# Share of alerts per trigger type, and of alerts carrying an action.
+LOGICAL_SHARE = 0.3
+ACTION_SHARE = 0.5
+# Average number of alerts watching each source entity.
+ALERTS_PER_SOURCE = 2
+# Dwell used by alerts given a for_seconds debounce.
+FOR_SECONDS = 60
+
+
+def source_entity_id(index: int) -> str:
+    """Return the entity_id of a source sensor."""
+    return f"binary_sensor.bench_source_{index}"
+
+
+def make_alert(
+    index: int, source_count: int, rng: random.Random, for_seconds_share: float = 0.0
+) -> dict:
+    """Return the config of one synthetic alert."""
+    alert = {
+        "name": f"Bench Alert {index}",
+        "severity": rng.choice(("warning", "critical")),
+    }
+    if rng.random() < LOGICAL_SHARE:
+        alert["trigger_type"] = "logical"
+        alert["logical_operator"] = rng.choice(("and", "or"))
+        alert["logical_conditions"] = [
+            {"entity_id": source_entity_id(rng.randrange(source_count)), "state": "on"}
+            for _ in range(2)
+        ]
+    else:
+        alert["trigger_type"] = "simple"
+        alert["entity_id"] = source_entity_id(rng.randrange(source_count))
+        alert["trigger_state"] = "on"
+    if for_seconds_share and rng.random() < for_seconds_share:
+        alert["for_seconds"] = FOR_SECONDS
+    if rng.random() < ACTION_SHARE:
+        alert["on_triggered"] = [
+            {
+                "service": f"{NOTIFY_DOMAIN}.{NOTIFY_SERVICE}",
+                "data": {"message": f"Bench alert {index}"},
+            }
+        ]
+    return alert
+
+
+class Install:
+    """A populated mock hass plus the indexes benchmarks need."""
+
+    def __init__(self, hass, alert_count: int, hub_count: int, source_count: int):
+        self.hass = hass
+        self.alert_count = alert_count
+        self.hub_count = hub_count
+        self.source_count = source_count
+        self.memory_bytes = None
+        self.setup_seconds = None
+        # source entity_id -> alert entities watching it (for reporting;
+        # dispatch goes through the mock bus)
+        self.watchers = defaultdict(list)
+
+    @property
+    def alerts(self) -> list:
+        """Return the alert binary sensors."""
+        return self.hass.data[DOMAIN]["entities"]
+
+    def platform_entities(self, platform: str) -> list:
+        """Return every entity a platform added, across all hubs."""
+        prefix = f"{platform}."
+        return [
+            entity
+            for entities in self.hass.config_entries._entities.values()
+            for entity in entities
+            if entity.entity_id.startswith(prefix)
+        ]
+
+    @property
+    def metrics(self):
+        """Return the integration-wide counters."""
+        return self.hass.data[DOMAIN]["metrics"]
+
+    def index_watchers(self):
+        """Map each source entity to the alerts subscribed to it."""
+        self.watchers.clear()
+        for entity in self.alerts:
+            for entity_id in entity.subscribed_entities():
+                self.watchers[entity_id].append(entity)
+
+    def set_source_state(self, entity_id: str, state: str, attributes: dict = None):
+        """Write a source state; watching alerts evaluate via state_changed."""
+        self.hass.states.async_set(entity_id, state, attributes)
+
+
+async def build_install(
+    alert_count: int,
+    hub_count: int,
+    seed: int = 0,
+    measure_memory: bool = True,
+    global_options: dict = None,
+    for_seconds_share: float = 0.0,
+) -> Install:
+    """Create a mock hass with ``alert_count`` alerts across ``hub_count`` hubs."""
+    logging.getLogger("custom_components").setLevel(logging.ERROR)
+    from custom_components.emergency_alerts import async_setup_entry
+
+    rng = random.Random(seed)
+    hub_count = max(1, min(hub_count, alert_count))
+    source_count = max(1, alert_count // ALERTS_PER_SOURCE)
+    hass = create_mock_hass()
+    hass.services.record_calls = False
+    hass.bus.record_events = False
+
+    async def notify(call_data):
+        return None
+
+    hass.services.async_register(NOTIFY_DOMAIN, NOTIFY_SERVICE, notify)
+    for index in range(source_count):
+        hass.states.async_set(source_entity_id(index), "off")
+
+    hubs = [dict() for _ in range(hub_count)]
+    for index in range(alert_count):
+        hubs[index % hub_count][f"bench_alert_{index}"] = make_alert(
+            index, source_count, rng, for_seconds_share
+        )
+
+    install = Install(hass, alert_count, hub_count, source_count)
+    gc.collect()
+    if measure_memory:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+
+    global_entry = ConfigEntry(
+        DOMAIN,
+        {"hub_type": "global", "name": "Global Settings"},
+        options=dict(global_options or {}),
+        entry_id="bench_global",
+        version=3,
+        title="Emergency Alerts - Global Settings",
+    )
+    hass.config_entries.async_add(global_entry)
+    await async_setup_entry(hass, global_entry)
+    for hub_index, alerts in enumerate(hubs):
+        entry = ConfigEntry(
+            DOMAIN,
+            {
+                "hub_type": "group",
+                "group": f"bench_{hub_index}",
+                "hub_name": f"bench_{hub_index}",
+                "alerts": alerts,
+            },
+            entry_id=f"bench_hub_{hub_index}",
+            version=3,
+            title=f"Emergency Alerts - Bench {hub_index}",
+        )
+        hass.config_entries.async_add(entry)
+        await async_setup_entry(hass, entry)
+    await hass.async_block_till_done()
+
+    install.setup_seconds = time.perf_counter() - started
+    if measure_memory:
+        gc.collect()
+        install.memory_bytes = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+    install.index_watchers()
+    return install
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Memory benchmark: bytes per alert, broken down by where they live.
+
+Builds installs on the mock HA core with tracemalloc running, then reports
+for each size:
+
+- ``total``: everything allocated during setup, per alert.
+- ``by_file``: the same bytes grouped by the source file that allocated
+  them (integration modules, the mock core's state machine, ...), so a
+  regression points at a module.
+- ``objects``: the deep size of each per-alert object (binary sensor,
+  select, runtime record, parsed definition, the state objects), counting
+  only what the object owns -- hass, the config entry and other shared
+  objects are excluded, and the runtime record and definition are counted
+  once rather than in every entity that refers to them.
+
+::
+
+    python -m dev_tools.benchmarks.memory --alerts 1000 5000
+"""
+
+import argparse
+import asyncio
+import gc
+import importlib
+import json
+import platform
+import sys
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dev_tools.benchmarks.harness import build_install, project_root
+from dev_tools.benchmarks.scale import _git_revision
+
+# Frames that belong to the benchmark itself rather than to setup work.
+_SKIP_FILES = ("tracemalloc.py", "harness.py", "memory.py")
+
+
+def _label(filename: str) -> str:
+    """Shorten an allocating file to a repo-relative label."""
+    path = Path(filename)
+    try:
+        return str(path.resolve().relative_to(project_root))
+    except ValueError:
+        return f"<{path.name}>"
+
+
+def _allocating_file(trace) -> str:
+    """Return the innermost repo frame of an allocation traceback."""
+    root = str(project_root)
+    # Tracebacks run from the oldest frame to the most recent one.
+    for frame in reversed(trace.traceback):
+        filename = frame.filename
+        if filename.startswith(root):
+            if filename.endswith(_SKIP_FILES):
+                # The synthetic alert configs the harness generates.
+                return "<alert config>"
+            return _label(filename)
+    return _label(trace.traceback[-1].filename)
+
+
+def deep_size(obj, shared: set) -> int:
+    """Return the bytes ``obj`` owns, not counting anything in ``shared``."""
+    seen = set(shared)
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        # Skip interned/shared immutables the object merely refers to.
+        if isinstance(current, (type, type(sys), type(deep_size))):
+            continue
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            attrs = getattr(current, "__dict__", None)
+            if attrs is not None:
+                stack.append(attrs)
+            for klass in type(current).__mro__:
+                for slot in getattr(klass, "__slots__", ()):
+                    value = getattr(current, slot, None)
+                    if value is not None:
+                        stack.append(value)
+    return total
+
+
+def _mean(values) -> int:
+    values = list(values)
+    return round(sum(values) / len(values)) if values else 0
+
+
+async def run_size(alerts: int, hubs: int, seed: int, top: int) -> dict:
+    """Measure one install size."""
+    # Import every platform first so module objects aren't billed to alerts.
+    for module in ("binary_sensor", "select", "sensor", "switch", "diagnostics"):
+        importlib.import_module(f"custom_components.emergency_alerts.{module}")
+    tracemalloc.start(25)
+    install = await build_install(alerts, hubs, seed=seed, measure_memory=False)
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    by_file = defaultdict(int)
+    for trace in snapshot.traces:
+        by_file[_allocating_file(trace)] += trace.size
+    total = sum(by_file.values())
+    per_alert = install.alert_count
+
+    hass = install.hass
+    sensors = install.alerts
+    selects = install.platform_entities("select")
+    # Objects every alert refers to but does not own.
+    shared = {
+        id(hass),
+        id(hass.data),
+        id(hass.states),
+        id(hass.bus),
+        id(hass.config_entries),
+    }
+    for entry in hass.config_entries.async_entries():
+        shared.update((id(entry), id(entry.data), id(entry.options)))
+    shared.add(id(install.metrics))
+    for sensor in sensors:
+        shared.add(id(sensor._integration_metrics))
+        shared.add(id(sensor._entry.data.get("alerts", {}).get(sensor._alert_id)))
+    # Per-alert records every platform refers to, sized on their own.
+    records = {}
+    for name in ("_runtime", "_definition"):
+        records[name] = [
+            getattr(sensor, name) for sensor in sensors if hasattr(sensor, name)
+        ]
+    owned = shared | {id(record) for group in records.values() for record in group}
+
+    # The runtime record points back at its binary sensor; don't count it twice.
+    runtime_sizes = [
+        deep_size(sensor._runtime, shared | {id(sensor)})
+        for sensor in sensors
+        if hasattr(sensor, "_runtime")
+    ]
+    definition_sizes = [
+        deep_size(definition, shared) for definition in records["_definition"]
+    ]
+    objects = {
+        "binary_sensor": _mean(deep_size(sensor, owned) for sensor in sensors),
+        "select": _mean(deep_size(select, owned) for select in selects),
+        "runtime": _mean(runtime_sizes) if runtime_sizes else None,
+        "definition": _mean(definition_sizes) if definition_sizes else None,
+        "alert_state": _mean(
+            deep_size(hass.states.get(sensor.entity_id), shared) for sensor in sensors
+        ),
+        "status_state": _mean(
+            deep_size(
+                hass.states.get(f"sensor.emergency_{sensor._alert_id}_status"), shared
+            )
+            for sensor in sensors
+        ),
+        "select_state": _mean(
+            deep_size(hass.states.get(select.entity_id), shared) for select in selects
+        ),
+    }
+    ranked = sorted(by_file.items(), key=lambda item: -item[1])
+    return {
+        "alerts": install.alert_count,
+        "hubs": install.hub_count,
+        "total": {"bytes": total, "bytes_per_alert": round(total / per_alert)},
+        "by_file": {
+            name: {"bytes": size, "bytes_per_alert": round(size / per_alert)}
+            for name, size in ranked[:top]
+        },
+        "objects": objects,
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--alerts",
+        type=int,
+        nargs="+",
+        default=[1000, 5000],
+        help="Install sizes to measure (default: 1000 5000)",
+    )
+    parser.add_argument(
+        "--hubs",
+        type=int,
+        default=20,
+        help="Group hubs to spread alerts over (default: 20)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=12,
+        help="Allocating files listed per size (default: 12)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "memory",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {"hubs": args.hubs, "seed": args.seed},
+        "runs": [
+            asyncio.run(run_size(size, args.hubs, args.seed, args.top))
+            for size in sorted(args.alerts)
+        ],
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
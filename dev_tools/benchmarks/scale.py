@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Scale benchmark: alert count vs. evaluation, write, summary and action cost.
+
+For each requested size, builds a fresh install on the mock HA core and
+replays two state-change storms against it:
+
+- ``toggle``: random source entities flip on/off, so watching alerts
+  transition, write state, broadcast summary updates and dispatch actions.
+- ``noise``: sources keep their state but get a new attribute value, so
+  alerts receive ``state_changed`` but, since none of them read
+  attributes, skip evaluation (``evaluations_skipped``).
+
+Source writes go through the mock core's state machine and event bus, so
+``async_track_state_change_event`` dispatch is part of what is measured.
+
+Sizes run smallest first. A size whose runtime, extrapolated quadratically
+from the previous one, would exceed ``--budget`` is reported as skipped
+rather than left running for hours.
+
+Results are printed (or written with ``--output``) as JSON so runs can be
+diffed across commits::
+
+    python -m dev_tools.benchmarks.scale --alerts 100 1000 20000 --output before.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from dev_tools.benchmarks.harness import build_install
+
+SUMMARY_UPDATE_SIGNAL = "emergency_alerts_summary_update"
+EVENT_STATE_CHANGED = "state_changed"
+
+
+def _counters(install) -> dict:
+    hass = install.hass
+    metrics = install.metrics
+    summary_sends, summary_ns = hass.dispatcher.stats[SUMMARY_UPDATE_SIGNAL]
+    state_events, state_event_ns = hass.bus.stats[EVENT_STATE_CHANGED]
+    return {
+        "evaluations": metrics.evaluations,
+        "evaluations_skipped": metrics.evaluations_skipped,
+        "evaluation_time_ns": metrics.evaluation_time_ns,
+        "actions_dispatched": metrics.actions_dispatched,
+        "services_called": hass.services.call_count,
+        "state_writes": hass.states.write_count,
+        "alert_state_writes": sum(e._metrics.state_writes for e in install.alerts),
+        "status_writes": sum(e._metrics.status_writes for e in install.alerts),
+        "summary_sends": summary_sends,
+        "summary_time_ns": summary_ns,
+        "state_events": state_events,
+        "state_event_time_ns": state_event_ns,
+    }
+
+
+def _per_second(count: int, seconds: float) -> float:
+    return round(count / seconds, 1) if seconds > 0 else None
+
+
+async def run_storm(install, kind: str, events: int, rng: random.Random) -> dict:
+    """Replay ``events`` source writes and report what they cost."""
+    hass = install.hass
+    sources = list(install.watchers)
+    before = _counters(install)
+
+    started = time.perf_counter()
+    for sequence in range(events):
+        entity_id = rng.choice(sources)
+        current = hass.states.get(entity_id)
+        if kind == "toggle":
+            install.set_source_state(
+                entity_id, "off" if current.state == "on" else "on"
+            )
+        else:
+            install.set_source_state(entity_id, current.state, {"sequence": sequence})
+    dispatched = time.perf_counter() - started
+    await hass.async_block_till_done()
+    total = time.perf_counter() - started
+
+    after = _counters(install)
+    delta = {key: after[key] - before[key] for key in after}
+    return {
+        "events": events,
+        "wall_seconds": round(total, 4),
+        "events_per_second": _per_second(events, dispatched),
+        "evaluations": delta["evaluations"],
+        "evaluations_per_second": _per_second(delta["evaluations"], dispatched),
+        "evaluations_skipped": delta["evaluations_skipped"],
+        "evaluation_ms": round(delta["evaluation_time_ns"] / 1e6, 3),
+        "state_changed": {
+            "events": delta["state_events"],
+            "dispatch_ms": round(delta["state_event_time_ns"] / 1e6, 3),
+        },
+        "state_writes": delta["state_writes"],
+        "alert_state_writes": delta["alert_state_writes"],
+        "status_writes": delta["status_writes"],
+        "summary": {
+            "recomputes": delta["summary_sends"],
+            "total_ms": round(delta["summary_time_ns"] / 1e6, 3),
+            "ms_per_recompute": (
+                round(delta["summary_time_ns"] / delta["summary_sends"] / 1e6, 4)
+                if delta["summary_sends"]
+                else None
+            ),
+            "share_of_wall": (
+                round(delta["summary_time_ns"] / 1e9 / total, 4) if total else None
+            ),
+        },
+        "actions": {
+            "dispatched": delta["actions_dispatched"],
+            "completed": delta["services_called"],
+            "per_second": _per_second(delta["services_called"], total),
+        },
+    }
+
+
+async def run_size(
+    alerts: int, hubs: int, events: int, seed: int, memory: bool
+) -> dict:
+    """Benchmark one install size."""
+    install = await build_install(alerts, hubs, seed=seed, measure_memory=memory)
+    rng = random.Random(seed)
+    result = {
+        "alerts": install.alert_count,
+        "hubs": install.hub_count,
+        "sources": install.source_count,
+        "setup_seconds": round(install.setup_seconds, 4),
+        "memory": None,
+        "storms": {},
+    }
+    if install.memory_bytes is not None:
+        result["memory"] = {
+            "total_bytes": install.memory_bytes,
+            "bytes_per_alert": round(install.memory_bytes / install.alert_count),
+        }
+    for kind in ("toggle", "noise"):
+        result["storms"][kind] = await run_storm(install, kind, events, rng)
+    return result
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--alerts",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 5000, 20000],
+        help="Install sizes to benchmark (default: 100 1000 5000 20000)",
+    )
+    parser.add_argument(
+        "--hubs",
+        type=int,
+        default=20,
+        help="Group hubs to spread alerts over (default: 20)",
+    )
+    parser.add_argument(
+        "--events",
+        type=int,
+        default=500,
+        help="Source state changes per storm (default: 500)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=600,
+        help=(
+            "Skip sizes predicted to take longer than this many seconds "
+            "(default: 600)"
+        ),
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip tracemalloc during setup (faster for large sizes)",
+    )
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "scale",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "budget_seconds": args.budget,
+            "hubs": args.hubs,
+            "events": args.events,
+            "seed": args.seed,
+        },
+        "runs": [],
+    }
+    previous = None
+    for size in sorted(args.alerts):
+        if previous is not None:
+            # Summary recomputes make both setup and storms O(alerts^2).
+            predicted = previous[1] * (size / previous[0]) ** 2
+            if predicted > args.budget:
+                report["runs"].append(
+                    {
+                        "alerts": size,
+                        "skipped": True,
+                        "predicted_seconds": round(predicted, 1),
+                    }
+                )
+                continue
+        started = time.perf_counter()
+        report["runs"].append(
+            asyncio.run(
+                run_size(size, args.hubs, args.events, args.seed, not args.no_memory)
+            )
+        )
+        previous = (size, time.perf_counter() - started)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Timer benchmark: escalation, snooze and for_seconds over simulated hours.
+
+Builds an install on the mock HA core and runs it on the mock core's
+virtual clock for ``--hours`` of simulated time. Every ``--step`` seconds a
+batch of source entities flips on/off and a few active alerts are snoozed
+through their select entity; the clock then advances, firing for_seconds
+dwells, escalation timers and snooze expiries in deadline order.
+
+Reports how many timers fired, how many escalations and snooze expiries
+they caused, and how much faster than real time the run went::
+
+    python -m dev_tools.benchmarks.timers --alerts 1000 --hours 24
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from dev_tools.benchmarks.harness import build_install
+from dev_tools.benchmarks.scale import _git_revision
+
+STATE_ACTIVE = "active"
+
+
+def _count_causes(install) -> tuple:
+    """Count recorded transitions per cause, and alerts whose history wrapped."""
+    causes = Counter()
+    wrapped = 0
+    for entity in install.alerts:
+        history = entity._history
+        if history is None:
+            continue
+        if len(history) >= history.capacity:
+            wrapped += 1
+        for _timestamp, _from, _to, cause in history.iter_range():
+            causes[cause] += 1
+    return causes, wrapped
+
+
+async def run(args) -> dict:
+    """Run one simulated period and return the report."""
+    install = await build_install(
+        args.alerts,
+        args.hubs,
+        seed=args.seed,
+        measure_memory=False,
+        global_options={
+            "default_escalation_time": args.escalation,
+            "history_size": 1000,
+        },
+        for_seconds_share=args.for_seconds_share,
+    )
+    hass = install.hass
+    clock = hass.clock
+    rng = random.Random(args.seed)
+    sources = list(install.watchers)
+    selects = {
+        entity._alert_id: entity
+        for entity in install.platform_entities("select")
+        if hasattr(entity, "_alert_id")
+    }
+    simulated = args.hours * 3600
+    steps = int(simulated // args.step)
+    snoozed = 0
+
+    started = time.perf_counter()
+    with clock:
+        for _ in range(steps):
+            for _ in range(args.changes):
+                entity_id = rng.choice(sources)
+                current = hass.states.get(entity_id).state
+                install.set_source_state(entity_id, "off" if current == "on" else "on")
+            active = [
+                alert
+                for alert in install.alerts
+                if alert.get_status() == STATE_ACTIVE and alert._alert_id in selects
+            ]
+            for alert in rng.sample(active, min(args.snoozes, len(active))):
+                await selects[alert._alert_id].async_select_option("snoozed")
+                snoozed += 1
+            await clock.advance(args.step)
+    wall = time.perf_counter() - started
+
+    causes, wrapped = _count_causes(install)
+    return {
+        "alerts": install.alert_count,
+        "hubs": install.hub_count,
+        "setup_seconds": round(install.setup_seconds, 4),
+        "simulated_seconds": simulated,
+        "wall_seconds": round(wall, 4),
+        "speedup": round(simulated / wall, 1) if wall else None,
+        "timers_fired": clock.fired,
+        "timers_per_second": round(clock.fired / wall, 1) if wall else None,
+        "timers_pending": clock.pending,
+        "source_changes": steps * args.changes,
+        "snoozes_started": snoozed,
+        "escalations": causes["escalation_timeout"],
+        "snooze_expiries": causes["snooze_expired"],
+        "transitions": sum(causes.values()),
+        "history_wrapped_alerts": wrapped,
+        "actions_dispatched": install.metrics.actions_dispatched,
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--alerts",
+        type=int,
+        default=1000,
+        help="Alerts in the install (default: 1000)",
+    )
+    parser.add_argument(
+        "--hubs",
+        type=int,
+        default=20,
+        help="Group hubs to spread alerts over (default: 20)",
+    )
+    parser.add_argument(
+        "--hours",
+        type=float,
+        default=24,
+        help="Simulated hours to run (default: 24)",
+    )
+    parser.add_argument(
+        "--step",
+        type=float,
+        default=60,
+        help="Simulated seconds between batches of changes (default: 60)",
+    )
+    parser.add_argument(
+        "--changes",
+        type=int,
+        default=20,
+        help="Source state flips per step (default: 20)",
+    )
+    parser.add_argument(
+        "--snoozes",
+        type=int,
+        default=2,
+        help="Active alerts snoozed per step (default: 2)",
+    )
+    parser.add_argument(
+        "--escalation",
+        type=int,
+        default=300,
+        help="default_escalation_time in seconds (default: 300)",
+    )
+    parser.add_argument(
+        "--for-seconds-share",
+        type=float,
+        default=0.2,
+        help="Share of alerts with a for_seconds dwell (default: 0.2)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "timers",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            key: value for key, value in vars(args).items() if key != "output"
+        },
+        "run": asyncio.run(run(args)),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
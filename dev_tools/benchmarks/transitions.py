@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Transition benchmark: state machine throughput and notification fan-out.
+
+Builds an install on the mock HA core, turns every source on so the alerts
+fire, then cycles each firing alert through acknowledged -> snoozed ->
+resolved -> active ``--rounds`` times, three ways:
+
+- ``table``: bare ``state_machine.step`` lookups on a flags integer, the
+  decision cost alone.
+- ``engine``: ``EmergencyBinarySensor.transition``, with timers, events,
+  actions, state writes and signals.
+- ``select``: the same commands through ``async_select_option``, the path
+  the dashboard uses.
+
+For the entity paths it reports transitions per second and, per
+transition, how many states were written and how many dispatcher signals
+were sent. ``--transition-log`` appends every transition to a transition
+log in a temporary directory, to measure what logging adds on the event
+loop, and reports the log's counters after a final flush::
+
+    python -m dev_tools.benchmarks.transitions --alerts 1000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from custom_components.emergency_alerts.core.history import CAUSE_SELECT
+from custom_components.emergency_alerts.core.state_machine import (
+    CMD_ACKNOWLEDGE,
+    CMD_REACTIVATE,
+    CMD_RESOLVE,
+    CMD_SNOOZE,
+    step,
+)
+from custom_components.emergency_alerts.core.transition_log import (
+    TRANSITION_LOG_FILE,
+    TransitionLog,
+)
+from dev_tools.benchmarks.harness import build_install
+from dev_tools.benchmarks.scale import _git_revision
+
+# One round: every handled state, then back to active.
+CYCLE = (
+    (CMD_ACKNOWLEDGE, "acknowledged"),
+    (CMD_SNOOZE, "snoozed"),
+    (CMD_RESOLVE, "resolved"),
+    (CMD_REACTIVATE, "active"),
+)
+
+
+class _Counters:
+    """Count state writes and dispatcher sends on the mock core."""
+
+    def __init__(self, hass):
+        self.hass = hass
+        self.writes = 0
+        async_set = hass.states.async_set
+
+        def counting_set(*args, **kwargs):
+            self.writes += 1
+            return async_set(*args, **kwargs)
+
+        hass.states.async_set = counting_set
+
+    def signals(self) -> int:
+        return sum(stat[0] for stat in self.hass.dispatcher.stats.values())
+
+
+def _bench_table(flags: int, transitions: int) -> dict:
+    """Time bare table lookups."""
+    commands = [command for command, _option in CYCLE] * (transitions // len(CYCLE))
+    started = time.perf_counter()
+    for command in commands:
+        _row, flags = step(flags, command)
+    elapsed = time.perf_counter() - started
+    return {
+        "transitions": len(commands),
+        "seconds": round(elapsed, 4),
+        "transitions_per_second": (
+            round(len(commands) / elapsed, 1) if elapsed else None
+        ),
+    }
+
+
+async def _bench_entities(
+    counters: _Counters, alerts: list, rounds: int, apply
+) -> dict:
+    """Time one entity path over every alert and report per-transition costs."""
+    writes = counters.writes
+    signals = counters.signals()
+    count = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for command, option in CYCLE:
+            for alert in alerts:
+                await apply(alert, command, option)
+                count += 1
+    elapsed = time.perf_counter() - started
+    # Let cancelled snooze timers finish unwinding.
+    await asyncio.sleep(0)
+    return {
+        "transitions": count,
+        "seconds": round(elapsed, 4),
+        "transitions_per_second": round(count / elapsed, 1) if elapsed else None,
+        "state_writes_per_transition": round((counters.writes - writes) / count, 3),
+        "signals_per_transition": round((counters.signals() - signals) / count, 3),
+    }
+
+
+async def run(args) -> dict:
+    """Build the install and run each path."""
+    install = await build_install(
+        args.alerts, args.hubs, seed=args.seed, measure_memory=False
+    )
+    hass = install.hass
+    for entity_id in install.watchers:
+        install.set_source_state(entity_id, "on")
+    await hass.async_block_till_done()
+    firing = [alert for alert in install.alerts if alert._is_on]
+    selects = {
+        (entity._entry.entry_id, entity._alert_id): entity
+        for entity in install.platform_entities("select")
+    }
+    counters = _Counters(hass)
+    log = None
+    if args.transition_log:
+        log_dir = tempfile.mkdtemp(prefix="ea-transitions-")
+        log = TransitionLog(hass, os.path.join(log_dir, TRANSITION_LOG_FILE))
+        await log.async_load()
+        hass.data["emergency_alerts"]["transition_log"] = log
+
+    async def engine(alert, command, _option):
+        alert.transition(command, CAUSE_SELECT)
+
+    async def select(alert, _command, option):
+        await selects[(alert._entry.entry_id, alert._alert_id)].async_select_option(
+            option
+        )
+
+    transitions = args.rounds * len(CYCLE) * max(1, len(firing))
+    report = {
+        "alerts": install.alert_count,
+        "firing_alerts": len(firing),
+        "table": _bench_table(firing[0]._runtime.flags if firing else 0, transitions),
+        "engine": await _bench_entities(counters, firing, args.rounds, engine),
+        "select": await _bench_entities(counters, firing, args.rounds, select),
+    }
+    if log is not None:
+        started = time.perf_counter()
+        await log.async_close()
+        report["transition_log"] = dict(
+            log.stats(), close_seconds=round(time.perf_counter() - started, 4)
+        )
+    for alert in install.alerts:
+        alert._cleanup_timers()
+    await hass.async_block_till_done()
+    return report
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--alerts",
+        type=int,
+        default=1000,
+        help="Alerts in the install (default: 1000)",
+    )
+    parser.add_argument(
+        "--hubs",
+        type=int,
+        default=20,
+        help="Group hubs to spread alerts over (default: 20)",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="Times each firing alert goes through the cycle (default: 5)",
+    )
+    parser.add_argument(
+        "--transition-log",
+        action="store_true",
+        help="Append transitions to a transition log in a temporary directory",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "transitions",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            key: value for key, value in vars(args).items() if key != "output"
+        },
+        "run": asyncio.run(run(args)),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
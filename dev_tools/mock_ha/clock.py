@@ -0,0 +1,225 @@
+"""Virtual clock and timer scheduler for the mock HA core.
+
+Timers scheduled through the mock ``async_call_later`` /
+``async_track_time_interval`` helpers, and every ``asyncio.sleep`` while the
+clock is installed, wait on virtual time instead of wall time. Nothing fires
+until a test or benchmark calls :meth:`VirtualClock.advance`, which runs due
+timers strictly in ``(deadline, scheduling order)`` order and lets the work
+each one triggers finish before the next fires. Hours of simulated time
+therefore take only as long as the callbacks themselves.
+
+The integration's own ``datetime.now()`` / ``time.time()`` calls are not
+virtualized; ``homeassistant.util.dt`` from the shim is, while installed.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Optional
+
+_real_sleep = asyncio.sleep
+_active: Optional["VirtualClock"] = None
+
+
+class TimerHandle:
+    """A scheduled virtual timer."""
+
+    __slots__ = ("when", "seq", "callback", "args", "cancelled")
+
+    def __init__(self, when: float, seq: int, callback: Callable, args: tuple):
+        self.when = when
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other: "TimerHandle") -> bool:
+        return (self.when, self.seq) < (other.when, other.seq)
+
+    def cancel(self) -> None:
+        """Stop the timer from firing."""
+        self.cancelled = True
+
+
+class VirtualClock:
+    """Controllable clock with a deterministic timer heap."""
+
+    def __init__(self, start: Optional[float] = None, hass=None):
+        self._now = time.time() if start is None else start
+        self._timers: List[TimerHandle] = []
+        self._seq = itertools.count()
+        self.fired = 0
+        # When set, coroutine callbacks become hass tasks and each fired
+        # timer is followed by hass.async_block_till_done().
+        self.hass = hass
+
+    def time(self) -> float:
+        """Return the virtual POSIX timestamp."""
+        return self._now
+
+    def utcnow(self) -> datetime:
+        """Return the virtual time as an aware UTC datetime."""
+        return datetime.fromtimestamp(self._now, timezone.utc)
+
+    @property
+    def pending(self) -> int:
+        """Return the number of timers still scheduled."""
+        return sum(1 for handle in self._timers if not handle.cancelled)
+
+    def next_deadline(self) -> Optional[float]:
+        """Return when the next live timer fires, or None."""
+        while self._timers and self._timers[0].cancelled:
+            heapq.heappop(self._timers)
+        return self._timers[0].when if self._timers else None
+
+    def call_at(self, when: float, callback: Callable, *args: Any) -> TimerHandle:
+        """Schedule ``callback(*args)`` at virtual time ``when``."""
+        handle = TimerHandle(max(when, self._now), next(self._seq), callback, args)
+        heapq.heappush(self._timers, handle)
+        return handle
+
+    def call_later(self, delay: float, callback: Callable, *args: Any) -> TimerHandle:
+        """Schedule ``callback(*args)`` ``delay`` virtual seconds from now."""
+        return self.call_at(self._now + max(delay, 0), callback, *args)
+
+    def rebase(self, start: float) -> None:
+        """Move the clock to ``start``, keeping pending timers the same distance away.
+
+        Lets a replay set up the integration first and only then pin the
+        clock to the first recorded timestamp.
+        """
+        delta = start - self._now
+        self._now = start
+        for handle in self._timers:
+            handle.when += delta
+
+    def jump(self, seconds: float) -> bool:
+        """Move time forward without settling, if no timer comes due meanwhile.
+
+        Returns False (and leaves time alone) when a timer would fire; the
+        caller then needs :meth:`advance`. Replays use this to skip the
+        per-step settle between most records.
+        """
+        target = self._now + seconds
+        deadline = self.next_deadline()
+        if deadline is not None and deadline <= target:
+            return False
+        self._now = max(self._now, target)
+        return True
+
+    async def sleep(self, delay: float, result: Any = None) -> Any:
+        """``asyncio.sleep`` replacement that waits on virtual time."""
+        if delay <= 0:
+            return await _real_sleep(0, result)
+        future = asyncio.get_running_loop().create_future()
+
+        def wake():
+            if not future.done():
+                future.set_result(result)
+
+        handle = self.call_later(delay, wake)
+        try:
+            return await future
+        finally:
+            handle.cancel()
+
+    async def _settle(self) -> None:
+        """Let everything a fired timer started run until it blocks again."""
+        # A few bare yields resume tasks woken by sleep(); hass-tracked tasks
+        # are then drained completely.
+        for _ in range(3):
+            await _real_sleep(0)
+        if self.hass is not None:
+            await self.hass.async_block_till_done()
+
+    async def advance(self, seconds: float) -> int:
+        """Move virtual time forward, firing every timer that comes due.
+
+        Returns the number of timers fired.
+        """
+        target = self._now + seconds
+        fired = 0
+        await self._settle()
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > target:
+                break
+            handle = heapq.heappop(self._timers)
+            self._now = handle.when
+            result = handle.callback(*handle.args)
+            if asyncio.iscoroutine(result):
+                if self.hass is not None:
+                    self.hass.async_create_task(result)
+                else:
+                    asyncio.get_running_loop().create_task(result)
+            fired += 1
+            await self._settle()
+        self._now = max(self._now, target)
+        self.fired += fired
+        return fired
+
+    async def advance_to_idle(self, limit: float = 366 * 86400) -> int:
+        """Fire timers until none are left (or ``limit`` seconds pass)."""
+        fired = 0
+        stop = self._now + limit
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > stop:
+                return fired
+            fired += await self.advance(deadline - self._now)
+
+    def install(self) -> None:
+        """Route ``asyncio.sleep`` and the shim's ``dt_util`` to this clock."""
+        global _active
+        if _active is not None and _active is not self:
+            raise RuntimeError("Another VirtualClock is already installed")
+        _active = self
+        asyncio.sleep = self.sleep
+
+    def uninstall(self) -> None:
+        """Restore the real ``asyncio.sleep`` and wall time."""
+        global _active
+        if _active is self:
+            _active = None
+            asyncio.sleep = _real_sleep
+
+    def __enter__(self) -> "VirtualClock":
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.uninstall()
+
+
+def utcnow() -> datetime:
+    """Return the installed clock's time, or the wall clock's."""
+    if _active is not None:
+        return _active.utcnow()
+    return datetime.now(timezone.utc)
+
+
+def call_later(hass, delay, action: Callable) -> Callable[[], None]:
+    """Mock ``homeassistant.helpers.event.async_call_later``."""
+    if isinstance(delay, timedelta):
+        delay = delay.total_seconds()
+    clock = hass.clock
+    handle = clock.call_later(delay, lambda: action(clock.utcnow()))
+    return handle.cancel
+
+
+def track_time_interval(
+    hass, action: Callable, interval: timedelta
+) -> Callable[[], None]:
+    """Mock ``homeassistant.helpers.event.async_track_time_interval``."""
+    clock = hass.clock
+    seconds = interval.total_seconds()
+    state = {"handle": None}
+
+    def fire():
+        state["handle"] = clock.call_later(seconds, fire)
+        return action(clock.utcnow())
+
+    state["handle"] = clock.call_later(seconds, fire)
+    return lambda: state["handle"].cancel()
@@ -1,33 +1,108 @@
 """Mock Home Assistant core for local testing."""
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
 import asyncio
+import importlib
+import re
+import time
 from collections import defaultdict
 
+from . import clock
+from .clock import VirtualClock
+
+
+EVENT_STATE_CHANGED = "state_changed"
+EVENT_HOMEASSISTANT_STOP = "homeassistant_stop"
+MATCH_ALL = "*"
+
 
 class MockState:
     """Mock HA state object."""
     
-    def __init__(self, entity_id: str, state: str, attributes: Dict[str, Any] = None):
+    def __init__(
+        self,
+        entity_id: str,
+        state: str,
+        attributes: Dict[str, Any] = None,
+        last_changed: datetime = None,
+    ):
         self.entity_id = entity_id
         self.state = state
         self.attributes = attributes or {}
-        self.last_changed = datetime.now()
-        self.last_updated = datetime.now()
+        self.last_updated = clock.utcnow()
+        self.last_changed = last_changed or self.last_updated
+    
+    @property
+    def domain(self) -> str:
+        return self.entity_id.split(".", 1)[0]
+
+
+class MockEvent:
+    """Mock HA event object."""
+    
+    __slots__ = ("event_type", "data", "time_fired")
+    
+    def __init__(self, event_type: str, data: Dict[str, Any] = None):
+        self.event_type = event_type
+        self.data = data or {}
+        self.time_fired = clock.utcnow()
 
 
 class MockStates:
-    """Mock HA states manager."""
+    """Mock HA states manager.
     
-    def __init__(self):
+    Like HA's state machine, writing an unchanged state and attributes is a
+    no-op; every real write fires ``state_changed`` on the bus (when one is
+    attached) with ``entity_id``, ``old_state`` and ``new_state``.
+    """
+    
+    def __init__(self, bus: "MockBus" = None):
         self._states: Dict[str, MockState] = {}
+        self._bus = bus
+        self.write_count = 0
     
     def get(self, entity_id: str) -> Optional[MockState]:
         return self._states.get(entity_id)
     
-    def async_set(self, entity_id: str, state: str, attributes: Dict[str, Any] = None):
-        """Set entity state."""
-        self._states[entity_id] = MockState(entity_id, state, attributes)
+    def async_set(
+        self,
+        entity_id: str,
+        state: str,
+        attributes: Dict[str, Any] = None,
+        force_update: bool = False,
+    ):
+        """Set entity state and fire state_changed if anything changed."""
+        state = str(state) if state is not None else "unknown"
+        attributes = attributes or {}
+        old_state = self._states.get(entity_id)
+        same_state = old_state is not None and old_state.state == state
+        if same_state and not force_update and old_state.attributes == attributes:
+            return
+        new_state = MockState(
+            entity_id,
+            state,
+            dict(attributes),
+            old_state.last_changed if same_state else None,
+        )
+        self.write_count += 1
+        self._states[entity_id] = new_state
+        if self._bus is not None:
+            self._bus.async_fire(
+                EVENT_STATE_CHANGED,
+                {"entity_id": entity_id, "old_state": old_state, "new_state": new_state},
+            )
+    
+    def async_remove(self, entity_id: str) -> bool:
+        """Remove an entity's state."""
+        old_state = self._states.pop(entity_id, None)
+        if old_state is None:
+            return False
+        if self._bus is not None:
+            self._bus.async_fire(
+                EVENT_STATE_CHANGED,
+                {"entity_id": entity_id, "old_state": old_state, "new_state": None},
+            )
+        return True
     
     def async_entity_ids(self, domain: str = None) -> List[str]:
         """Get all entity IDs optionally filtered by domain."""
@@ -35,8 +110,10 @@ class MockStates:
             return [eid for eid in self._states.keys() if eid.startswith(f"{domain}.")]
         return list(self._states.keys())
     
-    def async_all(self) -> List[MockState]:
-        """Get all states."""
+    def async_all(self, domain: str = None) -> List[MockState]:
+        """Get all states optionally filtered by domain."""
+        if domain:
+            return [s for eid, s in self._states.items() if eid.startswith(f"{domain}.")]
         return list(self._states.values())
 
 
@@ -46,21 +123,38 @@ class MockServices:
     def __init__(self):
         self._services: Dict[str, Dict[str, callable]] = defaultdict(dict)
         self._calls: List[Dict[str, Any]] = []
+        # Benchmarks turn this off so the call log doesn't grow unbounded.
+        self.record_calls = True
+        self.call_count = 0
     
-    def async_register(self, domain: str, service: str, handler: callable):
+    def async_register(
+        self, domain: str, service: str, handler: callable, schema=None, supports_response=None
+    ):
         """Register a service."""
         self._services[domain][service] = handler
     
+    def has_service(self, domain: str, service: str) -> bool:
+        """Return True if the service is registered."""
+        return service in self._services.get(domain, {})
+    
     async def async_call(
-        self, domain: str, service: str, service_data: Dict[str, Any] = None, blocking: bool = True
+        self,
+        domain: str,
+        service: str,
+        service_data: Dict[str, Any] = None,
+        blocking: bool = True,
+        return_response: bool = False,
+        **kwargs,
     ):
         """Call a service."""
-        self._calls.append({
-            "domain": domain,
-            "service": service,
-            "data": service_data or {},
-            "timestamp": datetime.now()
-        })
+        self.call_count += 1
+        if self.record_calls:
+            self._calls.append({
+                "domain": domain,
+                "service": service,
+                "data": service_data or {},
+                "timestamp": datetime.now()
+            })
         
         handler = self._services.get(domain, {}).get(service)
         if handler and blocking:
@@ -81,18 +175,79 @@ class MockServices:
 
 
 class MockBus:
-    """Mock event bus."""
+    """Mock event bus with listener dispatch.
     
-    def __init__(self):
+    Like HA's bus, plain listeners run synchronously inside ``async_fire``
+    and coroutine results are scheduled as tasks. Fired events are also
+    kept for inspection unless ``record_events`` is turned off.
+    """
+    
+    def __init__(self, hass=None):
+        self.hass = hass
         self._events: List[Dict[str, Any]] = []
+        self._listeners: Dict[str, List[tuple]] = defaultdict(list)
+        # Benchmarks turn this off so the event log doesn't grow unbounded.
+        self.record_events = True
+        # event_type -> [fires, total listener time in ns]
+        self.stats: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    
+    def async_listen(
+        self, event_type: str, listener: Callable, event_filter: Callable = None
+    ) -> Callable[[], None]:
+        """Listen for ``event_type`` (or MATCH_ALL) and return a remove callback."""
+        entry = (listener, event_filter)
+        self._listeners[event_type].append(entry)
+        
+        def remove():
+            try:
+                self._listeners[event_type].remove(entry)
+            except ValueError:
+                pass
+        
+        return remove
+    
+    def async_listen_once(self, event_type: str, listener: Callable) -> Callable[[], None]:
+        """Listen for the next ``event_type`` only."""
+        
+        def once(event):
+            remove()
+            return listener(event)
+        
+        remove = self.async_listen(event_type, once)
+        return remove
     
     def async_fire(self, event_type: str, event_data: Dict[str, Any] = None):
-        """Fire an event."""
-        self._events.append({
-            "type": event_type,
-            "data": event_data or {},
-            "timestamp": datetime.now()
-        })
+        """Fire an event and run its listeners."""
+        event = MockEvent(event_type, event_data)
+        if self.record_events:
+            self._events.append({
+                "type": event_type,
+                "data": event.data,
+                "timestamp": event.time_fired,
+            })
+        listeners = self._listeners.get(event_type, [])
+        match_all = self._listeners.get(MATCH_ALL, [])
+        if not listeners and not match_all:
+            return
+        started = time.perf_counter_ns()
+        for listener, event_filter in [*listeners, *match_all]:
+            if event_filter is not None and not event_filter(event.data):
+                continue
+            result = listener(event)
+            if asyncio.iscoroutine(result):
+                if self.hass is not None:
+                    self.hass.async_create_task(result)
+                else:
+                    asyncio.get_running_loop().create_task(result)
+        stat = self.stats[event_type]
+        stat[0] += 1
+        stat[1] += time.perf_counter_ns() - started
+    
+    def listener_count(self, event_type: str = None) -> int:
+        """Return the number of listeners, optionally for one event type."""
+        if event_type is not None:
+            return len(self._listeners.get(event_type, ()))
+        return sum(len(listeners) for listeners in self._listeners.values())
     
     def get_events(self, event_type: str = None) -> List[Dict[str, Any]]:
         """Get events for testing."""
@@ -105,12 +260,203 @@ class MockBus:
         self._events.clear()
 
 
+def async_track_state_change_event(
+    hass, entity_ids, action: Callable
+) -> Callable[[], None]:
+    """Mock ``homeassistant.helpers.event.async_track_state_change_event``.
+    
+    As in HA, all trackers share one ``state_changed`` listener that looks
+    the entity up in an index, so an event costs O(trackers of that entity)
+    rather than O(all trackers).
+    """
+    if isinstance(entity_ids, str):
+        entity_ids = [entity_ids]
+    entity_ids = [entity_id.lower() for entity_id in entity_ids]
+    if not entity_ids:
+        return lambda: None
+    index = hass.state_change_index
+    if not hass.state_change_listener:
+        
+        def dispatch(event):
+            for job in list(index.get(event.data["entity_id"], ())):
+                result = job(event)
+                if asyncio.iscoroutine(result):
+                    hass.async_create_task(result)
+        
+        hass.state_change_listener = hass.bus.async_listen(EVENT_STATE_CHANGED, dispatch)
+    for entity_id in entity_ids:
+        index[entity_id].append(action)
+    
+    def remove():
+        for entity_id in entity_ids:
+            jobs = index.get(entity_id)
+            if jobs is None:
+                continue
+            try:
+                jobs.remove(action)
+            except ValueError:
+                pass
+            if not jobs:
+                del index[entity_id]
+    
+    return remove
+
+
+class MockDispatcher:
+    """Dispatcher signal registry, timed per signal.
+
+    Like HA's dispatcher, plain callbacks run synchronously inside ``send``
+    and coroutine results are scheduled as tasks.
+    """
+    
+    def __init__(self, hass):
+        self.hass = hass
+        self._targets: Dict[str, List[Callable]] = defaultdict(list)
+        # signal -> [sends, total handler time in ns]
+        self.stats: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    
+    def connect(self, signal: str, target: Callable) -> Callable[[], None]:
+        """Connect a target to a signal and return its disconnect callback."""
+        self._targets[signal].append(target)
+        
+        def remove():
+            try:
+                self._targets[signal].remove(target)
+            except ValueError:
+                pass
+        
+        return remove
+    
+    def send(self, signal: str, *args):
+        """Call every target connected to ``signal``."""
+        targets = self._targets.get(signal)
+        if not targets:
+            return
+        started = time.perf_counter_ns()
+        for target in list(targets):
+            result = target(*args)
+            if asyncio.iscoroutine(result):
+                self.hass.async_create_task(result)
+        stat = self.stats[signal]
+        stat[0] += 1
+        stat[1] += time.perf_counter_ns() - started
+
+
+class MockEntity:
+    """Minimal Entity base that writes its state into ``hass.states``."""
+    
+    hass = None
+    entity_id: Optional[str] = None
+    _attr_name: Optional[str] = None
+    _attr_unique_id: Optional[str] = None
+    _attr_extra_state_attributes: Optional[Dict[str, Any]] = None
+    
+    @property
+    def name(self):
+        return self._attr_name
+    
+    @property
+    def unique_id(self):
+        return self._attr_unique_id
+    
+    @property
+    def state(self):
+        return None
+    
+    @property
+    def extra_state_attributes(self):
+        return self._attr_extra_state_attributes
+    
+    def async_on_remove(self, func: Callable[[], None]):
+        """Register a callback run when the entity is removed."""
+        self.__dict__.setdefault("_on_remove", []).append(func)
+    
+    def async_write_ha_state(self):
+        """Write the current state and attributes."""
+        self.hass.states.async_set(self.entity_id, self.state, self.extra_state_attributes)
+    
+    async def async_added_to_hass(self):
+        pass
+    
+    async def async_will_remove_from_hass(self):
+        pass
+    
+    async def async_remove(self):
+        """Run removal callbacks and drop the entity's state."""
+        for func in self.__dict__.pop("_on_remove", []):
+            func()
+        await self.async_will_remove_from_hass()
+        self.hass.states.async_remove(self.entity_id)
+
+
+class MockBinarySensorEntity(MockEntity):
+    """Binary sensor base: state is on/off from ``is_on``."""
+    
+    _attr_is_on = None
+    
+    @property
+    def is_on(self):
+        return self._attr_is_on
+    
+    @property
+    def state(self):
+        is_on = self.is_on
+        return None if is_on is None else ("on" if is_on else "off")
+
+
+class MockSensorEntity(MockEntity):
+    """Sensor base: state is ``native_value``."""
+    
+    _attr_native_value = None
+    
+    @property
+    def native_value(self):
+        return self._attr_native_value
+    
+    @property
+    def state(self):
+        return self.native_value
+
+
+class MockSelectEntity(MockEntity):
+    """Select base: state is ``current_option``."""
+    
+    _attr_current_option = None
+    _attr_options: List[str] = []
+    
+    @property
+    def current_option(self):
+        return self._attr_current_option
+    
+    @property
+    def options(self):
+        return self._attr_options
+    
+    @property
+    def state(self):
+        return self.current_option
+
+
+class MockSwitchEntity(MockBinarySensorEntity):
+    """Switch base: state is on/off from ``is_on``."""
+
+
+def _slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(text).lower()).strip("_")
+
+
 class MockConfigEntries:
     """Mock config entries manager."""
     
     def __init__(self, hass):
         self.hass = hass
         self._entries: List[Any] = []
+        # entry_id -> entities added by its platforms
+        self._entities: Dict[str, List[MockEntity]] = defaultdict(list)
+    
+    def async_add(self, entry):
+        """Register a config entry."""
+        self._entries.append(entry)
     
     def async_entries(self, domain: str = None) -> List[Any]:
         """Get config entries."""
@@ -129,33 +475,88 @@ class MockConfigEntries:
         pass
     
     async def async_forward_entry_setups(self, entry, platforms: List[str]):
-        """Forward entry setup to platforms."""
-        # Mock platform setup
-        pass
+        """Set up each platform module of the entry's integration.
+
+        Platforms are imported from ``custom_components.<domain>.<platform>``;
+        entities they add are attached to ``hass`` and written once.
+        """
+        for platform in platforms:
+            module = importlib.import_module(f"custom_components.{entry.domain}.{platform}")
+            
+            def async_add_entities(entities, update_before_add=False, _platform=platform):
+                self.hass.async_create_task(
+                    self._async_add_entities(entry, _platform, list(entities))
+                )
+            
+            await module.async_setup_entry(self.hass, entry, async_add_entities)
+        await self.hass.async_block_till_done()
+    
+    async def _async_add_entities(self, entry, platform: str, entities: List[MockEntity]):
+        for entity in entities:
+            entity.hass = self.hass
+            if entity.entity_id is None:
+                entity.entity_id = f"{platform}.{_slugify(entity.name or entity.unique_id)}"
+            self._entities[entry.entry_id].append(entity)
+            await entity.async_added_to_hass()
+            entity.async_write_ha_state()
     
     async def async_forward_entry_unload(self, entry, platform: str) -> bool:
         """Unload platform."""
+        prefix = f"{platform}."
+        keep = []
+        for entity in self._entities.get(entry.entry_id, []):
+            if entity.entity_id.startswith(prefix):
+                await entity.async_remove()
+            else:
+                keep.append(entity)
+        self._entities[entry.entry_id] = keep
         return True
 
 
+class MockConfig:
+    """Mock core config."""
+    
+    def __init__(self, config_dir: str = "."):
+        self.config_dir = config_dir
+    
+    def path(self, *parts: str) -> str:
+        """Return a path inside the config directory."""
+        import os
+        return os.path.join(self.config_dir, *parts)
+
+
 class MockHomeAssistant:
     """Mock Home Assistant instance for testing."""
     
     def __init__(self):
-        self.states = MockStates()
+        self.bus = MockBus(self)
+        self.states = MockStates(self.bus)
         self.services = MockServices()
-        self.bus = MockBus()
         self.config_entries = MockConfigEntries(self)
+        self.dispatcher = MockDispatcher(self)
+        # Timers only fire when a test or benchmark advances this clock.
+        self.clock = VirtualClock(hass=self)
+        self.config = MockConfig()
         self.data: Dict[str, Any] = {}
+        # entity_id -> async_track_state_change_event actions
+        self.state_change_index: Dict[str, List[Callable]] = defaultdict(list)
+        self.state_change_listener: Optional[Callable[[], None]] = None
         self.loop = asyncio.get_event_loop()
+        self._tasks: set = set()
     
     async def async_block_till_done(self):
-        """Block until all pending tasks are done."""
+        """Block until all tasks created through hass are done."""
         await asyncio.sleep(0)
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+            await asyncio.sleep(0)
     
-    def async_create_task(self, coro):
-        """Create async task."""
-        return self.loop.create_task(coro)
+    def async_create_task(self, coro, name: str = None, eager_start: bool = True):
+        """Create a task tracked by ``async_block_till_done``."""
+        task = asyncio.get_running_loop().create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
     
     async def async_add_executor_job(self, func, *args):
         """Run sync function in executor."""
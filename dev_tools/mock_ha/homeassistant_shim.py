@@ -1,20 +1,41 @@
 """Shim homeassistant modules for local testing without HA installation."""
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 from types import ModuleType
 
 # Import our mock HA core
-from .ha_core import MockHomeAssistant, MockState, MockConfigEntries
+from . import clock
+from .ha_core import (
+    MockBinarySensorEntity,
+    EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
+    MATCH_ALL,
+    MockConfigEntries,
+    MockEvent,
+    MockHomeAssistant,
+    MockSelectEntity,
+    MockSensorEntity,
+    MockState,
+    MockSwitchEntity,
+    async_track_state_change_event,
+)
 
 
 class ConfigEntry:
     """Mock config entry."""
-    def __init__(self, domain, data, options=None, entry_id=None, version=1):
+    def __init__(self, domain, data, options=None, entry_id=None, version=1, title=""):
         self.domain = domain
         self.data = data
         self.options = options or {}
         self.entry_id = entry_id or "test_entry_id"
         self.version = version
+        self.title = title
+        self._on_unload = []
+    
+    def async_on_unload(self, func):
+        """Register a callback run when the entry unloads."""
+        self._on_unload.append(func)
 
 
 # Create mock modules
@@ -28,10 +49,72 @@ def create_mock_modules():
     # homeassistant.core
     core_module = ModuleType('homeassistant.core')
     core_module.HomeAssistant = MockHomeAssistant
+    core_module.State = MockState
+    core_module.Event = MockEvent
     core_module.callback = lambda func: func  # Simple passthrough decorator
+    core_module.SupportsResponse = type('SupportsResponse', (), {
+        'NONE': 'none',
+        'OPTIONAL': 'optional',
+        'ONLY': 'only',
+    })
     sys.modules['homeassistant.core'] = core_module
     ha_module.core = core_module
     
+    # homeassistant.const
+    const_module = ModuleType('homeassistant.const')
+    const_module.CONF_NAME = 'name'
+    const_module.EVENT_HOMEASSISTANT_STOP = EVENT_HOMEASSISTANT_STOP
+    const_module.EVENT_STATE_CHANGED = EVENT_STATE_CHANGED
+    const_module.MATCH_ALL = MATCH_ALL
+    const_module.STATE_UNAVAILABLE = 'unavailable'
+    const_module.STATE_UNKNOWN = 'unknown'
+    const_module.EntityCategory = type('EntityCategory', (), {
+        'CONFIG': 'config',
+        'DIAGNOSTIC': 'diagnostic',
+    })
+    sys.modules['homeassistant.const'] = const_module
+    ha_module.const = const_module
+    
+    # homeassistant.exceptions
+    exceptions_module = ModuleType('homeassistant.exceptions')
+    
+    class HomeAssistantError(Exception):
+        """Mock base HA error."""
+    
+    class ServiceNotFound(HomeAssistantError):
+        """Mock missing-service error."""
+    
+    class ServiceValidationError(HomeAssistantError):
+        """Mock service validation error."""
+    
+    exceptions_module.HomeAssistantError = HomeAssistantError
+    exceptions_module.ServiceNotFound = ServiceNotFound
+    exceptions_module.ServiceValidationError = ServiceValidationError
+    sys.modules['homeassistant.exceptions'] = exceptions_module
+    ha_module.exceptions = exceptions_module
+    
+    # homeassistant.util.dt
+    util_module = ModuleType('homeassistant.util')
+    dt_module = ModuleType('homeassistant.util.dt')
+    dt_module.utcnow = clock.utcnow
+    dt_module.now = lambda: clock.utcnow().astimezone()
+    dt_module.as_utc = lambda value: (
+        value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    )
+    dt_module.utc_from_timestamp = lambda ts: datetime.fromtimestamp(ts, timezone.utc)
+    
+    def parse_datetime(value):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    
+    dt_module.parse_datetime = parse_datetime
+    util_module.dt = dt_module
+    sys.modules['homeassistant.util'] = util_module
+    sys.modules['homeassistant.util.dt'] = dt_module
+    ha_module.util = util_module
+    
     # homeassistant.config_entries
     config_entries_module = ModuleType('homeassistant.config_entries')
     config_entries_module.ConfigEntry = ConfigEntry
@@ -156,24 +239,82 @@ def create_mock_modules():
     
     # homeassistant.helpers.dispatcher
     dispatcher_module = ModuleType('homeassistant.helpers.dispatcher')
-    dispatcher_module.async_dispatcher_send = lambda hass, signal, *args: None
-    dispatcher_module.async_dispatcher_connect = lambda hass, signal, callback: lambda: None
+    dispatcher_module.async_dispatcher_send = lambda hass, signal, *args: hass.dispatcher.send(signal, *args)
+    dispatcher_module.async_dispatcher_connect = lambda hass, signal, target: hass.dispatcher.connect(signal, target)
     sys.modules['homeassistant.helpers.dispatcher'] = dispatcher_module
     helpers_module.dispatcher = dispatcher_module
     
     # homeassistant.helpers.event
     event_module = ModuleType('homeassistant.helpers.event')
-    event_module.async_call_later = lambda hass, delay, callback: lambda: None
-    event_module.async_track_state_change_event = lambda hass, entities, callback: lambda: None
+    event_module.async_call_later = clock.call_later
+    event_module.async_track_state_change_event = async_track_state_change_event
+    event_module.async_track_time_interval = clock.track_time_interval
+    
+    class TrackTemplate:
+        """Mock template tracker spec."""
+        def __init__(self, template, variables):
+            self.template = template
+            self.variables = variables
+    
+    class TrackTemplateResultInfo:
+        """Mock template tracker; never re-renders."""
+        def __init__(self):
+            self.listeners = {"entities": set(), "domains": set(), "all": False}
+        
+        def async_refresh(self):
+            pass
+        
+        def async_remove(self):
+            pass
+    
+    event_module.TrackTemplate = TrackTemplate
+    event_module.TrackTemplateResultInfo = TrackTemplateResultInfo
+    event_module.async_track_template_result = (
+        lambda hass, track_templates, action: TrackTemplateResultInfo()
+    )
     sys.modules['homeassistant.helpers.event'] = event_module
     helpers_module.event = event_module
     
+    # homeassistant.helpers.storage
+    storage_module = ModuleType('homeassistant.helpers.storage')
+    
+    class Store:
+        """Mock JSON store; keeps data in memory for the process."""
+        _saved = {}
+        
+        def __init__(self, hass, version, key, **kwargs):
+            self.hass = hass
+            self.version = version
+            self.key = key
+        
+        async def async_load(self):
+            return Store._saved.get(self.key)
+        
+        async def async_save(self, data):
+            Store._saved[self.key] = data
+        
+        def async_delay_save(self, data_func, delay=0):
+            Store._saved[self.key] = data_func()
+    
+    storage_module.Store = Store
+    sys.modules['homeassistant.helpers.storage'] = storage_module
+    helpers_module.storage = storage_module
+    
     # homeassistant.helpers.device_registry
     device_registry_module = ModuleType('homeassistant.helpers.device_registry')
     device_registry_module.async_get = lambda hass: None
     sys.modules['homeassistant.helpers.device_registry'] = device_registry_module
     helpers_module.device_registry = device_registry_module
     
+    # homeassistant.helpers.entity_registry
+    entity_registry_module = ModuleType('homeassistant.helpers.entity_registry')
+    # An empty registry: no entity is registered to any integration.
+    empty_entity_registry = ModuleType('entity_registry')
+    empty_entity_registry.async_get = lambda entity_id: None
+    entity_registry_module.async_get = lambda hass: empty_entity_registry
+    sys.modules['homeassistant.helpers.entity_registry'] = entity_registry_module
+    helpers_module.entity_registry = entity_registry_module
+    
     # homeassistant.helpers.entity
     entity_module = ModuleType('homeassistant.helpers.entity')
     entity_module.DeviceInfo = dict
@@ -216,23 +357,40 @@ def create_mock_modules():
     
     # homeassistant.components.binary_sensor
     binary_sensor_module = ModuleType('homeassistant.components.binary_sensor')
-    binary_sensor_module.BinarySensorEntity = object
+    binary_sensor_module.BinarySensorEntity = MockBinarySensorEntity
     sys.modules['homeassistant.components.binary_sensor'] = binary_sensor_module
     components_module.binary_sensor = binary_sensor_module
     
     # homeassistant.components.sensor
     sensor_module = ModuleType('homeassistant.components.sensor')
-    sensor_module.SensorEntity = object
+    sensor_module.SensorEntity = MockSensorEntity
+    sensor_module.SensorStateClass = type('SensorStateClass', (), {
+        'MEASUREMENT': 'measurement',
+        'TOTAL': 'total',
+        'TOTAL_INCREASING': 'total_increasing',
+    })
     sys.modules['homeassistant.components.sensor'] = sensor_module
     components_module.sensor = sensor_module
     
     # homeassistant.components.switch
     switch_module = ModuleType('homeassistant.components.switch')
-    switch_module.SwitchEntity = object
+    switch_module.SwitchEntity = MockSwitchEntity
     switch_module.SwitchDeviceClass = type('SwitchDeviceClass', (), {})
     sys.modules['homeassistant.components.switch'] = switch_module
     components_module.switch = switch_module
     
+    # homeassistant.components.select
+    select_module = ModuleType('homeassistant.components.select')
+    select_module.SelectEntity = MockSelectEntity
+    sys.modules['homeassistant.components.select'] = select_module
+    components_module.select = select_module
+    
+    # homeassistant.components.diagnostics
+    diagnostics_module = ModuleType('homeassistant.components.diagnostics')
+    diagnostics_module.async_redact_data = lambda data, to_redact: data
+    sys.modules['homeassistant.components.diagnostics'] = diagnostics_module
+    components_module.diagnostics = diagnostics_module
+    
     # homeassistant.components.persistent_notification
     notification_module = ModuleType('homeassistant.components.persistent_notification')
     notification_module.async_create = lambda hass, message, title=None, notification_id=None: None
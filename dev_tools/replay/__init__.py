@@ -0,0 +1,6 @@
+"""Replay recorded Home Assistant history through Emergency Alerts.
+
+Run from the repository root, e.g. ``python -m dev_tools.replay --help``.
+Alerts run on the mock HA core in ``dev_tools/mock_ha`` under its virtual
+clock; no Home Assistant installation is needed.
+"""
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""Vectorized backtest of numeric threshold rules against recorded history.
+
+For each rule (entity, comparator, candidate thresholds, ``for_seconds``
+dwell) the entity's history is loaded once into NumPy arrays and every
+candidate threshold is evaluated in one batch, with no Python callback per
+sample:
+
+1. The distinct state strings are compared against each threshold with the
+   same rules as ``core.numeric.compare_values`` (numeric when both sides
+   parse with ``float()``, string equality otherwise), giving a
+   ``thresholds x distinct states`` truth table. A sample of that table is
+   cross-checked against ``compare_values`` itself on every run.
+   With ``--hysteresis H`` the rule is evaluated like a ``numeric`` trigger
+   instead: it latches on when the value passes the threshold and stays on
+   until it crosses back past the clear threshold (``threshold - H`` for
+   ``>``/``>=``, ``threshold + H`` for ``<``/``<=``), and non-numeric states
+   keep the previous result. The latch is vectorized with two running
+   maxima, and a sample is cross-checked against ``NumericThreshold``.
+2. The table is gathered onto the samples, and run starts/ends come from
+   one ``np.diff`` over the padded boolean matrix.
+3. A run fires ``for_seconds`` after it starts if it lasts at least that
+   long (the dwell timer fires before a state change at the same instant,
+   as it does on the virtual clock), and stays active until the run ends.
+
+Needs NumPy::
+
+    python -m dev_tools.replay.backtest --recorder home-assistant_v2.db \\
+        --rule 'sensor.freezer_temperature > -20:-10:0.5' --for-seconds 300 \\
+        --hysteresis 1.5
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# Set up mock homeassistant modules BEFORE importing the integration
+from dev_tools.mock_ha.homeassistant_shim import setup_test_environment  # noqa: E402
+
+setup_test_environment()
+
+from custom_components.emergency_alerts.const import (  # noqa: E402
+    COMP_EQ,
+    COMP_GT,
+    COMP_GTE,
+    COMP_LT,
+    COMP_LTE,
+    COMP_NE,
+    COMPARATORS,
+)
+from custom_components.emergency_alerts.core.numeric import (  # noqa: E402
+    compare_values,
+    NumericThreshold,
+    to_number,
+)
+
+from .sources import iter_jsonl, parse_timestamp, RecorderDatabase  # noqa: E402
+
+_NUMERIC_OPS = {
+    COMP_LT: np.less,
+    COMP_LTE: np.less_equal,
+    COMP_GT: np.greater,
+    COMP_GTE: np.greater_equal,
+}
+# Cap on booleans materialized per batch (thresholds x samples).
+BATCH_CELLS = 20_000_000
+# Truth-table cells cross-checked against compare_values per rule.
+VERIFY_CELLS = 100_000
+
+
+def expand_thresholds(values: Iterable[str]) -> List[str]:
+    """Expand ``lo:hi:step`` ranges (inclusive) and keep plain values verbatim."""
+    thresholds = []
+    for value in values:
+        if value.count(":") == 2:
+            low, high, step = (float(part) for part in value.split(":"))
+            count = int(np.floor((high - low) / step + 1e-9)) + 1
+            thresholds.extend(repr(round(low + i * step, 10)) for i in range(count))
+        else:
+            thresholds.append(value)
+    return thresholds
+
+
+def truth_table(
+    states: np.ndarray, comparator: str, thresholds: List[str]
+) -> np.ndarray:
+    """Return ``thresholds x states`` booleans with ``compare_values`` semantics.
+
+    ``states`` holds distinct state strings; numeric parsing is done once
+    per distinct string with ``float()``, exactly as production parses.
+    """
+    numbers = np.array([to_number(state) for state in states.tolist()], dtype=float)
+    numeric = np.array([to_number(state) is not None for state in states.tolist()])
+    table = np.empty((len(thresholds), len(states)), dtype=bool)
+    for row, threshold in enumerate(thresholds):
+        equal = states == str(threshold)
+        if comparator == COMP_NE:
+            table[row] = ~equal
+            continue
+        expected = to_number(threshold)
+        op = _NUMERIC_OPS.get(comparator)
+        if op is None or expected is None:
+            # ==, unknown comparators, or a non-numeric threshold: equality.
+            table[row] = equal
+            continue
+        table[row] = np.where(numeric, op(numbers, expected), equal)
+    return table
+
+
+def verify_table(
+    table: np.ndarray,
+    states: np.ndarray,
+    comparator: str,
+    thresholds: List[str],
+    seed: int = 0,
+) -> None:
+    """Cross-check (a sample of) the table against ``compare_values``."""
+    rows, cols = table.shape
+    if rows * cols <= VERIFY_CELLS:
+        cells = ((r, c) for r in range(rows) for c in range(cols))
+    else:
+        rng = np.random.default_rng(seed)
+        cells = zip(
+            rng.integers(rows, size=VERIFY_CELLS), rng.integers(cols, size=VERIFY_CELLS)
+        )
+    for row, col in cells:
+        expected = compare_values(str(states[col]), comparator, thresholds[row])
+        if bool(table[row, col]) != expected:
+            raise AssertionError(
+                f"Vectorized compare disagrees with compare_values for "
+                f"{states[col]!r} {comparator} {thresholds[row]!r}: "
+                f"{bool(table[row, col])} != {expected}"
+            )
+
+
+def clear_threshold(comparator: str, threshold: float, hysteresis: float) -> float:
+    """Return the clear threshold ``--hysteresis`` implies for a rule."""
+    if comparator in (COMP_GT, COMP_GTE):
+        return threshold - hysteresis
+    if comparator in (COMP_LT, COMP_LTE):
+        return threshold + hysteresis
+    return threshold
+
+
+def hysteresis_tables(
+    states: np.ndarray, comparator: str, thresholds: List[str], hysteresis: float
+) -> tuple:
+    """Return ``(on, hold)`` ``thresholds x states`` tables for a numeric trigger.
+
+    ``on`` is where the trigger turns on; ``hold`` where an active trigger
+    stays on (past the clear threshold, or not a number at all).
+    """
+    numbers = np.array([to_number(state) for state in states.tolist()], dtype=float)
+    numeric = ~np.isnan(numbers)
+    op = {COMP_EQ: np.equal, COMP_NE: np.not_equal, **_NUMERIC_OPS}[comparator]
+    on_at = np.array([float(t) for t in thresholds])[:, None]
+    clear_at = np.array(
+        [clear_threshold(comparator, float(t), hysteresis) for t in thresholds]
+    )[:, None]
+    with np.errstate(invalid="ignore"):
+        on = numeric & op(numbers, on_at)
+        hold = ~numeric | op(numbers, clear_at)
+    return on, hold
+
+
+def latch(on: np.ndarray, hold: np.ndarray) -> np.ndarray:
+    """Per row: on from any ``on`` sample until the next sample not in ``hold``.
+
+    A sample is active iff the last ``on`` at or before it comes after the
+    last break (``~hold``) at or before it; ``on`` implies ``hold``.
+    """
+    index = np.arange(on.shape[1])
+    last_on = np.maximum.accumulate(np.where(on, index, -1), axis=1)
+    last_break = np.maximum.accumulate(np.where(hold, -1, index), axis=1)
+    return last_on > last_break
+
+
+def verify_latch(
+    active: np.ndarray,
+    states: np.ndarray,
+    comparator: str,
+    threshold: str,
+    hysteresis: float,
+) -> None:
+    """Cross-check one latched row against ``NumericThreshold.evaluate``."""
+    numeric = NumericThreshold(
+        comparator,
+        float(threshold),
+        clear_threshold(comparator, float(threshold), hysteresis),
+    )
+    expected = False
+    for sample, state in enumerate(states[:VERIFY_CELLS].tolist()):
+        expected = numeric.evaluate(state, expected)
+        if bool(active[sample]) != expected:
+            raise AssertionError(
+                f"Vectorized hysteresis disagrees with NumericThreshold for "
+                f"{comparator} {threshold} (hysteresis {hysteresis}) "
+                f"at sample {sample} ({state!r}): "
+                f"{bool(active[sample])} != {expected}"
+            )
+
+
+def backtest(
+    times: np.ndarray,
+    states: np.ndarray,
+    comparator: str,
+    thresholds: List[str],
+    for_seconds: float = 0,
+    end: Optional[float] = None,
+    max_fire_times: int = 20,
+    verify: bool = True,
+    hysteresis: Optional[float] = None,
+) -> List[Dict]:
+    """Backtest one entity's samples against every candidate threshold.
+
+    ``times`` must be sorted; each state holds until the next sample, the
+    last one until ``end`` (default: the last sample time). With
+    ``hysteresis``, rules behave like ``numeric`` triggers (see the module
+    docstring).
+    """
+    if end is None:
+        end = float(times[-1]) if len(times) else 0.0
+    distinct, inverse = np.unique(states, return_inverse=True)
+    if hysteresis is None:
+        table = truth_table(distinct, comparator, thresholds)
+        if verify:
+            verify_table(table, distinct, comparator, thresholds)
+    else:
+        on, hold = hysteresis_tables(distinct, comparator, thresholds, hysteresis)
+
+    edges = np.append(times, end)
+    samples = len(times)
+    results = []
+    batch = max(1, BATCH_CELLS // max(1, samples))
+    for first in range(0, len(thresholds), batch):
+        chunk = thresholds[first : first + batch]
+        padded = np.zeros((len(chunk), samples + 2), dtype=np.int8)
+        if hysteresis is None:
+            padded[:, 1:-1] = table[first : first + batch][:, inverse]
+        else:
+            padded[:, 1:-1] = latch(
+                on[first : first + batch][:, inverse],
+                hold[first : first + batch][:, inverse],
+            )
+            if verify:
+                verify_latch(padded[0, 1:-1], states, comparator, chunk[0], hysteresis)
+        steps = np.diff(padded, axis=1)
+        start_rows, start_cols = np.nonzero(steps == 1)
+        _end_rows, end_cols = np.nonzero(steps == -1)
+        run_start = edges[start_cols]
+        run_end = edges[end_cols]
+        open_at_end = end_cols == samples
+        fired = (run_end - run_start) >= for_seconds
+        fire_time = run_start + for_seconds
+        active = np.where(fired, run_end - fire_time, 0.0)
+        fires = np.bincount(start_rows[fired], minlength=len(chunk))
+        active_seconds = np.bincount(start_rows, weights=active, minlength=len(chunk))
+        held_back = np.bincount(start_rows[~fired & ~open_at_end], minlength=len(chunk))
+        for row, threshold in enumerate(chunk):
+            mask = fired & (start_rows == row)
+            fire_times = fire_time[mask][:max_fire_times]
+            results.append(
+                {
+                    "threshold": threshold,
+                    "fires": int(fires[row]),
+                    "fire_times": [
+                        datetime.fromtimestamp(ts, timezone.utc).isoformat()
+                        for ts in fire_times.tolist()
+                    ],
+                    "active_seconds": round(float(active_seconds[row]), 3),
+                    "mean_active_seconds": (
+                        round(float(active_seconds[row]) / int(fires[row]), 3)
+                        if fires[row]
+                        else None
+                    ),
+                    "active_at_end": bool(np.any(mask & open_at_end)),
+                    "suppressed_by_dwell": int(held_back[row]),
+                }
+            )
+    return results
+
+
+def load_series(
+    args, entity_ids: List[str], start: Optional[float], end: Optional[float]
+) -> Dict[str, tuple]:
+    """Return ``entity_id -> (times, states)`` arrays, streamed from the source."""
+    columns: Dict[str, tuple] = {entity_id: ([], []) for entity_id in entity_ids}
+    if args.recorder:
+        database = RecorderDatabase(args.recorder)
+        try:
+            for entity_id in entity_ids:
+                times, states = columns[entity_id]
+                if start is not None:
+                    before = database.state_before(entity_id, start)
+                    if before is not None:
+                        times.append(start)
+                        states.append(str(before.state))
+                for record in database.iter_entity(entity_id, start, end):
+                    times.append(record.timestamp)
+                    states.append(str(record.state))
+        finally:
+            database.close()
+    else:
+        for record in iter_jsonl(args.jsonl, entity_ids, start, end):
+            times, states = columns[record.entity_id]
+            times.append(record.timestamp)
+            states.append(str(record.state))
+    return {
+        entity_id: (np.array(times, dtype=float), np.array(states, dtype=str))
+        for entity_id, (times, states) in columns.items()
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    history = parser.add_mutually_exclusive_group(required=True)
+    history.add_argument(
+        "--recorder", help="HA recorder SQLite database (opened read-only)"
+    )
+    history.add_argument(
+        "--jsonl", nargs="+", help="Time-sorted JSONL state exports (.gz ok)"
+    )
+    parser.add_argument(
+        "--rule",
+        action="append",
+        required=True,
+        metavar="'ENTITY_ID COMPARATOR THRESHOLDS'",
+        help=(
+            "Entity, comparator (one of " + " ".join(COMPARATORS) + ") and candidate "
+            "thresholds separated by spaces or commas; lo:hi:step ranges are "
+            "inclusive. Quote it; repeat for more rules."
+        ),
+    )
+    parser.add_argument(
+        "--for-seconds",
+        type=float,
+        default=0,
+        help="Dwell before a rule fires, as the alert's for_seconds (default: 0)",
+    )
+    parser.add_argument(
+        "--hysteresis",
+        type=float,
+        help=(
+            "Evaluate rules as numeric triggers whose clear threshold is this far "
+            "back from each threshold (default: plain comparisons)"
+        ),
+    )
+    parser.add_argument("--start", help="Backtest from this time (ISO 8601 or epoch)")
+    parser.add_argument("--end", help="Backtest up to this time (ISO 8601 or epoch)")
+    parser.add_argument(
+        "--max-fire-times",
+        type=int,
+        default=20,
+        help="Fire timestamps listed per threshold (default: 20)",
+    )
+    parser.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="Skip the cross-check against the integration's comparison code",
+    )
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    rules = []
+    for text in args.rule:
+        rule = text.replace(",", " ").split()
+        if len(rule) < 3 or rule[1] not in COMPARATORS:
+            parser.error(
+                f"--rule needs 'ENTITY_ID COMPARATOR THRESHOLDS'; got {text!r}"
+            )
+        thresholds = expand_thresholds(rule[2:])
+        if args.hysteresis is not None and any(
+            to_number(t) is None for t in thresholds
+        ):
+            parser.error(f"--hysteresis needs numeric thresholds; got {text!r}")
+        rules.append((rule[0], rule[1], thresholds))
+    start = parse_timestamp(args.start) if args.start else None
+    end = parse_timestamp(args.end) if args.end else None
+
+    started = time.perf_counter()
+    series = load_series(args, sorted({rule[0] for rule in rules}), start, end)
+    loaded = time.perf_counter()
+    report = {
+        "for_seconds": args.for_seconds,
+        "hysteresis": args.hysteresis,
+        "rules": [],
+    }
+    evaluated = 0
+    for entity_id, comparator, thresholds in rules:
+        times, states = series[entity_id]
+        results = (
+            backtest(
+                times,
+                states,
+                comparator,
+                thresholds,
+                args.for_seconds,
+                end,
+                args.max_fire_times,
+                not args.no_verify,
+                args.hysteresis,
+            )
+            if len(times)
+            else []
+        )
+        evaluated += len(times) * len(thresholds)
+        report["rules"].append(
+            {
+                "entity_id": entity_id,
+                "comparator": comparator,
+                "samples": len(times),
+                "distinct_states": int(len(np.unique(states))) if len(states) else 0,
+                "thresholds": results,
+            }
+        )
+    finished = time.perf_counter()
+    report["timing"] = {
+        "load_seconds": round(loaded - started, 4),
+        "backtest_seconds": round(finished - loaded, 4),
+        "sample_evaluations": evaluated,
+        "sample_evaluations_per_second": (
+            round(evaluated / (finished - loaded), 1) if finished > loaded else None
+        ),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
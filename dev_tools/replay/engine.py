@@ -0,0 +1,328 @@
+"""Replay recorded state history through the integration on the mock core.
+
+The integration is set up on :mod:`dev_tools.mock_ha` exactly as HA would
+set it up, the virtual clock is pinned to the first recorded timestamp,
+and every record becomes a ``hass.states.async_set`` at its recorded time.
+Alerts therefore evaluate through the real ``state_changed`` subscription,
+``for_seconds`` dwells and escalation timers fire at the right simulated
+moments, and actions go to the mock service registry (which only counts
+them). Nothing waits on wall time, so history replays as fast as the
+integration can evaluate it.
+"""
+
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# Set up mock homeassistant modules BEFORE importing the integration
+from dev_tools.mock_ha.homeassistant_shim import (  # noqa: E402
+    ConfigEntry,
+    setup_test_environment,
+)
+
+setup_test_environment()
+
+from dev_tools.mock_ha.ha_core import (  # noqa: E402
+    create_mock_hass,
+    EVENT_STATE_CHANGED,
+)
+
+from .sources import Record  # noqa: E402
+
+DOMAIN = "emergency_alerts"
+STATE_ON = "on"
+STATUS_ESCALATED = "escalated"
+# Records between drains of the action tasks the replay has queued.
+DRAIN_EVERY = 1000
+
+
+def load_config_entries(path: str) -> List[ConfigEntry]:
+    """Return the Emergency Alerts entries in ``.storage/core.config_entries``."""
+    with open(path, encoding="utf-8") as handle:
+        storage = json.load(handle)
+    entries = []
+    for raw in storage.get("data", {}).get("entries", []):
+        if raw.get("domain") != DOMAIN:
+            continue
+        entries.append(
+            ConfigEntry(
+                DOMAIN,
+                raw.get("data", {}),
+                options=raw.get("options", {}),
+                entry_id=raw.get("entry_id"),
+                version=raw.get("version", 1),
+                title=raw.get("title", ""),
+            )
+        )
+    return entries
+
+
+def load_alert_file(
+    path: str, global_options: Dict[str, Any] = None
+) -> List[ConfigEntry]:
+    """Wrap an ``alert_id -> config`` mapping (YAML/JSON) in a global and group hub."""
+    with open(path, encoding="utf-8") as handle:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+
+            alerts = yaml.safe_load(handle)
+        else:
+            alerts = json.load(handle)
+    return [
+        ConfigEntry(
+            DOMAIN,
+            {"hub_type": "global", "name": "Global Settings"},
+            options=dict(global_options or {}),
+            entry_id="replay_global",
+            version=3,
+            title="Emergency Alerts - Global Settings",
+        ),
+        ConfigEntry(
+            DOMAIN,
+            {
+                "hub_type": "group",
+                "group": "replay",
+                "hub_name": "replay",
+                "alerts": alerts,
+            },
+            entry_id="replay_hub",
+            version=3,
+            title="Emergency Alerts - Replay",
+        ),
+    ]
+
+
+class AlertReplayStats:
+    """What one alert did during a replay."""
+
+    __slots__ = (
+        "alert_id",
+        "hub_name",
+        "fires",
+        "fire_times",
+        "active_since",
+        "active_seconds",
+        "escalations",
+    )
+
+    def __init__(self, alert_id: str, hub_name: str):
+        self.alert_id = alert_id
+        self.hub_name = hub_name
+        self.fires = 0
+        self.fire_times: List[float] = []
+        self.active_since: Optional[float] = None
+        self.active_seconds = 0.0
+        self.escalations = 0
+
+
+class Replay:
+    """Drive the integration from a stream of recorded states."""
+
+    def __init__(self, entries: List[ConfigEntry], max_fire_times: int = 100):
+        self.entries = entries
+        self.max_fire_times = max_fire_times
+        self.hass = None
+        self.records = 0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self.wall_seconds = 0.0
+        # alert binary_sensor / status sensor entity_id -> stats
+        self._by_entity: Dict[str, AlertReplayStats] = {}
+        self._by_status_entity: Dict[str, AlertReplayStats] = {}
+        self.skipped: List[Dict[str, str]] = []
+
+    @property
+    def alerts(self) -> list:
+        """Return the alert binary sensors."""
+        return self.hass.data[DOMAIN]["entities"]
+
+    async def async_setup(self) -> None:
+        """Set up every hub on a fresh mock hass."""
+        logging.getLogger("custom_components").setLevel(logging.ERROR)
+        from custom_components.emergency_alerts import (
+            async_migrate_entry,
+            async_setup_entry,
+        )
+
+        hass = self.hass = create_mock_hass()
+        hass.services.record_calls = False
+        hass.bus.record_events = False
+        # Set up the global hub first so group hubs see its options.
+        for entry in sorted(
+            self.entries, key=lambda e: e.data.get("hub_type") != "global"
+        ):
+            hass.config_entries.async_add(entry)
+            await async_migrate_entry(hass, entry)
+            await async_setup_entry(hass, entry)
+        await hass.async_block_till_done()
+
+        for entity in self.alerts:
+            stats = AlertReplayStats(entity._alert_id, entity._hub_name)
+            self._by_entity[entity.entity_id] = stats
+            self._by_status_entity[f"sensor.emergency_{entity._alert_id}_status"] = (
+                stats
+            )
+            if entity._trigger_type == "template":
+                # The mock core does not render Jinja templates.
+                self.skipped.append(
+                    {
+                        "alert_id": entity._alert_id,
+                        "reason": "template triggers are not replayed",
+                    }
+                )
+        hass.bus.async_listen(EVENT_STATE_CHANGED, self._on_state_changed)
+
+    def watched_entities(self) -> List[str]:
+        """Return every source entity some alert subscribes to."""
+        watched = set()
+        for entity in self.alerts:
+            watched.update(entity.subscribed_entities())
+        return sorted(watched)
+
+    def _on_state_changed(self, event) -> None:
+        entity_id = event.data["entity_id"]
+        stats = self._by_entity.get(entity_id)
+        now = self.hass.clock.time()
+        if stats is not None:
+            old_state = event.data["old_state"]
+            new_state = event.data["new_state"]
+            was_on = old_state is not None and old_state.state == STATE_ON
+            is_on = new_state is not None and new_state.state == STATE_ON
+            if is_on and not was_on:
+                stats.fires += 1
+                stats.active_since = now
+                if len(stats.fire_times) < self.max_fire_times:
+                    stats.fire_times.append(now)
+            elif was_on and not is_on and stats.active_since is not None:
+                stats.active_seconds += now - stats.active_since
+                stats.active_since = None
+            return
+        stats = self._by_status_entity.get(entity_id)
+        if stats is not None:
+            old_state = event.data["old_state"]
+            new_state = event.data["new_state"]
+            if (
+                new_state is not None
+                and new_state.state == STATUS_ESCALATED
+                and (old_state is None or old_state.state != STATUS_ESCALATED)
+            ):
+                stats.escalations += 1
+
+    async def _move_to(self, timestamp: float) -> None:
+        clock = self.hass.clock
+        delta = timestamp - clock.time()
+        if delta > 0 and not clock.jump(delta):
+            await clock.advance(delta)
+
+    async def async_run(
+        self,
+        records: Iterable[Record],
+        initial: Iterable[Record] = (),
+        tail_seconds: float = 0,
+    ) -> None:
+        """Replay ``records`` (time-ordered), after seeding ``initial`` states."""
+        hass = self.hass
+        records: Iterator[Record] = iter(records)
+        initial = list(initial)
+        first = next(records, None)
+        if first is None and not initial:
+            return
+        start = (
+            first.timestamp if first is not None else max(r.timestamp for r in initial)
+        )
+        if initial:
+            start = min(start, min(r.timestamp for r in initial))
+        hass.clock.rebase(start)
+        self.first_timestamp = start
+
+        started = time.perf_counter()
+        with hass.clock:
+            for record in initial:
+                hass.states.async_set(record.entity_id, record.state, record.attributes)
+            await hass.async_block_till_done()
+            stream = chain((first,), records) if first is not None else ()
+            count = 0
+            for record in stream:
+                await self._move_to(record.timestamp)
+                hass.states.async_set(record.entity_id, record.state, record.attributes)
+                count += 1
+                if count % DRAIN_EVERY == 0:
+                    await hass.async_block_till_done()
+            self.records = count
+            self.last_timestamp = hass.clock.time()
+            await hass.clock.advance(tail_seconds)
+            await hass.async_block_till_done()
+        self.wall_seconds = time.perf_counter() - started
+
+    def report(self) -> Dict[str, Any]:
+        """Return fires, timings and action counts as a JSON-ready dict."""
+        end = self.hass.clock.time()
+        alerts = []
+        for entity in self.alerts:
+            stats = self._by_entity[entity.entity_id]
+            active_seconds = stats.active_seconds
+            if stats.active_since is not None:
+                active_seconds += end - stats.active_since
+            alerts.append(
+                {
+                    "alert_id": stats.alert_id,
+                    "hub_name": stats.hub_name,
+                    "fires": stats.fires,
+                    "fire_times": [_iso(ts) for ts in stats.fire_times],
+                    "fire_times_truncated": stats.fires > len(stats.fire_times),
+                    "active_seconds": round(active_seconds, 3),
+                    "active_at_end": stats.active_since is not None,
+                    "escalations": stats.escalations,
+                    "actions_dispatched": entity._metrics.actions_dispatched,
+                    "actions_failed": entity._metrics.actions_failed,
+                }
+            )
+        alerts.sort(key=lambda alert: (-alert["fires"], alert["alert_id"]))
+        simulated = (
+            (end - self.first_timestamp) if self.first_timestamp is not None else 0
+        )
+        metrics = self.hass.data[DOMAIN]["metrics"]
+        return {
+            "window": {
+                "start": _iso(self.first_timestamp),
+                "end": _iso(end) if self.first_timestamp is not None else None,
+            },
+            "records": self.records,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "records_per_second": (
+                round(self.records / self.wall_seconds, 1)
+                if self.wall_seconds
+                else None
+            ),
+            "simulated_seconds": round(simulated, 3),
+            "speedup": (
+                round(simulated / self.wall_seconds, 1) if self.wall_seconds else None
+            ),
+            "totals": {
+                "alerts": len(alerts),
+                "alerts_fired": sum(1 for alert in alerts if alert["fires"]),
+                "fires": sum(alert["fires"] for alert in alerts),
+                "escalations": sum(alert["escalations"] for alert in alerts),
+                "evaluations": metrics.evaluations,
+                "actions_dispatched": metrics.actions_dispatched,
+                "actions_failed": metrics.actions_failed,
+                "services_called": self.hass.services.call_count,
+            },
+            "skipped": self.skipped,
+            "alerts": alerts,
+        }
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
@@ -0,0 +1,244 @@
+"""Streaming readers for recorded Home Assistant state history.
+
+Every reader yields :class:`Record` tuples in timestamp order without
+loading whole tables or files, so a year of history replays in constant
+memory:
+
+- :func:`iter_recorder` reads the HA recorder SQLite database. Each
+  entity gets its own cursor walking the ``(metadata_id, last_updated_ts)``
+  index, and the cursors are merged with :func:`heapq.merge`, so SQLite
+  never has to sort the states table.
+- :func:`iter_jsonl` reads JSON Lines exports (optionally gzipped), one
+  state per line, each file already sorted by time.
+"""
+
+import gzip
+import heapq
+import json
+import sqlite3
+from datetime import datetime, timezone
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+# Rows pulled per SQLite round trip for each entity cursor.
+FETCH_SIZE = 1000
+
+_by_time = attrgetter("timestamp")
+
+
+class Record(NamedTuple):
+    """One recorded state."""
+
+    timestamp: float
+    entity_id: str
+    state: str
+    attributes: Optional[Dict[str, Any]]
+
+
+def parse_timestamp(value) -> float:
+    """Return a POSIX timestamp from an epoch number or ISO 8601 string."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    raise ValueError(f"Unsupported timestamp: {value!r}")
+
+
+def _open_text(path: str):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _iter_jsonl_file(
+    path: str,
+    entity_ids: Optional[set],
+    start: Optional[float],
+    end: Optional[float],
+) -> Iterator[Record]:
+    last = None
+    with _open_text(path) as handle:
+        for line_number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            entity_id = row["entity_id"]
+            if entity_ids is not None and entity_id not in entity_ids:
+                continue
+            timestamp = parse_timestamp(
+                row.get(
+                    "last_updated_ts", row.get("last_updated", row.get("timestamp"))
+                )
+            )
+            if last is not None and timestamp < last:
+                raise ValueError(
+                    f"{path}:{line_number}: timestamps go backwards; "
+                    "sort each JSONL file by time before replaying"
+                )
+            last = timestamp
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp > end:
+                return
+            yield Record(timestamp, entity_id, row.get("state"), row.get("attributes"))
+
+
+def iter_jsonl(
+    paths: Iterable[str],
+    entity_ids: Optional[Iterable[str]] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> Iterator[Record]:
+    """Stream states from JSONL files, merged across files by time.
+
+    Each line is an object with ``entity_id``, ``state``, a timestamp
+    (``last_updated_ts`` / ``last_updated`` / ``timestamp``, epoch or ISO
+    8601) and optional ``attributes``. Each file must be sorted by time;
+    files may overlap.
+    """
+    wanted = set(entity_ids) if entity_ids is not None else None
+    streams = [_iter_jsonl_file(path, wanted, start, end) for path in paths]
+    return heapq.merge(*streams, key=_by_time)
+
+
+class RecorderDatabase:
+    """Read-only view of an HA recorder SQLite database.
+
+    Supports the current schema (``states_meta`` + ``last_updated_ts``) and
+    the older one that kept ``entity_id`` and ``last_updated`` on the
+    states table.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        tables = {
+            row[0]
+            for row in self._connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        if "states" not in tables:
+            raise ValueError(f"{path} is not a Home Assistant recorder database")
+        columns = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(states)")
+        }
+        self._has_meta = "states_meta" in tables and "metadata_id" in columns
+        self._has_ts = "last_updated_ts" in columns
+        self._has_attributes_table = (
+            "state_attributes" in tables and "attributes_id" in columns
+        )
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._connection.close()
+
+    def _entity_filter(self, entity_id: str):
+        """Return a (SQL fragment, parameters) selecting one entity's rows."""
+        if self._has_meta:
+            row = self._connection.execute(
+                "SELECT metadata_id FROM states_meta WHERE entity_id = ?", (entity_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            return "s.metadata_id = ?", [row[0]]
+        return "s.entity_id = ?", [entity_id]
+
+    def _select(self, with_attributes: bool) -> str:
+        time_column = "s.last_updated_ts" if self._has_ts else "s.last_updated"
+        if with_attributes and self._has_attributes_table:
+            return (
+                f"SELECT {time_column}, s.state, sa.shared_attrs FROM states s "
+                "LEFT JOIN state_attributes sa ON sa.attributes_id = s.attributes_id"
+            )
+        if with_attributes:
+            return f"SELECT {time_column}, s.state, s.attributes FROM states s"
+        return f"SELECT {time_column}, s.state, NULL FROM states s"
+
+    def _time_bound(self, value: float):
+        if self._has_ts:
+            return value
+        return datetime.fromtimestamp(value, timezone.utc).strftime(
+            "%Y-%m-%d %H:%M:%S.%f"
+        )
+
+    def _rows(self, entity_id: str, sql: str, params: List) -> Iterator[Record]:
+        cursor = self._connection.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                return
+            for timestamp, state, attributes in rows:
+                if not self._has_ts:
+                    timestamp = parse_timestamp(timestamp)
+                yield Record(
+                    timestamp,
+                    entity_id,
+                    state,
+                    json.loads(attributes) if attributes else None,
+                )
+
+    def iter_entity(
+        self,
+        entity_id: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        with_attributes: bool = False,
+    ) -> Iterator[Record]:
+        """Stream one entity's states in time order."""
+        selector = self._entity_filter(entity_id)
+        if selector is None:
+            return iter(())
+        where, params = selector
+        time_column = "s.last_updated_ts" if self._has_ts else "s.last_updated"
+        clauses = [where]
+        if start is not None:
+            clauses.append(f"{time_column} >= ?")
+            params.append(self._time_bound(start))
+        if end is not None:
+            clauses.append(f"{time_column} <= ?")
+            params.append(self._time_bound(end))
+        sql = (
+            f"{self._select(with_attributes)} WHERE {' AND '.join(clauses)} "
+            f"ORDER BY {time_column}"
+        )
+        return self._rows(entity_id, sql, params)
+
+    def state_before(
+        self, entity_id: str, timestamp: float, with_attributes: bool = False
+    ) -> Optional[Record]:
+        """Return the last state recorded before ``timestamp``, if any."""
+        selector = self._entity_filter(entity_id)
+        if selector is None:
+            return None
+        where, params = selector
+        time_column = "s.last_updated_ts" if self._has_ts else "s.last_updated"
+        params.append(self._time_bound(timestamp))
+        sql = (
+            f"{self._select(with_attributes)} WHERE {where} AND {time_column} < ? "
+            f"ORDER BY {time_column} DESC LIMIT 1"
+        )
+        return next(self._rows(entity_id, sql, params), None)
+
+
+def iter_recorder(
+    database: RecorderDatabase,
+    entity_ids: Iterable[str],
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    with_attributes: bool = False,
+) -> Iterator[Record]:
+    """Stream states of ``entity_ids`` from the recorder, merged by time."""
+    streams = [
+        database.iter_entity(entity_id, start, end, with_attributes)
+        for entity_id in sorted(set(entity_ids))
+    ]
+    return heapq.merge(*streams, key=_by_time)
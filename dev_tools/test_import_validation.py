@@ -88,10 +88,10 @@ def test_const_imports_valid():
                 errors.append(f"{file_path.name}: Syntax error - {e}")
                 continue
         
-        # Find imports from const
+        # Find imports from the integration's const.py (not homeassistant.const)
         for node in ast.walk(tree):
             if isinstance(node, ast.ImportFrom):
-                if node.module and 'const' in node.module:
+                if node.level and node.module and node.module.endswith('const'):
                     for alias in node.names:
                         imported_name = alias.name
                         